@@ -2,33 +2,83 @@ from collections import deque
 import typing
 import os
 import time
+import hmac
 
 from pyrsistent import pmap
 
+from noobit_markets.base.nonce import NonceSource, key_id
+
+
+
+# (secret, digestmod, decode) => hmac keyed with the decoded secret, never updated
+_HMAC_TEMPLATES: typing.Dict[tuple, hmac.HMAC] = {}
+
+
+def hmac_signer(
+        secret: str,
+        digestmod: typing.Callable,
+        decode: typing.Callable[[str], bytes] = str.encode
+    ) -> hmac.HMAC:
+    """fresh hmac object for `secret`
+
+    Decoding the secret and hashing the padded key are done once per secret,
+    each call only copies the precomputed state.
+    """
+    cache_key = (secret, digestmod, decode)
+    try:
+        template = _HMAC_TEMPLATES[cache_key]
+    except KeyError:
+        template = hmac.new(decode(secret), digestmod=digestmod)
+        _HMAC_TEMPLATES[cache_key] = template
+    return template.copy()
+
+
+
+def _load_dotenv():
+    """read `.env` into the environment, once per process and only when keys are first needed
+    """
+    global _DOTENV_LOADED
+    if _DOTENV_LOADED:
+        return
+    _DOTENV_LOADED = True
+
+    from dotenv import load_dotenv
+    load_dotenv()
+
+
+_DOTENV_LOADED = False
+
 
 
 class BaseAuth(object):
 
 
-    key_pairs_dq: deque = deque()
+    # loaded from the environment on first use (see `_key_pairs`), so auth instances are cheap
+    # to create, e.g as default arguments evaluated at import time
+    key_pairs_dq: typing.Optional[deque] = None
     last_nonce: int = 0
 
+    # shared with other processes if set (see base.nonce), per exchange auth class
+    nonce_source: typing.Optional[NonceSource] = None
+    exchange: str = ""
+
 
     def __init__(self, exchange_name: str):
 
         self.exchange_name: str = exchange_name.upper()
+        self._set_class_var("exchange", self.exchange_name)
 
-        kp = self.get_exchange_keys()
-        self._set_class_var("key_pairs_dq", kp)
 
-
-    def get_exchange_keys(self) -> typing.Deque:
+    @classmethod
+    def get_exchange_keys(cls) -> typing.Deque:
         """
         """
+        _load_dotenv()
+
         try:
             key_pairs = set()
             # get dict from env where keys are either api_key or api_secret
-            key_dict = {k: v for k, v in dict(os.environ).items() if self.exchange_name.upper() in k}
+            key_dict = {k: v for k, v in dict(os.environ).items() if cls.exchange.upper() in k}
             # match corresponding api_key and api_secret
             
             # TODO find better solution, as this makes our signature tests fail for travis builds (will not have any api keys present)
@@ -46,7 +96,8 @@ class BaseAuth(object):
                     })
                     key_pairs.add(pair)
 
-            return deque(frozenset(key_pairs))
+            # same order in every process, so key indexes of a nonce source match
+            return deque(sorted(key_pairs, key=lambda kp: kp["api_key"]))
 
         except Exception as e:
             raise e
@@ -57,34 +108,71 @@ class BaseAuth(object):
         setattr(cls, attr, value)
 
 
+    @classmethod
+    def _key_pairs(cls) -> deque:
+        if cls.key_pairs_dq is None:
+            if not cls.exchange:
+                # no instance created yet, we don't know which keys to look for
+                return deque()
+            cls._set_class_var("key_pairs_dq", cls.get_exchange_keys())
+        return cls.key_pairs_dq
+
+
+    @classmethod
+    def set_nonce_source(cls, source: typing.Optional[NonceSource]):
+        """share nonces and key rotation with other processes (None to go back to in process)
+
+        Usage:
+            KrakenAuth.set_nonce_source(FileNonceSource("/tmp/noobit-nonces.json"))
+        """
+        cls._set_class_var("nonce_source", source)
+
+
     @classmethod
     def rotate_keys(cls):
-        cls.key_pairs_dq.rotate(-1)
+        key_pairs = cls._key_pairs()
+
+        if cls.nonce_source is None or len(key_pairs) < 2:
+            key_pairs.rotate(-1)
+            return
+
+        index = cls.nonce_source.next_key(cls.exchange, len(key_pairs))
+        target = sorted(key_pairs, key=lambda kp: kp["api_key"])[index]
+        while key_pairs[0] is not target:
+            key_pairs.rotate(-1)
 
 
     @property
     def key(self):
-        return self.key_pairs_dq[0]["api_key"]
+        return self._key_pairs()[0]["api_key"]
 
 
     @property
     def secret(self):
-        return self.key_pairs_dq[0]["api_secret"]
+        return self._key_pairs()[0]["api_secret"]
 
 
     @property
     def keypair(self):
         self.rotate_keys()
-        return self.key_pairs_dq[0]
+        return self._key_pairs()[0]
 
 
     def __iter__(self):
         self.rotate_keys()
-        yield(self.key_pairs_dq[0])
+        yield(self._key_pairs()[0])
 
 
     @property
     def nonce(self):
+        if self.nonce_source is not None:
+            # nonces are per api key (exchanges check them per key)
+            key_pairs = self._key_pairs()
+            api_key = key_pairs[0]["api_key"] if key_pairs else None
+            valid_nonce = self.nonce_source.next_nonce(key_id(self.exchange, api_key))
+            self._set_class_var("last_nonce", valid_nonce)
+            return valid_nonce
+
         ts = int(time.time()*10**3)
         valid_nonce = ts if ts > self.last_nonce else self.last_nonce + 1
         self._set_class_var("last_nonce", valid_nonce)
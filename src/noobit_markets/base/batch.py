@@ -0,0 +1,154 @@
+"""
+Batch order entry : place or cancel many orders concurrently.
+
+Exchanges we support have no bulk endpoint to place orders (and only "cancel all" endpoints to cancel
+them in bulk), so batches are fanned out concurrently over the single order endpoints, under a `RateLimiter`.
+Each order gets its own `Result`, in the same order as the requests, a failing order never fails the batch.
+"""
+
+import asyncio
+import time
+import typing
+
+from noobit_markets.base import ntypes
+from noobit_markets.base.models.result import Result, Err
+from noobit_markets.base.models.rest.response import NoobitResponseSymbols
+
+
+
+
+# ============================================================
+# EXPORTS
+# ============================================================
+
+
+__all__ = (
+    "RateLimiter",
+    "batch_new_orders",
+    "batch_cancel",
+)
+
+
+
+
+# ============================================================
+# RATE LIMITER
+# ============================================================
+
+
+class RateLimiter(object):
+    """limit number of requests in flight, and optionally space out request starts
+
+    Args:
+        max_concurrent: maximum number of requests in flight
+        interval: minimum number of seconds between two request starts
+
+    Usage:
+        limiter = RateLimiter(max_concurrent=5, interval=0.1)
+        async with limiter:
+            await client.request(...)
+    """
+
+    def __init__(self, max_concurrent: int = 5, interval: float = 0):
+        self.max_concurrent = max_concurrent
+        self.interval = interval
+
+        self._sem: typing.Optional[asyncio.Semaphore] = None
+        self._lock: typing.Optional[asyncio.Lock] = None
+        self._last_start: float = 0
+
+
+    # created lazily, so the limiter can be instantiated outside of a running loop
+    def _ensure_primitives(self):
+        if self._sem is None:
+            self._sem = asyncio.Semaphore(self.max_concurrent)
+            self._lock = asyncio.Lock()
+
+
+    async def __aenter__(self):
+        self._ensure_primitives()
+        await self._sem.acquire()
+
+        if self.interval:
+            async with self._lock:
+                wait = self._last_start + self.interval - time.monotonic()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                self._last_start = time.monotonic()
+
+        return self
+
+
+    async def __aexit__(self, *exc_info):
+        self._sem.release()
+
+
+
+
+# ============================================================
+# FAN OUT
+# ============================================================
+
+
+async def _limited(limiter: RateLimiter, coro_func: typing.Callable, *args, **kwargs) -> Result:
+    async with limiter:
+        try:
+            return await coro_func(*args, **kwargs)
+        except Exception as e:
+            # dont let one order fail the whole batch
+            return Err(e)
+
+
+async def batch_new_orders(
+        new_order_func: typing.Callable[..., typing.Awaitable[Result]],
+        client: ntypes.CLIENT,
+        symbols_resp: NoobitResponseSymbols,
+        orders: typing.Sequence[typing.Mapping[str, typing.Any]],
+        *,
+        limiter: typing.Optional[RateLimiter] = None,
+        **kwargs
+    ) -> typing.Tuple[Result, ...]:
+    """place `orders` concurrently with `new_order_func` (e.g `post_neworder_kraken`)
+
+    Args:
+        orders: keyword arguments of `new_order_func` for each order
+            (symbol, side, ordType, clOrdID, orderQty, price, timeInForce ...)
+        kwargs: passed to every call (logger, auth, base_url ...)
+
+    Returns:
+        one `Result` per order, in the same order as `orders`
+    """
+
+    limiter = limiter if limiter is not None else RateLimiter()
+
+    return tuple(await asyncio.gather(*[
+        _limited(limiter, new_order_func, client, symbols_resp=symbols_resp, **order, **kwargs)
+        for order in orders
+    ]))
+
+
+async def batch_cancel(
+        cancel_func: typing.Callable[..., typing.Awaitable[Result]],
+        client: ntypes.CLIENT,
+        symbols_resp: NoobitResponseSymbols,
+        orders: typing.Sequence[typing.Tuple[ntypes.SYMBOL, str]],
+        *,
+        limiter: typing.Optional[RateLimiter] = None,
+        **kwargs
+    ) -> typing.Tuple[Result, ...]:
+    """cancel `orders` concurrently with `cancel_func` (e.g `cancel_openorder_kraken`)
+
+    Args:
+        orders: (symbol, orderID) for each order to cancel
+        kwargs: passed to every call (logger, auth, base_url ...)
+
+    Returns:
+        one `Result` per order, in the same order as `orders`
+    """
+
+    limiter = limiter if limiter is not None else RateLimiter()
+
+    return tuple(await asyncio.gather(*[
+        _limited(limiter, cancel_func, client, symbol, symbols_resp, orderID, **kwargs)
+        for symbol, orderID in orders
+    ]))
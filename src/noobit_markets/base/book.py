@@ -0,0 +1,318 @@
+"""
+Consolidated order book : books of the same symbol from several exchanges, merged into one price ordered view.
+
+Each price level keeps the volume of every venue quoting it, so the best consolidated price comes with
+the venues to route to. Updates are incremental : a venue update only touches the price levels that changed
+(full books, as yielded by `KrakenWsPublic.orderbook`, `BinanceWsPublic.orderbook` or `get_orderbook_*`,
+are diffed against the previous book of that venue), other venues are never re-merged.
+
+Usage:
+    books = ConsolidatedBooks()
+    asyncio.ensure_future(books.consume(kraken_ws.orderbook(symbols_resp, "XBT-USD", depth=10)))
+    asyncio.ensure_future(books.consume(binance_ws.orderbook(symbols_resp, "XBT-USD")))
+
+    price, venues = books["XBT-USD"].best_ask()      # e.g (Decimal("9500.1"), {"KRAKEN": Decimal("1.2")})
+"""
+
+import bisect
+import types
+import typing
+from decimal import Decimal
+
+from typing_extensions import Literal
+
+from noobit_markets.base import ntypes
+from noobit_markets.base.models.result import Result
+from noobit_markets.base.models.rest.response import NoobitResponseOrderBook
+
+
+
+
+# ============================================================
+# EXPORTS
+# ============================================================
+
+
+__all__ = (
+    "ConsolidatedBook",
+    "ConsolidatedBooks",
+)
+
+
+SIDE = Literal["asks", "bids"]
+
+# venue => volume at a price level (read only view, kept up to date)
+LEVEL = typing.Mapping[str, Decimal]
+
+_ZERO = Decimal(0)
+
+
+def _venue(exchange: typing.Union[ntypes.EXCHANGE, str]) -> str:
+    # validated responses hold an `EXCHANGE` member, compact events a plain string
+    return getattr(exchange, "value", exchange)
+
+
+
+
+# ============================================================
+# SIDE
+# ============================================================
+
+
+class _Side(object):
+    """one side of the consolidated book
+
+    `prices` is kept sorted ascending (bisect), best price is at one end of it.
+    """
+
+    __slots__ = ("descending", "prices", "levels", "totals")
+
+    def __init__(self, descending: bool):
+        self.descending = descending
+        self.prices: typing.List[Decimal] = []
+        self.levels: typing.Dict[Decimal, typing.Dict[str, Decimal]] = {}
+        self.totals: typing.Dict[Decimal, Decimal] = {}
+
+
+    def set(self, venue: str, price: Decimal, volume: Decimal):
+        """set volume of `venue` at `price`, 0 removes it
+        """
+        venues = self.levels.get(price)
+
+        if volume <= 0:
+            if venues is None or venue not in venues:
+                return
+            old = venues.pop(venue)
+            if venues:
+                self.totals[price] -= old
+            else:
+                del self.levels[price]
+                del self.totals[price]
+                del self.prices[bisect.bisect_left(self.prices, price)]
+            return
+
+        if venues is None:
+            self.levels[price] = {venue: volume}
+            self.totals[price] = volume
+            bisect.insort(self.prices, price)
+        else:
+            self.totals[price] += volume - venues.get(venue, _ZERO)
+            venues[venue] = volume
+
+
+    def best(self) -> typing.Optional[Decimal]:
+        if not self.prices:
+            return None
+        return self.prices[-1] if self.descending else self.prices[0]
+
+
+    def ordered(self) -> typing.Iterable[Decimal]:
+        return reversed(self.prices) if self.descending else iter(self.prices)
+
+
+
+
+# ============================================================
+# BOOK
+# ============================================================
+
+
+class ConsolidatedBook(object):
+    """book of a single symbol, across venues
+
+    Args:
+        symbol: noobit symbol (e.g "XBT-USD")
+    """
+
+    def __init__(self, symbol: ntypes.SYMBOL):
+        self.symbol = symbol
+        self._sides = {"asks": _Side(descending=False), "bids": _Side(descending=True)}
+        # last book of each venue, to diff snapshots against
+        self._venues: typing.Dict[str, typing.Dict[str, typing.Dict[Decimal, Decimal]]] = {}
+        self.utcTime: typing.Dict[str, int] = {}
+
+
+    # ========================================
+    # UPDATES
+
+
+    def apply_snapshot(
+            self,
+            venue: str,
+            asks: typing.Mapping[Decimal, Decimal],
+            bids: typing.Mapping[Decimal, Decimal],
+            utcTime: typing.Optional[int] = None
+        ):
+        """replace the book of `venue`, only levels that differ from its previous book are updated
+        """
+        previous = self._venues.setdefault(venue, {"asks": {}, "bids": {}})
+
+        for side_name, new in (("asks", asks), ("bids", bids)):
+            side = self._sides[side_name]
+            old = previous[side_name]
+
+            for price in [price for price in old if price not in new]:
+                side.set(venue, price, _ZERO)
+            for price, volume in new.items():
+                if old.get(price) != volume:
+                    side.set(venue, price, volume)
+
+            previous[side_name] = {price: volume for price, volume in new.items() if volume > 0}
+
+        if utcTime is not None:
+            self.utcTime[venue] = utcTime
+
+
+    def apply_update(
+            self,
+            venue: str,
+            asks: typing.Mapping[Decimal, Decimal],
+            bids: typing.Mapping[Decimal, Decimal],
+            utcTime: typing.Optional[int] = None
+        ):
+        """apply level deltas of `venue` (volume is the new volume at that price, 0 removes the level)
+        """
+        previous = self._venues.setdefault(venue, {"asks": {}, "bids": {}})
+
+        for side_name, delta in (("asks", asks), ("bids", bids)):
+            side = self._sides[side_name]
+            book = previous[side_name]
+            for price, volume in delta.items():
+                side.set(venue, price, volume)
+                if volume > 0:
+                    book[price] = volume
+                else:
+                    book.pop(price, None)
+
+        if utcTime is not None:
+            self.utcTime[venue] = utcTime
+
+
+    def remove_venue(self, venue: str):
+        """drop all levels of `venue` (e.g on disconnect, its book is stale)
+        """
+        self.apply_snapshot(venue, {}, {})
+        del self._venues[venue]
+        self.utcTime.pop(venue, None)
+
+
+    # ========================================
+    # QUERIES
+
+
+    @property
+    def venues(self) -> typing.Tuple[str, ...]:
+        return tuple(self._venues)
+
+
+    def _best(self, side_name: str) -> typing.Optional[typing.Tuple[Decimal, LEVEL]]:
+        side = self._sides[side_name]
+        price = side.best()
+        if price is None:
+            return None
+        return price, types.MappingProxyType(side.levels[price])
+
+
+    def best_ask(self) -> typing.Optional[typing.Tuple[Decimal, LEVEL]]:
+        """lowest ask and the volume of each venue quoting it (None if book is empty)
+        """
+        return self._best("asks")
+
+
+    def best_bid(self) -> typing.Optional[typing.Tuple[Decimal, LEVEL]]:
+        """highest bid and the volume of each venue quoting it (None if book is empty)
+        """
+        return self._best("bids")
+
+
+    def spread(self) -> typing.Optional[Decimal]:
+        ask, bid = self._sides["asks"].best(), self._sides["bids"].best()
+        if ask is None or bid is None:
+            return None
+        # can be negative, venues are not arbitraged against each other
+        return ask - bid
+
+
+    def depth_at(self, side: SIDE, price: Decimal) -> Decimal:
+        """total volume at `price` across venues
+        """
+        return self._sides[side].totals.get(price, _ZERO)
+
+
+    def venues_at(self, side: SIDE, price: Decimal) -> LEVEL:
+        return types.MappingProxyType(self._sides[side].levels.get(price, {}))
+
+
+    def levels(self, side: SIDE, n: typing.Optional[int] = None) -> typing.List[typing.Tuple[Decimal, Decimal, LEVEL]]:
+        """`n` best levels as (price, total volume, volume per venue), best first
+        """
+        _side = self._sides[side]
+        res = []
+        for price in _side.ordered():
+            if n is not None and len(res) >= n:
+                break
+            res.append((price, _side.totals[price], types.MappingProxyType(_side.levels[price])))
+        return res
+
+
+    def venue_book(self, venue: str) -> typing.Dict[str, typing.Dict[Decimal, Decimal]]:
+        """last known book of a single venue
+        """
+        book = self._venues.get(venue, {"asks": {}, "bids": {}})
+        return {"asks": dict(book["asks"]), "bids": dict(book["bids"])}
+
+
+
+
+# ============================================================
+# BOOKS
+# ============================================================
+
+
+class ConsolidatedBooks(object):
+    """consolidated books indexed by symbol, fed with `NoobitResponseOrderBook`s of any exchange
+    """
+
+    def __init__(self):
+        self._books: typing.Dict[ntypes.SYMBOL, ConsolidatedBook] = {}
+
+
+    def __getitem__(self, symbol: ntypes.SYMBOL) -> ConsolidatedBook:
+        return self.book(symbol)
+
+
+    def __contains__(self, symbol: ntypes.SYMBOL) -> bool:
+        return symbol in self._books
+
+
+    def book(self, symbol: ntypes.SYMBOL) -> ConsolidatedBook:
+        try:
+            return self._books[symbol]
+        except KeyError:
+            book = self._books[symbol] = ConsolidatedBook(symbol)
+            return book
+
+
+    def apply(self, orderbook: NoobitResponseOrderBook) -> ConsolidatedBook:
+        """full book of one exchange (all sources we have yield full books, not deltas)
+        """
+        book = self.book(orderbook.symbol)
+        book.apply_snapshot(_venue(orderbook.exchange), orderbook.asks, orderbook.bids, orderbook.utcTime)
+        return book
+
+
+    async def consume(self, stream: typing.AsyncIterable[Result[NoobitResponseOrderBook, Exception]]):
+        """feed from a websocket orderbook stream, errors are skipped
+
+        When the stream ends the venue is removed from the books it was feeding, as they would go stale.
+        """
+        fed: typing.Set[typing.Tuple[ntypes.SYMBOL, str]] = set()
+        try:
+            async for msg in stream:
+                if msg.is_ok():
+                    self.apply(msg.value)
+                    fed.add((msg.value.symbol, _venue(msg.value.exchange)))
+        finally:
+            for symbol, venue in fed:
+                if venue in self._books[symbol].venues:
+                    self._books[symbol].remove_venue(venue)
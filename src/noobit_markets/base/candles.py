@@ -0,0 +1,336 @@
+"""
+Streaming candles : aggregate public trades into ohlc bars, for any exchange.
+
+Bars are built from the trade feeds (`aiter_trade`, `b_aiter_trade`, `trade`...), compact or not,
+so they exist for any venue and any bar definition:
+    - time bars of any duration, including sub-minute (e.g "15S", "1M", "4H")
+    - volume bars (close once `volume` base units traded, trades are split across bars)
+    - tick bars (close every `ticks` trades)
+
+Every trade is O(1) work. Time bars are emitted when the bar closes (on the local clock, see `grace`),
+not when the first trade of the next bar comes in. Partial (still open) bars can be emitted on every trade.
+
+Usage:
+    async for msg in aiter_candles(kraken_ws.trade(symbols_resp, "XBT-USD"), timeframe="15S"):
+        if msg.is_ok():
+            print(msg.value)    # NoobitResponseItemOhlc
+"""
+
+import asyncio
+import re
+import time
+import typing
+from decimal import Decimal
+
+from pyrsistent import pmap
+from pydantic import ValidationError
+
+from noobit_markets.base import ntypes
+from noobit_markets.base.request import _validate_data
+from noobit_markets.base.models.result import Result, Ok
+from noobit_markets.base.models.events import TradeTick, CandleUpdate
+from noobit_markets.base.models.rest.response import NoobitResponseItemOhlc, NoobitResponseTrades
+
+
+
+
+# ============================================================
+# EXPORTS
+# ============================================================
+
+
+__all__ = (
+    "timeframe_ms",
+    "CandleBuilder",
+    "aiter_candles",
+)
+
+
+
+
+# ============================================================
+# TIMEFRAMES
+# ============================================================
+
+
+_TF_UNITS = {"S": 1000, "M": 60_000, "H": 3_600_000, "D": 86_400_000, "W": 604_800_000}
+_TF_RE = re.compile(r"^(\d+)([SMHDW])$")
+
+
+def timeframe_ms(timeframe: str) -> int:
+    """duration in ms of a timeframe, noobit notation (`ntypes.TIMEFRAME`) extended with any multiple
+    and seconds (e.g "15S", "2M", "12H")
+    """
+    match = _TF_RE.match(timeframe.upper())
+    if match is None or int(match.group(1)) == 0:
+        raise ValueError(f"Invalid timeframe : {timeframe}")
+    return int(match.group(1)) * _TF_UNITS[match.group(2)]
+
+
+
+
+# ============================================================
+# BUILDER
+# ============================================================
+
+
+class CandleBuilder(object):
+    """bars of a single symbol, exactly one of `timeframe`, `volume` or `ticks` must be given
+
+    Time bars are aligned on the epoch (like exchange candles) and labelled with their open time,
+    volume and tick bars with the time of their first trade. No bar is emitted for intervals without trades.
+
+    Args:
+        timeframe: time bars (see `timeframe_ms`)
+        volume: volume bars, in base units
+        ticks: tick bars, number of trades
+    """
+
+    __slots__ = (
+        "symbol", "exchange", "interval", "volume_threshold", "ticks",
+        "late", "_open_time", "_open", "_high", "_low", "_close", "_volume", "_count",
+    )
+
+    def __init__(
+            self,
+            symbol: ntypes.SYMBOL,
+            exchange: str = "",
+            *,
+            timeframe: typing.Optional[str] = None,
+            volume: typing.Optional[Decimal] = None,
+            ticks: typing.Optional[int] = None
+        ):
+        if sum(arg is not None for arg in (timeframe, volume, ticks)) != 1:
+            raise ValueError("Exactly one of timeframe, volume or ticks is required")
+        if volume is not None and volume <= 0:
+            raise ValueError(f"Invalid volume threshold : {volume}")
+        if ticks is not None and ticks <= 0:
+            raise ValueError(f"Invalid tick count : {ticks}")
+
+        self.symbol = symbol
+        self.exchange = exchange
+        self.interval = timeframe_ms(timeframe) if timeframe is not None else None
+        self.volume_threshold = Decimal(volume) if volume is not None else None
+        self.ticks = ticks
+
+        # trades older than the current (time) bar, dropped
+        self.late = 0
+
+        self._open_time: typing.Optional[int] = None
+        self._open = self._high = self._low = self._close = self._volume = Decimal(0)
+        self._count = 0
+
+
+    @property
+    def is_open(self) -> bool:
+        return self._open_time is not None
+
+
+    @property
+    def close_time(self) -> typing.Optional[int]:
+        """end of the current time bar (None for volume/tick bars or if no bar is open)
+        """
+        if self.interval is None or self._open_time is None:
+            return None
+        return self._open_time + self.interval
+
+
+    def add(self, price: Decimal, qty: Decimal, ts: int) -> typing.List[Result[NoobitResponseItemOhlc, ValidationError]]:
+        """add a trade (ts in ms), returns the bars it closed (usually none)
+        """
+        closed = []
+
+        if self.interval is not None:
+            start = ts - ts % self.interval
+            if self._open_time is not None:
+                if start < self._open_time:
+                    self.late += 1
+                    return closed
+                if start > self._open_time:
+                    closed.append(self._emit())
+            self._add(price, qty, start)
+            return closed
+
+        if self.ticks is not None:
+            self._add(price, qty, ts)
+            if self._count >= self.ticks:
+                closed.append(self._emit())
+            return closed
+
+        # volume bars, split the trade if it overshoots the threshold
+        while True:
+            remaining = self.volume_threshold - self._volume
+            if qty < remaining:
+                self._add(price, qty, ts)
+                return closed
+            self._add(price, remaining, ts)
+            closed.append(self._emit())
+            qty -= remaining
+            if qty <= 0:
+                return closed
+
+
+    def flush(self, now: typing.Optional[int] = None) -> typing.Optional[Result[NoobitResponseItemOhlc, ValidationError]]:
+        """close the current bar if it is over at `now` (ms), or unconditionally if `now` is None
+        """
+        if self._open_time is None:
+            return None
+        if now is not None and (self.interval is None or now < self._open_time + self.interval):
+            return None
+        return self._emit()
+
+
+    def partial(self) -> typing.Optional[CandleUpdate]:
+        """current (still open) bar
+        """
+        if self._open_time is None:
+            return None
+        return CandleUpdate(
+            exchange=self.exchange,
+            symbol=self.symbol,
+            utcTime=self._open_time,
+            open=self._open,
+            high=self._high,
+            low=self._low,
+            close=self._close,
+            volume=self._volume,
+            trdCount=self._count,
+        )
+
+
+    def _add(self, price: Decimal, qty: Decimal, ts: int):
+        if self._open_time is None:
+            self._open_time = ts
+            self._open = self._high = self._low = price
+        elif price > self._high:
+            self._high = price
+        elif price < self._low:
+            self._low = price
+        self._close = price
+        self._volume += qty
+        self._count += 1
+
+
+    def _emit(self) -> Result[NoobitResponseItemOhlc, ValidationError]:
+        bar = _validate_data(NoobitResponseItemOhlc, pmap({
+            "symbol": self.symbol,
+            "utcTime": self._open_time,
+            "open": self._open,
+            "high": self._high,
+            "low": self._low,
+            "close": self._close,
+            "volume": self._volume,
+            "trdCount": self._count,
+        }))
+        self._open_time = None
+        self._volume = Decimal(0)
+        self._count = 0
+        return bar
+
+
+
+
+# ============================================================
+# STREAM
+# ============================================================
+
+
+_Trade = typing.Tuple[str, ntypes.SYMBOL, Decimal, Decimal, int]
+
+
+def _iter_trades(value: typing.Any) -> typing.Iterable[_Trade]:
+    """(exchange, symbol, price, qty, ts) of a trade feed message, validated or compact
+    """
+    if isinstance(value, NoobitResponseTrades):
+        # `EXCHANGE` member, compact events hold a plain string
+        exchange = value.exchange.value
+        return ((exchange, t.symbol, t.avgPx, t.cumQty, t.transactTime) for t in value.trades)
+    if isinstance(value, TradeTick):
+        value = (value, )
+    return ((t.exchange, t.symbol, t.avgPx, t.cumQty, t.transactTime) for t in value)
+
+
+_END = object()
+
+
+async def aiter_candles(
+        stream: typing.AsyncIterable[Result],
+        *,
+        timeframe: typing.Optional[str] = None,
+        volume: typing.Optional[Decimal] = None,
+        ticks: typing.Optional[int] = None,
+        partial: bool = False,
+        grace: int = 250,
+    ) -> typing.AsyncIterable[Result[typing.Union[NoobitResponseItemOhlc, CandleUpdate], Exception]]:
+    """bars of every symbol in a trade stream, errors of the stream are passed through
+
+    Args:
+        partial: also yield a `CandleUpdate` of the open bar after every trade message
+        grace: ms to wait after a time bar ends before closing it, for trades still in flight
+            (later trades for a closed bar are dropped, see `CandleBuilder.late`)
+    """
+    builders: typing.Dict[typing.Tuple[str, ntypes.SYMBOL], CandleBuilder] = {}
+    spec = {"timeframe": timeframe, "volume": volume, "ticks": ticks}
+    interval = timeframe_ms(timeframe) if timeframe is not None else None
+
+    # pump the stream into a queue, so we can wait on it with a timeout (to close time bars)
+    # without cancelling the iteration of the stream itself
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def pump():
+        try:
+            async for msg in stream:
+                await queue.put(msg)
+        finally:
+            await queue.put(_END)
+
+    pumping = asyncio.ensure_future(pump())
+
+    try:
+        while True:
+            timeout = None
+            if interval is not None and builders:
+                now = int(time.time()*10**3)
+                timeout = max(((now // interval + 1) * interval + grace - now) / 10**3, 0)
+
+            try:
+                msg = await asyncio.wait_for(queue.get(), timeout)
+            except asyncio.TimeoutError:
+                now = int(time.time()*10**3) - grace
+                for builder in builders.values():
+                    bar = builder.flush(now)
+                    if bar is not None:
+                        yield bar
+                continue
+
+            if msg is _END:
+                break
+
+            if msg.is_err():
+                yield msg
+                continue
+
+            touched = {}
+            for exchange, symbol, price, qty, ts in _iter_trades(msg.value):
+                key = (exchange, symbol)
+                builder = builders.get(key)
+                if builder is None:
+                    builder = builders[key] = CandleBuilder(symbol, exchange, **spec)
+                for bar in builder.add(price, qty, ts):
+                    yield bar
+                touched[key] = builder
+
+            if partial:
+                for builder in touched.values():
+                    update = builder.partial()
+                    if update is not None:
+                        yield Ok(update)
+
+        # stream ended, last bars are incomplete but still the best we have
+        for builder in builders.values():
+            bar = builder.flush()
+            if bar is not None:
+                yield bar
+
+    finally:
+        pumping.cancel()
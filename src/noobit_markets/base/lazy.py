@@ -0,0 +1,140 @@
+"""
+Lazy imports, so that importing a package does not import all of its modules.
+
+Usage (in a package `__init__.py`):
+    __getattr__, __dir__, __all__ = lazy_exports(__name__, {
+        "ohlc": ("get_ohlc_kraken",),
+        "trades": ("get_trades_kraken",),
+    })
+
+`from noobit_markets.exchanges.kraken.rest.public import get_ohlc_kraken` then only imports the `ohlc` module.
+
+Exchange interfaces are `LazyNamespace`s of `"module:attribute"` paths, resolved on first access:
+    KRAKEN = LazyNamespace("KRAKEN", rest={"public": {"ohlc": "noobit_markets.exchanges.kraken.rest.public.ohlc:get_ohlc_kraken"}})
+    KRAKEN.rest.public.ohlc     # imports the ohlc module, later lookups are plain attribute access
+"""
+
+import importlib
+import typing
+
+
+
+
+# ============================================================
+# EXPORTS
+# ============================================================
+
+
+__all__ = (
+    "lazy_exports",
+    "import_from",
+    "LazyNamespace",
+)
+
+
+
+
+# ============================================================
+# HELPERS
+# ============================================================
+
+
+def import_from(path: str) -> typing.Any:
+    """resolve a `"package.module:attribute"` path
+    """
+    module_name, _, attr = path.partition(":")
+    module = importlib.import_module(module_name)
+    return getattr(module, attr) if attr else module
+
+
+def lazy_exports(
+        package: str,
+        exports: typing.Mapping[str, typing.Iterable[str]]
+    ) -> typing.Tuple[typing.Callable[[str], typing.Any], typing.Callable[[], typing.List[str]], typing.Tuple[str, ...]]:
+    """module level `__getattr__`, `__dir__` (PEP 562) and `__all__` for a package
+
+    Args:
+        package: `__name__` of the package
+        exports: submodule name => names it exports
+    """
+    module_of = {name: submodule for submodule, names in exports.items() for name in names}
+
+    def __getattr__(name: str) -> typing.Any:
+        try:
+            submodule = module_of[name]
+        except KeyError:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}") from None
+
+        value = getattr(importlib.import_module(f"{package}.{submodule}"), name)
+        # cache on the package, next lookups don't go through __getattr__
+        setattr(importlib.import_module(package), name, value)
+        return value
+
+    def __dir__() -> typing.List[str]:
+        return sorted(set(vars(importlib.import_module(package))) | set(module_of))
+
+    return __getattr__, __dir__, tuple(module_of)
+
+
+
+
+# ============================================================
+# NAMESPACE
+# ============================================================
+
+
+class LazyNamespace(object):
+    """read only namespace, nested dicts become namespaces and `"module:attribute"` strings are
+    imported on first access, then cached as plain attributes
+
+    Any other value (None, a callable...) is returned as is.
+    """
+
+    def __init__(self, _name: str = "", **entries: typing.Any):
+        self._name = _name
+        self._entries = {
+            key: LazyNamespace(f"{_name}.{key}", **value) if isinstance(value, dict) else value
+            for key, value in entries.items()
+        }
+
+
+    def __getattr__(self, name: str) -> typing.Any:
+        # only called for attributes that are not resolved yet
+        entries = self.__dict__.get("_entries", {})
+        try:
+            value = entries[name]
+        except KeyError:
+            raise AttributeError(f"{self._name or 'namespace'} has no attribute {name!r}") from None
+
+        if isinstance(value, str):
+            value = import_from(value)
+        self.__dict__[name] = value
+        return value
+
+
+    def __setattr__(self, name: str, value: typing.Any):
+        if name in ("_name", "_entries"):
+            object.__setattr__(self, name, value)
+        else:
+            raise AttributeError(f"{self._name or 'namespace'} is read only")
+
+
+    def __dir__(self) -> typing.List[str]:
+        return sorted(self._entries)
+
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {self._name} {sorted(self._entries)}>"
+
+
+    def is_resolved(self, name: str) -> bool:
+        return name in self.__dict__
+
+
+    def resolve(self) -> dict:
+        """import everything, as nested dicts (e.g to validate against `ExchangeInterface`)
+        """
+        return {
+            key: value.resolve() if isinstance(value, LazyNamespace) else getattr(self, key)
+            for key, value in self._entries.items()
+        }
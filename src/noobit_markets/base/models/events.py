@@ -0,0 +1,238 @@
+"""
+Compact value objects for high frequency websocket market data.
+
+Unlike the `NoobitResponse...` pydantic models, these are plain slotted classes:
+no validation, no per instance `__dict__` and `rawJson` is only retained on demand.
+Field names mirror the corresponding noobit pydantic models, so that consumers
+can switch between both representations with minimal changes.
+"""
+
+import typing
+from decimal import Decimal
+
+from noobit_markets.base import ntypes
+
+
+
+
+# ============================================================
+# EXPORTS
+# ============================================================
+
+
+__all__ = (
+    "TradeTick",
+    "BestBidOffer",
+    "BookDelta",
+    "CandleUpdate",
+)
+
+
+
+
+# ============================================================
+# BASE
+# ============================================================
+
+
+class _CompactEvent(object):
+
+    __slots__: typing.Tuple[str, ...] = ()
+
+    def __repr__(self):
+        fields = ", ".join(f"{k}={getattr(self, k)!r}" for k in self.__slots__ if k != "rawJson")
+        return f"{self.__class__.__name__}({fields})"
+
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return all(getattr(self, k) == getattr(other, k) for k in self.__slots__ if k != "rawJson")
+
+    def dict(self) -> dict:
+        """same keys as the equivalent noobit pydantic model
+        """
+        return {k: getattr(self, k) for k in self.__slots__}
+
+
+
+
+# ============================================================
+# TRADE
+# ============================================================
+
+
+class TradeTick(_CompactEvent):
+    """Single public trade, see `NoobitResponseItemTrade`
+    """
+
+    __slots__ = (
+        "exchange",
+        "symbol",
+        "side",
+        "ordType",
+        "avgPx",
+        "cumQty",
+        "transactTime",
+        "trdMatchID",
+        "rawJson",
+    )
+
+    def __init__(
+            self,
+            exchange: str,
+            symbol: ntypes.SYMBOL,
+            side: ntypes.ORDERSIDE,
+            ordType: ntypes.ORDERTYPE,
+            avgPx: Decimal,
+            cumQty: Decimal,
+            transactTime: int,
+            trdMatchID: typing.Optional[str] = None,
+            rawJson: typing.Any = None
+        ):
+        self.exchange = exchange
+        self.symbol = symbol
+        self.side = side
+        self.ordType = ordType
+        self.avgPx = avgPx
+        self.cumQty = cumQty
+        self.transactTime = transactTime
+        self.trdMatchID = trdMatchID
+        self.rawJson = rawJson
+
+    @property
+    def grossTradeAmt(self) -> Decimal:
+        return self.avgPx * self.cumQty
+
+
+
+
+# ============================================================
+# SPREAD
+# ============================================================
+
+
+class BestBidOffer(_CompactEvent):
+    """Top of book, see `NoobitResponseItemSpread`
+    """
+
+    __slots__ = (
+        "exchange",
+        "symbol",
+        "utcTime",
+        "bestBidPrice",
+        "bestAskPrice",
+        "bestBidQty",
+        "bestAskQty",
+        "rawJson",
+    )
+
+    def __init__(
+            self,
+            exchange: str,
+            symbol: ntypes.SYMBOL,
+            utcTime: int,
+            bestBidPrice: Decimal,
+            bestAskPrice: Decimal,
+            bestBidQty: typing.Optional[Decimal] = None,
+            bestAskQty: typing.Optional[Decimal] = None,
+            rawJson: typing.Any = None
+        ):
+        self.exchange = exchange
+        self.symbol = symbol
+        self.utcTime = utcTime
+        self.bestBidPrice = bestBidPrice
+        self.bestAskPrice = bestAskPrice
+        self.bestBidQty = bestBidQty
+        self.bestAskQty = bestAskQty
+        self.rawJson = rawJson
+
+
+
+
+# ============================================================
+# ORDERBOOK
+# ============================================================
+
+
+class BookDelta(_CompactEvent):
+    """Orderbook snapshot or update, see `NoobitResponseOrderBook`
+
+    A quantity of 0 means the price level should be removed.
+    """
+
+    __slots__ = (
+        "exchange",
+        "symbol",
+        "utcTime",
+        "asks",
+        "bids",
+        "isSnapshot",
+        "rawJson",
+    )
+
+    def __init__(
+            self,
+            exchange: str,
+            symbol: ntypes.SYMBOL,
+            utcTime: int,
+            asks: ntypes.ASKS,
+            bids: ntypes.BIDS,
+            isSnapshot: bool = False,
+            rawJson: typing.Any = None
+        ):
+        self.exchange = exchange
+        self.symbol = symbol
+        self.utcTime = utcTime
+        self.asks = asks
+        self.bids = bids
+        self.isSnapshot = isSnapshot
+        self.rawJson = rawJson
+
+
+
+
+# ============================================================
+# OHLC
+# ============================================================
+
+
+class CandleUpdate(_CompactEvent):
+    """Current state of a (possibly still open) candle, see `NoobitResponseItemOhlc`
+    """
+
+    __slots__ = (
+        "exchange",
+        "symbol",
+        "utcTime",
+        "open",
+        "high",
+        "low",
+        "close",
+        "volume",
+        "trdCount",
+        "rawJson",
+    )
+
+    def __init__(
+            self,
+            exchange: str,
+            symbol: ntypes.SYMBOL,
+            utcTime: int,
+            open: Decimal,
+            high: Decimal,
+            low: Decimal,
+            close: Decimal,
+            volume: Decimal,
+            trdCount: int,
+            rawJson: typing.Any = None
+        ):
+        self.exchange = exchange
+        self.symbol = symbol
+        self.utcTime = utcTime
+        self.open = open
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+        self.trdCount = trdCount
+        self.rawJson = rawJson
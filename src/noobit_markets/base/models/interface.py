@@ -17,8 +17,11 @@ from noobit_markets.base.models.rest.response import (
     NoobitResponseSymbols,
     NoobitResponseBalances,
     NoobitResponseExposure,
-    NoobitResponseInstrument, NoobitResponseTrades
+    NoobitResponseInstrument, NoobitResponseTrades,
+    NoobitResponseCancelAll,
 )
+from noobit_markets.base.batch import RateLimiter
+from noobit_markets.base.templates import OrderTemplate
 
 
 # ============================================================
@@ -242,6 +245,25 @@ class _PrivateInterface(FrozenBaseModel):
     ]
 
 
+    # `new_order` for a pre-validated `OrderTemplate`
+    templated_order: typing.Optional[typing.Callable[
+        #argument types
+        [
+            ntypes.CLIENT, # client
+            OrderTemplate, # template
+            typing.Optional[Decimal], # price
+            typing.Optional[Decimal], # orderQty
+            typing.Optional[str], # clOrdID
+            typing.Optional[Decimal], # stopPrice
+            typing.Optional[typing.Callable], # logger
+            BaseAuth, # auth
+            pydantic.AnyHttpUrl, # base_url
+            str # endpoint
+        ],
+        Result[NoobitResponseItemOrder, Exception]
+    ]]
+
+
     # TODO remove option when we implemented binance
     remove_order: typing.Optional[typing.Callable[
         #argument types
@@ -259,6 +281,57 @@ class _PrivateInterface(FrozenBaseModel):
     ]]
 
 
+    # exchange native bulk cancel where available
+    cancel_all: typing.Optional[typing.Callable[
+        #argument types
+        [
+            ntypes.CLIENT, # client
+            typing.Optional[ntypes.SYMBOL], # symbol (None for all symbols, if exchange allows it)
+            NoobitResponseSymbols, # symbols_resp
+            typing.Optional[RateLimiter], # limiter
+            typing.Optional[typing.Callable], # logger
+            BaseAuth, # auth
+            pydantic.AnyHttpUrl, # base_url
+            str, # endpoint
+        ],
+        Result[NoobitResponseCancelAll, Exception]
+    ]]
+
+
+    # concurrent fan out of `new_order`, one result per order
+    batch_new_orders: typing.Optional[typing.Callable[
+        #argument types
+        [
+            ntypes.CLIENT, # client
+            NoobitResponseSymbols, # symbols_resp
+            typing.Sequence[typing.Mapping[str, typing.Any]], # orders (kwargs of `new_order`)
+            typing.Optional[RateLimiter], # limiter
+            typing.Optional[typing.Callable], # logger
+            BaseAuth, # auth
+            pydantic.AnyHttpUrl, # base_url
+            str, # endpoint
+        ],
+        typing.Tuple[Result[NoobitResponseItemOrder, Exception], ...]
+    ]]
+
+
+    # concurrent fan out of `remove_order`, one result per order
+    batch_cancel: typing.Optional[typing.Callable[
+        #argument types
+        [
+            ntypes.CLIENT, # client
+            NoobitResponseSymbols, # symbols_resp
+            typing.Sequence[typing.Tuple[ntypes.SYMBOL, str]], # orders (symbol, orderID)
+            typing.Optional[RateLimiter], # limiter
+            typing.Optional[typing.Callable], # logger
+            BaseAuth, # auth
+            pydantic.AnyHttpUrl, # base_url
+            str, # endpoint
+        ],
+        typing.Tuple[Result[NoobitResponseItemOrder, Exception], ...]
+    ]]
+
+
 class RestInterface(FrozenBaseModel):
 
     public: _PublicInterface
@@ -42,6 +42,7 @@ class _PrivateEndpoints(FrozenBaseModel):
     open_positions: typing.Optional[str] = Field(...)
     closed_positions: typing.Optional[str] = Field(...)
     ws_token: typing.Optional[str]
+    cancel_all: typing.Optional[str]
     volume: typing.Optional[str]
     ledger: typing.Optional[str]
     ledger_info:typing.Optional[str]
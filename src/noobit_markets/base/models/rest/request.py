@@ -1,6 +1,6 @@
 import typing
 from decimal import Decimal
-from noobit_markets.base.models.rest.response import NoobitResponseSymbols
+from noobit_markets.base.symbols import SymbolsIndex
 
 from pydantic import PositiveInt, Field, validator
 
@@ -17,7 +17,8 @@ from noobit_markets.base import ntypes
 
 class NoobitRequestOhlc(FrozenBaseModel):
 
-    symbols_resp: NoobitResponseSymbols
+    # NoobitResponseSymbols are converted to a shared index passed by reference (see base.symbols)
+    symbols_resp: SymbolsIndex
     timeframe: ntypes.TIMEFRAME
     since: typing.Optional[ntypes.TIMESTAMP]
     symbol: ntypes.SYMBOL
@@ -38,7 +39,7 @@ class NoobitRequestOhlc(FrozenBaseModel):
 
 class NoobitRequestOrderBook(FrozenBaseModel):
 
-    symbols_resp: NoobitResponseSymbols
+    symbols_resp: SymbolsIndex
     depth: ntypes.DEPTH
     symbol: ntypes.SYMBOL
 
@@ -57,7 +58,7 @@ class NoobitRequestOrderBook(FrozenBaseModel):
 
 class NoobitRequestTrades(FrozenBaseModel):
 
-    symbols_resp: NoobitResponseSymbols
+    symbols_resp: SymbolsIndex
     since: typing.Optional[ntypes.TIMESTAMP]
     symbol: ntypes.SYMBOL
 
@@ -76,7 +77,7 @@ class NoobitRequestTrades(FrozenBaseModel):
 
 class NoobitRequestInstrument(FrozenBaseModel):
 
-    symbols_resp: NoobitResponseSymbols
+    symbols_resp: SymbolsIndex
     symbol: ntypes.SYMBOL
     
     @validator("symbol")
@@ -96,7 +97,7 @@ class NoobitRequestInstrument(FrozenBaseModel):
 
 class NoobitRequestSpread(FrozenBaseModel):
 
-    symbols_resp: NoobitResponseSymbols 
+    symbols_resp: SymbolsIndex
     since: typing.Optional[ntypes.TIMESTAMP]
     symbol: ntypes.SYMBOL
     
@@ -118,7 +119,7 @@ class NoobitRequestSpread(FrozenBaseModel):
 # TODO we need Order Requests to contain a symbol / symbol_mapping param
 class NoobitRequestClosedOrders(FrozenBaseModel):
 
-    symbols_resp: NoobitResponseSymbols
+    symbols_resp: SymbolsIndex
     symbol: ntypes.SYMBOL
     
     @validator("symbol")
@@ -144,7 +145,7 @@ class NoobitRequestAddOrder(FrozenBaseModel):
     #  FIXME ? is this useful here ? shouldn it be oly in the resposne ?
     exchange: ntypes.EXCHANGE
 
-    symbols_resp: NoobitResponseSymbols
+    symbols_resp: SymbolsIndex
 
     side: ntypes.ORDERSIDE
     symbol: ntypes.SYMBOL
@@ -328,7 +329,7 @@ class NoobitRequestCancelOpenOrder(FrozenBaseModel):
 
     exchange: ntypes.EXCHANGE
 
-    symbols_resp: NoobitResponseSymbols
+    symbols_resp: SymbolsIndex
 
     symbol: ntypes.SYMBOL
 
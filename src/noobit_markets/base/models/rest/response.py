@@ -15,7 +15,6 @@ from noobit_markets.base.models.frozenbase import FrozenBaseModel
 from noobit_markets.base.models.result import Result
 from noobit_markets.base import ntypes
 
-from tabulate import tabulate
 
 
 
@@ -25,6 +24,12 @@ from tabulate import tabulate
 # ============================================================
 
 
+def tabulate(*args, **kwargs) -> str:
+    # only needed to pretty print responses, so we don't pay for the import otherwise
+    from tabulate import tabulate as _tabulate
+    return _tabulate(*args, **kwargs)
+
+
 class NoobitBaseResponse(FrozenBaseModel):
 
     #? should this be mandatory
@@ -1142,3 +1147,14 @@ class NoobitResponseNewOrder(NoobitBaseResponse):
 
 class AltResponseNewOrder(NoobitBaseResponse):
     pass
+
+
+#! ============================================================
+#! CANCEL ALL (Trading)
+
+
+class NoobitResponseCancelAll(NoobitBaseResponse):
+
+    # None if the exchange does not tell us (e.g ftx only queues the cancellation)
+    count: typing.Optional[int] = Field(..., ge=0)
+    orderIDs: typing.Optional[typing.Tuple[str, ...]]
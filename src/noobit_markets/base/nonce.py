@@ -0,0 +1,313 @@
+"""
+Nonce and API key allocation shared across processes.
+
+`BaseAuth` keeps the last nonce and the key rotation in class variables, which is fine within a single
+process, but several processes sharing an API key produce colliding nonces (Kraken `EAPI:Invalid nonce`)
+and rotate keys independently.
+
+A nonce source hands out strictly increasing nonces per API key and round robin key indexes:
+    - `LocalNonceSource`: in process (threads)
+    - `FileNonceSource`: processes on the same host, state kept in a locked file
+    - `NonceServer` + `RemoteNonceSource`: tiny local TCP server, for many processes
+
+Usage:
+    # once per process, before any private request
+    KrakenAuth.set_nonce_source(FileNonceSource("/tmp/noobit-nonces.json"))
+
+    # or, with a server started elsewhere (e.g `NonceServer(port=8765).serve_forever()`)
+    KrakenAuth.set_nonce_source(RemoteNonceSource(("127.0.0.1", 8765)))
+"""
+
+import hashlib
+import json
+import os
+import socket
+import socketserver
+import threading
+import time
+import typing
+from abc import ABC, abstractmethod
+
+try:
+    import fcntl
+except ImportError:     # windows
+    fcntl = None    # type: ignore
+
+
+
+
+# ============================================================
+# EXPORTS
+# ============================================================
+
+
+__all__ = (
+    "NonceSource",
+    "LocalNonceSource",
+    "FileNonceSource",
+    "NonceServer",
+    "RemoteNonceSource",
+    "key_id",
+)
+
+
+
+
+# ============================================================
+# BASE
+# ============================================================
+
+
+def key_id(exchange: str, api_key: typing.Optional[str]) -> str:
+    """identifies an API key without sharing it (file contents, socket messages)
+    """
+    if not api_key:
+        return exchange.upper()
+    return f"{exchange.upper()}-{hashlib.sha256(api_key.encode()).hexdigest()[:16]}"
+
+
+def _now_ms() -> int:
+    return int(time.time()*10**3)
+
+
+def _next(last: int) -> int:
+    # same scheme as `BaseAuth.nonce`: time in ms, or last + 1 if we are issuing faster than that
+    ts = _now_ms()
+    return ts if ts > last else last + 1
+
+
+class NonceSource(ABC):
+
+
+    @abstractmethod
+    def next_nonce(self, keyid: str) -> int:
+        """strictly increasing for a given `keyid`, across all users of the source
+        """
+        raise NotImplementedError
+
+
+    @abstractmethod
+    def next_key(self, exchange: str, n_keys: int) -> int:
+        """index (round robin) of the key to use for the next request
+        """
+        raise NotImplementedError
+
+
+
+
+# ============================================================
+# IN PROCESS
+# ============================================================
+
+
+class LocalNonceSource(NonceSource):
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._nonces: typing.Dict[str, int] = {}
+        self._keys: typing.Dict[str, int] = {}
+
+
+    def next_nonce(self, keyid: str) -> int:
+        with self._lock:
+            nonce = _next(self._nonces.get(keyid, 0))
+            self._nonces[keyid] = nonce
+            return nonce
+
+
+    def next_key(self, exchange: str, n_keys: int) -> int:
+        with self._lock:
+            count = self._keys.get(exchange, -1) + 1
+            self._keys[exchange] = count
+            return count % n_keys if n_keys else 0
+
+
+
+
+# ============================================================
+# FILE LOCK
+# ============================================================
+
+
+class FileNonceSource(NonceSource):
+    """state is a small json file, every call holds an exclusive `flock` on it (POSIX only)
+
+    Args:
+        path: file shared by all processes (created if needed)
+    """
+
+    def __init__(self, path: str):
+        if fcntl is None:
+            raise NotImplementedError("FileNonceSource requires fcntl (POSIX), use NonceServer instead")
+
+        self.path = path
+        # threads of a process would otherwise share the same file lock
+        self._lock = threading.Lock()
+
+
+    def _update(self, func: typing.Callable[[dict], int]) -> int:
+        with self._lock:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+
+                raw = b""
+                while True:
+                    chunk = os.read(fd, 65536)
+                    if not chunk:
+                        break
+                    raw += chunk
+                state = json.loads(raw) if raw else {"nonces": {}, "keys": {}}
+
+                value = func(state)
+
+                data = json.dumps(state).encode()
+                os.lseek(fd, 0, os.SEEK_SET)
+                os.ftruncate(fd, 0)
+                os.write(fd, data)
+                return value
+            finally:
+                # closing the fd releases the lock
+                os.close(fd)
+
+
+    def next_nonce(self, keyid: str) -> int:
+
+        def _func(state):
+            nonce = _next(state["nonces"].get(keyid, 0))
+            state["nonces"][keyid] = nonce
+            return nonce
+
+        return self._update(_func)
+
+
+    def next_key(self, exchange: str, n_keys: int) -> int:
+
+        def _func(state):
+            count = state["keys"].get(exchange, -1) + 1
+            state["keys"][exchange] = count
+            return count % n_keys if n_keys else 0
+
+        return self._update(_func)
+
+
+
+
+# ============================================================
+# LOCAL SERVER
+# ============================================================
+
+
+# line protocol:
+#   "NONCE <keyid>\n"           => "<nonce>\n"
+#   "KEY <exchange> <n_keys>\n" => "<index>\n"
+
+
+class _Handler(socketserver.StreamRequestHandler):
+
+    def handle(self):
+        source: NonceSource = self.server.source    # type: ignore
+
+        for line in self.rfile:
+            try:
+                cmd, *args = line.decode().split()
+                if cmd == "NONCE":
+                    value = source.next_nonce(args[0])
+                elif cmd == "KEY":
+                    value = source.next_key(args[0], int(args[1]))
+                else:
+                    raise ValueError(f"Unknown command : {cmd}")
+                self.wfile.write(f"{value}\n".encode())
+            except Exception as e:
+                self.wfile.write(f"ERR {e}\n".encode())
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class NonceServer(object):
+    """serves a `LocalNonceSource` over TCP, binds to localhost only
+
+    Args:
+        host, port: port 0 picks a free port (see `address`)
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, source: typing.Optional[NonceSource] = None):
+        self._server = _Server((host, port), _Handler)
+        self._server.source = source if source is not None else LocalNonceSource()     # type: ignore
+        self._thread: typing.Optional[threading.Thread] = None
+
+
+    @property
+    def address(self) -> typing.Tuple[str, int]:
+        return self._server.server_address     # type: ignore
+
+
+    def serve_forever(self):
+        self._server.serve_forever()
+
+
+    def start(self) -> "NonceServer":
+        """serve in a background thread
+        """
+        self._thread = threading.Thread(target=self.serve_forever, name="noobit-nonce-server", daemon=True)
+        self._thread.start()
+        return self
+
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+class RemoteNonceSource(NonceSource):
+    """client of a `NonceServer`, one persistent connection per thread
+    """
+
+    def __init__(self, address: typing.Tuple[str, int], timeout: float = 1):
+        self.address = tuple(address)
+        self.timeout = timeout
+        self._local = threading.local()
+
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            sock = socket.create_connection(self.address, timeout=self.timeout)
+            conn = (sock, sock.makefile("rb"))
+            self._local.conn = conn
+        return conn
+
+
+    def _call(self, line: str) -> int:
+        try:
+            sock, rfile = self._conn()
+            sock.sendall(line.encode())
+            resp = rfile.readline().decode().strip()
+        except OSError:
+            # drop the connection, next call reconnects
+            self._local.conn = None
+            raise
+
+        if not resp or resp.startswith("ERR"):
+            raise RuntimeError(f"Nonce server error : {resp or 'connection closed'}")
+        return int(resp)
+
+
+    def next_nonce(self, keyid: str) -> int:
+        return self._call(f"NONCE {keyid}\n")
+
+
+    def next_key(self, exchange: str, n_keys: int) -> int:
+        return self._call(f"KEY {exchange} {n_keys}\n")
@@ -0,0 +1,190 @@
+"""
+Offload CPU heavy stages (parsing / validation of large payloads) from the event loop.
+
+Large REST payloads (full depth orderbooks, 1000 trades, symbols) can take tens of milliseconds
+to validate, during which websocket dispatch is blocked. Payloads above a size threshold
+are handed to a worker pool and the result is awaited from the loop.
+
+Modes:
+    - `inline`: never offload, run on the event loop
+    - `thread`: run in a thread pool (default, works for any callable)
+    - `process`: run in a process pool, falls back to the thread pool for
+        callables or arguments that can not be pickled (e.g dynamically created models)
+
+    configure_offload("process", threshold=2000)
+"""
+
+import asyncio
+import concurrent.futures
+import functools
+import pickle
+import typing
+
+from typing_extensions import Literal
+
+
+
+
+# ============================================================
+# EXPORTS
+# ============================================================
+
+
+__all__ = (
+    "OFFLOAD_MODE",
+    "configure_offload",
+    "get_offload_config",
+    "shutdown_offload",
+    "payload_size",
+    "offload",
+)
+
+
+
+
+# ============================================================
+# CONFIG
+# ============================================================
+
+
+OFFLOAD_MODE = Literal[
+    "inline",
+    "thread",
+    "process"
+]
+
+_VALID_MODES = ("inline", "thread", "process")
+
+
+class _OffloadConfig(object):
+
+    def __init__(self):
+        self.mode: str = "thread"
+        # number of items (see `payload_size`) above which we offload
+        self.threshold: int = 1000
+        self.max_workers: typing.Optional[int] = None
+        self._thread_pool: typing.Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self._process_pool: typing.Optional[concurrent.futures.ProcessPoolExecutor] = None
+
+    @property
+    def thread_pool(self) -> concurrent.futures.ThreadPoolExecutor:
+        if self._thread_pool is None:
+            self._thread_pool = concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="noobit-offload"
+            )
+        return self._thread_pool
+
+    @property
+    def process_pool(self) -> concurrent.futures.ProcessPoolExecutor:
+        if self._process_pool is None:
+            self._process_pool = concurrent.futures.ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._process_pool
+
+    def shutdown(self, wait: bool = True):
+        if self._thread_pool is not None:
+            self._thread_pool.shutdown(wait=wait)
+            self._thread_pool = None
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=wait)
+            self._process_pool = None
+
+
+_config = _OffloadConfig()
+
+
+def configure_offload(
+        mode: OFFLOAD_MODE = "thread",
+        threshold: int = 1000,
+        max_workers: typing.Optional[int] = None
+    ) -> None:
+    if mode not in _VALID_MODES:
+        raise ValueError(f"Invalid offload mode : {mode}, must be one of {_VALID_MODES}")
+
+    # pools are recreated lazily with the new settings
+    _config.shutdown(wait=False)
+    _config.mode = mode
+    _config.threshold = threshold
+    _config.max_workers = max_workers
+
+
+def get_offload_config() -> typing.Tuple[str, int]:
+    return _config.mode, _config.threshold
+
+
+def shutdown_offload(wait: bool = True) -> None:
+    _config.shutdown(wait=wait)
+
+
+
+
+# ============================================================
+# SIZE
+# ============================================================
+
+
+def payload_size(obj: typing.Any, _depth: int = 2) -> int:
+    """rough number of items in a payload (nested containers are counted up to 2 levels)
+
+    cheap estimate, so that we do not spend on sizing what we wanted to save by offloading
+    """
+
+    if isinstance(obj, (str, bytes)):
+        return 1
+
+    if isinstance(obj, typing.Mapping):
+        values = obj.values()
+    elif isinstance(obj, (list, tuple)):
+        values = obj
+    else:
+        return 1
+
+    if _depth == 0:
+        return len(values)
+
+    return sum(payload_size(v, _depth-1) for v in values) or 1
+
+
+
+
+# ============================================================
+# OFFLOAD
+# ============================================================
+
+
+_picklable_cache: typing.Dict[int, bool] = {}
+
+
+def _is_picklable(func: typing.Callable, args: tuple) -> bool:
+    # models are passed as args and are what usually fails (dynamic models), cache per object
+    for obj in (func, *args[:1]):
+        key = id(obj)
+        if key not in _picklable_cache:
+            try:
+                pickle.dumps(obj)
+                _picklable_cache[key] = True
+            except Exception:
+                _picklable_cache[key] = False
+        if not _picklable_cache[key]:
+            return False
+    return True
+
+
+async def offload(func: typing.Callable, *args, size: int) -> typing.Any:
+    """run `func(*args)` in the configured pool if `size` is above threshold, inline otherwise
+    """
+
+    if _config.mode == "inline" or size < _config.threshold:
+        return func(*args)
+
+    loop = asyncio.get_event_loop()
+    call = functools.partial(func, *args)
+
+    if _config.mode == "process" and _is_picklable(func, args):
+        try:
+            return await loop.run_in_executor(_config.process_pool, call)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            # payload or result could not cross process boundary
+            pass
+
+    return await loop.run_in_executor(_config.thread_pool, call)
@@ -0,0 +1,195 @@
+"""
+Retention policy for the `rawJson` field of noobit responses.
+
+Policies:
+    - `keep`: original payload is stored as is (default)
+    - `drop`: `rawJson` is set to None
+    - `reference`: payload is moved to a bounded LRU store and `rawJson` only holds a `RawJsonRef`
+    - `compressed`: payload is stored as zlib compressed json in a `CompressedRawJson`
+
+The policy can be set globally with `set_rawjson_policy`, or for a single call
+(or any block of code) with the `rawjson_policy` context manager:
+
+    with rawjson_policy("drop"):
+        trades = await get_trades_kraken(client, symbol, symbols_resp)
+"""
+
+import collections
+import contextlib
+import contextvars
+import itertools
+import json
+import typing
+import zlib
+
+from typing_extensions import Literal
+
+
+
+
+# ============================================================
+# EXPORTS
+# ============================================================
+
+
+__all__ = (
+    "RAWJSON_POLICY",
+    "CompressedRawJson",
+    "RawJsonRef",
+    "set_rawjson_policy",
+    "get_rawjson_policy",
+    "rawjson_policy",
+    "set_rawjson_store_size",
+    "apply_rawjson_policy",
+)
+
+
+
+
+# ============================================================
+# POLICY
+# ============================================================
+
+
+RAWJSON_POLICY = Literal[
+    "keep",
+    "drop",
+    "reference",
+    "compressed"
+]
+
+_VALID_POLICIES = ("keep", "drop", "reference", "compressed")
+
+
+# global default, used when no policy is set in the current context
+_global_policy: str = "keep"
+
+# per call override (contextvars are local to each asyncio task)
+_ctx_policy: contextvars.ContextVar = contextvars.ContextVar("rawjson_policy", default=None)
+
+
+def _check_policy(policy: str):
+    if policy not in _VALID_POLICIES:
+        raise ValueError(f"Invalid rawJson policy : {policy}, must be one of {_VALID_POLICIES}")
+
+
+def set_rawjson_policy(policy: RAWJSON_POLICY) -> None:
+    global _global_policy
+    _check_policy(policy)
+    _global_policy = policy
+
+
+def get_rawjson_policy() -> str:
+    policy = _ctx_policy.get()
+    return _global_policy if policy is None else policy
+
+
+@contextlib.contextmanager
+def rawjson_policy(policy: RAWJSON_POLICY):
+    _check_policy(policy)
+    token = _ctx_policy.set(policy)
+    try:
+        yield
+    finally:
+        _ctx_policy.reset(token)
+
+
+
+
+# ============================================================
+# CONTAINERS
+# ============================================================
+
+
+class CompressedRawJson(object):
+
+    __slots__ = ("data", )
+
+    def __init__(self, payload: typing.Any):
+        self.data: bytes = zlib.compress(json.dumps(payload, default=str).encode())
+
+    def load(self) -> typing.Any:
+        return json.loads(zlib.decompress(self.data))
+
+    def __len__(self):
+        return len(self.data)
+
+    def __repr__(self):
+        return f"<CompressedRawJson:{len(self.data)} bytes>"
+
+
+class _RawJsonStore(object):
+    """bounded LRU store holding payloads for `RawJsonRef`
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: collections.OrderedDict = collections.OrderedDict()
+        self._keys = itertools.count()
+
+    def put(self, payload: typing.Any) -> int:
+        key = next(self._keys)
+        self._data[key] = payload
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+        return key
+
+    def get(self, key: int) -> typing.Any:
+        try:
+            self._data.move_to_end(key)
+            return self._data[key]
+        except KeyError:
+            return None
+
+
+_store = _RawJsonStore(maxsize=100)
+
+
+def set_rawjson_store_size(maxsize: int) -> None:
+    _store.maxsize = maxsize
+
+
+class RawJsonRef(object):
+
+    __slots__ = ("key", )
+
+    def __init__(self, key: int):
+        self.key = key
+
+    def resolve(self) -> typing.Any:
+        """original payload, or None if it has been evicted from the store
+        """
+        return _store.get(self.key)
+
+    def __repr__(self):
+        return f"<RawJsonRef:{self.key}>"
+
+
+
+
+# ============================================================
+# APPLY
+# ============================================================
+
+
+def apply_rawjson_policy(payload: typing.Any, policy: typing.Optional[RAWJSON_POLICY] = None) -> typing.Any:
+    """return the value to store under `rawJson` according to `policy` (defaults to current policy)
+    """
+
+    # already processed (e.g orderbook aggregation reusing rawJson of an update)
+    if payload is None or isinstance(payload, (CompressedRawJson, RawJsonRef)):
+        return payload
+
+    if policy is None:
+        policy = get_rawjson_policy()
+
+    if policy == "keep":
+        return payload
+    if policy == "drop":
+        return None
+    if policy == "reference":
+        return RawJsonRef(_store.put(payload))
+    if policy == "compressed":
+        return CompressedRawJson(payload)
+
+    raise ValueError(f"Invalid rawJson policy : {policy}")
@@ -0,0 +1,405 @@
+"""
+Capture of the raw websocket frames received by `BaseWsApi._dispatch`, for incident analysis and replays.
+
+Opt-in, pass a recorder to the websocket api:
+    recorder = FrameRecorder("captures/kraken", codec="zstd")
+    kwp = KrakenWsPublic(client, msg_handler, loop, feed_map, recorder=recorder)
+    ...
+    recorder.close()
+
+`record` only timestamps the frame and puts it on a queue, a background thread does the framing,
+compression and file io, so the dispatch loop is not slowed down (frames are dropped and counted
+in `dropped` if the writer falls behind by more than `max_pending` frames).
+
+File format (`.frames`):
+    header:  magic b"NBWF", version (u8), codec (u8: 0 none, 1 zlib, 2 zstd)
+    then, compressed as one stream, records of:
+        length (u32, of data), receive time (i64, ns since epoch), kind (u8), data
+    kind: 0 text frame (utf-8), 1 binary frame, 2 marker (utf-8, e.g "reconnect")
+
+Files are rotated on size (uncompressed bytes) and/or age, `read_frames` and `replay` read them back.
+"""
+
+import asyncio
+import datetime
+import os
+import queue
+import struct
+import threading
+import time
+import typing
+import zlib
+
+
+
+
+# ============================================================
+# EXPORTS
+# ============================================================
+
+
+__all__ = (
+    "Frame",
+    "FrameRecorder",
+    "read_frames",
+    "replay",
+)
+
+
+
+
+# ============================================================
+# FORMAT
+# ============================================================
+
+
+_MAGIC = b"NBWF"
+_VERSION = 1
+_FILE_HEADER = struct.Struct("<4sBB")
+_RECORD = struct.Struct("<IqB")
+
+_CODECS = {None: 0, "zlib": 1, "zstd": 2}
+_CODEC_NAMES = {v: k for k, v in _CODECS.items()}
+
+TEXT, BINARY, MARKER = 0, 1, 2
+
+
+class Frame(typing.NamedTuple):
+    ts: int
+    kind: int
+    data: typing.Union[str, bytes]
+
+
+def _zstd():
+    try:
+        import zstandard     # type: ignore
+    except ImportError:
+        raise RuntimeError("zstd captures require the `zstandard` package")
+    return zstandard
+
+
+
+
+# ============================================================
+# COMPRESSION
+# ============================================================
+
+
+class _Writer(object):
+    """file with optional streaming compression, `flush` makes everything written so far readable
+    """
+
+    def __init__(self, path: str, codec: typing.Optional[str], level: typing.Optional[int]):
+        self.path = path
+        self._file = open(path, "wb")
+        self._file.write(_FILE_HEADER.pack(_MAGIC, _VERSION, _CODECS[codec]))
+
+        self._compress: typing.Optional[typing.Callable[[bytes], bytes]] = None
+        self._flush: typing.Optional[typing.Callable[[], bytes]] = None
+        self._finish: typing.Optional[typing.Callable[[], bytes]] = None
+
+        if codec == "zlib":
+            obj = zlib.compressobj(6 if level is None else level)
+            self._compress = obj.compress
+            self._flush = lambda: obj.flush(zlib.Z_SYNC_FLUSH)
+            self._finish = obj.flush
+        elif codec == "zstd":
+            zstandard = _zstd()
+            obj = zstandard.ZstdCompressor(level=3 if level is None else level).compressobj()
+            self._compress = obj.compress
+            self._flush = lambda: obj.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+            self._finish = obj.flush
+
+
+    def write(self, data: bytes):
+        self._file.write(self._compress(data) if self._compress else data)
+
+
+    def flush(self):
+        if self._flush:
+            self._file.write(self._flush())
+        self._file.flush()
+
+
+    def close(self):
+        if self._finish:
+            self._file.write(self._finish())
+        self._file.close()
+
+
+def _decompressed(f: typing.BinaryIO, codec: typing.Optional[str], chunk_size: int = 1 << 16) -> typing.Iterator[bytes]:
+    if codec == "zlib":
+        obj = zlib.decompressobj()
+        decompress = obj.decompress
+    elif codec == "zstd":
+        decompress = _zstd().ZstdDecompressor().decompressobj().decompress
+    else:
+        decompress = None
+
+    while True:
+        chunk = f.read(chunk_size)
+        if not chunk:
+            return
+        yield decompress(chunk) if decompress else chunk
+
+
+
+
+# ============================================================
+# RECORDER
+# ============================================================
+
+
+_STOP = object()
+
+
+class FrameRecorder(object):
+    """write frames to rotating capture files in `directory`, from a background thread
+
+    Args:
+        directory: created if needed
+        prefix: file names are `<prefix>-<utc start time>-<seq>.frames`
+        codec: None, "zlib" or "zstd" (requires `zstandard`)
+        rotate_bytes: start a new file after that many (uncompressed) bytes
+        rotate_seconds: start a new file after that many seconds (None = size only)
+        flush_interval: seconds between flushes to disk when idle (what a crash may lose)
+        max_pending: frames waiting for the writer before new ones are dropped
+    """
+
+    def __init__(
+            self,
+            directory: str,
+            *,
+            prefix: str = "frames",
+            codec: typing.Optional[str] = "zlib",
+            level: typing.Optional[int] = None,
+            rotate_bytes: int = 256 * 2**20,
+            rotate_seconds: typing.Optional[float] = 3600,
+            flush_interval: float = 1,
+            max_pending: int = 100_000,
+        ):
+        if codec not in _CODECS:
+            raise ValueError(f"Unknown codec : {codec}")
+        if codec == "zstd":
+            # fail now rather than in the writer thread
+            _zstd()
+
+        self.directory = directory
+        self.prefix = prefix
+        self.codec = codec
+        self.level = level
+        self.rotate_bytes = rotate_bytes
+        self.rotate_seconds = rotate_seconds
+        self.flush_interval = flush_interval
+
+        self.recorded = 0
+        self.dropped = 0
+        self.files: typing.List[str] = []
+        # exception that stopped the writer thread
+        self.error: typing.Optional[BaseException] = None
+
+        os.makedirs(directory, exist_ok=True)
+
+        self._queue: queue.Queue = queue.Queue(max_pending)
+        self._seq = 0
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="noobit-frame-recorder", daemon=True)
+        self._thread.start()
+
+
+    # ========================================
+    # PRODUCER SIDE (event loop)
+
+
+    def record(self, frame: typing.Union[str, bytes]):
+        """called for every received frame, never blocks
+        """
+        if self._closed:
+            return
+        if self.error is not None:
+            self.dropped += 1
+            return
+        try:
+            self._queue.put_nowait((time.time_ns(), frame))
+        except queue.Full:
+            self.dropped += 1
+
+
+    def mark(self, text: str):
+        """marker record (e.g connection events), shows up in the capture between frames
+        """
+        if self._closed:
+            return
+        if self.error is not None:
+            self.dropped += 1
+            return
+        try:
+            self._queue.put_nowait((time.time_ns(), MARKER, text))
+        except queue.Full:
+            self.dropped += 1
+
+
+    def close(self, timeout: typing.Optional[float] = 5):
+        """write pending frames and close the current file
+
+        Raises:
+            the exception that stopped the writer thread, if any (e.g OSError on a full disk)
+        """
+        if self._closed:
+            return
+        self._closed = True
+        # a dead writer does not empty the queue anymore
+        if self._thread.is_alive():
+            try:
+                self._queue.put(_STOP, timeout=timeout)
+            except queue.Full:
+                pass
+            self._thread.join(timeout)
+        if self.error is not None:
+            raise self.error
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+    # ========================================
+    # WRITER THREAD
+
+
+    def _open(self) -> _Writer:
+        started = datetime.datetime.now(datetime.timezone.utc).strftime("%Y%m%dT%H%M%S")
+        path = os.path.join(self.directory, f"{self.prefix}-{started}-{self._seq:04d}.frames")
+        self._seq += 1
+        self.files.append(path)
+        return _Writer(path, self.codec, self.level)
+
+
+    def _run(self):
+        writer: typing.Optional[_Writer] = None
+        written = 0
+        opened_at = 0.0
+        dirty = False
+
+        try:
+            while True:
+                try:
+                    item = self._queue.get(timeout=self.flush_interval)
+                except queue.Empty:
+                    if writer is not None and dirty:
+                        writer.flush()
+                        dirty = False
+                    continue
+
+                if item is _STOP:
+                    return
+
+                if writer is None or written >= self.rotate_bytes or (
+                        self.rotate_seconds is not None and time.monotonic() - opened_at >= self.rotate_seconds):
+                    if writer is not None:
+                        writer.close()
+                    writer = self._open()
+                    written = 0
+                    opened_at = time.monotonic()
+
+                if len(item) == 3:
+                    ts, kind, data = item
+                    payload = data.encode()
+                else:
+                    ts, data = item
+                    if isinstance(data, str):
+                        kind, payload = TEXT, data.encode()
+                    else:
+                        kind, payload = BINARY, bytes(data)
+
+                writer.write(_RECORD.pack(len(payload), ts, kind) + payload)
+                written += _RECORD.size + len(payload)
+                self.recorded += 1
+                dirty = True
+
+        except Exception as e:
+            # raised by `close`, frames recorded from now on are dropped
+            self.error = e
+
+        finally:
+            if writer is not None:
+                try:
+                    writer.close()
+                except Exception as e:
+                    self.error = self.error or e
+
+
+
+
+# ============================================================
+# READ / REPLAY
+# ============================================================
+
+
+def read_frames(path: str) -> typing.Iterator[Frame]:
+    """frames of a capture file, in receive order (a truncated last record is ignored)
+    """
+    with open(path, "rb") as f:
+        header = f.read(_FILE_HEADER.size)
+        magic, version, codec = _FILE_HEADER.unpack(header) if len(header) == _FILE_HEADER.size else (None, None, None)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f"Not a frame capture : {path}")
+
+        buf = bytearray()
+        pos = 0
+        for chunk in _decompressed(f, _CODEC_NAMES[codec]):
+            buf += chunk
+            while len(buf) - pos >= _RECORD.size:
+                length, ts, kind = _RECORD.unpack_from(buf, pos)
+                end = pos + _RECORD.size + length
+                if len(buf) < end:
+                    break
+                data = bytes(buf[pos + _RECORD.size:end])
+                yield Frame(ts, kind, data if kind == BINARY else data.decode())
+                pos = end
+            # drop consumed bytes
+            del buf[:pos]
+            pos = 0
+
+
+async def replay(
+        paths: typing.Iterable[str],
+        msg_handler: typing.Callable[[typing.Any, typing.Dict, typing.Dict], typing.Awaitable[None]],
+        data_queues: typing.Dict,
+        status_queues: typing.Dict,
+        *,
+        speed: typing.Optional[float] = None
+    ) -> int:
+    """feed captured frames to a `msg_handler`, as `BaseWsApi._dispatch` does
+
+    Args:
+        speed: None replays as fast as possible, 1 in real time, 2 twice as fast...
+
+    Returns:
+        number of frames replayed (markers are skipped)
+    """
+    count = 0
+    first_ts: typing.Optional[int] = None
+    started = time.monotonic()
+
+    for path in paths:
+        for frame in read_frames(path):
+            if frame.kind == MARKER:
+                continue
+
+            if speed:
+                if first_ts is None:
+                    first_ts = frame.ts
+                delay = (frame.ts - first_ts) / 10**9 / speed - (time.monotonic() - started)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+            await msg_handler(frame.data, data_queues, status_queues)
+            count += 1
+            await asyncio.sleep(0)
+
+    return count
@@ -9,6 +9,8 @@ from noobit_markets.base.errors import BaseError
 from noobit_markets.base.models.frozenbase import FrozenBaseModel
 
 from noobit_markets.base.models.result import Ok, Err, Result
+from noobit_markets.base.rawjson import apply_rawjson_policy
+from noobit_markets.base.offload import offload, payload_size
 
 # response models
 from noobit_markets.base.models.rest.request import (
@@ -31,6 +33,7 @@ import pyrsistent
 __all__ = [
     "retry_request",
     "_validate_data",
+    "_avalidate_data",
     "validate_nreq_ohlc",
     "validate_nreq_trades",
     "validate_nreq_spread",
@@ -95,6 +98,32 @@ def _validate_data(
         fields: pyrsistent.PMap     # PRecord sublasses PMap so its also acceptable
     ) -> Result:
     
+    # honor rawJson retention policy (see base.rawjson)
+    if "rawJson" in fields:
+        fields = _with_rawjson_policy(fields)
+
+    return _validate_fields(model, fields)
+
+
+async def _avalidate_data(
+        model: typing.Type[BaseModel],
+        fields: pyrsistent.PMap
+    ) -> Result:
+    """same as `_validate_data`, but large payloads are validated in a worker pool (see base.offload)
+    """
+
+    # policy needs to be applied in this process (context vars, rawJson store)
+    if "rawJson" in fields:
+        fields = _with_rawjson_policy(fields)
+
+    return await offload(_validate_fields, model, fields, size=payload_size(fields))
+
+
+def _validate_fields(
+        model: typing.Type[BaseModel],
+        fields: typing.Mapping
+    ) -> Result:
+
     try:
         validated = model(**fields)     #type: ignore
         return Ok(validated)
@@ -104,6 +133,43 @@ def _validate_data(
         raise e
 
 
+def _validate_partial(
+        model: typing.Type[BaseModel],
+        validated: typing.Mapping,
+        fields: typing.Mapping
+    ) -> Result:
+    """only validate `fields`, `validated` being values already validated against `model` (e.g an order template)
+
+    Field validators run as usual (they see `validated` as `values`), but root validators
+    and validators of the other fields do not.
+    """
+
+    values = dict(validated)
+    errors = []
+
+    # declaration order, as with full validation
+    for name, field in model.__fields__.items():
+        if name not in fields:
+            continue
+        valid_value, error = field.validate(fields[name], values, loc=name, cls=model)   #type: ignore
+        if error:
+            errors.append(error)
+        else:
+            values[name] = valid_value
+
+    if errors:
+        return Err(ValidationError(errors, model))
+
+    return Ok(model.construct(**values))
+
+
+def _with_rawjson_policy(fields: typing.Mapping) -> typing.Mapping:
+    raw = apply_rawjson_policy(fields["rawJson"])
+    if isinstance(fields, pyrsistent.PMap):
+        return fields.set("rawJson", raw)
+    return {**fields, "rawJson": raw}
+
+
 def validate_data_against(data: dict, model: FrozenBaseModel):
     try:
         validated = model(**data)       #type: ignore
@@ -0,0 +1,227 @@
+"""
+Derive coarser ohlc candles from stored base resolution candles, instead of downloading every timeframe.
+
+    one_minute = (await KRAKEN.rest.public.ohlc(client, "XBT-USD", symbols_resp, "1M", since)).value
+    views = resample_many(one_minute.ohlc, ["5M", "1H", "1D"], fill_gaps=True)
+
+Timeframes are not limited to `ntypes.TIMEFRAME` (see `timeframe_ms`), any multiple of the base timeframe works.
+Buckets are aligned on the epoch (days at 00:00 UTC), weeks start on monday like exchange candles.
+Each timeframe is a single pass over its source, and `resample_many` derives each timeframe from the
+coarsest one already derived that divides it (1M => 5M => 1H => 1D) rather than from the base candles.
+"""
+
+import typing
+from decimal import Decimal
+
+from pyrsistent import pmap
+from pydantic import ValidationError
+
+from noobit_markets.base import ntypes
+from noobit_markets.base.candles import timeframe_ms
+from noobit_markets.base.request import _validate_data
+from noobit_markets.base.models.result import Result
+from noobit_markets.base.models.rest.response import NoobitResponseItemOhlc, NoobitResponseOhlc
+
+
+
+
+# ============================================================
+# EXPORTS
+# ============================================================
+
+
+__all__ = (
+    "resample",
+    "resample_many",
+    "resample_ohlc",
+    "fill_gaps",
+    "alignment_ms",
+)
+
+
+
+
+# ============================================================
+# ALIGNMENT
+# ============================================================
+
+
+# epoch is a thursday, weekly candles open on monday
+_WEEK_OFFSET = 4 * 86_400_000
+
+
+def alignment_ms(timeframe: str) -> int:
+    """offset from the epoch of the bucket boundaries of `timeframe`
+    """
+    return _WEEK_OFFSET if timeframe.upper().endswith("W") else 0
+
+
+def _base_interval(candles: typing.Sequence[NoobitResponseItemOhlc]) -> typing.Optional[int]:
+    # smallest step between consecutive candles (gaps only make steps bigger)
+    steps = [b.utcTime - a.utcTime for a, b in zip(candles, candles[1:]) if b.utcTime > a.utcTime]
+    return min(steps) if steps else None
+
+
+
+
+# ============================================================
+# RESAMPLE
+# ============================================================
+
+
+def _candle(symbol, utcTime, open, high, low, close, volume, trdCount) -> NoobitResponseItemOhlc:
+    # values come from already validated candles
+    return NoobitResponseItemOhlc.construct(
+        symbol=symbol, utcTime=utcTime, open=open, high=high, low=low, close=close, volume=volume, trdCount=trdCount
+    )
+
+
+def _aggregate(
+        candles: typing.Sequence[NoobitResponseItemOhlc],
+        interval: int,
+        offset: int,
+        fill: bool
+    ) -> typing.Tuple[NoobitResponseItemOhlc, ...]:
+
+    out: typing.List[NoobitResponseItemOhlc] = []
+    if not candles:
+        return ()
+
+    symbol = candles[0].symbol
+    current = None
+
+    for candle in candles:
+        start = candle.utcTime - (candle.utcTime - offset) % interval
+
+        if start == current:
+            if candle.high > high:
+                high = candle.high
+            if candle.low < low:
+                low = candle.low
+            close = candle.close
+            volume += candle.volume
+            count += candle.trdCount
+            continue
+
+        if current is not None:
+            out.append(_candle(symbol, current, open, high, low, close, volume, count))
+            if fill:
+                for gap in range(current + interval, start, interval):
+                    out.append(_candle(symbol, gap, close, close, close, close, Decimal(0), 0))
+
+        current = start
+        open, high, low, close = candle.open, candle.high, candle.low, candle.close
+        volume, count = candle.volume, candle.trdCount
+
+    out.append(_candle(symbol, current, open, high, low, close, volume, count))
+    return tuple(out)
+
+
+def _check(candles: typing.Sequence[NoobitResponseItemOhlc], interval: int, offset: int):
+
+    if len({candle.symbol for candle in candles}) > 1:
+        raise ValueError("Candles of a single symbol expected")
+
+    if any(b.utcTime < a.utcTime for a, b in zip(candles, candles[1:])):
+        raise ValueError("Candles must be sorted by utcTime")
+
+    base = _base_interval(candles)
+    if base is not None and (interval % base or offset % base):
+        raise ValueError(f"Target timeframe ({interval}ms) is not a multiple of the base timeframe ({base}ms)")
+
+
+def resample(
+        candles: typing.Sequence[NoobitResponseItemOhlc],
+        timeframe: str,
+        *,
+        fill_gaps: bool = False,
+        offset: typing.Optional[int] = None
+    ) -> typing.Tuple[NoobitResponseItemOhlc, ...]:
+    """candles of a coarser timeframe, sorted candles of a single symbol expected
+
+    The last candle is incomplete if the base candles do not cover its whole bucket.
+
+    Args:
+        fill_gaps: add flat candles (ohlc = previous close, no volume) for buckets without candles
+        offset: ms from the epoch to align buckets on (default: see `alignment_ms`)
+    """
+    candles = tuple(candles)
+    interval = timeframe_ms(timeframe)
+    offset = alignment_ms(timeframe) if offset is None else offset
+    _check(candles, interval, offset)
+
+    return _aggregate(candles, interval, offset, fill_gaps)
+
+
+def fill_gaps(
+        candles: typing.Sequence[NoobitResponseItemOhlc],
+        timeframe: typing.Optional[str] = None
+    ) -> typing.Tuple[NoobitResponseItemOhlc, ...]:
+    """same timeframe, with flat candles for missing buckets (timeframe inferred if not given)
+    """
+    candles = tuple(candles)
+    if timeframe is None:
+        interval = _base_interval(candles)
+        if interval is None:
+            return candles
+        return _aggregate(candles, interval, candles[0].utcTime % interval, True)
+    return resample(candles, timeframe, fill_gaps=True)
+
+
+def resample_many(
+        candles: typing.Sequence[NoobitResponseItemOhlc],
+        timeframes: typing.Optional[typing.Iterable[str]] = None,
+        *,
+        fill_gaps: bool = False
+    ) -> typing.Dict[str, typing.Tuple[NoobitResponseItemOhlc, ...]]:
+    """several timeframes at once, each derived from the coarsest timeframe already derived that divides it
+
+    Args:
+        timeframes: defaults to all `ntypes.TIMEFRAME` values that can be derived from the base candles
+    """
+    candles = tuple(candles)
+    base = _base_interval(candles)
+
+    if timeframes is None:
+        timeframes = [
+            tf for tf in ntypes.TIMEFRAME.__args__       # type: ignore
+            if base is None or (timeframe_ms(tf) % base == 0 and alignment_ms(tf) % base == 0)
+        ]
+
+    targets = sorted(set(tf.upper() for tf in timeframes), key=timeframe_ms)
+    for tf in targets:
+        _check(candles, timeframe_ms(tf), alignment_ms(tf))
+
+    # (interval, offset, candles) already derived, without gap filling so they can be aggregated further
+    derived: typing.List[typing.Tuple[int, int, typing.Tuple[NoobitResponseItemOhlc, ...]]] = []
+    res = {}
+
+    for tf in targets:
+        interval, offset = timeframe_ms(tf), alignment_ms(tf)
+
+        source = candles
+        for src_interval, src_offset, src_candles in reversed(derived):
+            if interval % src_interval == 0 and (offset - src_offset) % src_interval == 0:
+                source = src_candles
+                break
+
+        unfilled = _aggregate(source, interval, offset, False)
+        derived.append((interval, offset, unfilled))
+        res[tf] = _aggregate(unfilled, interval, offset, True) if fill_gaps else unfilled
+
+    return res
+
+
+def resample_ohlc(
+        ohlc: NoobitResponseOhlc,
+        timeframe: str,
+        *,
+        fill_gaps: bool = False
+    ) -> Result[NoobitResponseOhlc, ValidationError]:
+    """`resample` a `get_ohlc_*` response
+    """
+    return _validate_data(NoobitResponseOhlc, pmap({
+        "exchange": ohlc.exchange,
+        "rawJson": None,
+        "ohlc": resample(ohlc.ohlc, timeframe, fill_gaps=fill_gaps),
+    }))
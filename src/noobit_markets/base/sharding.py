@@ -0,0 +1,335 @@
+"""
+Sharded websocket orderbook ingestion across worker processes.
+
+A single process (and GIL) can not keep up with full depth books for hundreds of pairs.
+`ShardSupervisor` splits symbols across worker processes, each worker opens its own
+websocket connection(s), maintains its books and publishes top levels to shared memory
+(see base.shm), where any process can read them with `SharedBookReader`.
+
+    with ShardSupervisor("KRAKEN", symbols_resp, symbols, n_workers=4) as supervisor:
+        reader = supervisor.reader()
+        ...
+        reader.bbo("XBT-USD")
+"""
+
+import asyncio
+import multiprocessing
+import os
+import time
+import typing
+import uuid
+from decimal import Decimal
+
+from noobit_markets.base import ntypes
+from noobit_markets.base.models.events import BookDelta
+from noobit_markets.base.models.result import Ok
+from noobit_markets.base.models.rest.response import NoobitResponseSymbols
+from noobit_markets.base.shm import SharedBookWriter, SharedBookReader
+
+
+
+
+# ============================================================
+# EXPORTS
+# ============================================================
+
+
+__all__ = (
+    "ShardSupervisor",
+    "LocalBook",
+    "shard_symbols",
+)
+
+
+
+
+# ============================================================
+# LOCAL BOOK
+# ============================================================
+
+
+class LocalBook(object):
+    """full book maintained from `BookDelta`s, a quantity of 0 removes the level
+    """
+
+    __slots__ = ("asks", "bids", "utcTime", "max_depth")
+
+    def __init__(self, max_depth: typing.Optional[int] = None):
+        self.asks: typing.Dict[Decimal, Decimal] = {}
+        self.bids: typing.Dict[Decimal, Decimal] = {}
+        self.utcTime: int = 0
+        # exchanges like kraken do not send deletes for levels falling out of the subscribed depth
+        self.max_depth = max_depth
+
+
+    def apply(self, delta: BookDelta):
+
+        if delta.isSnapshot:
+            self.asks = {}
+            self.bids = {}
+
+        for side, updates in ((self.asks, delta.asks), (self.bids, delta.bids)):
+            for price, qty in updates.items():
+                if qty == 0:
+                    side.pop(price, None)
+                else:
+                    side[price] = qty
+
+        self.utcTime = delta.utcTime
+
+        if self.max_depth:
+            if len(self.asks) > self.max_depth:
+                self.asks = dict(self.top_asks(self.max_depth))
+            if len(self.bids) > self.max_depth:
+                self.bids = dict(self.top_bids(self.max_depth))
+
+
+    def top_asks(self, n: int) -> typing.List[typing.Tuple[Decimal, Decimal]]:
+        return sorted(self.asks.items())[:n]
+
+
+    def top_bids(self, n: int) -> typing.List[typing.Tuple[Decimal, Decimal]]:
+        return sorted(self.bids.items(), reverse=True)[:n]
+
+
+
+
+# ============================================================
+# FEEDS
+# ============================================================
+
+# each feed is an async generator yielding `BookDelta`s for all symbols of a shard
+# exchange modules are imported in the worker process only
+
+
+async def _kraken_book_feed(
+        symbols_resp: NoobitResponseSymbols,
+        symbols: typing.Sequence[ntypes.SYMBOL],
+        depth: int
+    ) -> typing.AsyncIterable[BookDelta]:
+
+    import websockets
+
+    from noobit_markets.base.websockets import subscribe, KrakenSubModel
+    from noobit_markets.exchanges.kraken.websockets.public.api import KrakenWsPublic
+    from noobit_markets.exchanges.kraken.websockets.public.routing import KrakenMsgRouter
+
+    to_ws_pair = {k: f"{v.noobit_base}/{v.noobit_quote}" for k, v in symbols_resp.asset_pairs.items()}
+
+    async with websockets.connect("wss://ws.kraken.com") as client:
+
+        kws = KrakenWsPublic(client, KrakenMsgRouter(compact=True, keep_raw=False), asyncio.get_event_loop(), {"book": "orderbook"})
+
+        # single subscription message for the whole shard
+        sub_model = KrakenSubModel(
+            exchange="kraken",
+            feed="orderbook",
+            msg={
+                "event": "subscribe",
+                "pair": [to_ws_pair[symbol] for symbol in symbols],
+                "subscription": {"name": "book", "depth": depth}
+            }
+        )
+        await subscribe(client, sub_model)
+
+        async for msg in kws.aiter_book():
+            if isinstance(msg, Ok):
+                yield msg.value
+
+
+async def _binance_book_feed(
+        symbols_resp: NoobitResponseSymbols,
+        symbols: typing.Sequence[ntypes.SYMBOL],
+        depth: int
+    ) -> typing.AsyncIterable[BookDelta]:
+
+    import websockets
+
+    from noobit_markets.exchanges.binance.websockets.public.api import BinanceWsPublic
+
+    symbol_to_exchange = lambda x: {k: v.exchange_pair.lower() for k, v in symbols_resp.asset_pairs.items()}[x]
+
+    # binance streams are one socket per symbol, merge them into a single queue
+    merged: asyncio.Queue = asyncio.Queue()
+
+    async with websockets.connect("wss://stream.binance.com:9443/ws") as client:
+
+        bws = BinanceWsPublic(client, None, asyncio.get_event_loop(), {})
+
+        async def _forward(symbol):
+            async for msg in bws.b_aiter_book(symbol_to_exchange, symbol, compact=True, keep_raw=False):
+                await merged.put(msg.value)
+
+        tasks = [asyncio.ensure_future(_forward(symbol)) for symbol in symbols]
+        try:
+            while True:
+                yield await merged.get()
+        finally:
+            for task in tasks:
+                task.cancel()
+
+
+_BOOK_FEEDS: typing.Dict[str, typing.Callable[..., typing.AsyncIterable[BookDelta]]] = {
+    "KRAKEN": _kraken_book_feed,
+    "BINANCE": _binance_book_feed,
+}
+
+
+
+
+# ============================================================
+# WORKER
+# ============================================================
+
+
+async def _run_shard(
+        exchange: str,
+        shm_name: str,
+        all_symbols: typing.Sequence[ntypes.SYMBOL],
+        symbols: typing.Sequence[ntypes.SYMBOL],
+        symbols_resp: NoobitResponseSymbols,
+        depth: int,
+        top_n: int
+    ):
+
+    books = {symbol: LocalBook(max_depth=depth) for symbol in symbols}
+
+    with SharedBookWriter(shm_name, all_symbols, top_n) as writer:
+        async for delta in _BOOK_FEEDS[exchange](symbols_resp, symbols, depth):
+            book = books.get(delta.symbol)
+            if book is None:
+                continue
+            book.apply(delta)
+            writer.publish(delta.symbol, book.top_asks(top_n), book.top_bids(top_n), book.utcTime)
+
+
+def _worker_main(*args):
+    # websockets base classes hold class level asyncio queues, bound to the default loop
+    loop = asyncio.get_event_loop()
+    loop.run_until_complete(_run_shard(*args))
+
+
+
+
+# ============================================================
+# SUPERVISOR
+# ============================================================
+
+
+def shard_symbols(symbols: typing.Sequence[ntypes.SYMBOL], n_shards: int) -> typing.List[typing.List[ntypes.SYMBOL]]:
+    """round robin split, empty shards are dropped
+    """
+    return [list(symbols[i::n_shards]) for i in range(n_shards) if symbols[i::n_shards]]
+
+
+class ShardSupervisor(object):
+    """spawn and supervise book ingestion workers for a single exchange
+
+    Args:
+        exchange: key of `_BOOK_FEEDS` (KRAKEN, BINANCE)
+        symbols_resp: symbols response for the exchange (sent to each worker)
+        symbols: symbols to ingest
+        n_workers: number of worker processes (defaults to cpu count)
+        depth: book depth requested from the exchange
+        top_n: number of levels published to shared memory
+        mp_context: multiprocessing start method
+    """
+
+    def __init__(
+            self,
+            exchange: str,
+            symbols_resp: NoobitResponseSymbols,
+            symbols: typing.Sequence[ntypes.SYMBOL],
+            n_workers: typing.Optional[int] = None,
+            depth: int = 10,
+            top_n: int = 10,
+            mp_context: str = "spawn"
+        ):
+
+        if exchange not in _BOOK_FEEDS:
+            raise ValueError(f"No sharded book feed for exchange : {exchange}")
+
+        self.exchange = exchange
+        self.symbols_resp = symbols_resp
+        self.symbols = tuple(symbols)
+        self.depth = depth
+        self.top_n = top_n
+        self.shards = shard_symbols(self.symbols, n_workers or os.cpu_count() or 1)
+        self.shm_name = f"noobit-{exchange.lower()}-{uuid.uuid4().hex[:8]}"
+
+        self._ctx = multiprocessing.get_context(mp_context)
+        self._workers: typing.Dict[int, multiprocessing.process.BaseProcess] = {}
+        self._restarts: typing.Dict[int, int] = {}
+        self._owner: typing.Optional[SharedBookWriter] = None
+
+
+    def _spawn(self, shard_id: int):
+        process = self._ctx.Process(
+            target=_worker_main,
+            args=(
+                self.exchange,
+                self.shm_name,
+                self.symbols,
+                self.shards[shard_id],
+                self.symbols_resp,
+                self.depth,
+                self.top_n,
+            ),
+            name=f"{self.shm_name}-{shard_id}",
+            daemon=True
+        )
+        process.start()
+        self._workers[shard_id] = process
+
+
+    def start(self):
+        # supervisor owns (creates and unlinks) the segment
+        self._owner = SharedBookWriter(self.shm_name, self.symbols, self.top_n, create=True)
+        for shard_id in range(len(self.shards)):
+            self._spawn(shard_id)
+
+
+    def check(self) -> typing.List[int]:
+        """restart dead workers, returns the ids of restarted shards
+        """
+        restarted = []
+        for shard_id, process in self._workers.items():
+            if not process.is_alive():
+                self._restarts[shard_id] = self._restarts.get(shard_id, 0) + 1
+                restarted.append(shard_id)
+        for shard_id in restarted:
+            self._spawn(shard_id)
+        return restarted
+
+
+    async def supervise(self, interval: float = 1):
+        while self._owner is not None:
+            self.check()
+            await asyncio.sleep(interval)
+
+
+    def reader(self) -> SharedBookReader:
+        return SharedBookReader(self.shm_name, self.symbols, self.top_n)
+
+
+    def stop(self, timeout: float = 5):
+        for process in self._workers.values():
+            process.terminate()
+        deadline = time.time() + timeout
+        for process in self._workers.values():
+            process.join(max(0, deadline - time.time()))
+        self._workers = {}
+
+        if self._owner is not None:
+            self._owner.close()
+            self._owner.unlink()
+            self._owner = None
+
+
+    def __enter__(self):
+        self.start()
+        return self
+
+
+    def __exit__(self, *args):
+        self.stop()
@@ -0,0 +1,248 @@
+"""
+Top of book published in shared memory, so that other processes can read it without copying
+whole books over pipes/sockets.
+
+One slot per symbol, each slot has a single writer and is protected by a seqlock:
+    - writer increments the sequence (odd = write in progress), writes the levels,
+        then increments the sequence again (even = consistent)
+    - readers copy the slot and retry if the sequence was odd or changed during the copy
+    - a writer dying mid-write leaves the sequence odd (readers fail) until the slot is published again
+
+Slot layout (float64):
+    [seq, utcTime, n_asks, n_bids, ask_px_0, ask_qty_0, ..., bid_px_0, bid_qty_0, ...]
+
+Prices and quantities are stored as floats, readers needing exact values should use the websocket feeds.
+
+Requires python >= 3.8 (`multiprocessing.shared_memory`).
+"""
+
+import array
+import typing
+from decimal import Decimal
+
+from noobit_markets.base import ntypes
+
+
+
+
+# ============================================================
+# EXPORTS
+# ============================================================
+
+
+__all__ = (
+    "SharedBookWriter",
+    "SharedBookReader",
+)
+
+
+
+
+# ============================================================
+# LAYOUT
+# ============================================================
+
+
+_ITEMSIZE = 8
+# header of the whole segment : [top_n, n_slots]
+_SEGMENT_HEADER = 2
+# header of each slot : [seq, utcTime, n_asks, n_bids]
+_SLOT_HEADER = 4
+
+
+def _slot_size(top_n: int) -> int:
+    return _SLOT_HEADER + 4 * top_n
+
+
+def _segment_size(top_n: int, n_slots: int) -> int:
+    return (_SEGMENT_HEADER + n_slots * _slot_size(top_n)) * _ITEMSIZE
+
+
+def _shared_memory():
+    try:
+        from multiprocessing import shared_memory
+    except ImportError:
+        raise RuntimeError("Shared memory books require python >= 3.8")
+    return shared_memory
+
+
+
+
+# ============================================================
+# BASE
+# ============================================================
+
+
+class _SharedBook(object):
+
+    def __init__(self, name: str, symbols: typing.Sequence[ntypes.SYMBOL], top_n: int, create: bool):
+
+        shared_memory = _shared_memory()
+
+        if create:
+            self._shm = shared_memory.SharedMemory(name=name, create=True, size=_segment_size(top_n, len(symbols)))
+        else:
+            self._shm = shared_memory.SharedMemory(name=name, create=False)
+
+        self.name = self._shm.name
+        self.top_n = top_n
+        self.symbols = tuple(symbols)
+        self._index = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self._slot_size = _slot_size(top_n)
+        self._raw: memoryview = self._shm.buf[:_segment_size(top_n, len(symbols))]
+        self._buf: memoryview = self._raw.cast("d")
+
+        if create:
+            self._buf[0] = top_n
+            self._buf[1] = len(symbols)
+        elif (int(self._buf[0]), int(self._buf[1])) != (top_n, len(symbols)):
+            raise ValueError(f"Shared book <{name}> layout does not match : top_n={int(self._buf[0])}, n_slots={int(self._buf[1])}")
+
+
+    def _offset(self, symbol: ntypes.SYMBOL) -> int:
+        return _SEGMENT_HEADER + self._index[symbol] * self._slot_size
+
+
+    def close(self):
+        self._buf.release()
+        self._raw.release()
+        self._shm.close()
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *args):
+        self.close()
+
+
+
+
+# ============================================================
+# WRITER
+# ============================================================
+
+
+class SharedBookWriter(_SharedBook):
+    """publish top levels for `symbols`, only one writer should ever publish a given symbol
+
+    Args:
+        name: name of the shared memory segment
+        symbols: all symbols of the segment, order has to be the same for writers and readers
+        top_n: number of levels published per side
+        create: create the segment (owner), else attach to an existing one
+    """
+
+    def __init__(self, name: str, symbols: typing.Sequence[ntypes.SYMBOL], top_n: int = 10, create: bool = False):
+        super().__init__(name, symbols, top_n, create)
+
+
+    def publish(
+            self,
+            symbol: ntypes.SYMBOL,
+            asks: typing.Sequence[typing.Tuple[Decimal, Decimal]],
+            bids: typing.Sequence[typing.Tuple[Decimal, Decimal]],
+            utcTime: int
+        ):
+        """asks sorted ascending, bids sorted descending (extra levels are ignored)
+        """
+
+        start = self._offset(symbol)
+        n_asks = min(len(asks), self.top_n)
+        n_bids = min(len(bids), self.top_n)
+
+        levels = array.array("d", [0.0] * (4 * self.top_n))
+        for i, (price, qty) in enumerate(asks[:n_asks]):
+            levels[2*i] = float(price)
+            levels[2*i+1] = float(qty)
+        bids_start = 2 * self.top_n
+        for i, (price, qty) in enumerate(bids[:n_bids]):
+            levels[bids_start+2*i] = float(price)
+            levels[bids_start+2*i+1] = float(qty)
+
+        buf = self._buf
+        # odd sequence : write in progress
+        # (the sequence is already odd if a previous writer died mid-write, we take over its write)
+        seq = int(buf[start]) | 1
+        buf[start] = seq
+        buf[start+1] = utcTime
+        buf[start+2] = n_asks
+        buf[start+3] = n_bids
+        buf[start+_SLOT_HEADER:start+self._slot_size] = levels
+        buf[start] = seq + 1
+
+
+    def unlink(self):
+        self._shm.unlink()
+
+
+
+
+# ============================================================
+# READER
+# ============================================================
+
+
+class SharedBookReader(_SharedBook):
+    """read top levels published by `SharedBookWriter`s
+
+    Args:
+        name: name of the shared memory segment
+        symbols: same symbols (in the same order) as the writer
+        top_n: same as the writer
+        max_retries: number of attempts to get a consistent copy of a slot
+    """
+
+    def __init__(self, name: str, symbols: typing.Sequence[ntypes.SYMBOL], top_n: int = 10, max_retries: int = 1000):
+        super().__init__(name, symbols, top_n, create=False)
+        self.max_retries = max_retries
+
+
+    def _read(self, symbol: ntypes.SYMBOL, length: int) -> typing.Tuple[float, ...]:
+        start = self._offset(symbol)
+        buf = self._buf
+
+        for _ in range(self.max_retries):
+            seq = buf[start]
+            if seq % 2:
+                continue
+            values = tuple(buf[start+1:start+length])
+            if buf[start] == seq:
+                # values[0] is utcTime, seq 0 means nothing has been published yet
+                return values if seq else ()
+
+        raise BlockingIOError(f"Could not get a consistent read for {symbol}")
+
+
+    def seq(self, symbol: ntypes.SYMBOL) -> int:
+        """number of updates published for `symbol`, cheap way to poll for changes
+        """
+        return int(self._buf[self._offset(symbol)]) // 2
+
+
+    def bbo(self, symbol: ntypes.SYMBOL) -> typing.Optional[typing.Tuple[int, float, float, float, float]]:
+        """(utcTime, bestBidPrice, bestBidQty, bestAskPrice, bestAskQty), None if nothing published
+        """
+        bids_start = _SLOT_HEADER + 2 * self.top_n
+        values = self._read(symbol, bids_start + 2)
+        if not values:
+            return None
+        utc_time, n_asks, n_bids = values[0], values[1], values[2]
+        ask = values[_SLOT_HEADER-1:_SLOT_HEADER+1] if n_asks else (float("nan"), 0.0)
+        bid = values[bids_start-1:bids_start+1] if n_bids else (float("nan"), 0.0)
+        return int(utc_time), bid[0], bid[1], ask[0], ask[1]
+
+
+    def top(self, symbol: ntypes.SYMBOL) -> typing.Optional[typing.Tuple[int, typing.List[typing.Tuple[float, float]], typing.List[typing.Tuple[float, float]]]]:
+        """(utcTime, asks, bids) with levels as (price, qty), None if nothing published
+        """
+        values = self._read(symbol, self._slot_size)
+        if not values:
+            return None
+        utc_time, n_asks, n_bids = int(values[0]), int(values[1]), int(values[2])
+        levels = values[_SLOT_HEADER-1:]
+        bids_start = 2 * self.top_n
+        asks = [(levels[2*i], levels[2*i+1]) for i in range(n_asks)]
+        bids = [(levels[bids_start+2*i], levels[bids_start+2*i+1]) for i in range(n_bids)]
+        return utc_time, asks, bids
@@ -0,0 +1,194 @@
+"""
+In memory state of our own account : orders, fills, balances and positions.
+
+Meant to be seeded once from REST, then kept current from private websocket feeds
+(see exchange specific subclasses, e.g `KrakenAccountState`) and periodically reconciled
+against REST, so that strategies can read account state without a round trip.
+"""
+
+import collections
+import typing
+from decimal import Decimal
+
+from noobit_markets.base import ntypes
+from noobit_markets.base.models.rest.response import NoobitResponseItemOrder, NoobitResponseItemTrade
+
+
+
+
+# ============================================================
+# EXPORTS
+# ============================================================
+
+
+__all__ = (
+    "AccountState",
+    "CLOSED_ORDSTATUS",
+)
+
+
+
+
+# ============================================================
+# ACCOUNT STATE
+# ============================================================
+
+
+# orders with these statuses are moved out of the open orders
+CLOSED_ORDSTATUS = frozenset(("FILLED", "CANCELED", "CLOSED", "EXPIRED", "REJECTED"))
+
+
+class AccountState(object):
+    """orders indexed by orderID and clOrdID, fills by orderID, balances by asset
+
+    Args:
+        max_closed: number of closed orders (and their fills) kept in memory
+    """
+
+    def __init__(self, max_closed: int = 1000):
+        self.max_closed = max_closed
+
+        self._open: typing.Dict[str, NoobitResponseItemOrder] = {}
+        self._closed: collections.OrderedDict = collections.OrderedDict()
+        self._by_clordid: typing.Dict[str, str] = {}
+
+        self._fills: typing.Dict[str, typing.List[NoobitResponseItemTrade]] = collections.defaultdict(list)
+        self._fill_ids: typing.Set[str] = set()
+
+        self._balances: typing.Dict[ntypes.ASSET, Decimal] = {}
+        self._positions: typing.Dict[str, NoobitResponseItemOrder] = {}
+
+
+    # ========================================
+    # ORDERS
+
+
+    def upsert_order(self, order: NoobitResponseItemOrder):
+
+        if order.clOrdID is not None:
+            self._by_clordid[str(order.clOrdID)] = order.orderID
+
+        if order.ordStatus in CLOSED_ORDSTATUS:
+            self._open.pop(order.orderID, None)
+            self._closed[order.orderID] = order
+            self._closed.move_to_end(order.orderID)
+            self._evict_closed()
+        else:
+            self._open[order.orderID] = order
+
+
+    def update_order(self, orderID: str, **fields) -> typing.Optional[NoobitResponseItemOrder]:
+        """partial update of a known order (no validation), returns None for unknown orders
+        """
+
+        current = self.order(orderID)
+        if current is None:
+            return None
+
+        updated = current.copy(update=fields)
+        self.upsert_order(updated)
+        return updated
+
+
+    def seed_orders(self, orders: typing.Iterable[NoobitResponseItemOrder]):
+        for order in orders:
+            self.upsert_order(order)
+
+
+    def reconcile_orders(self, open_orders: typing.Iterable[NoobitResponseItemOrder]) -> typing.Set[str]:
+        """make open orders match `open_orders` (REST being the reference)
+
+        Returns:
+            orderIDs that were missing, stale or not open anymore
+        """
+
+        reference = {order.orderID: order for order in open_orders}
+        diff = set()
+
+        for orderID, order in list(self._open.items()):
+            if orderID not in reference:
+                # we missed the update closing the order, we do not know how it was closed
+                diff.add(orderID)
+                self.upsert_order(order.copy(update={"ordStatus": "CLOSED", "workingIndicator": False}))
+
+        for orderID, order in reference.items():
+            current = self._open.get(orderID)
+            if current is None or current.cumQty != order.cumQty or current.ordStatus != order.ordStatus:
+                diff.add(orderID)
+            self.upsert_order(order)
+
+        return diff
+
+
+    def order(self, orderID: str) -> typing.Optional[NoobitResponseItemOrder]:
+        return self._open.get(orderID) or self._closed.get(orderID)
+
+
+    def order_by_clordid(self, clOrdID: typing.Union[str, int]) -> typing.Optional[NoobitResponseItemOrder]:
+        orderID = self._by_clordid.get(str(clOrdID))
+        return None if orderID is None else self.order(orderID)
+
+
+    def open_orders(self, symbol: typing.Optional[ntypes.SYMBOL] = None) -> typing.Tuple[NoobitResponseItemOrder, ...]:
+        if symbol is None:
+            return tuple(self._open.values())
+        return tuple(order for order in self._open.values() if order.symbol == symbol)
+
+
+    def _evict_closed(self):
+        while len(self._closed) > self.max_closed:
+            orderID, order = self._closed.popitem(last=False)
+            if order.clOrdID is not None and self._by_clordid.get(str(order.clOrdID)) == orderID:
+                del self._by_clordid[str(order.clOrdID)]
+            for fill in self._fills.pop(orderID, []):
+                self._fill_ids.discard(fill.trdMatchID)
+
+
+    # ========================================
+    # FILLS
+
+
+    def add_fill(self, fill: NoobitResponseItemTrade) -> bool:
+        """returns False if fill was already known
+        """
+
+        if fill.trdMatchID in self._fill_ids:
+            return False
+        self._fill_ids.add(fill.trdMatchID)
+        self._fills[fill.orderID].append(fill)
+        return True
+
+
+    def fills(self, orderID: str) -> typing.Tuple[NoobitResponseItemTrade, ...]:
+        return tuple(self._fills.get(orderID, ()))
+
+
+    # ========================================
+    # BALANCES
+
+
+    def seed_balances(self, balances: typing.Mapping[ntypes.ASSET, Decimal]):
+        self._balances = dict(balances)
+
+
+    def balance(self, asset: ntypes.ASSET) -> Decimal:
+        return self._balances.get(asset, Decimal(0))
+
+
+    @property
+    def balances(self) -> typing.Mapping[ntypes.ASSET, Decimal]:
+        return dict(self._balances)
+
+
+    # ========================================
+    # POSITIONS
+
+
+    def seed_positions(self, positions: typing.Iterable[NoobitResponseItemOrder]):
+        self._positions = {position.orderID: position for position in positions}
+
+
+    def positions(self, symbol: typing.Optional[ntypes.SYMBOL] = None) -> typing.Tuple[NoobitResponseItemOrder, ...]:
+        if symbol is None:
+            return tuple(self._positions.values())
+        return tuple(position for position in self._positions.values() if position.symbol == symbol)
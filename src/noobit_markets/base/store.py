@@ -0,0 +1,531 @@
+"""
+Local append-only market data store : trades, candles and book levels, kept so that history is only downloaded once.
+
+Layout, one directory per partition:
+    <root>/<EXCHANGE>/<SYMBOL>/<kind>/<YYYY-MM-DD>/<min_ts>_<max_ts>_<written_ns>_<pid>_<seq>.seg
+
+A segment is immutable, columnar and compressed per column (zlib), rows are sorted by timestamp.
+Segment names are the time range index : reads skip days and segments outside of the requested range
+without opening them, then only decompress the columns asked for, from a memory map of the file.
+
+Values are stored as float64 / int64 (`array` typecodes "d" / "q"), like `base.shm`, so results are
+array backed (`ColumnBatch`) but not exact decimals.
+
+Usage:
+    store = MarketStore("~/.noobit/data")
+    store.append(await KRAKEN.rest.public.trades(client, "XBT-USD", symbols_resp, since))
+    await store.record(kraken_ws.trade(symbols_resp, "XBT-USD"))        # until the stream ends
+
+    batch = store.read("KRAKEN", "XBT-USD", "trades", start=since, columns=("price", "qty"))
+    batch["price"]      # array("d", [...])
+"""
+
+import array
+import bisect
+import datetime
+import itertools
+import mmap
+import os
+import struct
+import sys
+import time
+import typing
+import zlib
+
+from noobit_markets.base import ntypes
+from noobit_markets.base.models.result import Result, Ok, Err
+from noobit_markets.base.models.events import TradeTick, BookDelta, CandleUpdate
+from noobit_markets.base.models.rest.response import (
+    NoobitResponseTrades,
+    NoobitResponseOhlc,
+    NoobitResponseOrderBook,
+    NoobitResponseItemOhlc,
+)
+
+
+
+
+# ============================================================
+# EXPORTS
+# ============================================================
+
+
+__all__ = (
+    "SCHEMAS",
+    "ColumnBatch",
+    "MarketStore",
+)
+
+
+
+
+# ============================================================
+# SCHEMAS
+# ============================================================
+
+
+# kind => (column, array typecode), first column is always the timestamp (ms)
+SCHEMAS: typing.Dict[str, typing.Tuple[typing.Tuple[str, str], ...]] = {
+    # side: 1 = buy, -1 = sell
+    "trades": (("ts", "q"), ("price", "d"), ("qty", "d"), ("side", "b")),
+    "ohlc": (("ts", "q"), ("open", "d"), ("high", "d"), ("low", "d"), ("close", "d"), ("volume", "d"), ("count", "q")),
+    # one row per level, side: 1 = bid, -1 = ask, snapshot: 1 if the levels replace the whole book
+    "book": (("ts", "q"), ("side", "b"), ("price", "d"), ("qty", "d"), ("snapshot", "b")),
+}
+
+_DAY = 86_400_000
+
+
+
+
+# ============================================================
+# SEGMENT FORMAT
+# ============================================================
+
+
+# magic, version, n_rows, min_ts, max_ts, n_cols
+_HEADER = struct.Struct("<4sBIqqB")
+# name, typecode, compressed length
+_COLUMN = struct.Struct("<16scI")
+_MAGIC = b"NBSG"
+_VERSION = 1
+
+
+def _to_le(arr: array.array) -> bytes:
+    if sys.byteorder == "big":
+        arr = array.array(arr.typecode, arr)
+        arr.byteswap()
+    return arr.tobytes()
+
+
+def _from_le(typecode: str, data: bytes) -> array.array:
+    arr = array.array(typecode)
+    arr.frombytes(data)
+    if sys.byteorder == "big":
+        arr.byteswap()
+    return arr
+
+
+def _write_segment(path: str, columns: typing.Dict[str, array.array], level: int):
+    ts = columns["ts"]
+    blocks = [(name, arr.typecode, zlib.compress(_to_le(arr), level)) for name, arr in columns.items()]
+
+    header = _HEADER.pack(_MAGIC, _VERSION, len(ts), ts[0], ts[-1], len(blocks))
+    header += b"".join(_COLUMN.pack(name.encode(), typecode.encode(), len(block)) for name, typecode, block in blocks)
+
+    # segments are immutable : write aside, then move in place
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(header)
+        for _, _, block in blocks:
+            f.write(block)
+    os.replace(tmp, path)
+
+
+def _read_segment(path: str, names: typing.Iterable[str]) -> typing.Dict[str, array.array]:
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        magic, version, _n_rows, _min_ts, _max_ts, n_cols = _HEADER.unpack_from(mm, 0)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f"Not a segment file : {path}")
+
+        offset = _HEADER.size
+        layout = {}
+        data_offset = offset + n_cols * _COLUMN.size
+        for _ in range(n_cols):
+            name, typecode, length = _COLUMN.unpack_from(mm, offset)
+            offset += _COLUMN.size
+            layout[name.rstrip(b"\0").decode()] = (typecode.decode(), data_offset, length)
+            data_offset += length
+
+        res = {}
+        with memoryview(mm) as view:
+            for name in names:
+                typecode, start, length = layout[name]
+                res[name] = _from_le(typecode, zlib.decompress(view[start:start+length]))
+        return res
+
+
+def _segment_name(filename: str) -> typing.Tuple[int, ...]:
+    """(min_ts, max_ts, written_ns, pid, seq)
+    """
+    return tuple(int(part) for part in filename[:-len(".seg")].split("_"))
+
+
+
+
+# ============================================================
+# RESULTS
+# ============================================================
+
+
+class ColumnBatch(object):
+    """columns of equal length, as arrays
+    """
+
+    def __init__(self, kind: str, columns: typing.Dict[str, array.array]):
+        self.kind = kind
+        self.columns = columns
+
+
+    def __len__(self) -> int:
+        return len(self.columns["ts"]) if "ts" in self.columns else len(next(iter(self.columns.values()), ()))
+
+
+    def __getitem__(self, name: str) -> array.array:
+        return self.columns[name]
+
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.columns
+
+
+    def rows(self) -> typing.Iterator[tuple]:
+        return zip(*self.columns.values())
+
+
+    def __repr__(self) -> str:
+        return f"<ColumnBatch {self.kind} rows={len(self)} columns={list(self.columns)}>"
+
+
+
+
+# ============================================================
+# STORE
+# ============================================================
+
+
+def _day(ts: int) -> str:
+    return datetime.datetime.fromtimestamp(ts // 1000, datetime.timezone.utc).strftime("%Y-%m-%d")
+
+
+def _argsort(values: typing.Sequence) -> typing.List[int]:
+    return sorted(range(len(values)), key=values.__getitem__)
+
+
+def _take(columns: typing.Dict[str, array.array], idx: typing.Sequence[int]) -> typing.Dict[str, array.array]:
+    return {name: array.array(arr.typecode, (arr[i] for i in idx)) for name, arr in columns.items()}
+
+
+class MarketStore(object):
+    """append-only store, one writer process per (exchange, symbol, kind) at a time is expected
+    (concurrent writers do not corrupt segments, but may interleave rows)
+
+    Args:
+        root: directory of the store (created if needed)
+        segment_rows: rows buffered per partition before a segment is written
+        level: zlib compression level
+    """
+
+    def __init__(self, root: str, segment_rows: int = 50_000, level: int = 6):
+        self.root = os.path.expanduser(root)
+        self.segment_rows = segment_rows
+        self.level = level
+
+        self._buffers: typing.Dict[typing.Tuple[str, str, str], typing.Dict[str, array.array]] = {}
+        self._seq = itertools.count()
+
+
+    def _dir(self, exchange: str, symbol: ntypes.SYMBOL, kind: str) -> str:
+        return os.path.join(self.root, exchange.upper(), symbol, kind)
+
+
+    # ========================================
+    # WRITE
+
+
+    def append_rows(
+            self,
+            exchange: typing.Union[ntypes.EXCHANGE, str],
+            symbol: ntypes.SYMBOL,
+            kind: str,
+            rows: typing.Iterable[tuple]
+        ):
+        """rows in the column order of `SCHEMAS[kind]`
+        """
+        # validated responses hold an `EXCHANGE` member, compact events a plain string
+        exchange = getattr(exchange, "value", exchange)
+        key = (exchange.upper(), symbol, kind)
+        buffer = self._buffers.get(key)
+        if buffer is None:
+            buffer = self._buffers[key] = {name: array.array(typecode) for name, typecode in SCHEMAS[kind]}
+
+        columns = tuple(buffer.values())
+        for row in rows:
+            for col, value in zip(columns, row):
+                col.append(value)
+
+        if len(buffer["ts"]) >= self.segment_rows:
+            self._flush(key)
+
+
+    def append_trades(self, trades: typing.Union[NoobitResponseTrades, TradeTick, typing.Iterable[TradeTick]]):
+        """trades of `get_trades_*` or of a websocket trade feed (validated or compact)
+        """
+        if isinstance(trades, NoobitResponseTrades):
+            exchange, items = trades.exchange, trades.trades
+        else:
+            items = (trades, ) if isinstance(trades, TradeTick) else tuple(trades)
+            if not items:
+                return
+            exchange = items[0].exchange
+
+        by_symbol: typing.Dict[str, list] = {}
+        for t in items:
+            by_symbol.setdefault(t.symbol, []).append(
+                (int(t.transactTime), float(t.avgPx), float(t.cumQty), 1 if t.side == "BUY" else -1)
+            )
+        for symbol, rows in by_symbol.items():
+            self.append_rows(exchange, symbol, "trades", rows)
+
+
+    def append_ohlc(
+            self,
+            ohlc: typing.Union[NoobitResponseOhlc, typing.Iterable[typing.Union[NoobitResponseItemOhlc, CandleUpdate]]],
+            exchange: typing.Optional[str] = None
+        ):
+        """candles of `get_ohlc_*`, or closed candles (e.g `base.candles`, then `exchange` is required
+        unless items are `CandleUpdate`s)
+        """
+        if isinstance(ohlc, NoobitResponseOhlc):
+            exchange, items = ohlc.exchange, ohlc.ohlc
+        else:
+            items = tuple(ohlc)
+
+        by_symbol: typing.Dict[str, list] = {}
+        for c in items:
+            by_symbol.setdefault((exchange or c.exchange, c.symbol), []).append(
+                (int(c.utcTime), float(c.open), float(c.high), float(c.low), float(c.close), float(c.volume), int(c.trdCount))
+            )
+        for (_exchange, symbol), rows in by_symbol.items():
+            self.append_rows(_exchange, symbol, "ohlc", rows)
+
+
+    def append_book(self, book: typing.Union[NoobitResponseOrderBook, BookDelta]):
+        """full book (`get_orderbook_*`, websocket books) or delta (compact websocket feeds)
+        """
+        snapshot = 1 if isinstance(book, NoobitResponseOrderBook) or book.isSnapshot else 0
+        ts = int(book.utcTime)
+        rows = [(ts, -1, float(price), float(qty), snapshot) for price, qty in book.asks.items()]
+        rows.extend((ts, 1, float(price), float(qty), snapshot) for price, qty in book.bids.items())
+        self.append_rows(book.exchange, book.symbol, "book", rows)
+
+
+    def append(self, value: typing.Any):
+        """any supported response or event, results are unwrapped and errors ignored
+        """
+        if isinstance(value, (Ok, Err)):
+            if value.is_err():
+                return
+            value = value.value
+
+        if isinstance(value, (NoobitResponseTrades, TradeTick)):
+            self.append_trades(value)
+        elif isinstance(value, NoobitResponseOhlc):
+            self.append_ohlc(value)
+        elif isinstance(value, (NoobitResponseOrderBook, BookDelta)):
+            self.append_book(value)
+        elif isinstance(value, (list, tuple)):
+            # e.g `Ok([])` from compact feeds
+            if not value:
+                return
+            if all(isinstance(item, TradeTick) for item in value):
+                self.append_trades(value)
+            elif all(isinstance(item, BookDelta) for item in value):
+                for book in value:
+                    self.append_book(book)
+            else:
+                raise TypeError(f"Can not store sequence of {type(value[0])}")
+        else:
+            raise TypeError(f"Can not store {type(value)}")
+
+
+    async def record(self, stream: typing.AsyncIterable[Result]):
+        """append every message of a websocket stream, buffers are flushed when it ends
+        """
+        try:
+            async for msg in stream:
+                self.append(msg)
+        finally:
+            self.flush()
+
+
+    def _flush(self, key: typing.Tuple[str, str, str]):
+        buffer = self._buffers.pop(key, None)
+        if buffer is None or not buffer["ts"]:
+            return
+
+        ts = buffer["ts"]
+        if any(b < a for a, b in zip(ts, ts[1:])):
+            buffer = _take(buffer, _argsort(ts))
+            ts = buffer["ts"]
+
+        # one segment per day partition
+        start = 0
+        while start < len(ts):
+            day_end = (ts[start] // _DAY + 1) * _DAY
+            end = bisect.bisect_left(ts, day_end, start)
+            columns = {name: arr[start:end] for name, arr in buffer.items()}
+
+            directory = os.path.join(self._dir(*key), _day(ts[start]))
+            os.makedirs(directory, exist_ok=True)
+            filename = f"{ts[start]}_{ts[end-1]}_{time.time_ns()}_{os.getpid()}_{next(self._seq)}.seg"
+            _write_segment(os.path.join(directory, filename), columns, self.level)
+            start = end
+
+
+    def flush(self):
+        for key in list(self._buffers):
+            self._flush(key)
+
+
+    def close(self):
+        self.flush()
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+    # ========================================
+    # READ
+
+
+    def segments(
+            self,
+            exchange: str,
+            symbol: ntypes.SYMBOL,
+            kind: str,
+            start: typing.Optional[int] = None,
+            end: typing.Optional[int] = None
+        ) -> typing.List[str]:
+        """paths of the segments that may hold rows in [start, end), in write order
+        """
+        directory = self._dir(exchange, symbol, kind)
+        if not os.path.isdir(directory):
+            return []
+
+        first_day = _day(start) if start is not None else None
+        last_day = _day(end - 1) if end is not None else None
+
+        res = []
+        for day in sorted(os.listdir(directory)):
+            if (first_day and day < first_day) or (last_day and day > last_day):
+                continue
+            for filename in os.listdir(os.path.join(directory, day)):
+                if not filename.endswith(".seg"):
+                    continue
+                min_ts, max_ts, *written = _segment_name(filename)
+                if (start is not None and max_ts < start) or (end is not None and min_ts >= end):
+                    continue
+                res.append((tuple(written), os.path.join(directory, day, filename)))
+
+        return [path for _, path in sorted(res)]
+
+
+    def read(
+            self,
+            exchange: str,
+            symbol: ntypes.SYMBOL,
+            kind: str,
+            start: typing.Optional[int] = None,
+            end: typing.Optional[int] = None,
+            columns: typing.Optional[typing.Iterable[str]] = None,
+            dedup: bool = True
+        ) -> ColumnBatch:
+        """rows with start <= ts < end, sorted by ts (rows still buffered are not included, see `flush`)
+
+        Args:
+            columns: subset of the columns of `SCHEMAS[kind]` (ts is always returned)
+            dedup: drop rows written twice (e.g overlapping backfills and streams) : identical rows
+                of different segments are one event, of the same segment distinct events.
+                For candles only the last written candle of a given ts is kept
+        """
+        schema = dict(SCHEMAS[kind])
+        names = ["ts"] + [name for name in (columns or schema) if name != "ts"]
+        for name in names:
+            if name not in schema:
+                raise KeyError(f"Unknown column {name} for {kind}")
+        if dedup:
+            # need all columns to compare rows
+            read_names = list(schema)
+        else:
+            read_names = names
+
+        merged = {name: array.array(schema[name]) for name in read_names}
+        # segment each row was read from, to tell duplicates from identical rows of a segment
+        source = array.array("l")
+        last_max = None
+        overlapping = False
+
+        for i, path in enumerate(self.segments(exchange, symbol, kind, start, end)):
+            segment = _read_segment(path, read_names)
+            ts = segment["ts"]
+            lo = bisect.bisect_left(ts, start) if start is not None else 0
+            hi = bisect.bisect_left(ts, end) if end is not None else len(ts)
+            if lo >= hi:
+                continue
+
+            # same ts in two segments may be a duplicate (e.g last candle of two REST calls)
+            if last_max is not None and ts[lo] <= last_max:
+                overlapping = True
+            last_max = ts[hi-1] if last_max is None else max(last_max, ts[hi-1])
+
+            for name in read_names:
+                merged[name].extend(segment[name][lo:hi])
+            source.extend(itertools.repeat(i, hi - lo))
+
+        if overlapping:
+            # stable, rows of the same ts stay in write order
+            order = _argsort(merged["ts"])
+            merged = _take(merged, order)
+            source = array.array("l", (source[i] for i in order))
+
+        if dedup and overlapping:
+            merged = self._dedup(kind, merged, source)
+
+        return ColumnBatch(kind, {name: merged[name] for name in names})
+
+
+    @staticmethod
+    def _dedup(
+            kind: str,
+            columns: typing.Dict[str, array.array],
+            source: typing.Sequence[int]
+        ) -> typing.Dict[str, array.array]:
+        ts = columns["ts"]
+        cols = tuple(columns.values())
+        keep: typing.List[int] = []
+
+        if kind == "ohlc":
+            # last written candle of each ts (rows of the same ts are in write order)
+            keep = [i for i in range(len(ts)) if i + 1 == len(ts) or ts[i+1] != ts[i]]
+
+        else:
+            # identical rows within a segment are distinct events (e.g two equal trades),
+            # across segments they are the same event written twice : keep the max count of any segment
+            i = 0
+            while i < len(ts):
+                j = i
+                while j < len(ts) and ts[j] == ts[i]:
+                    j += 1
+
+                counts: typing.Dict[tuple, typing.Dict[int, int]] = {}
+                for k in range(i, j):
+                    per_segment = counts.setdefault(tuple(col[k] for col in cols), {})
+                    per_segment[source[k]] = per_segment.get(source[k], 0) + 1
+
+                allowed = {row: max(per_segment.values()) for row, per_segment in counts.items()}
+                for k in range(i, j):
+                    row = tuple(col[k] for col in cols)
+                    if allowed[row]:
+                        allowed[row] -= 1
+                        keep.append(k)
+                i = j
+
+        if len(keep) == len(ts):
+            return columns
+        return _take(columns, keep)
@@ -0,0 +1,128 @@
+"""
+Shared index over a validated `NoobitResponseSymbols`.
+
+Request models hold the index by reference instead of a copy of the whole symbols response,
+and symbol lookups (noobit symbol <=> exchange pair) are dict lookups on mappings built once per
+symbols response, instead of rebuilding a mapping of all listed pairs on each request.
+
+Usage:
+    index = symbols_index(symbols_resp)
+    index.symbol_to_exchange("XBT-USD")     # "XXBTZUSD"
+    "XBT-USD" in index
+"""
+
+import collections
+import typing
+
+from noobit_markets.base import ntypes
+from noobit_markets.base.models.rest.response import NoobitResponseSymbols, NoobitResponseItemSymbols
+
+
+
+
+# ============================================================
+# EXPORTS
+# ============================================================
+
+
+__all__ = (
+    "SymbolsIndex",
+    "symbols_index",
+)
+
+
+
+
+# ============================================================
+# INDEX
+# ============================================================
+
+
+class SymbolsIndex(object):
+    """read only view of a validated `NoobitResponseSymbols`, never copied by request models
+    """
+
+    __slots__ = ("response", "asset_pairs", "_to_exchange", "_from_exchange")
+
+    def __init__(self, response: NoobitResponseSymbols):
+        self.response = response
+        # same mapping as the response (for validators written against `symbols_resp.asset_pairs`)
+        self.asset_pairs: typing.Mapping[ntypes.SYMBOL, NoobitResponseItemSymbols] = response.asset_pairs
+
+        self._to_exchange = {k: v.exchange_pair for k, v in response.asset_pairs.items()}
+        self._from_exchange = {v.exchange_pair: k for k, v in response.asset_pairs.items()}
+
+
+    @property
+    def exchange(self) -> ntypes.EXCHANGE:
+        return self.response.exchange
+
+    @property
+    def assets(self) -> typing.Mapping:
+        return self.response.assets
+
+
+    def __contains__(self, symbol: object) -> bool:
+        return symbol in self.asset_pairs
+
+    def __repr__(self):
+        return f"SymbolsIndex(exchange={self.exchange}, pairs={len(self.asset_pairs)})"
+
+
+    def symbol_to_exchange(self, symbol: ntypes.SYMBOL) -> str:
+        return self._to_exchange[symbol]
+
+    def symbol_from_exchange(self, exchange_pair: str) -> ntypes.SYMBOL:
+        return self._from_exchange[exchange_pair]
+
+
+    # ========================================
+    # PYDANTIC
+
+
+    @classmethod
+    def __get_validators__(cls):
+        yield cls.validate
+
+
+    @classmethod
+    def validate(cls, v: typing.Any) -> "SymbolsIndex":
+        # passed by reference, validated only once per symbols response
+        if isinstance(v, SymbolsIndex):
+            return v
+        if not isinstance(v, NoobitResponseSymbols):
+            v = NoobitResponseSymbols.parse_obj(v)
+        return symbols_index(v)
+
+
+
+
+# ============================================================
+# CACHE
+# ============================================================
+
+
+_MAX_INDEXES = 16
+
+# id(symbols_resp) => index, the index keeps a reference to the response so ids are not reused
+_indexes: "collections.OrderedDict[int, SymbolsIndex]" = collections.OrderedDict()
+
+
+def symbols_index(symbols_resp: typing.Union[NoobitResponseSymbols, SymbolsIndex]) -> SymbolsIndex:
+    """index for `symbols_resp`, built once (a few symbols responses are cached)
+    """
+
+    if isinstance(symbols_resp, SymbolsIndex):
+        return symbols_resp
+
+    key = id(symbols_resp)
+    index = _indexes.get(key)
+    if index is None or index.response is not symbols_resp:
+        index = SymbolsIndex(symbols_resp)
+        _indexes[key] = index
+        while len(_indexes) > _MAX_INDEXES:
+            _indexes.popitem(last=False)
+    else:
+        _indexes.move_to_end(key)
+
+    return index
@@ -0,0 +1,174 @@
+"""
+Pre-validated order templates, for repeated submissions of near identical orders.
+
+A template is compiled once per (exchange, symbol, side, ordType): the full `NoobitRequestAddOrder`
+validation runs at compile time, each submission then only validates the fields that vary
+(price, orderQty, stopPrice, clOrdID) with the same field validators.
+The exchange request model is handled the same way (see `OrderTemplate.exchange_request`).
+
+Usage:
+    template = OrderTemplate.compile("KRAKEN", symbols_resp, "XBT-USD", "BUY", "LIMIT", "GOOD-TIL-CANCEL").value
+    await post_templated_order_kraken(client, template, price=Decimal("9000.5"), orderQty=Decimal("0.1"), clOrdID=123)
+"""
+
+import typing
+from decimal import Decimal
+
+from pyrsistent import pmap
+
+from noobit_markets.base import ntypes
+from noobit_markets.base.request import _validate_data, _validate_partial
+from noobit_markets.base.models.result import Result, Ok
+from noobit_markets.base.models.rest.request import NoobitRequestAddOrder
+from noobit_markets.base.models.rest.response import NoobitResponseSymbols
+
+
+
+
+# ============================================================
+# EXPORTS
+# ============================================================
+
+
+__all__ = (
+    "OrderTemplate",
+)
+
+
+
+
+# ============================================================
+# ORDER TEMPLATE
+# ============================================================
+
+
+# fields that vary between submissions, in declaration order of `NoobitRequestAddOrder`
+_VARYING_FIELDS = ("clOrdID", "orderQty", "price", "stopPrice")
+
+
+class OrderTemplate(object):
+    """compiled `NoobitRequestAddOrder` for a given (exchange, symbol, side, ordType)
+
+    Use `OrderTemplate.compile` to create one.
+    """
+
+    def __init__(self, valid_request: NoobitRequestAddOrder, exchange_pair: str, required: typing.FrozenSet[str]):
+        self.valid_request = valid_request
+        self.exchange_pair = exchange_pair
+        # varying fields that can not be None (depends on ordType)
+        self.required = required
+
+        self._static = {k: v for k, v in dict(valid_request).items() if k not in _VARYING_FIELDS}
+        # static part of the validated exchange request, set on first `exchange_request`
+        self._exchange_static: typing.Optional[dict] = None
+
+
+    @property
+    def exchange(self) -> ntypes.EXCHANGE:
+        return self.valid_request.exchange
+
+    @property
+    def symbol(self) -> ntypes.SYMBOL:
+        return self.valid_request.symbol
+
+    @property
+    def symbols_resp(self) -> NoobitResponseSymbols:
+        return self.valid_request.symbols_resp.response
+
+
+    @classmethod
+    def compile(
+            cls,
+            exchange: ntypes.EXCHANGE,
+            symbols_resp: NoobitResponseSymbols,
+            symbol: ntypes.SYMBOL,
+            side: ntypes.ORDERSIDE,
+            ordType: ntypes.ORDERTYPE,
+            timeInForce: typing.Optional[ntypes.TIMEINFORCE] = None,
+            **kwargs
+        ) -> Result["OrderTemplate", Exception]:
+        """validate all static fields once, with placeholder values for the varying fields
+        """
+
+        required = {"orderQty"}
+        if ordType not in ["MARKET", "STOP-LOSS", "TAKE-PROFIT"]:
+            required.add("price")
+        if ordType in ["STOP-LOSS", "TAKE-PROFIT", "STOP-LOSS-LIMIT", "TAKE-PROFIT-LIMIT"]:
+            required.add("stopPrice")
+
+        placeholders: typing.Dict[str, typing.Any] = {"clOrdID": None, "orderQty": None, "price": None, "stopPrice": None}
+        specs = symbols_resp.asset_pairs.get(symbol)
+        if specs is not None:
+            placeholders["orderQty"] = specs.order_min or Decimal(1).scaleb(-specs.volume_decimals)
+            for field in required - {"orderQty"}:
+                placeholders[field] = Decimal(1)
+
+        valid_request = _validate_data(
+            NoobitRequestAddOrder,
+            pmap({
+                "exchange": exchange,
+                "symbols_resp": symbols_resp,
+                "symbol": symbol,
+                "side": side,
+                "ordType": ordType,
+                "timeInForce": timeInForce,
+                "quoteOrderQty": None,
+                **placeholders,
+                **kwargs,
+            })
+        )
+        if valid_request.is_err():
+            return valid_request
+
+        return Ok(cls(valid_request.value, specs.exchange_pair, frozenset(required)))
+
+
+    def fill(
+            self,
+            price: typing.Optional[Decimal] = None,
+            orderQty: typing.Optional[Decimal] = None,
+            clOrdID: typing.Optional[typing.Union[str, int]] = None,
+            stopPrice: typing.Optional[Decimal] = None,
+        ) -> Result[NoobitRequestAddOrder, Exception]:
+        """`NoobitRequestAddOrder` with only the varying fields validated (decimals, order_min ...)
+        """
+
+        fields = {"clOrdID": clOrdID, "orderQty": orderQty, "price": price, "stopPrice": stopPrice}
+
+        missing = [k for k in self.required if fields[k] is None]
+        if missing:
+            # let the field validators report it, as full validation would
+            fields = {k: v for k, v in fields.items() if k not in missing}
+            return _validate_data(NoobitRequestAddOrder, pmap({**self._static, **fields}))
+
+        return _validate_partial(NoobitRequestAddOrder, self._static, fields)
+
+
+    def exchange_request(
+            self,
+            model: typing.Type,
+            parsed_req: typing.Mapping,
+            varying: typing.Iterable[str]
+        ) -> Result:
+        """exchange request model for `parsed_req`, fully validated on first call only
+
+        Args:
+            model: exchange request model (e.g `KrakenRequestNewOrder`)
+            parsed_req: output of the exchange `parse_request`
+            varying: keys of `parsed_req` that change between submissions (nonce, price, volume ...)
+        """
+
+        varying = tuple(varying)
+
+        if self._exchange_static is None:
+            valid_req = _validate_data(model, pmap(parsed_req))
+            if valid_req.is_ok():
+                self._exchange_static = {k: v for k, v in dict(valid_req.value).items() if k not in varying}
+            return valid_req
+
+        return _validate_partial(model, self._exchange_static, {k: parsed_req[k] for k in varying})
+
+
+    def symbol_to_exchange(self, symbol: ntypes.SYMBOL) -> str:
+        # avoids building the full pair mapping on each submission
+        return self.exchange_pair
@@ -1,10 +1,10 @@
 import asyncio
+import itertools
 import json
+import time
 import typing
-import inspect
 from abc import ABC
 from decimal import Decimal
-from collections import deque
 import re
 
 from typing_extensions import Literal, TypedDict
@@ -14,9 +14,12 @@ import websockets
 from websockets import WebSocketClientProtocol
 
 from noobit_markets.base import ntypes
-from noobit_markets.base.models.result import Result, Ok
+from noobit_markets.base.models.result import Result, Ok, Err
+from noobit_markets.base.errors import BadRequest, RequestTimeout
 
-from noobit_markets.base.models.rest.response import NoobitResponseInstrument, NoobitResponseOhlc, NoobitResponseOpenOrders, NoobitResponseOrderBook, NoobitResponseSpread, NoobitResponseTrades
+from noobit_markets.base.models.rest.response import NoobitResponseInstrument, NoobitResponseOhlc, NoobitResponseOpenOrders, NoobitResponseOrderBook, NoobitResponseSpread, NoobitResponseSymbols, NoobitResponseTrades
+from noobit_markets.base.batch import RateLimiter
+from noobit_markets.base.recorder import FrameRecorder
 
 
 
@@ -36,6 +39,13 @@ class KrakenSubMsg(pydantic.BaseModel):
   pair: typing.Optional[typing.List[str]] = pydantic.Field(...)
   subscription: typing.Dict[str, typing.Any]
 
+  def with_reqid(self, reqid: int) -> "KrakenSubMsg":
+    return self.copy(update={"reqid": reqid})
+
+  # kraken acknowledges each pair separately
+  def ack_keys(self) -> typing.Tuple[str, ...]:
+    return tuple(self.pair or ())
+
 
 class KrakenSubModel(SubModel):
 
@@ -61,6 +71,13 @@ class BinanceSubMsg(pydantic.BaseModel):
             if not values.get("params"):
                 raise ValueError("Empty mandatory field: <params>")
 
+    def with_reqid(self, reqid: int) -> "BinanceSubMsg":
+        return self.copy(update={"id": reqid})
+
+    # binance acknowledges the whole message at once
+    def ack_keys(self) -> typing.Tuple[str, ...]:
+        return tuple(self.params or ())
+
 class BinanceSubModel(SubModel):
     msg: BinanceSubMsg
 
@@ -68,10 +85,51 @@ class BinanceSubModel(SubModel):
 # ========================================
 
 
-async def subscribe(client: WebSocketClientProtocol, sub_model: SubModel, q_maxsize = 0) -> None:
+def as_symbols(symbol: typing.Union[ntypes.SYMBOL, typing.Sequence[ntypes.SYMBOL]]) -> typing.Tuple[ntypes.SYMBOL, ...]:
+  """`validate_sub` functions accept one symbol or many (one message for all of them)"""
+  if isinstance(symbol, str):
+    return (symbol, )
+  return tuple(symbol)
+
+
+async def subscribe(client: WebSocketClientProtocol, sub_model: SubModel, q_maxsize = 0) -> Result[dict, Exception]:
+  """send the subscription message, does not wait for the exchange acknowledgement (see `BaseWsApi.subscribe_acked`)
+  """
 
   payload = (sub_model.msg).dict(exclude_none=True)
-  await client.send(json.dumps(payload))
+  try:
+    await client.send(json.dumps(payload))
+  except Exception as e:
+    return Err(e)
+  return Ok(payload)
+
+
+def _msg_symbol(msg: Result) -> typing.Optional[ntypes.SYMBOL]:
+  if not msg.is_ok():
+    return None
+  value = msg.value
+  symbol = getattr(value, "symbol", None)
+  if symbol is not None:
+    return symbol
+  # responses with many items (trades, ohlc, spread) are for a single symbol
+  for field in ("trades", "ohlc", "spread"):
+    items = getattr(value, field, None)
+    if items:
+      return items[0].symbol
+  return None
+
+
+class _SubRequest(object):
+  """subscription message waiting for its acknowledgement(s)"""
+
+  __slots__ = ("future", "keys", "pending", "subscribed", "errors")
+
+  def __init__(self, future: asyncio.Future, keys: typing.Iterable[str]):
+    self.future = future
+    self.keys = tuple(keys)
+    self.pending = set(self.keys)
+    self.subscribed: typing.List[str] = []
+    self.errors: typing.Dict[typing.Optional[str], str] = {}
 
 
 
@@ -84,15 +142,22 @@ async def subscribe(client: WebSocketClientProtocol, sub_model: SubModel, q_maxs
 class WsApiProto(ABC):
 
     _running_tasks: typing.Dict
-    _subd_feeds: typing.Dict
+    _subd_feeds: typing.Dict = {}
     _terminate: bool
 
-    _data_queues = typing.Dict[str, asyncio.Queue]
+    _data_queues: typing.Dict[str, asyncio.Queue] = {}
+    _status_queues: typing.Dict[str, asyncio.Queue] = {}
+
+
+# put in data queues on `close`, ends `iterq`
+_CLOSED = object()
 
 
 
 class BaseWsApi(WsApiProto):
 
+    # seconds to wait for subscription acknowledgements
+    sub_timeout: float = 5
 
     def __init__(
             self,
@@ -102,7 +167,23 @@ class BaseWsApi(WsApiProto):
                 typing.Coroutine[typing.Any, typing.Any, None]
             ],
             loop: asyncio.BaseEventLoop,
+            *,
+            connect: typing.Optional[typing.Callable[[], typing.Awaitable[websockets.WebSocketClientProtocol]]] = None,
+            max_retries: int = 10,
+            backoff: float = 1,
+            max_backoff: float = 60,
+            on_reconnect: typing.Optional[typing.Callable[["BaseWsApi", int], typing.Awaitable[None]]] = None,
+            recorder: typing.Optional[FrameRecorder] = None,
         ):
+        """
+        Args:
+            connect: coroutine function returning a new connection, enables reconnection
+                (e.g `lambda: websockets.connect("wss://ws.kraken.com")`)
+            max_retries: consecutive failed reconnection attempts before giving up
+            backoff, max_backoff: delay before the first attempt, doubled on each failure up to `max_backoff`
+            on_reconnect: called with the api and the disconnection time (ms) once subscriptions are replayed
+            recorder: captures every received frame (see base.recorder), closing it is left to the caller
+        """
 
         self.loop = loop
 
@@ -113,55 +194,173 @@ class BaseWsApi(WsApiProto):
 
         self.msg_handler = msg_handler
 
+        self._connect = connect
+        self._max_retries = max_retries
+        self._backoff = backoff
+        self._max_backoff = max_backoff
+        self._on_reconnect_cb = on_reconnect
+        self._recorder = recorder
+
+        # queues and feeds declared on the class are templates, each instance gets its own
+        # (so closing an instance only ends its own tasks and iterators)
+        self._data_queues = {feed: asyncio.Queue(q.maxsize) for feed, q in self._data_queues.items()}
+        self._status_queues = {feed: asyncio.Queue(q.maxsize) for feed, q in self._status_queues.items()}
+        self._subd_feeds = {feed: set(subd) if isinstance(subd, set) else subd for feed, subd in self._subd_feeds.items()}
+        self._running_tasks = dict()
+        self._terminate = False
+
+        # coroutines passed to `schedule`, started by `_watcher` as soon as they are queued
+        self._pending_tasks: asyncio.Queue = asyncio.Queue()
+        # tasks started by `_watcher` that are still running
+        self._scheduled: typing.Set[asyncio.Future] = set()
+        # (feed, pair) => futures waiting for the subscription status, resolved by `_watch_sub`
+        self._sub_waiters: typing.Dict[typing.Tuple[str, str], typing.List[asyncio.Future]] = dict()
+        # reqid => subscription message waiting for its acknowledgement, resolved by `_watch_sub`
+        self._sub_requests: typing.Dict[int, _SubRequest] = dict()
+        self._sub_reqids = itertools.count(1)
+
         # self.install_signal_handlers()
 
-        # self._pending_tasks.add(self.dispatch)
         self._running_tasks["dispatch"] = asyncio.ensure_future(self._dispatch())
         self._running_tasks["watcher"] = asyncio.ensure_future(self._watcher())
 
 
     async def _watcher(self):
+        """start scheduled coroutines, waits on the queue (no polling)
+        """
         while True:
-            try:
-                # print("Running :", self._running_tasks)
-                if self._terminate: break
+            elem = await self._pending_tasks.get()
+
+            # sentinel put by `close`
+            if elem is None or self._terminate: break
+
+            if isinstance(elem, tuple):
+                coro, kwargs = elem
+                task = asyncio.ensure_future(coro, **kwargs)
+            else:
+                task = asyncio.ensure_future(elem)
+
+            self._scheduled.add(task)
+            task.add_done_callback(self._task_done)
+
+
+    def _task_done(self, task: asyncio.Future):
+        # supervision: scheduled tasks should not fail silently
+        self._scheduled.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            print(f"Scheduled task failed : {task.exception()!r}")
+
+
+    async def close(self):
+        """stop dispatching, cancel all tasks (running and scheduled), end data iterators and close the connection
+        """
+        self._terminate = True
+        self._pending_tasks.put_nowait(None)
+
+        tasks = [task for task in (*self._running_tasks.values(), *self._scheduled) if task is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._running_tasks.clear()
 
-                elem = self._pending_tasks.popleft()
-                if inspect.iscoroutine(elem):
-                    task = asyncio.ensure_future(elem)
-                if isinstance(elem, tuple):
-                    coro, kwargs = elem
-                    task = asyncio.ensure_future(coro, **kwargs)
+        for waiters in self._sub_waiters.values():
+            for fut in waiters:
+                if not fut.done():
+                    fut.cancel()
+        self._sub_waiters.clear()
 
-            # no item in dq
-            except IndexError:
-                await asyncio.sleep(0.5)
+        for queue in self._data_queues.values():
+            queue.put_nowait(_CLOSED)
+
+        if getattr(self.client, "close", None) is not None:
+            await self.client.close()
 
 
     async def _dispatch(self):
         """base function dispatching messages to the appropriate queue --- calls msg_handler
+
+        If a `connect` function was given, a dropped connection is replaced (exponential backoff)
+        and `_on_reconnect` replays subscriptions, otherwise errors are raised as is.
         """
         _retries = 0
-        _delay = 1
+        _delay = self._backoff
 
-        while _retries < 10:
+        while True:
             try:
 
                 async for msg in self.client:
 
-                    if self._terminate: break
+                    if self._terminate: return
+                    if self._recorder is not None:
+                        self._recorder.record(msg)
                     await self.msg_handler(msg, self._data_queues, self._status_queues)
                     await asyncio.sleep(0)
 
                     self._count += 1
+                    # connection is healthy again
+                    _retries = 0
+                    _delay = self._backoff
 
-            except Exception as e:
+            except asyncio.CancelledError:
                 raise
 
+            except Exception as e:
+                if self._connect is None:
+                    raise
+                print(f"Websocket connection lost : {e!r}")
+
+            # iteration also ends without error on a clean close
+            if self._terminate or self._connect is None:
+                return
+
+            disconnected_at = int(time.time() * 10**3)
+            if self._recorder is not None:
+                self._recorder.mark("disconnected")
+
+            while True:
+                if _retries >= self._max_retries:
+                    raise ConnectionError(f"Gave up reconnecting after {_retries} attempts")
+
+                await asyncio.sleep(_delay)
+                _retries += 1
+                _delay = min(_delay * 2, self._max_backoff)
+
+                try:
+                    self.client = await self._connect()
+                    if self._recorder is not None:
+                        self._recorder.mark("reconnected")
+                    break
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    print(f"Websocket reconnection failed (attempt {_retries}) : {e!r}")
+
+            await self._on_reconnect(disconnected_at)
+
+
+    async def _on_reconnect(self, disconnected_at: int):
+        """called by `_dispatch` on a new connection, before any message from it is dispatched
+
+        Args:
+            disconnected_at: time the connection was lost (ms), for backfills
+        """
+        result = await self.resubscribe()
+        if result.is_err():
+            print(f"Resubscription failed : {result.value}")
+
+        if self._on_reconnect_cb is not None:
+            await self._on_reconnect_cb(self, disconnected_at)
+
+
+    async def resubscribe(self) -> Result:
+        """replay subscriptions on the current connection, to be implemented by exchanges
+        """
+        return Ok(())
+
 
     def _ensure_dispatch(self):
         if not self._running_tasks.get("dispatch", None):
-           self._running_tasks["dispatch"] = asyncio.ensure_future(self.dispatch())
+           self._running_tasks["dispatch"] = asyncio.ensure_future(self._dispatch())
 
 
     # async def iterq(self, queue, feed) -> typing.AsyncIterable[Result[BaseModel, Exception]]:
@@ -170,20 +369,107 @@ class BaseWsApi(WsApiProto):
         while True:
             if self._terminate: break
             try:
-                yield await queue[feed].get()
+                msg = await queue[feed].get()
             except Exception as e:
                 raise e
+            if msg is _CLOSED: break
+            yield msg
 
 
     def schedule(self, coro):
-        self._pending_tasks.append(coro)
+        """run `coro` (or a (coro, kwargs) tuple for `ensure_future`) as a supervised task
+        """
+        self._pending_tasks.put_nowait(coro)
+
+
+    async def wait_subscribed(self, feed: str, pair: str, timeout: float = 5) -> bool:
+        """wait for the subscription status of (`feed`, `pair`)
+
+        Returns:
+            True if subscribed, False if the exchange refused it or the timeout expired
+        """
+        if pair in self._subd_feeds.get(feed, ()):
+            return True
+
+        fut = asyncio.get_event_loop().create_future()
+        self._sub_waiters.setdefault((feed, pair), []).append(fut)
+        try:
+            return await asyncio.wait_for(fut, timeout)
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            waiters = self._sub_waiters.get((feed, pair), [])
+            if fut in waiters:
+                waiters.remove(fut)
+
+
+    def _resolve_sub(self, feed: str, pair: str, subscribed: bool):
+        for fut in self._sub_waiters.pop((feed, pair), []):
+            if not fut.done():
+                fut.set_result(subscribed)
+
+
+    async def subscribe_acked(self, sub_model: SubModel, timeout: float = 5) -> Result[typing.Tuple[str, ...], Exception]:
+        """send `sub_model` with a new request id and wait for the exchange acknowledgement(s)
+
+        A single message can subscribe to many pairs, we wait for all of them.
+
+        Returns:
+            Ok: pairs (binance: streams) successfully subscribed, pairs refused by the exchange are left out
+            Err: `BadRequest` if all were refused, `RequestTimeout` if not all were acknowledged in time
+        """
+
+        reqid = next(self._sub_reqids)
+        msg = sub_model.msg.with_reqid(reqid)     #type: ignore
+        sub_model = sub_model.copy(update={"msg": msg})
+
+        fut = asyncio.get_event_loop().create_future()
+        request = _SubRequest(fut, msg.ack_keys())
+        self._sub_requests[reqid] = request
+
+        try:
+            sent = await subscribe(self.client, sub_model)
+            if sent.is_err():
+                return sent
+
+            try:
+                await asyncio.wait_for(asyncio.shield(fut), timeout)
+            except asyncio.TimeoutError:
+                return Err(RequestTimeout(f"No acknowledgement after {timeout} seconds for : {sorted(request.pending)}", sent.value))
+
+            if request.errors and not request.subscribed:
+                return Err(BadRequest(f"Subscription refused : {request.errors}", sent.value))
+            return Ok(tuple(request.subscribed))
+
+        finally:
+            self._sub_requests.pop(reqid, None)
+
+
+    def _ack_sub(self, reqid: int, key: typing.Optional[str], error: typing.Optional[str] = None):
+        """acknowledgement for one pair (`key`) of request `reqid`, None `key` acknowledges all of them
+        """
+        request = self._sub_requests.get(reqid)
+        if request is None or request.future.done():
+            return
+
+        keys = [key] if key is not None else ([k for k in request.keys if k in request.pending] or [None])
+        for k in keys:
+            if error is None:
+                if k is not None:
+                    request.subscribed.append(k)
+            else:
+                request.errors[k] = error
+            request.pending.discard(k)
+
+        if not request.pending:
+            request.future.set_result(None)
 
 
     async def _watch_conn(self, queues):
-        while True:
+        while not self._terminate:
 
             async for msg in self.iterq(queues, "connection"):
-                if self._terminate: break
+                if self._terminate: return
                 if msg["status"] == "online":
                     self._connection = True
                     # print("We are now online")
@@ -191,26 +477,48 @@ class BaseWsApi(WsApiProto):
 
     async def _watch_sub(self, queues, feed_map):
 
-        while True:
+        while not self._terminate:
 
             async for msg in self.iterq(queues, "subscription"):
 
-                if self._terminate: break
+                if self._terminate: return
 
-                feed = msg["subscription"]["name"]
-                pair = msg["pair"]
+                # binance acknowledges a whole message: {"result": null, "id": 1} or {"error": {...}, "id": 1}
+                if "id" in msg and ("result" in msg or "error" in msg):
+                    error = msg.get("error")
+                    self._ack_sub(msg["id"], None, None if error is None else str(error))
+                    continue
+
+                feed = msg.get("subscription", {}).get("name")
+                # private feeds have no pair
+                pair = msg.get("pair")
+                reqid = msg.get("reqid")
 
                 # TODO parse subscription message (this is specific to kraken)
                 if msg["status"] == "subscribed":
                     # TODO will also need to add parameters (for ex depth for book)
-                    self._subd_feeds[feed_map[feed]].add(pair)
+                    subd = self._subd_feeds[feed_map[feed]]
+                    if isinstance(subd, set):
+                        subd.add(pair)
+                    else:
+                        self._subd_feeds[feed_map[feed]] = True
+                    self._resolve_sub(feed_map[feed], pair, True)
+                    if reqid is not None:
+                        self._ack_sub(reqid, pair)
                     print("We are now successfully subscribed to :", feed, pair)
 
                 elif msg["status"] == "unsubscribed":
-                    self._subd_feeds[feed_map[feed]].remove(pair)
+                    subd = self._subd_feeds[feed_map[feed]]
+                    if isinstance(subd, set):
+                        subd.discard(pair)
+                    else:
+                        self._subd_feeds[feed_map[feed]] = False
                 
                 elif msg["status"] == "error":
-                    print(f"Suscription failed for feed <{feed}>\n", f"Error message : {msg['errorMessage']}")
+                    self._resolve_sub(feed_map.get(feed, feed), pair, False)
+                    if reqid is not None:
+                        self._ack_sub(reqid, pair, msg.get("errorMessage", "error"))
+                    print(f"Suscription failed for feed <{feed}>\n", f"Error message : {msg.get('errorMessage')}")
 
 
 # ? ============================================================
@@ -249,7 +557,6 @@ class BaseWsPublic(BaseWsApi):
         "error": set()
     }
 
-    _pending_tasks: typing.Deque = deque()
     _running_tasks: typing.Dict = dict()
 
     _count: int = 0
@@ -275,11 +582,14 @@ class BaseWsPublic(BaseWsApi):
                 typing.Coroutine[typing.Any, typing.Any, None]
             ],
             loop: asyncio.BaseEventLoop,
-            feed_map: dict
+            feed_map: dict,
+            **kwargs
         ):
 
-        super().__init__(client, msg_handler, loop)
+        # kwargs: reconnection options, see `BaseWsApi`
+        super().__init__(client, msg_handler, loop, **kwargs)
         self.feed_map = feed_map
+        self._full_books = dict()
         self._running_tasks["subscription"] = asyncio.ensure_future(self.subscription())
         self._running_tasks["connection"] = asyncio.ensure_future(self.connection())
 
@@ -304,6 +614,111 @@ class BaseWsPublic(BaseWsApi):
         await super()._watch_conn(self._status_queues)
 
 
+    #========================================
+    # BULK SUBSCRIPTION
+
+
+    # max number of pairs per subscription message
+    _sub_batch_size: int = 100
+    # min seconds between two subscription messages
+    _sub_interval: float = 0
+
+
+    async def subscribe_many(
+            self,
+            symbols_resp: NoobitResponseSymbols,
+            feed: str,
+            symbols: typing.Iterable[ntypes.SYMBOL],
+            *,
+            per_symbol: bool = False,
+            **params
+        ) -> Result[typing.Union[typing.AsyncIterable, typing.Dict[ntypes.SYMBOL, typing.AsyncIterable]], Exception]:
+        """subscribe to `feed` for all `symbols`, in as few messages as the exchange allows
+
+        Args:
+            feed: "trade", "spread", "orderbook", "ohlc" (depending on exchange)
+            per_symbol: one stream per symbol instead of a single merged stream
+            params: feed parameters (e.g depth for orderbook, timeframe for ohlc)
+
+        Returns:
+            merged stream, or symbol => stream for subscribed symbols only
+            (symbols refused by the exchange are left out)
+
+        Usage:
+            streams = await ws.subscribe_many(symbols_resp, "trade", ["XBT-USD", "ETH-USD"], per_symbol=True)
+            async for msg in streams.value["XBT-USD"]:
+                ...
+        """
+
+        self._ensure_dispatch()
+
+        symbols = tuple(symbols)
+        batches = [symbols[i:i+self._sub_batch_size] for i in range(0, len(symbols), self._sub_batch_size)]
+
+        sub_models = []
+        for batch in batches:
+            valid_sub_model = self._validate_sub_many(symbols_resp, feed, batch, **params)
+            if valid_sub_model.is_err():
+                return valid_sub_model
+            sub_models.append(valid_sub_model.value)
+
+        limiter = RateLimiter(max_concurrent=max(len(batches), 1), interval=self._sub_interval)
+
+        async def _send(batch, sub_model):
+            async with limiter:
+                return await self._subscribe_batch(symbols_resp, feed, batch, sub_model, **params)
+
+        results = await asyncio.gather(*[_send(batch, sub_model) for batch, sub_model in zip(batches, sub_models)])
+
+        acked = {key for result in results if result.is_ok() for key in result.value}
+        subscribed = tuple(s for s in symbols if self._ack_key(symbols_resp, feed, s) in acked)
+        if symbols and not subscribed:
+            return next((result for result in results if result.is_err()), Err(BadRequest("No symbol subscribed", str(symbols))))
+
+        stream = self._feed_stream(symbols_resp, feed, subscribed)
+        if not per_symbol:
+            return Ok(stream)
+        return Ok(self._demux(stream, subscribed))
+
+
+    # exchange specific, see subclasses
+
+
+    def _validate_sub_many(self, symbols_resp: NoobitResponseSymbols, feed: str, symbols: typing.Tuple[ntypes.SYMBOL, ...], **params) -> Result[SubModel, Exception]:
+        raise NotImplementedError
+
+
+    def _ack_key(self, symbols_resp: NoobitResponseSymbols, feed: str, symbol: ntypes.SYMBOL) -> str:
+        """key under which the exchange acknowledges `symbol` (e.g kraken ws pair, binance stream)
+        """
+        raise NotImplementedError
+
+
+    async def _subscribe_batch(self, symbols_resp: NoobitResponseSymbols, feed: str, symbols: typing.Tuple[ntypes.SYMBOL, ...], sub_model: SubModel, **params) -> Result[typing.Tuple[str, ...], Exception]:
+        return await self.subscribe_acked(sub_model, self.sub_timeout)
+
+
+    def _feed_stream(self, symbols_resp: NoobitResponseSymbols, feed: str, symbols: typing.Tuple[ntypes.SYMBOL, ...]) -> typing.AsyncIterable:
+        """merged stream of messages for `symbols`
+        """
+        return self.iterq(self._data_queues, feed)
+
+
+    def _demux(self, stream: typing.AsyncIterable, symbols: typing.Tuple[ntypes.SYMBOL, ...]) -> typing.Dict[ntypes.SYMBOL, typing.AsyncIterable]:
+        queues = {symbol: asyncio.Queue() for symbol in symbols}
+
+        async def _route():
+            async for msg in stream:
+                symbol = _msg_symbol(msg)
+                # errors (and messages we cant attribute) go to every stream
+                targets = [queues[symbol]] if symbol in queues else queues.values()
+                for queue in targets:
+                    queue.put_nowait(msg)
+
+        self.schedule(_route())
+        return {symbol: self.iterq(queues, symbol) for symbol in symbols}
+
+
     # mostly needed for mypy (so it knows the type of `msg`)
     async def aiter_book(self) -> typing.AsyncIterable[Result[NoobitResponseOrderBook, pydantic.ValidationError]]:
         async for msg in self.iterq(self._data_queues, "orderbook"):
@@ -351,7 +766,9 @@ class BaseWsPrivate(BaseWsApi):
     _status_queues: _t_qdict = {
         "connection": asyncio.Queue(), 
         "subscription": asyncio.Queue(),
-        "heartbeat": asyncio.Queue()
+        "heartbeat": asyncio.Queue(),
+        # acks for orders sent over websocket
+        "order_status": asyncio.Queue()
     }
 
     _subd_feeds: typing.Dict[str, bool] = {
@@ -361,7 +778,6 @@ class BaseWsPrivate(BaseWsApi):
         "user_cancel": False
     }
 
-    _pending_tasks: typing.Deque = deque()
     _running_tasks: typing.Dict = dict()
 
     _count: int = 0
@@ -380,10 +796,12 @@ class BaseWsPrivate(BaseWsApi):
             ],
             loop: asyncio.BaseEventLoop,
             auth_token: str,
-            feed_map: dict
+            feed_map: dict,
+            **kwargs
         ):
 
-        super().__init__(client, msg_handler, loop)
+        # kwargs: reconnection options, see `BaseWsApi`
+        super().__init__(client, msg_handler, loop, **kwargs)
         self.auth_token = auth_token
         self.feed_map = feed_map
         self._running_tasks["subscription"] = asyncio.ensure_future(self.subscription())
@@ -10,6 +10,7 @@ from noobit_markets.base.models.rest.response import NOrderBook
 # noobit binance
 from noobit_markets.exchanges.binance.rest.public.symbols import get_symbols_binance
 from noobit_markets.exchanges.binance.websockets.public.api import BinanceWsPublic
+from noobit_markets.exchanges.binance.websockets.public.routing import msg_handler
 
 
 feed_map = {
@@ -24,7 +25,7 @@ async def main(loop):
     
     async with websockets.connect("wss://stream.binance.com:9443/ws") as client:
 
-        bws = BinanceWsPublic(client, None, loop, feed_map)
+        bws = BinanceWsPublic(client, msg_handler, loop, feed_map)
         symbol = ntypes.PSymbol("XBT-USDT")
 
         async def coro1():
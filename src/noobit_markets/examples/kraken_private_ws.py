@@ -4,8 +4,8 @@ import asyncio
 import httpx
 
 
-from noobit_markets.exchanges.kraken.rest.private.ws_auth import get_wstoken_kraken
 from noobit_markets.exchanges.kraken.websockets.private.api import KrakenWsPrivate
+from noobit_markets.exchanges.kraken.websockets.private.token import KrakenWsTokenManager
 from noobit_markets.exchanges.kraken.websockets.private.routing import msg_handler
 
 # TODO should be a TypedDict, the keys all map to queues with same names (==> enforce key names)
@@ -19,15 +19,15 @@ feed_map = {
 
 async def main(loop):
 
-    async with websockets.connect("wss://ws-auth.kraken.com") as w_client:
-        async with httpx.AsyncClient() as h_client:
-            result = await get_wstoken_kraken(h_client)
-            if result.is_ok():
-                token = result.value.token
-            else:
-                raise ValueError(result)
+    async with websockets.connect("wss://ws-auth.kraken.com") as w_client, httpx.AsyncClient() as h_client:
+        tokens = KrakenWsTokenManager(h_client)
+        result = await tokens.prefetch()
+        if result.is_err():
+            raise ValueError(result)
+        # always have a valid token at hand for reconnects (see `KrakenWsPrivate.resubscribe`)
+        asyncio.ensure_future(tokens.keep_fresh())
 
-        kwp = KrakenWsPrivate(w_client, msg_handler, loop, token, feed_map)
+        kwp = KrakenWsPrivate(w_client, msg_handler, loop, None, feed_map, token_manager=tokens)
 
         async def coro1():
             print("launching user trades coro")
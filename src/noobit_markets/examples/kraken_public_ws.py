@@ -7,7 +7,7 @@ import httpx
 from noobit_markets.base import ntypes
 
 from noobit_markets.exchanges.kraken.websockets.public.api import KrakenWsPublic
-from noobit_markets.exchanges.kraken.websockets.public.routing import msg_handler
+from noobit_markets.exchanges.kraken.websockets.public.routing import KrakenMsgRouter
 
 from noobit_markets.exchanges.kraken.rest.public.symbols import get_symbols_kraken
 
@@ -36,7 +36,8 @@ async def main(loop):
 
     async with websockets.connect("wss://ws.kraken.com") as client:
 
-        kws = KrakenWsPublic(client, msg_handler, loop, feed_map)
+        # reconnects with backoff and replays subscriptions if the connection drops
+        kws = KrakenWsPublic(client, KrakenMsgRouter(), loop, feed_map, connect=lambda: websockets.connect("wss://ws.kraken.com"))
         symbol = ntypes.PSymbol("XBT-USD")
 
         async def coro1():
@@ -0,0 +1,9 @@
+from noobit_markets.base.lazy import lazy_exports
+
+
+# `from noobit_markets.exchanges import BINANCE` only imports the binance interface
+__getattr__, __dir__, __all__ = lazy_exports(__name__, {
+    "kraken.interface": ("KRAKEN",),
+    "binance.interface": ("BINANCE",),
+    "ftx.interface": ("FTX",),
+})
@@ -59,6 +59,9 @@ BINANCE_ENDPOINTS = endpoints.RESTEndpoints(**{
             # https://github.com/binance-exchange/binance-official-api-docs/blob/master/rest-api.md#cancel-order-trade
             "remove_order": "api/v3/order", #DELETE
 
+            # https://github.com/binance-exchange/binance-official-api-docs/blob/master/rest-api.md#cancel-all-open-orders-on-a-symbol-trade
+            "cancel_all": "api/v3/openOrders", #DELETE #requires symbol
+
             # https://github.com/binance-exchange/binance-official-api-docs/blob/master/rest-api.md#start-user-data-stream-user_stream
             "ws_token": "api/v3/userDataStream" #for SPOT wallet
         }
@@ -1,51 +1,42 @@
-from noobit_markets.base.models.interface import ExchangeInterface
+from noobit_markets.base.lazy import LazyNamespace
 
-# private endpoints
 
+# endpoints are imported on first access (e.g `BINANCE.rest.public.ohlc`), and then cached
+# full validation: `ExchangeInterface(**BINANCE.resolve())`
 
-# public endpoints
-from noobit_markets.exchanges.binance.rest.public.ohlc import get_ohlc_binance
-from noobit_markets.exchanges.binance.rest.public.orderbook import get_orderbook_binance
-from noobit_markets.exchanges.binance.rest.public.trades import get_trades_binance
-from noobit_markets.exchanges.binance.rest.public.instrument import get_instrument_binance
-from noobit_markets.exchanges.binance.rest.public.symbols import get_symbols_binance
+_PUBLIC = "noobit_markets.exchanges.binance.rest.public"
+_PRIVATE = "noobit_markets.exchanges.binance.rest.private"
+_WS = "noobit_markets.exchanges.binance.websockets"
 
-# private endpoints
-from noobit_markets.exchanges.binance.rest.private.balances import get_balances_binance
-from noobit_markets.exchanges.binance.rest.private.exposure import get_exposure_binance
-from noobit_markets.exchanges.binance.rest.private.trades import get_usertrades_binance
-from noobit_markets.exchanges.binance.rest.private.orders import get_closedorders_binance, get_openorders_binance
-from noobit_markets.exchanges.binance.rest.private.trading import post_neworder_binance
-from noobit_markets.exchanges.binance.rest.private.cancel_open import cancel_openorder_binance
 
-# ws
-from noobit_markets.exchanges.binance.websockets.public.api import BinanceWsPublic
 
-
-
-BINANCE = ExchangeInterface(**{
+BINANCE = LazyNamespace("BINANCE", **{
     "rest": {
         "public": {
-            "ohlc": get_ohlc_binance,
-            "orderbook": get_orderbook_binance, 
-            "symbols": get_symbols_binance, 
-            "trades": get_trades_binance, 
-            "instrument": get_instrument_binance, 
-            "spread": get_instrument_binance, 
+            "ohlc": f"{_PUBLIC}.ohlc:get_ohlc_binance",
+            "orderbook": f"{_PUBLIC}.orderbook:get_orderbook_binance",
+            "symbols": f"{_PUBLIC}.symbols:get_symbols_binance",
+            "trades": f"{_PUBLIC}.trades:get_trades_binance",
+            "instrument": f"{_PUBLIC}.instrument:get_instrument_binance",
+            "spread": f"{_PUBLIC}.instrument:get_instrument_binance",
         },
         "private": {
-            "balances": get_balances_binance, 
-            "exposure": get_exposure_binance, 
-            "trades": get_usertrades_binance, 
-            "open_positions": get_closedorders_binance, 
-            "open_orders": get_openorders_binance, 
-            "closed_orders": get_closedorders_binance, 
-            "new_order": post_neworder_binance,
-            "remove_order": cancel_openorder_binance
+            "balances": f"{_PRIVATE}.balances:get_balances_binance",
+            "exposure": f"{_PRIVATE}.exposure:get_exposure_binance",
+            "trades": f"{_PRIVATE}.trades:get_usertrades_binance",
+            "open_positions": f"{_PRIVATE}.orders:get_closedorders_binance",
+            "open_orders": f"{_PRIVATE}.orders:get_openorders_binance",
+            "closed_orders": f"{_PRIVATE}.orders:get_closedorders_binance",
+            "new_order": f"{_PRIVATE}.trading:post_neworder_binance",
+            "templated_order": f"{_PRIVATE}.trading:post_templated_order_binance",
+            "remove_order": f"{_PRIVATE}.cancel_open:cancel_openorder_binance",
+            "cancel_all": f"{_PRIVATE}.cancel_open:cancel_all_binance",
+            "batch_new_orders": f"{_PRIVATE}.trading:post_neworders_binance",
+            "batch_cancel": f"{_PRIVATE}.cancel_open:cancel_openorders_binance",
         },
     },
     "ws":{
-        "public": BinanceWsPublic,
-        "private": None 
+        "public": f"{_WS}.public.api:BinanceWsPublic",
+        "private": None
     }
-})
\ No newline at end of file
+})
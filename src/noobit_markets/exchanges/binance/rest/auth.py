@@ -1,14 +1,11 @@
 import urllib
 import hashlib
-import hmac
 import typing
 
 import pydantic
-from dotenv import load_dotenv
-load_dotenv()
 
 from noobit_markets.base.request import *
-from noobit_markets.base.auth import make_base
+from noobit_markets.base.auth import make_base, hmac_signer
 from noobit_markets.base.models.frozenbase import FrozenBaseModel
 
 
@@ -58,22 +55,36 @@ class BinanceAuth(BinanceBase):
         Returns
             request dict containing signature key/value pair
         """
-        sorted_req_args = sorted([(k, v) for k, v in request_args.items()], reverse=True)
-        postdata = urllib.parse.urlencode(sorted_req_args)
-
-        signature = hmac.new(
-            self.secret.encode(),
-            postdata.encode(),
-            hashlib.sha256
-        )
+        _query, signature = self._query_signature(request_args)
 
         # dict isntead of pmap since pmap doesnt support assignment
-        request_args["signature"] = signature.hexdigest()
+        request_args["signature"] = signature
+
+        return request_args
+
+
+    def _signed_query(self, request_args: typing.Mapping) -> str:
+        """Sign request data and return the full query string (signature last)
+        Args:
+            request_args: all query params
+        Returns
+            query string to append to the url, same params and order as the signed payload
+        """
+        query, signature = self._query_signature(request_args)
+        return f"{query}&signature={signature}"
+
+
+    def _query_signature(self, request_args: typing.Mapping) -> typing.Tuple[str, str]:
+        # canonical query string, built once for both the signature and the url
+        query = urllib.parse.urlencode(sorted(request_args.items(), reverse=True))
+
+        signature = hmac_signer(self.secret, hashlib.sha256)
+        signature.update(query.encode())
 
         # binance calls header and sign only later (2 steps) so we rotate here and not in header
         self.rotate_keys()
 
-        return request_args
+        return query, signature.hexdigest()
 
 
         # DOCS:
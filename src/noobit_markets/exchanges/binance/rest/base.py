@@ -4,9 +4,6 @@ import typing
 import httpx
 import pyrsistent
 
-import stackprinter     #type: ignore
-stackprinter.set_excepthook(style="darkbg2")
-
 # base
 from noobit_markets.base.response import (
     resp_json,
@@ -15,9 +15,11 @@ from noobit_markets.base.request import (
 
 # Base
 from noobit_markets.base import ntypes
+from noobit_markets.base.symbols import symbols_index
+from noobit_markets.base.batch import RateLimiter, batch_cancel
 from noobit_markets.base.models.result import Ok, Result
-from noobit_markets.base.models.rest.response import NoobitResponseItemOrder, NoobitResponseSymbols, T_OrderParsedItem
-from noobit_markets.base.models.rest.request import NoobitRequestCancelOpenOrder
+from noobit_markets.base.models.rest.response import NoobitResponseItemOrder, NoobitResponseSymbols, NoobitResponseCancelAll, T_OrderParsedItem
+from noobit_markets.base.models.rest.request import NoobitRequestCancelOpenOrder, NoobitRequestOpenOrders
 from noobit_markets.base.models.frozenbase import FrozenBaseModel
 
 
@@ -30,6 +32,8 @@ from noobit_markets.exchanges.binance.types import *
 
 __all__ = (
     "cancel_openorder_binance",
+    "cancel_openorders_binance",
+    "cancel_all_binance",
 )
 
 
@@ -54,6 +58,10 @@ class BinanceRequestCancelOpenOrder(BinancePrivateRequest):
         return v
 
 
+class BinanceRequestCancelAll(BinancePrivateRequest):
+    symbol: str
+
+
 class _ParsedReq(TypedDict):
     symbol: typing.Any
     orderId: typing.Any
@@ -102,6 +110,18 @@ def parse_request(
 # }
 
 
+# response of `DELETE api/v3/openOrders` is a list of cancelled orders (same as above)
+# or of cancelled OCO order lists, we only keep the orderIds
+
+class _CancelledItem(FrozenBaseModel):
+    orderId: typing.Optional[pydantic.PositiveInt]
+    orders: typing.Optional[typing.Tuple[typing.Mapping[str, typing.Any], ...]]
+
+
+class BinanceResponseCancelAll(FrozenBaseModel):
+    cancelled: typing.Tuple[_CancelledItem, ...]
+
+
 class BinanceResponseCancelOpenOrder(FrozenBaseModel):
 
     symbol: str
@@ -209,7 +229,7 @@ async def cancel_openorder_binance(
     ) -> Result[NoobitResponseItemOrder, ValidationError]:
 
 
-    symbol_to_exchange = lambda x: {k: v.exchange_pair for k, v in symbols_resp.asset_pairs.items()}[x]
+    symbol_to_exchange = lambda x: symbols_index(symbols_resp).symbol_to_exchange(x)
     symbol_from_exchange = lambda x: {f"{v.noobit_base}{v.noobit_quote}": k for k, v in symbols_resp.asset_pairs.items()}[x]
 
     req_url = urljoin(base_url, endpoint)
@@ -255,4 +275,96 @@ async def cancel_openorder_binance(
         return valid_result_content
 
     parsed_result = parse_result(valid_result_content.value, symbol_from_exchange)
-    return Ok(parsed_result)
\ No newline at end of file
+    return Ok(parsed_result)
+
+
+async def cancel_openorders_binance(
+        client: ntypes.CLIENT,
+        symbols_resp: NoobitResponseSymbols,
+        orders: typing.Sequence[typing.Tuple[ntypes.SYMBOL, str]],
+        # prevent unintentional passing of following args
+        *,
+        limiter: typing.Optional[RateLimiter] = None,
+        logger: typing.Optional[typing.Callable] = None,
+        auth=BinanceAuth(),
+        base_url: pydantic.AnyHttpUrl = endpoints.BINANCE_ENDPOINTS.private.url,
+        endpoint: str = endpoints.BINANCE_ENDPOINTS.private.endpoints.remove_order
+    ) -> typing.Tuple[Result[NoobitResponseItemOrder, Exception], ...]:
+    """cancel (symbol, orderID) `orders` concurrently, one `Result` per order
+    """
+
+    return await batch_cancel(
+        cancel_openorder_binance, client, symbols_resp, orders,
+        limiter=limiter, logger=logger, auth=auth, base_url=base_url, endpoint=endpoint
+    )
+
+
+async def cancel_all_binance(
+        client: ntypes.CLIENT,
+        symbol: typing.Optional[ntypes.SYMBOL],
+        symbols_resp: NoobitResponseSymbols,
+        # prevent unintentional passing of following args
+        *,
+        limiter: typing.Optional[RateLimiter] = None,
+        logger: typing.Optional[typing.Callable] = None,
+        auth=BinanceAuth(),
+        base_url: pydantic.AnyHttpUrl = endpoints.BINANCE_ENDPOINTS.private.url,
+        endpoint: str = endpoints.BINANCE_ENDPOINTS.private.endpoints.cancel_all
+    ) -> Result[NoobitResponseCancelAll, Exception]:
+    """cancel all open orders for `symbol` in a single call (binance requires a symbol)
+    """
+
+    symbol_to_exchange = lambda x: symbols_index(symbols_resp).symbol_to_exchange(x)
+
+    req_url = urljoin(base_url, endpoint)
+    method = "DELETE"
+    headers: typing.Dict = auth.headers()
+
+    valid_noobit_req = _validate_data(
+        NoobitRequestOpenOrders,
+        pmap({"symbol": symbol, "symbols_resp": symbols_resp})
+    )
+    if valid_noobit_req.is_err():
+        return valid_noobit_req
+
+    parsed_req = {
+        "symbol": symbol_to_exchange(valid_noobit_req.value.symbol),
+        "timestamp": auth.nonce
+    }
+    signed_req = auth._sign(parsed_req)
+
+    valid_binance_req = _validate_data(BinanceRequestCancelAll, pmap(signed_req))
+    if valid_binance_req.is_err():
+        return valid_binance_req
+
+    if logger:
+        logger(f"Cancel All - Parsed Request : {valid_binance_req.value}")
+
+    result_content = await get_result_content_from_req(client, method, req_url, valid_binance_req.value, headers)
+    if result_content.is_err():
+        return result_content
+
+    if logger:
+        logger(f"Cancel All - Result Content : {result_content.value}")
+
+    valid_result_content = _validate_data(BinanceResponseCancelAll, pmap({"cancelled": result_content.value}))
+    if valid_result_content.is_err():
+        return valid_result_content
+
+    orderIDs = []
+    for item in valid_result_content.value.cancelled:
+        if item.orderId is not None:
+            orderIDs.append(str(item.orderId))
+        # OCO order list
+        for order in item.orders or ():
+            orderIDs.append(str(order["orderId"]))
+
+    return _validate_data(
+        NoobitResponseCancelAll,
+        pmap({
+            "count": len(orderIDs),
+            "orderIDs": tuple(orderIDs),
+            "rawJson": result_content.value,
+            "exchange": "BINANCE",
+        })
+    )
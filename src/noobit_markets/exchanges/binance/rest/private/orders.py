@@ -14,6 +14,7 @@ from noobit_markets.base.request import (
 
 # Base
 from noobit_markets.base import ntypes
+from noobit_markets.base.symbols import symbols_index
 from noobit_markets.base.models.result import Ok, Result
 from noobit_markets.base.models.rest.response import NoobitResponseClosedOrders,NoobitResponseOpenOrders, NoobitResponseSymbols, T_OrderParsedRes, T_OrderParsedItem
 from noobit_markets.base.models.rest.request import NoobitRequestClosedOrders
@@ -211,7 +212,7 @@ async def _get_all_orders(
     ) -> Result[_AllOrders, ValidationError]:
 
 
-    symbol_to_exchange = lambda x: {k: v.exchange_pair for k, v in symbols_resp.asset_pairs.items()}[x]
+    symbol_to_exchange = lambda x: symbols_index(symbols_resp).symbol_to_exchange(x)
     symbol_from_exchange = lambda x: {f"{v.noobit_base}{v.noobit_quote}": k for k, v in symbols_resp.asset_pairs.items()}[x]
 
     req_url = urljoin(base_url, endpoint)
@@ -14,6 +14,7 @@ from noobit_markets.base.request import (
 
 # Base
 from noobit_markets.base import ntypes
+from noobit_markets.base.symbols import symbols_index
 from noobit_markets.base.models.result import Err, Result
 from noobit_markets.base.models.rest.response import NoobitResponseSymbols, NoobitResponseTrades, T_PrivateTradesParsedRes, T_PrivateTradesParsedItem
 from noobit_markets.base.models.rest.request import NoobitRequestTrades
@@ -168,8 +169,8 @@ async def get_usertrades_binance(
         endpoint: str = endpoints.BINANCE_ENDPOINTS.private.endpoints.trades_history
     ) -> Result[NoobitResponseTrades, ValidationError]:
 
-    symbol_to_exchange = lambda x: {k: v.exchange_pair for k, v in symbols_resp.asset_pairs.items()}[x]
-    symbol_from_exchange= lambda x: {v.exchange_pair: k for k, v in symbols_resp.asset_pairs.items()}[x]
+    symbol_to_exchange = lambda x: symbols_index(symbols_resp).symbol_to_exchange(x)
+    symbol_from_exchange= lambda x: symbols_index(symbols_resp).symbol_from_exchange(x)
 
     req_url = urljoin(base_url, endpoint)
     method = "GET"
@@ -1,7 +1,7 @@
 from decimal import Decimal
 import typing
 from typing import Any
-from urllib.parse import urljoin, urlencode
+from urllib.parse import urljoin
 
 import pydantic
 from pydantic.error_wrappers import ValidationError
@@ -15,6 +15,9 @@ from noobit_markets.base.request import (
 
 # Base
 from noobit_markets.base import ntypes
+from noobit_markets.base.symbols import symbols_index
+from noobit_markets.base.batch import RateLimiter, batch_new_orders
+from noobit_markets.base.templates import OrderTemplate
 from noobit_markets.base.models.result import Result
 from noobit_markets.base.models.rest.response import NoobitResponseItemOrder, NoobitResponseSymbols, T_OrderParsedItem
 from noobit_markets.base.models.rest.request import NoobitRequestAddOrder
@@ -28,7 +31,9 @@ from noobit_markets.exchanges.binance.types import *
 
 
 __all__ = (
-    "post_neworder_binance"
+    "post_neworder_binance",
+    "post_neworders_binance",
+    "post_templated_order_binance",
 )
 
 
@@ -253,11 +258,9 @@ async def post_neworder_binance(
     ) -> Result[NoobitResponseItemOrder, ValidationError]:
 
     
-    symbol_to_exchange= lambda x: {k: v.exchange_pair for k, v in symbols_resp.asset_pairs.items()}[x]
+    symbol_to_exchange= lambda x: symbols_index(symbols_resp).symbol_to_exchange(x)
     
     req_url = urljoin(base_url, endpoint)
-    method = "POST"
-    headers: typing.Dict = auth.headers()
 
     valid_noobit_req = _validate_data(NoobitRequestAddOrder, pmap({
         "exchange": "BINANCE",
@@ -285,21 +288,74 @@ async def post_neworder_binance(
     valid_binance_req = _validate_data(BinanceRequestNewOrder, pmap({**parsed_req}))
     if valid_binance_req.is_err():
         return valid_binance_req
-    
+
+    return await _send_neworder(
+        client, valid_noobit_req.value, valid_binance_req.value,
+        logger=logger, auth=auth, req_url=req_url
+    )
+
+
+# binance request fields that change between two orders of the same template
+_TEMPLATE_VARYING = ("quantity", "price", "newClientOrderId", "stopPrice", "timestamp")
+
+
+async def post_templated_order_binance(
+        client: ntypes.CLIENT,
+        template: OrderTemplate,
+        price: typing.Optional[Decimal] = None,
+        orderQty: typing.Optional[Decimal] = None,
+        clOrdID: typing.Optional[str] = None,
+        stopPrice: typing.Optional[Decimal] = None,
+        # prevent unintentional passing of following args
+        *,
+        logger: typing.Optional[typing.Callable] = None,
+        auth=BinanceAuth(),
+        base_url: pydantic.AnyHttpUrl = endpoints.BINANCE_ENDPOINTS.private.url,
+        endpoint: str = endpoints.BINANCE_ENDPOINTS.private.endpoints.new_order,
+    ) -> Result[NoobitResponseItemOrder, ValidationError]:
+    """same as `post_neworder_binance`, but only price, orderQty, clOrdID and stopPrice are validated
+    (see `noobit_markets.base.templates`)
+    """
+
+    req_url = urljoin(base_url, endpoint)
+
+    valid_noobit_req = template.fill(price=price, orderQty=orderQty, clOrdID=clOrdID, stopPrice=stopPrice)
+    if valid_noobit_req.is_err():
+        return valid_noobit_req
+
+    parsed_req = parse_request(valid_noobit_req.value, template.symbol_to_exchange)
+    parsed_req["timestamp"] = auth.nonce
+
+    valid_binance_req = template.exchange_request(BinanceRequestNewOrder, parsed_req, _TEMPLATE_VARYING)
+    if valid_binance_req.is_err():
+        return valid_binance_req
+
+    return await _send_neworder(
+        client, valid_noobit_req.value, valid_binance_req.value,
+        logger=logger, auth=auth, req_url=req_url
+    )
+
+
+async def _send_neworder(
+        client: ntypes.CLIENT,
+        valid_noobit_req: NoobitRequestAddOrder,
+        valid_binance_req: BinanceRequestNewOrder,
+        *,
+        logger: typing.Optional[typing.Callable],
+        auth: BinanceAuth,
+        req_url: str,
+    ) -> Result[NoobitResponseItemOrder, ValidationError]:
+
+    method = "POST"
+    headers: typing.Dict = auth.headers()
+
     if logger:
-        logger(f"New Order - Parsed Request : {valid_binance_req.value}")
+        logger(f"New Order - Parsed Request : {valid_binance_req}")
 
     #! sign after validation, otherwise we aill get all the non values too
-    signed_req: dict = auth._sign(valid_binance_req.value.dict(exclude_none=True))
-
     #! we should not pass in "params" to the client, but construct the whole url + query string ourself, so we can make sure its sorted properly
-
-    #! ====>
-    qstrings = sorted([(k, v) for k, v in signed_req.items() if not "signature" in k], reverse=True)
-    qstrings_join = urlencode(qstrings)
-    full_url = "?".join([req_url, qstrings_join])
-    full_url += f"&signature={signed_req['signature']}"
-    #! <=====
+    # query string is built once, and is exactly the signed payload
+    full_url = "?".join([req_url, auth._signed_query(valid_binance_req.dict(exclude_none=True))])
 
     result_content = await get_result_content_from_req(client, method, full_url, FrozenBaseModel(), headers)
     if result_content.is_err():
@@ -312,7 +368,30 @@ async def post_neworder_binance(
     if valid_result_content.is_err():
         return valid_result_content
 
-    parsed_result = parse_result(valid_result_content.value, symbol)
+    parsed_result = parse_result(valid_result_content.value, valid_noobit_req.symbol)
 
     valid_parsed_response_data = _validate_data(NoobitResponseItemOrder, pmap({**parsed_result, "rawJson": result_content.value, "exchange": "BINANCE"}))
     return valid_parsed_response_data
+
+
+async def post_neworders_binance(
+        client: ntypes.CLIENT,
+        symbols_resp: NoobitResponseSymbols,
+        orders: typing.Sequence[typing.Mapping[str, typing.Any]],
+        # prevent unintentional passing of following args
+        *,
+        limiter: typing.Optional[RateLimiter] = None,
+        logger: typing.Optional[typing.Callable] = None,
+        auth=BinanceAuth(),
+        base_url: pydantic.AnyHttpUrl = endpoints.BINANCE_ENDPOINTS.private.url,
+        endpoint: str = endpoints.BINANCE_ENDPOINTS.private.endpoints.new_order,
+    ) -> typing.Tuple[Result[NoobitResponseItemOrder, Exception], ...]:
+    """place `orders` (keyword arguments of `post_neworder_binance`) concurrently, one `Result` per order
+
+    Binance spot has no batch order endpoint, each order is a separate call under `limiter`.
+    """
+
+    return await batch_new_orders(
+        post_neworder_binance, client, symbols_resp, orders,
+        limiter=limiter, logger=logger, auth=auth, base_url=base_url, endpoint=endpoint
+    )
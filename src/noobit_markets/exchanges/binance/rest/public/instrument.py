@@ -14,6 +14,7 @@ from noobit_markets.base.request import (
 
 # Base
 from noobit_markets.base import ntypes
+from noobit_markets.base.symbols import symbols_index
 from noobit_markets.base.models.result import Err, Result
 from noobit_markets.base.models.rest.response import NoobitResponseInstrument, NoobitResponseSymbols, T_InstrumentParsedRes
 from noobit_markets.base.models.rest.request import NoobitRequestInstrument
@@ -155,7 +156,7 @@ async def get_instrument_binance(
     ) -> Result[NoobitResponseInstrument, ValidationError]:
 
 
-    symbol_to_exchange = lambda x : {k: v.exchange_pair for k, v in symbols_resp.asset_pairs.items()}[x]
+    symbol_to_exchange = lambda x: symbols_index(symbols_resp).symbol_to_exchange(x)
     
     req_url = urljoin(base_url, endpoint)
     method = "GET"
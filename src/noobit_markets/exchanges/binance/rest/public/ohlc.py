@@ -10,10 +10,12 @@ from typing_extensions import Literal, TypedDict
 from noobit_markets.base.request import (
     retry_request,
     _validate_data,
+    _avalidate_data,
 )
 
 # Base
 from noobit_markets.base import ntypes
+from noobit_markets.base.symbols import symbols_index
 from noobit_markets.base.models.result import Err, Result
 from noobit_markets.base.models.rest.response import NoobitResponseOhlc, NoobitResponseSymbols, T_OhlcParsedRes
 from noobit_markets.base.models.rest.request import NoobitRequestOhlc
@@ -170,7 +172,7 @@ async def get_ohlc_binance(
     ) -> Result[NoobitResponseOhlc, ValidationError]:
 
 
-    symbol_to_exchange = lambda x : {k: v.exchange_pair for k, v in symbols_resp.asset_pairs.items()}[x]
+    symbol_to_exchange = lambda x: symbols_index(symbols_resp).symbol_to_exchange(x)
     
     req_url = urljoin(base_url, endpoint)
     method = "GET"
@@ -199,11 +201,11 @@ async def get_ohlc_binance(
     if logger:
         logger(f"Ohlc - Result Content : {result_content.value}")
 
-    valid_result_content = _validate_data(BinanceResponseOhlc, pmap({"ohlc": result_content.value}))
+    valid_result_content = await _avalidate_data(BinanceResponseOhlc, pmap({"ohlc": result_content.value}))
     if valid_result_content.is_err():
         return valid_result_content
 
     parsed_result_ohlc = parse_result(valid_result_content.value, symbol)
 
-    valid_parsed_response_data = _validate_data(NoobitResponseOhlc, pmap({"ohlc": parsed_result_ohlc, "rawJson" :result_content.value, "exchange": "BINANCE"}))
+    valid_parsed_response_data = await _avalidate_data(NoobitResponseOhlc, pmap({"ohlc": parsed_result_ohlc, "rawJson" :result_content.value, "exchange": "BINANCE"}))
     return valid_parsed_response_data
@@ -10,11 +10,13 @@ from typing_extensions import Literal, TypedDict
 
 from noobit_markets.base.request import (
     retry_request,
-    _validate_data
+    _validate_data,
+    _avalidate_data,
 )
 
 # Base
 from noobit_markets.base import ntypes
+from noobit_markets.base.symbols import symbols_index
 from noobit_markets.base.models.result import Result, Err
 from noobit_markets.base.models.rest.response import NoobitResponseOrderBook, NoobitResponseSymbols, T_OrderBookParsedRes
 from noobit_markets.base.models.rest.request import NoobitRequestOrderBook
@@ -128,7 +130,7 @@ async def get_orderbook_binance(
     ) -> Result[NoobitResponseOrderBook, ValidationError]:
     
     
-    symbol_to_exchange = lambda x : {k: v.exchange_pair for k, v in symbols_resp.asset_pairs.items()}[x]
+    symbol_to_exchange = lambda x: symbols_index(symbols_resp).symbol_to_exchange(x)
     
     req_url = urljoin(base_url, endpoint)
     method = "GET"
@@ -157,11 +159,11 @@ async def get_orderbook_binance(
     if logger:
         logger(f"Orderbook - Result Content : {result_content.value}")
 
-    valid_result_content = _validate_data(BinanceResponseOrderBook, result_content.value)
+    valid_result_content = await _avalidate_data(BinanceResponseOrderBook, result_content.value)
     if valid_result_content.is_err():
         return valid_result_content
 
     parsed_result_ob = parse_result(valid_result_content.value, symbol)
 
-    valid_parsed_response_data = _validate_data(NoobitResponseOrderBook, pmap({**parsed_result_ob, "rawJson" :result_content.value, "exchange": "BINANCE"}))
+    valid_parsed_response_data = await _avalidate_data(NoobitResponseOrderBook, pmap({**parsed_result_ob, "rawJson" :result_content.value, "exchange": "BINANCE"}))
     return valid_parsed_response_data
@@ -15,6 +15,7 @@ from noobit_markets.base.request import (
 
 # Base
 from noobit_markets.base import ntypes
+from noobit_markets.base.symbols import symbols_index
 from noobit_markets.base.models.result import Err, Result
 from noobit_markets.base.models.rest.response import NoobitResponseSpread, NoobitResponseSymbols, T_SpreadParsedRes
 from noobit_markets.base.models.rest.request import NoobitRequestSpread
@@ -120,7 +121,7 @@ async def get_spread_binance(
     ) -> Result[NoobitResponseSpread, ValidationError]:
 
 
-    symbol_to_exchange = lambda x : {k: v.exchange_pair for k, v in symbols_resp.asset_pairs.items()}[x]
+    symbol_to_exchange = lambda x: symbols_index(symbols_resp).symbol_to_exchange(x)
     
     req_url = urljoin(base_url, endpoint)
     method = "GET"
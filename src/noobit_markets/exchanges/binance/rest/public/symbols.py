@@ -8,6 +8,7 @@ from typing_extensions import Literal
 from noobit_markets.base.request import (
     retry_request,
     _validate_data,
+    _avalidate_data,
 )
 
 # Base
@@ -204,11 +205,11 @@ async def get_symbols_binance(
     if logger:
         logger(f"Symbols - Result Content : {result_content.value}")
 
-    valid_result_content = _validate_data(BinanceResponseSymbols, result_content.value)
+    valid_result_content = await _avalidate_data(BinanceResponseSymbols, result_content.value)
     if valid_result_content.is_err():
         return valid_result_content
 
     parsed_result = parse_result(valid_result_content.value)
 
-    valid_parsed_response_data = _validate_data(NoobitResponseSymbols, pmap({**parsed_result, "rawJson": result_content.value, "exchange": "BINANCE"}))
+    valid_parsed_response_data = await _avalidate_data(NoobitResponseSymbols, pmap({**parsed_result, "rawJson": result_content.value, "exchange": "BINANCE"}))
     return valid_parsed_response_data
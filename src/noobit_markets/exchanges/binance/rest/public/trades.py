@@ -10,10 +10,12 @@ from typing_extensions import TypedDict
 from noobit_markets.base.request import (
     retry_request,
     _validate_data,
+    _avalidate_data,
 )
 
 # Base
 from noobit_markets.base import ntypes
+from noobit_markets.base.symbols import symbols_index
 from noobit_markets.base.models.result import Result, Err
 from noobit_markets.base.models.rest.response import NoobitResponseSymbols, NoobitResponseTrades, T_PublicTradesParsedRes, T_PublicTradesParsedItem
 from noobit_markets.base.models.rest.request import NoobitRequestTrades
@@ -149,7 +151,7 @@ async def get_trades_binance(
     ) -> Result[NoobitResponseTrades, Exception]:
 
 
-    symbol_to_exchange = lambda x : {k: v.exchange_pair for k, v in symbols_resp.asset_pairs.items()}[x]
+    symbol_to_exchange = lambda x: symbols_index(symbols_resp).symbol_to_exchange(x)
     
     req_url = urljoin(base_url, endpoint)
     method = "GET"
@@ -178,11 +180,11 @@ async def get_trades_binance(
     if logger:
         logger(f"Trades - Result Content : {result_content.value}")
 
-    valid_result_content = _validate_data(BinanceResponseTrades, pmap({"trades" :result_content.value}))
+    valid_result_content = await _avalidate_data(BinanceResponseTrades, pmap({"trades" :result_content.value}))
     if valid_result_content.is_err():
         return valid_result_content
 
     parsed_result = parse_result(valid_result_content.value, symbol)
 
-    valid_parsed_response_data = _validate_data(NoobitResponseTrades, pmap({"trades": parsed_result, "rawJson": result_content.value, "exchange": "BINANCE"}))
+    valid_parsed_response_data = await _avalidate_data(NoobitResponseTrades, pmap({"trades": parsed_result, "rawJson": result_content.value, "exchange": "BINANCE"}))
     return valid_parsed_response_data
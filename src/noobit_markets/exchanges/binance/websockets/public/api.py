@@ -1,3 +1,4 @@
+import asyncio
 import typing
 import json
 from noobit_markets.exchanges.binance.websockets.public import orderbook
@@ -10,6 +11,7 @@ from noobit_markets.base import ntypes
 from noobit_markets.base.websockets import subscribe, BaseWsPublic, websockets
 from noobit_markets.base.models.result import Result, Ok, Err
 from noobit_markets.base.models.rest.response import NoobitResponseOrderBook, NoobitResponseSpread, NoobitResponseSymbols, NoobitResponseTrades
+from noobit_markets.base.models.events import TradeTick, BookDelta
 
 
 # noobit kraken ws
@@ -34,8 +36,21 @@ from noobit_markets.exchanges.binance.websockets.public import trades, orderbook
 
 # ========================================
 
+# stream name for each noobit feed
+_STREAMS = {
+    "trade": "aggTrade",
+    "orderbook": "depth20",
+}
+
+# binance allows 1024 streams per connection
+_STREAMS_PER_CONN = 200
+
+
 class BinanceWsPublic(BaseWsPublic):
 
+    # binance limits incoming messages to 5 per second
+    _sub_batch_size = 200
+    _sub_interval = 0.2
 
     # intentionally not typed
     async def aiter_ws(self, symbol_to_exchange, symbol, feed_name):
@@ -47,9 +62,19 @@ class BinanceWsPublic(BaseWsPublic):
 
     # mostly for mypy hinting
     # prefix with b_ to not mess with method of superclass (mypy will complaib)
-    async def b_aiter_trade(self, symbol_to_exchange: ntypes.SYMBOL_TO_EXCHANGE, symbol: ntypes.SYMBOL) -> typing.AsyncIterable[Result[NoobitResponseTrades, ValidationError]]:
+    # `compact` yields slotted `TradeTick` events instead of validated responses
+    async def b_aiter_trade(
+            self,
+            symbol_to_exchange: ntypes.SYMBOL_TO_EXCHANGE,
+            symbol: ntypes.SYMBOL,
+            compact: bool = False,
+            keep_raw: bool = True
+        ) -> typing.AsyncIterable[Result[typing.Union[NoobitResponseTrades, TradeTick], ValidationError]]:
         
         async for msg in self.aiter_ws(symbol_to_exchange, symbol, "aggTrade"):
+            if compact:
+                yield Ok(trades.parse_event(msg, symbol, keep_raw))
+                continue
             parsed_msg = trades.parse_msg(msg, symbol)
             valid_parsed = trades.validate_parsed(msg, parsed_msg)
             yield valid_parsed
@@ -64,9 +89,14 @@ class BinanceWsPublic(BaseWsPublic):
             symbol_to_exchange: ntypes.SYMBOL_TO_EXCHANGE, 
             symbol: ntypes.SYMBOL,
             # snapshot: NoobitResponseOrderBook
-        ) -> typing.AsyncIterable[Result[NoobitResponseOrderBook, ValidationError]]:
+            compact: bool = False,
+            keep_raw: bool = True
+        ) -> typing.AsyncIterable[Result[typing.Union[NoobitResponseOrderBook, BookDelta], ValidationError]]:
         
         async for msg in self.aiter_ws(symbol_to_exchange, symbol, "depth20"):
+            if compact:
+                yield Ok(orderbook.parse_event(msg, symbol, keep_raw))
+                continue
             parsed_msg = orderbook.parse_msg(msg, symbol)
             valid_parsed = orderbook.validate_parsed(msg, parsed_msg)
             yield valid_parsed
@@ -75,42 +105,119 @@ class BinanceWsPublic(BaseWsPublic):
 
 
 
+    # intentionally not typed
+    async def aiter_ws_many(self, streams):
+        """combined stream, messages are {"stream": <stream name>, "data": <raw payload>}
+        """
+        stream_uri = f"wss://{self.client.host}:{str(self.client.port)}/stream?streams={'/'.join(streams)}"
+        async with websockets.connect(stream_uri) as client:
+                async for msg in client:
+                    yield json.loads(msg)
+
+
+    #========================================
+    # BULK SUBSCRIPTION
+
+
+    def _symbol_to_stream_pair(self, symbols_resp: NoobitResponseSymbols) -> ntypes.SYMBOL_TO_EXCHANGE:
+        # mapping built once per symbols response (called for each symbol of a bulk subscription)
+        cached = getattr(self, "_stream_pairs", None)
+        if cached is None or cached[0] is not symbols_resp:
+            cached = (symbols_resp, {k: f"{v.exchange_pair.lower()}" for k, v in symbols_resp.asset_pairs.items()})
+            self._stream_pairs = cached
+        return cached[1].__getitem__
+
+
+    def _validate_sub_many(self, symbols_resp, feed, symbols, **params):
+        module = {"trade": trades, "orderbook": orderbook}.get(feed)
+        if module is None:
+            return Err(ValueError(f"Unknown feed : {feed}"))
+        return module.validate_sub(self._symbol_to_stream_pair(symbols_resp), symbols)
+
+
+    def _ack_key(self, symbols_resp, feed, symbol):
+        return f"{self._symbol_to_stream_pair(symbols_resp)(symbol)}@{_STREAMS[feed]}"
+
+
+    async def _feed_stream(self, symbols_resp, feed, symbols):
+        # data is not sent on the main connection, we read combined streams (a few connections for many symbols)
+        symbol_to_exchange = self._symbol_to_stream_pair(symbols_resp)
+        by_stream = {f"{symbol_to_exchange(symbol)}@{_STREAMS[feed]}": symbol for symbol in symbols}
+        streams = list(by_stream)
+
+        queue: asyncio.Queue = asyncio.Queue()
+
+        async def _pump(chunk):
+            async for msg in self.aiter_ws_many(chunk):
+                queue.put_nowait(msg)
+
+        for i in range(0, len(streams), _STREAMS_PER_CONN):
+            self.schedule(_pump(streams[i:i+_STREAMS_PER_CONN]))
+
+        module = trades if feed == "trade" else orderbook
+        while not self._terminate:
+            msg = await queue.get()
+            symbol, data = by_stream[msg["stream"]], msg["data"]
+            yield module.validate_parsed(data, module.parse_msg(data, symbol))
+
+
     # TODO msg_handler should be a class attribute and declared here, since it is the same for all Kraken Ws
     #       should not be an initable param
     #========================================
     # ENDPOINTS
 
     #? should we return msg wrapped in result ?
-    async def trade(self, symbols_resp: NoobitResponseSymbols, symbol: ntypes.PSymbol) -> typing.AsyncIterable[Result[NoobitResponseTrades, ValidationError]]:
+    async def trade(
+            self,
+            symbols_resp: NoobitResponseSymbols,
+            symbol: ntypes.PSymbol,
+            compact: bool = False,
+            keep_raw: bool = True
+        ) -> typing.AsyncIterable[Result[typing.Union[NoobitResponseTrades, TradeTick], ValidationError]]:
         super()._ensure_dispatch()
 
         symbol_to_exchange = lambda x : {k: f"{v.exchange_pair.lower()}" for k, v in symbols_resp.asset_pairs.items()}[x]
         valid_sub_model = trades.validate_sub(symbol_to_exchange, symbol)
-        
         if isinstance(valid_sub_model, Err):
-            print(valid_sub_model)
-        else:
-            await subscribe(self.client, valid_sub_model.value)
+            yield valid_sub_model
+            return
+
+        # acknowledged by {"result": null, "id": ...} (see `_watch_sub`)
+        sub_result = await self.subscribe_acked(valid_sub_model.value, self.sub_timeout)
+        if sub_result.is_err():
+            yield sub_result
+            return
 
         self._subd_feeds["trade"].add(symbol_to_exchange(symbol))
 
-        async for msg in self.b_aiter_trade(symbol_to_exchange, symbol):
+        async for msg in self.b_aiter_trade(symbol_to_exchange, symbol, compact, keep_raw):
             yield msg
 
 
     
-    async def orderbook(self, symbols_resp: NoobitResponseSymbols, symbol: ntypes.PSymbol) -> typing.AsyncIterable[Result[NoobitResponseOrderBook, ValidationError]]:
+    async def orderbook(
+            self,
+            symbols_resp: NoobitResponseSymbols,
+            symbol: ntypes.PSymbol,
+            compact: bool = False,
+            keep_raw: bool = True
+        ) -> typing.AsyncIterable[Result[typing.Union[NoobitResponseOrderBook, BookDelta], ValidationError]]:
         
         symbol_to_exchange = lambda x : {k: f"{v.exchange_pair.lower()}" for k, v in symbols_resp.asset_pairs.items()}[x]
         valid_sub_model = orderbook.validate_sub(symbol_to_exchange, symbol)
         if isinstance(valid_sub_model, Err):
-            print(valid_sub_model)
-        else:
-            await subscribe(self.client, valid_sub_model.value)
+            yield valid_sub_model
+            return
+
+        # acknowledged by {"result": null, "id": ...} (see `_watch_sub`)
+        sub_result = await self.subscribe_acked(valid_sub_model.value, self.sub_timeout)
+        if sub_result.is_err():
+            yield sub_result
+            return
 
         self._subd_feeds["orderbook"].add(symbol_to_exchange(symbol))
 
-        async for msg in self.b_aiter_book(symbol_to_exchange, symbol):
+        async for msg in self.b_aiter_book(symbol_to_exchange, symbol, compact, keep_raw):
             yield msg
             
             
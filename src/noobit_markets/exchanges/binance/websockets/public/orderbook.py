@@ -1,23 +1,27 @@
 from decimal import Decimal
 import typing
+import time
 
 from pydantic import ValidationError
 
-from noobit_markets.base.websockets import BinanceSubModel
+from noobit_markets.base.websockets import BinanceSubModel, as_symbols
 from noobit_markets.base.ntypes import SYMBOL_TO_EXCHANGE, SYMBOL
 
 from noobit_markets.base.models.rest.response import NoobitResponseOrderBook, NoobitResponseTrades, T_PublicTradesParsedItem
+from noobit_markets.base.models.events import BookDelta
 from noobit_markets.base.models.result import Result, Ok, Err
+from noobit_markets.base.rawjson import apply_rawjson_policy
 from typing_extensions import TypedDict
 
 
 
-def validate_sub(symbol_to_exchange: SYMBOL_TO_EXCHANGE, symbol: SYMBOL) -> Result[BinanceSubModel, ValidationError]:
+def validate_sub(symbol_to_exchange: SYMBOL_TO_EXCHANGE, symbol: typing.Union[SYMBOL, typing.Sequence[SYMBOL]]) -> Result[BinanceSubModel, ValidationError]:
 
     msg = {
         "id": 1,
         "method": "SUBSCRIBE",
-        "params": (f"{symbol_to_exchange(symbol)}@depth20",)
+        # one or many streams per message
+        "params": tuple(f"{symbol_to_exchange(s)}@depth20" for s in as_symbols(symbol))
     }
 
     try:
@@ -48,7 +52,7 @@ def validate_parsed(msg: BinanceBookMsg, parsed_msg: dict):
 
     try:
         validated_msg = NoobitResponseOrderBook(
-            rawJson=msg,
+            rawJson=apply_rawjson_policy(msg),
             exchange="BINANCE",
             **parsed_msg
             )
@@ -82,6 +86,23 @@ def parse_side(message: bidsorasks):
     return parsed_side
 
 
+def parse_event(msg: BinanceBookMsg, symbol: SYMBOL, keep_raw: bool = False) -> BookDelta:
+    """compact alternative to `parse_msg` + `validate_parsed`
+
+    partial depth streams (`depth20`) always send the full top levels
+    """
+
+    return BookDelta(
+        exchange="BINANCE",
+        symbol=symbol,
+        utcTime=int(time.time() * 10**3),
+        asks={Decimal(item[0]): Decimal(item[1]) for item in msg["asks"]},
+        bids={Decimal(item[0]): Decimal(item[1]) for item in msg["bids"]},
+        isSnapshot=True,
+        rawJson=msg if keep_raw else None
+    )
+
+
 # SAMPLE ORDERBOOK MESSAGE
 # {
 #   "lastUpdateId": 160,  // Last update ID
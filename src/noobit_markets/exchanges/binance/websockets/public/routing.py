@@ -0,0 +1,27 @@
+import json
+import typing
+import asyncio
+
+
+_t_qdict = typing.Dict[str, asyncio.Queue]
+
+
+__all__ = "msg_handler"
+
+
+
+
+async def msg_handler(msg, data_queues: _t_qdict, status_queues: _t_qdict):
+    """
+    forward to appropriate asyncio queue
+
+    data is read from one connection per stream (see `BinanceWsPublic.aiter_ws`),
+    the main connection only carries replies to subscription messages:
+        {"result": null, "id": 1}
+        {"error": {"code": 2, "msg": "Invalid request"}, "id": 1}
+    """
+
+    msg = json.loads(msg)
+
+    if isinstance(msg, dict) and "id" in msg:
+        await status_queues["subscription"].put(msg)
@@ -1,22 +1,26 @@
+import typing
 from decimal import Decimal
 
 from pydantic import ValidationError
 
-from noobit_markets.base.websockets import BinanceSubModel
+from noobit_markets.base.websockets import BinanceSubModel, as_symbols
 from noobit_markets.base.ntypes import SYMBOL_TO_EXCHANGE, SYMBOL
 
 from noobit_markets.base.models.rest.response import NoobitResponseTrades, T_PublicTradesParsedItem
+from noobit_markets.base.models.events import TradeTick
 from noobit_markets.base.models.result import Result, Ok, Err
+from noobit_markets.base.rawjson import apply_rawjson_policy
 from typing_extensions import TypedDict
 
 
 
-def validate_sub(symbol_to_exchange: SYMBOL_TO_EXCHANGE, symbol: SYMBOL) -> Result[BinanceSubModel, ValidationError]:
+def validate_sub(symbol_to_exchange: SYMBOL_TO_EXCHANGE, symbol: typing.Union[SYMBOL, typing.Sequence[SYMBOL]]) -> Result[BinanceSubModel, ValidationError]:
 
     msg = {
         "id": 1,
         "method": "SUBSCRIBE",
-        "params": (f"{symbol_to_exchange(symbol)}@aggTrade",)
+        # one or many streams per message
+        "params": tuple(f"{symbol_to_exchange(s)}@aggTrade" for s in as_symbols(symbol))
     }
 
     try:
@@ -39,7 +43,7 @@ def validate_parsed(msg, parsed_msg):
     try:
         validated_msg = NoobitResponseTrades(
             trades=parsed_msg,
-            rawJson=msg,
+            rawJson=apply_rawjson_policy(msg),
             exchange="BINANCE"
             )
         return Ok(validated_msg)
@@ -109,4 +113,21 @@ def _parse_single(info: _BinanceResponseItem, symbol: SYMBOL) -> T_PublicTradesP
             "text": None
         }
 
-    return parsed_trade
\ No newline at end of file
+    return parsed_trade
+
+
+def parse_event(info: _BinanceResponseItem, symbol: SYMBOL, keep_raw: bool = False) -> TradeTick:
+    """compact alternative to `parse_msg` + `validate_parsed`
+    """
+
+    return TradeTick(
+        exchange="BINANCE",
+        symbol=symbol,
+        side="SELL" if info["m"] else "BUY",
+        ordType="MARKET",
+        avgPx=Decimal(info["p"]),
+        cumQty=Decimal(info["q"]),
+        transactTime=info["T"],
+        trdMatchID=str(info["a"]),
+        rawJson=info if keep_raw else None
+    )
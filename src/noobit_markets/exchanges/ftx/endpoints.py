@@ -30,6 +30,7 @@ FTX_ENDPOINTS = endpoints.RESTEndpoints(
                 "trades_info": "fills",  # GET /fills?market={market}
                 "new_order": "orders",  # POST /orders
                 "remove_order": "orders",  # DELETE /orders/{order_id} or /orders/by_client_id/{client_order_id} or /orders to delete all
+                "cancel_all": "orders",  # DELETE /orders?market={market}
                 # ---- Missing
                 # "ledger": "Ledgers",
                 # "ledger_info": "",
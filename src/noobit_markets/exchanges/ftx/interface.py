@@ -1,29 +1,38 @@
-from noobit_markets.base.models.interface import ExchangeInterface
+from noobit_markets.base.lazy import LazyNamespace
 
-from .rest.public import *
-from .rest.private import *
 
+# endpoints are imported on first access (e.g `FTX.rest.public.ohlc`), and then cached
+# full validation: `ExchangeInterface(**FTX.resolve())`
 
-FTX = ExchangeInterface(
+_PUBLIC = "noobit_markets.exchanges.ftx.rest.public"
+_PRIVATE = "noobit_markets.exchanges.ftx.rest.private"
+
+
+FTX = LazyNamespace("FTX",
     **{
         "rest": {
             "public": {
-                "ohlc": get_ohlc_ftx,
-                "orderbook": get_orderbook_ftx,
-                "symbols": get_symbols_ftx,
-                "trades": get_trades_ftx,
+                "ohlc": f"{_PUBLIC}.ohlc:get_ohlc_ftx",
+                "orderbook": f"{_PUBLIC}.orderbook:get_orderbook_ftx",
+                "symbols": f"{_PUBLIC}.symbols:get_symbols_ftx",
+                "trades": f"{_PUBLIC}.trades:get_trades_ftx",
                 "instrument": None,
                 "spread": None,
             },
             "private": {
-                "balances": get_balances_ftx,
-                "exposure": get_exposure_ftx,
-                "trades": get_usertrades_ftx,
+                "balances": f"{_PRIVATE}.balances:get_balances_ftx",
+                "exposure": f"{_PRIVATE}.exposure:get_exposure_ftx",
+                "trades": f"{_PRIVATE}.trades:get_usertrades_ftx",
                 "open_positions": None,
                 "closed_positions": None,
-                "open_orders": get_openorders_ftx,
-                "closed_orders": get_closedorders_ftx,
-                "new_order": post_neworder_ftx,
+                "open_orders": f"{_PRIVATE}.orders:get_openorders_ftx",
+                "closed_orders": f"{_PRIVATE}.orders:get_closedorders_ftx",
+                "new_order": f"{_PRIVATE}.trading:post_neworder_ftx",
+                "templated_order": None,
+                "remove_order": None,
+                "cancel_all": f"{_PRIVATE}.cancel_open:cancel_all_ftx",
+                "batch_new_orders": f"{_PRIVATE}.trading:post_neworders_ftx",
+                "batch_cancel": None,
             },
         },
         # TODO add websockets
@@ -1,18 +1,13 @@
 import hashlib
-import hmac
 import json
 import typing
 
 from typing_extensions import Literal
-from dotenv import load_dotenv
 
-from noobit_markets.base.auth import make_base
+from noobit_markets.base.auth import make_base, hmac_signer
 from noobit_markets.base.models.frozenbase import FrozenBaseModel
 
 
-load_dotenv()
-
-
 class FtxPrivateRequest(FrozenBaseModel):
 
     pass
@@ -76,6 +71,7 @@ class FtxAuth(FtxBase):
         # if body: message += json.dumps(body)
         sig_payload = message.encode()
 
-        signature = hmac.new((self.secret).encode(), sig_payload, hashlib.sha256)
+        signature = hmac_signer(self.secret, hashlib.sha256)
+        signature.update(sig_payload)
 
         return signature.hexdigest()
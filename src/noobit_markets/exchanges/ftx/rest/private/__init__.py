@@ -1,5 +1,12 @@
-from .balances import get_balances_ftx
-from .exposure import get_exposure_ftx
-from .orders import get_openorders_ftx, get_closedorders_ftx
-from .trades import get_usertrades_ftx
-from .trading import post_neworder_ftx
\ No newline at end of file
+from noobit_markets.base.lazy import lazy_exports
+
+
+# endpoint modules are only imported when first accessed
+__getattr__, __dir__, __all__ = lazy_exports(__name__, {
+    "balances": ("get_balances_ftx",),
+    "exposure": ("get_exposure_ftx",),
+    "orders": ("get_openorders_ftx", "get_closedorders_ftx"),
+    "trades": ("get_usertrades_ftx",),
+    "trading": ("post_neworder_ftx", "post_neworders_ftx"),
+    "cancel_open": ("cancel_all_ftx",),
+})
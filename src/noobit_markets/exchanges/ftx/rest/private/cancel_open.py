@@ -0,0 +1,135 @@
+import typing
+
+import pydantic
+from pyrsistent import pmap
+
+from noobit_markets.base.request import (
+    # retry_request,
+    _validate_data,
+)
+
+# Base
+from noobit_markets.base import ntypes
+from noobit_markets.base.symbols import symbols_index
+from noobit_markets.base.batch import RateLimiter
+from noobit_markets.base.models.result import Result
+from noobit_markets.base.models.rest.response import NoobitResponseSymbols, NoobitResponseCancelAll
+from noobit_markets.base.models.rest.request import NoobitRequestOpenOrders
+from noobit_markets.base.models.frozenbase import FrozenBaseModel
+
+# FTX
+from noobit_markets.exchanges.ftx.rest.auth import FtxAuth
+from noobit_markets.exchanges.ftx import endpoints
+from noobit_markets.exchanges.ftx.rest.base import get_result_content_from_req
+
+
+__all__ = (
+    "cancel_all_ftx",
+)
+
+
+# ============================================================
+# FTX REQUEST
+# ============================================================
+
+
+class FtxRequestCancelAll(FrozenBaseModel):
+
+    # all markets if None
+    market: typing.Optional[str]
+
+
+
+
+# ============================================================
+# FTX RESPONSE
+# ============================================================
+
+
+# SAMPLE RESPONSE
+
+# {
+#   "success": true,
+#   "result": "Orders queued for cancelation"
+# }
+
+
+class FtxResponseCancelAll(FrozenBaseModel):
+
+    message: str
+
+
+
+
+# ============================================================
+# FETCH
+# ============================================================
+
+
+async def cancel_all_ftx(
+        client: ntypes.CLIENT,
+        symbol: typing.Optional[ntypes.SYMBOL],
+        symbols_resp: NoobitResponseSymbols,
+        # prevent unintentional passing of following args
+        *,
+        limiter: typing.Optional[RateLimiter] = None,
+        logger: typing.Optional[typing.Callable] = None,
+        auth=FtxAuth(),
+        base_url: pydantic.AnyHttpUrl = endpoints.FTX_ENDPOINTS.private.url,
+        endpoint: str = endpoints.FTX_ENDPOINTS.private.endpoints.cancel_all,
+    ) -> Result[NoobitResponseCancelAll, Exception]:
+    """cancel all open orders for `symbol` (or for all markets if None) in a single call
+
+    FTX only queues the cancellation, so we do not get back a count or the cancelled orderIDs
+    """
+
+    symbol_to_exchange = lambda x: symbols_index(symbols_resp).symbol_to_exchange(x)
+
+    req_url = "/".join([base_url, endpoint])
+    method = "DELETE"
+
+    if symbol is not None:
+        valid_noobit_req = _validate_data(
+            NoobitRequestOpenOrders, pmap({"symbol": symbol, "symbols_resp": symbols_resp})
+        )
+        if valid_noobit_req.is_err():
+            return valid_noobit_req
+
+    valid_ftx_req = _validate_data(
+        FtxRequestCancelAll,
+        pmap({"market": None if symbol is None else symbol_to_exchange(symbol)})
+    )
+    if valid_ftx_req.is_err():
+        return valid_ftx_req
+
+    querystr = "" if valid_ftx_req.value.market is None else f"?market={valid_ftx_req.value.market}"
+    req_url += querystr
+    headers = auth.headers(method, f"/api/{endpoint}{querystr}")
+
+    if logger:
+        logger(f"Cancel All - Parsed Request : {valid_ftx_req.value}")
+
+    result_content = await get_result_content_from_req(
+        client, method, req_url, FrozenBaseModel(), headers
+    )
+    if result_content.is_err():
+        return result_content
+
+    if logger:
+        logger(f"Cancel All - Result content : {result_content.value}")
+
+    valid_result_content = _validate_data(
+        FtxResponseCancelAll, pmap({"message": result_content.value})
+    )
+    if valid_result_content.is_err():
+        return valid_result_content
+
+    return _validate_data(
+        NoobitResponseCancelAll,
+        pmap({
+            "count": None,
+            "orderIDs": None,
+            "rawJson": result_content.value,
+            "exchange": "FTX",
+        })
+    )
@@ -12,6 +12,7 @@ from noobit_markets.base.request import (
 
 # Base
 from noobit_markets.base import ntypes
+from noobit_markets.base.symbols import symbols_index
 from noobit_markets.base.models.result import Result
 from noobit_markets.base.models.rest.request import NoobitRequestTrades
 from noobit_markets.base.models.rest.response import (
@@ -177,9 +178,7 @@ async def get_usertrades_ftx(
         f"{v.noobit_base}{v.noobit_quote}": k
         for k, v in symbols_resp.asset_pairs.items()
     }[x]
-    symbol_to_exchange = lambda x: {
-        k: v.exchange_pair for k, v in symbols_resp.asset_pairs.items()
-    }[x]
+    symbol_to_exchange = lambda x: symbols_index(symbols_resp).symbol_to_exchange(x)
 
     req_url = "/".join([base_url, "fills"])
     method = "GET"
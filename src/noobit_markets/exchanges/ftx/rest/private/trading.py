@@ -12,6 +12,8 @@ from noobit_markets.base.request import (
 
 # Base
 from noobit_markets.base import ntypes
+from noobit_markets.base.symbols import symbols_index
+from noobit_markets.base.batch import RateLimiter, batch_new_orders
 from noobit_markets.base.models.result import Result
 from noobit_markets.base.models.rest.request import NoobitRequestAddOrder
 from noobit_markets.base.models.rest.response import (
@@ -29,7 +31,10 @@ from noobit_markets.exchanges.ftx import endpoints
 from noobit_markets.exchanges.ftx.rest.base import get_result_content_from_req
 
 
-__all__ = "post_neworder_ftx"
+__all__ = (
+    "post_neworder_ftx",
+    "post_neworders_ftx",
+)
 
 
 # ============================================================
@@ -209,9 +214,7 @@ async def post_neworder_ftx(
         f"{v.noobit_base}{v.noobit_quote}": k
         for k, v in symbols_resp.asset_pairs.items()
     }[x]
-    symbol_to_exchange = lambda x: {
-        k: v.exchange_pair for k, v in symbols_resp.asset_pairs.items()
-    }[x]
+    symbol_to_exchange = lambda x: symbols_index(symbols_resp).symbol_to_exchange(x)
 
     req_url = "/".join([base_url, "orders"])
     method = "POST"
@@ -282,3 +285,26 @@ async def post_neworder_ftx(
         ),
     )
     return valid_parsed_response
+
+
+async def post_neworders_ftx(
+        client: ntypes.CLIENT,
+        symbols_resp: NoobitResponseSymbols,
+        orders: typing.Sequence[typing.Mapping[str, typing.Any]],
+        # prevent unintentional passing of following args
+        *,
+        limiter: typing.Optional[RateLimiter] = None,
+        logger: typing.Optional[typing.Callable] = None,
+        auth=FtxAuth(),
+        base_url: pydantic.AnyHttpUrl = endpoints.FTX_ENDPOINTS.private.url,
+        endpoint: str = endpoints.FTX_ENDPOINTS.private.endpoints.new_order,
+    ) -> typing.Tuple[Result[NoobitResponseItemOrder, Exception], ...]:
+    """place `orders` (keyword arguments of `post_neworder_ftx`) concurrently, one `Result` per order
+
+    FTX has no batch order endpoint, each order is a separate call under `limiter`.
+    """
+
+    return await batch_new_orders(
+        post_neworder_ftx, client, symbols_resp, orders,
+        limiter=limiter, logger=logger, auth=auth, base_url=base_url, endpoint=endpoint
+    )
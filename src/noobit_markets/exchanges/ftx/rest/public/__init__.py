@@ -1,4 +1,10 @@
-from .ohlc import get_ohlc_ftx
-from .orderbook import get_orderbook_ftx
-from .symbols import get_symbols_ftx
-from .trades import get_trades_ftx
\ No newline at end of file
+from noobit_markets.base.lazy import lazy_exports
+
+
+# endpoint modules are only imported when first accessed
+__getattr__, __dir__, __all__ = lazy_exports(__name__, {
+    "ohlc": ("get_ohlc_ftx",),
+    "orderbook": ("get_orderbook_ftx",),
+    "symbols": ("get_symbols_ftx",),
+    "trades": ("get_trades_ftx",),
+})
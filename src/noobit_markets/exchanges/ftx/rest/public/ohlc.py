@@ -9,10 +9,12 @@ from typing_extensions import TypedDict
 from noobit_markets.base.request import (
     # retry_request,
     _validate_data,
+    _avalidate_data,
 )
 
 # Base
 from noobit_markets.base import ntypes
+from noobit_markets.base.symbols import symbols_index
 from noobit_markets.base.models.result import Result, Err
 from noobit_markets.base.models.rest.response import (
     NoobitResponseOhlc,
@@ -164,9 +166,7 @@ async def get_ohlc_ftx(
     endpoint: str = endpoints.FTX_ENDPOINTS.public.endpoints.ohlc,
 ) -> Result[NoobitResponseOhlc, pydantic.ValidationError]:
 
-    symbol_to_exchange = lambda x: {
-        k: v.exchange_pair for k, v in symbols_resp.asset_pairs.items()
-    }[x]
+    symbol_to_exchange = lambda x: symbols_index(symbols_resp).symbol_to_exchange(x)
 
     # ftx has variable urls besides query params
     # format: https://ftx.com/api/markets/{market_name}/candles
@@ -209,7 +209,7 @@ async def get_ohlc_ftx(
     if logger:
         logger(f"Ohlc - Result Content : {result_content.value}")
 
-    valid_result_content = _validate_data(
+    valid_result_content = await _avalidate_data(
         FtxResponseOhlc, pmap({"ohlc": result_content.value})
     )
     if valid_result_content.is_err():
@@ -217,7 +217,7 @@ async def get_ohlc_ftx(
 
     parsed_result = parse_result(valid_result_content.value.ohlc, symbol)
 
-    valid_parsed_response_data = _validate_data(
+    valid_parsed_response_data = await _avalidate_data(
         NoobitResponseOhlc,
         pmap(
             {"ohlc": parsed_result, "rawJson": result_content.value, "exchange": "FTX"}
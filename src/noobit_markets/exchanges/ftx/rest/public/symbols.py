@@ -7,6 +7,7 @@ from pyrsistent import pmap
 from noobit_markets.base.request import (
     # retry_request,
     _validate_data,
+    _avalidate_data,
 )
 
 # Base
@@ -209,7 +210,7 @@ async def get_symbols_ftx(
     if logger:
         logger(f"Symbols - Result Content : {result_content.value}")
 
-    valid_result_content = _validate_data(
+    valid_result_content = await _avalidate_data(
         FtxResponseSymbols, pmap({"symbols": result_content.value})
     )
     if valid_result_content.is_err():
@@ -217,7 +218,7 @@ async def get_symbols_ftx(
 
     parsed_result = parse_result(valid_result_content.value)
 
-    valid_parsed_response_data = _validate_data(
+    valid_parsed_response_data = await _avalidate_data(
         NoobitResponseSymbols,
         pmap({**parsed_result, "rawJson": result_content.value, "exchange": "FTX"}),
     )
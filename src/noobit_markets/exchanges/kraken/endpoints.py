@@ -38,6 +38,7 @@ KRAKEN_ENDPOINTS = endpoints.RESTEndpoints(**{
             "volume": "TradeVolume",
             "new_order": "AddOrder",
             "remove_order": "CancelOrder",
+            "cancel_all": "CancelAll",
             "ws_token": "GetWebSocketsToken",
         }
     }
@@ -1,55 +1,43 @@
-from noobit_markets.base.models.interface import ExchangeInterface
+from noobit_markets.base.lazy import LazyNamespace
 
-# rest private endpoints
-from noobit_markets.exchanges.kraken.rest.private.balances import get_balances_kraken
-from noobit_markets.exchanges.kraken.rest.private.cancel_open import cancel_openorder_kraken
-from noobit_markets.exchanges.kraken.rest.private.exposure import get_exposure_kraken
-from noobit_markets.exchanges.kraken.rest.private.trades import get_usertrades_kraken
-from noobit_markets.exchanges.kraken.rest.private.positions import get_openpositions_kraken
-from noobit_markets.exchanges.kraken.rest.private.orders import (
-    get_openorders_kraken,
-    get_closedorders_kraken,
-)
-from noobit_markets.exchanges.kraken.rest.private.trading import post_neworder_kraken
 
-# rest public endpoints
-from noobit_markets.exchanges.kraken.rest.public.ohlc import get_ohlc_kraken
-from noobit_markets.exchanges.kraken.rest.public.symbols import get_symbols_kraken
-from noobit_markets.exchanges.kraken.rest.public.orderbook import get_orderbook_kraken
-from noobit_markets.exchanges.kraken.rest.public.trades import get_trades_kraken
-from noobit_markets.exchanges.kraken.rest.public.instrument import get_instrument_kraken
-from noobit_markets.exchanges.kraken.rest.public.spread import get_spread_kraken
+# endpoints are imported on first access (e.g `KRAKEN.rest.public.ohlc`), and then cached
+# full validation: `ExchangeInterface(**KRAKEN.resolve())`
 
-# kraken ws
-from noobit_markets.exchanges.kraken.websockets.public.api import KrakenWsPublic
-from noobit_markets.exchanges.kraken.websockets.private.api import KrakenWsPrivate
+_PUBLIC = "noobit_markets.exchanges.kraken.rest.public"
+_PRIVATE = "noobit_markets.exchanges.kraken.rest.private"
+_WS = "noobit_markets.exchanges.kraken.websockets"
 
 
 
-KRAKEN = ExchangeInterface(**{
+KRAKEN = LazyNamespace("KRAKEN", **{
     "rest": {
         "public": {
-            "ohlc": get_ohlc_kraken,
-            "orderbook": get_orderbook_kraken,
-            "symbols": get_symbols_kraken,
-            "trades": get_trades_kraken,
-            "instrument": get_instrument_kraken,
-            "spread": get_spread_kraken
+            "ohlc": f"{_PUBLIC}.ohlc:get_ohlc_kraken",
+            "orderbook": f"{_PUBLIC}.orderbook:get_orderbook_kraken",
+            "symbols": f"{_PUBLIC}.symbols:get_symbols_kraken",
+            "trades": f"{_PUBLIC}.trades:get_trades_kraken",
+            "instrument": f"{_PUBLIC}.instrument:get_instrument_kraken",
+            "spread": f"{_PUBLIC}.spread:get_spread_kraken"
         },
         "private": {
-            "balances": get_balances_kraken,
-            "exposure": get_exposure_kraken,
-            "trades": get_usertrades_kraken,
-            "open_positions": get_openpositions_kraken,
-            "open_orders": get_openorders_kraken,
-            "closed_orders": get_closedorders_kraken,
-            "new_order": post_neworder_kraken,
-            "remove_order": cancel_openorder_kraken
+            "balances": f"{_PRIVATE}.balances:get_balances_kraken",
+            "exposure": f"{_PRIVATE}.exposure:get_exposure_kraken",
+            "trades": f"{_PRIVATE}.trades:get_usertrades_kraken",
+            "open_positions": f"{_PRIVATE}.positions:get_openpositions_kraken",
+            "open_orders": f"{_PRIVATE}.orders:get_openorders_kraken",
+            "closed_orders": f"{_PRIVATE}.orders:get_closedorders_kraken",
+            "new_order": f"{_PRIVATE}.trading:post_neworder_kraken",
+            "templated_order": f"{_PRIVATE}.trading:post_templated_order_kraken",
+            "remove_order": f"{_PRIVATE}.cancel_open:cancel_openorder_kraken",
+            "cancel_all": f"{_PRIVATE}.cancel_open:cancel_all_kraken",
+            "batch_new_orders": f"{_PRIVATE}.trading:post_neworders_kraken",
+            "batch_cancel": f"{_PRIVATE}.cancel_open:cancel_openorders_kraken",
         }
     },
 
     "ws":{
-        "public": KrakenWsPublic,
-        "private": KrakenWsPrivate
+        "public": f"{_WS}.public.api:KrakenWsPublic",
+        "private": f"{_WS}.private.api:KrakenWsPrivate"
     }
 })
@@ -1,16 +1,12 @@
 import urllib
 import hashlib
 import base64
-import hmac
 import typing
 
 import pydantic
 import pyrsistent
-from dotenv import load_dotenv
 
-load_dotenv()
-
-from noobit_markets.base.auth import make_base
+from noobit_markets.base.auth import make_base, hmac_signer
 from noobit_markets.base.models.frozenbase import FrozenBaseModel
 
 
@@ -54,7 +50,8 @@ class KrakenAuth(KrakenBase):
         encoded = (str(request_args["nonce"]) + postdata).encode()
         message = endpoint.encode() + hashlib.sha256(encoded).digest()
 
-        signature = hmac.new(base64.b64decode(self.secret), message, hashlib.sha512)
+        signature = hmac_signer(self.secret, hashlib.sha512, base64.b64decode)
+        signature.update(message)
         sigdigest = base64.b64encode(signature.digest())
 
         return sigdigest.decode()
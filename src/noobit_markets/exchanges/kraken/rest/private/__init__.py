@@ -1,7 +1,14 @@
-from .balances import get_balances_kraken
-from .exposure import get_exposure_kraken
-from .orders import get_closedorders_kraken, get_openorders_kraken
-from .positions import get_openpositions_kraken
-from .trades import get_usertrades_kraken
-from .trading import post_neworder_kraken
-from .ws_auth import get_wstoken_kraken
\ No newline at end of file
+from noobit_markets.base.lazy import lazy_exports
+
+
+# endpoint modules are only imported when first accessed
+__getattr__, __dir__, __all__ = lazy_exports(__name__, {
+    "balances": ("get_balances_kraken",),
+    "exposure": ("get_exposure_kraken",),
+    "orders": ("get_closedorders_kraken", "get_openorders_kraken"),
+    "positions": ("get_openpositions_kraken",),
+    "trades": ("get_usertrades_kraken",),
+    "trading": ("post_neworder_kraken", "post_neworders_kraken", "post_templated_order_kraken"),
+    "cancel_open": ("cancel_openorder_kraken", "cancel_openorders_kraken", "cancel_all_kraken"),
+    "ws_auth": ("get_wstoken_kraken",),
+})
@@ -12,9 +12,12 @@ from noobit_markets.base.request import (
 
 # Base
 from noobit_markets.base import ntypes
+from noobit_markets.base.symbols import symbols_index
+from noobit_markets.base.batch import RateLimiter, batch_cancel
+from noobit_markets.base.errors import ExchangeError
 from noobit_markets.base.models.result import Result, Ok, Err
 from noobit_markets.base.models.rest.response import (
-    NoobitResponseItemOrder, NoobitResponseSymbols,
+    NoobitResponseItemOrder, NoobitResponseSymbols, NoobitResponseCancelAll,
 )
 from noobit_markets.base.models.frozenbase import FrozenBaseModel
 
@@ -22,10 +25,14 @@ from noobit_markets.base.models.frozenbase import FrozenBaseModel
 from noobit_markets.exchanges.kraken.rest.auth import KrakenAuth, KrakenPrivateRequest
 from noobit_markets.exchanges.kraken import endpoints
 from noobit_markets.exchanges.kraken.rest.base import get_result_content_from_req
-from .orders import get_closedorders_kraken
+from .orders import get_order_kraken, get_openorders_kraken
 
 
-__all__ = "cancel_openorder_kraken"
+__all__ = (
+    "cancel_openorder_kraken",
+    "cancel_openorders_kraken",
+    "cancel_all_kraken",
+)
 
 
 # ============================================================
@@ -42,6 +49,10 @@ class KrakenRequestCancelOpenOrder(KrakenPrivateRequest):
     txid: str
 
 
+class KrakenRequestCancelAll(KrakenPrivateRequest):
+    pass
+
+
 
 # ============================================================
 # KRAKEN RESPONSE
@@ -54,6 +65,13 @@ class KrakenResponseCancelOpenOrder(FrozenBaseModel):
     pending: typing.Optional[typing.Tuple[str, ...]]
 
 
+# SAMPLE RESPONSE
+# {"error": [], "result": {"count": 4}}
+
+class KrakenResponseCancelAll(FrozenBaseModel):
+    count: pydantic.conint(ge=0)
+
+
 
 # ============================================================
 # FETCH
@@ -74,9 +92,7 @@ async def cancel_openorder_kraken(
     endpoint: str = endpoints.KRAKEN_ENDPOINTS.private.endpoints.remove_order,
 ) -> Result[NoobitResponseItemOrder, Exception]:
 
-    symbol_to_exchange = lambda x: {
-        k: v.exchange_pair for k, v in symbols_resp.asset_pairs.items()
-    }[x]
+    symbol_to_exchange = lambda x: symbols_index(symbols_resp).symbol_to_exchange(x)
 
     req_url = urljoin(base_url, endpoint)
     method = "POST"
@@ -108,20 +124,131 @@ async def cancel_openorder_kraken(
         return valid_result_content
 
 
-    cl_ord = await get_closedorders_kraken(
-        client, symbol, symbols_resp, logger=logger, auth=auth
+    # QueryOrders for the cancelled txid only, instead of fetching and scanning all closed orders
+    return await get_order_kraken(
+        client, symbol, symbols_resp, orderID, logger=logger, auth=auth
     )
 
-    if isinstance(cl_ord, Ok):
-        try:
-            [order_info] = [order for order in cl_ord.value.orders if order.orderID == orderID]
-            return Ok(order_info)
-        except ValueError as e:
-            return Err(e)
-        except Exception as e:
-            return Err(e)
-    else:
-        return cl_ord
 
+async def cancel_openorders_kraken(
+    client: ntypes.CLIENT,
+    symbols_resp: NoobitResponseSymbols,
+    orders: typing.Sequence[typing.Tuple[ntypes.SYMBOL, str]],
+    # prevent unintentional passing of following args
+    *,
+    limiter: typing.Optional[RateLimiter] = None,
+    logger: typing.Optional[typing.Callable] = None,
+    auth=KrakenAuth(),
+    base_url: pydantic.AnyHttpUrl = endpoints.KRAKEN_ENDPOINTS.private.url,
+    endpoint: str = endpoints.KRAKEN_ENDPOINTS.private.endpoints.remove_order,
+) -> typing.Tuple[Result[NoobitResponseItemOrder, Exception], ...]:
+    """cancel (symbol, orderID) `orders`, one `Result` per order
+
+    Requests are signed with increasing nonces, sent one at a time by default so they reach Kraken in order.
+    Pass a `limiter` allowing more requests in flight if a nonce window is configured on the API key.
+    """
 
-    
+    # one request in flight at a time
+    limiter = limiter if limiter is not None else RateLimiter(max_concurrent=1)
+
+    return await batch_cancel(
+        cancel_openorder_kraken, client, symbols_resp, orders,
+        limiter=limiter, logger=logger, auth=auth, base_url=base_url, endpoint=endpoint
+    )
+
+
+async def cancel_all_kraken(
+    client: ntypes.CLIENT,
+    symbol: typing.Optional[ntypes.SYMBOL],
+    symbols_resp: NoobitResponseSymbols,
+    # prevent unintentional passing of following args
+    *,
+    limiter: typing.Optional[RateLimiter] = None,
+    logger: typing.Optional[typing.Callable] = None,
+    auth=KrakenAuth(),
+    base_url: pydantic.AnyHttpUrl = endpoints.KRAKEN_ENDPOINTS.private.url,
+    endpoint: str = endpoints.KRAKEN_ENDPOINTS.private.endpoints.cancel_all,
+) -> Result[NoobitResponseCancelAll, Exception]:
+    """cancel all open orders (single `CancelAll` call) or all open orders for `symbol`
+
+    Kraken can only cancel all orders at once, for a single symbol we fetch its open orders
+    and cancel them under `limiter` (see `cancel_openorders_kraken`).
+    """
+
+    if symbol is not None:
+        return await _cancel_symbol_kraken(
+            client, symbol, symbols_resp, limiter=limiter, logger=logger, auth=auth, base_url=base_url
+        )
+
+    req_url = urljoin(base_url, endpoint)
+    method = "POST"
+    data = {"nonce": auth.nonce}
+
+    valid_kraken_req = _validate_data(KrakenRequestCancelAll, pmap(data))
+    if valid_kraken_req.is_err():
+        return valid_kraken_req
+
+    headers = auth.headers(endpoint, data)
+
+    result_content = await get_result_content_from_req(
+        client, method, req_url, valid_kraken_req.value, headers
+    )
+    if result_content.is_err():
+        return result_content
+
+    if logger:
+        logger(f"Cancel All - Result content : {result_content.value}")
+
+    valid_result_content = _validate_data(KrakenResponseCancelAll, result_content.value)
+    if valid_result_content.is_err():
+        return valid_result_content
+
+    return _validate_data(
+        NoobitResponseCancelAll,
+        pmap({
+            "count": valid_result_content.value.count,
+            "orderIDs": None,
+            "rawJson": result_content.value,
+            "exchange": "KRAKEN",
+        })
+    )
+
+
+async def _cancel_symbol_kraken(
+    client: ntypes.CLIENT,
+    symbol: ntypes.SYMBOL,
+    symbols_resp: NoobitResponseSymbols,
+    *,
+    limiter: typing.Optional[RateLimiter],
+    logger: typing.Optional[typing.Callable],
+    auth: KrakenAuth,
+    base_url: pydantic.AnyHttpUrl,
+) -> Result[NoobitResponseCancelAll, Exception]:
+
+    open_orders = await get_openorders_kraken(
+        client, symbol, symbols_resp, logger=logger, auth=auth, base_url=base_url
+    )
+    if open_orders.is_err():
+        return open_orders
+
+    results = await cancel_openorders_kraken(
+        client, symbols_resp, [(symbol, order.orderID) for order in open_orders.value.orders],
+        limiter=limiter, logger=logger, auth=auth, base_url=base_url
+    )
+
+    errors = tuple(result.value for result in results if result.is_err())
+    if errors:
+        # raw_error holds the exception of each failed cancellation
+        return Err(ExchangeError(errors, str([order.orderID for order in open_orders.value.orders])))
+
+    orderIDs = tuple(result.value.orderID for result in results)
+
+    return _validate_data(
+        NoobitResponseCancelAll,
+        pmap({
+            "count": len(orderIDs),
+            "orderIDs": orderIDs,
+            "rawJson": [result.value for result in results],
+            "exchange": "KRAKEN",
+        })
+    )
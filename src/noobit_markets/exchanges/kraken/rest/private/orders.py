@@ -18,8 +18,9 @@ from noobit_markets.base.request import (
 
 # Base
 from noobit_markets.base import ntypes
-from noobit_markets.base.models.result import Result
+from noobit_markets.base.models.result import Result, Err
 from noobit_markets.base.models.rest.response import (
+    NoobitResponseItemOrder,
     NoobitResponseOpenOrders,
     NoobitResponseClosedOrders,
     NoobitResponseSymbols,
@@ -35,7 +36,7 @@ from noobit_markets.exchanges.kraken.rest.base import get_result_content_from_re
 from noobit_markets.exchanges.kraken.types import K_ORDERTYPE_TO_N, K_ORDERSIDE_TO_N, K_ORDERSTATUS_TO_N
 
 
-__all__ = ("get_closedorders_kraken", "get_openorders_kraken")
+__all__ = ("get_closedorders_kraken", "get_openorders_kraken", "get_order_kraken")
 
 
 # ============================================================
@@ -51,6 +52,12 @@ class KrakenRequestClosedOrders(KrakenRequestOpenOrders):
     pass
 
 
+class KrakenRequestQueryOrders(KrakenPrivateRequest):
+    trades: bool
+    # comma delimited list of transaction ids (max 50)
+    txid: str
+
+
 # ============================================================
 # KRAKEN RESPONSE
 # ============================================================
@@ -188,10 +195,15 @@ class KrakenResponseClosedOrders(FrozenBaseModel):
     count: ntypes.COUNT
 
 
+class KrakenResponseQueryOrders(FrozenBaseModel):
+    # orders are keyed by txid, closed orders have additional `closetm` and `reason` fields
+    orders: typing.Mapping[str, typing.Union[SingleClosedOrder, SingleOpenOrder]]
+
+
 def parse_result_openorders(
     result_data: typing.Mapping[str, SingleOpenOrder],
     symbol_from_exchange: ntypes.SYMBOL_FROM_EXCHANGE,
-    symbol: ntypes.SYMBOL,
+    symbol: typing.Optional[ntypes.SYMBOL],
 ) -> T_OrderParsedRes:
 
     parsed = [
@@ -199,14 +211,15 @@ def parse_result_openorders(
         for key, order in result_data.items()
     ]
 
-    filtered = [item for item in parsed if item["symbol"] == symbol]
+    # no symbol : orders for all symbols
+    filtered = [item for item in parsed if symbol is None or item["symbol"] == symbol]
     return tuple(filtered)
 
 
 def parse_result_closedorders(
     result_data: typing.Mapping[str, SingleClosedOrder],
     symbol_from_exchange: ntypes.SYMBOL_FROM_EXCHANGE,
-    symbol: ntypes.SYMBOL,
+    symbol: typing.Optional[ntypes.SYMBOL],
 ) -> T_OrderParsedRes:
 
     parsed = [
@@ -214,7 +227,8 @@ def parse_result_closedorders(
         for key, order in result_data.items()
     ]
 
-    filtered = [item for item in parsed if item["symbol"] == symbol]
+    # no symbol : orders for all symbols
+    filtered = [item for item in parsed if symbol is None or item["symbol"] == symbol]
     return tuple(filtered)
 
 
@@ -282,6 +296,7 @@ def _single_order(
 
 async def get_openorders_kraken(
     client: ntypes.CLIENT,
+    # None returns orders for all symbols (annotation kept in line with other exchanges)
     symbol: ntypes.SYMBOL,
     symbols_resp: NoobitResponseSymbols,
     # prevent unintentional passing of following args
@@ -352,6 +367,7 @@ async def get_openorders_kraken(
 # @retry_request(retries=10, logger= lambda *args: print("===x=x=x=x@ : ", *args))
 async def get_closedorders_kraken(
     client: ntypes.CLIENT,
+    # None returns orders for all symbols (annotation kept in line with other exchanges)
     symbol: ntypes.SYMBOL,
     symbols_resp: NoobitResponseSymbols,
     # prevent unintentional passing of following args
@@ -412,3 +428,72 @@ async def get_closedorders_kraken(
         ),
     )
     return valid_parsed_result_data
+
+
+
+
+# ============================================================
+# FETCH
+# ============================================================
+
+
+async def get_order_kraken(
+    client: ntypes.CLIENT,
+    symbol: ntypes.SYMBOL,
+    symbols_resp: NoobitResponseSymbols,
+    orderID: str,
+    # prevent unintentional passing of following args
+    *,
+    logger: typing.Optional[typing.Callable] = None,
+    auth=KrakenAuth(),
+    base_url: pydantic.AnyHttpUrl = endpoints.KRAKEN_ENDPOINTS.private.url,
+    endpoint: str = endpoints.KRAKEN_ENDPOINTS.private.endpoints.order_info,
+) -> Result[NoobitResponseItemOrder, Exception]:
+    """single order by txid (QueryOrders), avoids fetching and scanning all open/closed orders
+    """
+
+    # format: "ETHUSD"
+    symbol_from_exchange = lambda x: {
+        f"{v.noobit_base}{v.noobit_quote}": k
+        for k, v in symbols_resp.asset_pairs.items()
+    }[x]
+
+    req_url = urljoin(base_url, endpoint)
+    # Kraken Doc : Private methods must use POST
+    method = "POST"
+    data = {"nonce": auth.nonce, "trades": True, "txid": orderID}
+
+    valid_kraken_req = _validate_data(KrakenRequestQueryOrders, pmap(data))
+    if valid_kraken_req.is_err():
+        return valid_kraken_req
+
+    if logger:
+        logger(f"Query Order - Parsed Request : {valid_kraken_req.value}")
+
+    headers = auth.headers(endpoint, valid_kraken_req.value.dict())
+
+    result_content = await get_result_content_from_req(
+        client, method, req_url, valid_kraken_req.value, headers
+    )
+    if result_content.is_err():
+        return result_content
+
+    if logger:
+        logger(f"Query Order - Result content : {result_content.value}")
+
+    valid_result_content = _validate_data(
+        KrakenResponseQueryOrders, pmap({"orders": result_content.value})
+    )
+    if valid_result_content.is_err():
+        return valid_result_content
+
+    try:
+        order = valid_result_content.value.orders[orderID]
+    except KeyError:
+        return Err(KeyError(f"Order {orderID} not found"))
+
+    valid_parsed_result_data = _validate_data(
+        NoobitResponseItemOrder,
+        pmap(_single_order(orderID, order, symbol_from_exchange)),
+    )
+    return valid_parsed_result_data
@@ -13,6 +13,7 @@ from noobit_markets.base.request import (
 
 # Base
 from noobit_markets.base import ntypes
+from noobit_markets.base.symbols import symbols_index
 from noobit_markets.base.models.result import Result
 from noobit_markets.base.models.rest.response import (
     NoobitResponseSymbols,
@@ -185,9 +186,7 @@ async def get_usertrades_kraken(
 ) -> Result[NoobitResponseTrades, pydantic.ValidationError]:
 
     # format: "DOTUSD" or "XETHZUSD" (doc incorrect on this one)
-    symbol_from_exchange = lambda x: {
-        v.exchange_pair: k for k, v in symbols_resp.asset_pairs.items()
-    }[x]
+    symbol_from_exchange = lambda x: symbols_index(symbols_resp).symbol_from_exchange(x)
 
     req_url = urljoin(base_url, endpoint)
     method = "POST"
@@ -16,7 +16,10 @@ from noobit_markets.base.request import (
 
 # Base
 from noobit_markets.base import ntypes
-from noobit_markets.base.models.result import Result, Ok
+from noobit_markets.base.symbols import symbols_index
+from noobit_markets.base.batch import RateLimiter, batch_new_orders
+from noobit_markets.base.templates import OrderTemplate
+from noobit_markets.base.models.result import Result, Err
 from noobit_markets.base.models.rest.response import (
     NoobitResponseNewOrder,
     NoobitResponseSymbols,
@@ -31,10 +34,14 @@ from noobit_markets.exchanges.kraken.rest.auth import KrakenAuth, KrakenPrivateR
 from noobit_markets.exchanges.kraken import endpoints
 from noobit_markets.exchanges.kraken.rest.base import get_result_content_from_req
 from noobit_markets.exchanges.kraken.types import K_ORDERSIDE_FROM_N, K_ORDERTYPE_FROM_N
-from .orders import get_openorders_kraken, get_closedorders_kraken
+from .orders import get_order_kraken
 
 
-__all__ = "post_neworder_kraken"
+__all__ = (
+    "post_neworder_kraken",
+    "post_neworders_kraken",
+    "post_templated_order_kraken",
+)
 
 
 # ============================================================
@@ -237,6 +244,51 @@ def parse_result(
     return res
 
 
+def parse_ack(
+    valid_request: NoobitRequestAddOrder,
+    orderID: str,
+) -> dict:
+    """order as known right after AddOrder (fast ack mode), built from the request we sent
+    """
+
+    orderQty = valid_request.orderQty if valid_request.orderQty else valid_request.quoteOrderQty
+
+    return {
+        "orderID": orderID,
+        "symbol": valid_request.symbol,
+        "currency": valid_request.symbol.split("-")[1],
+        "side": valid_request.side,
+        "ordType": valid_request.ordType,
+        "execInst": None,
+        "clOrdID": valid_request.clOrdID,
+        "account": None,
+        "cashMargin": "cash",
+        "ordStatus": "PENDING-NEW",
+        "workingIndicator": False,
+        "ordRejReason": None,
+        "timeInForce": valid_request.timeInForce,
+        "transactTime": None,
+        "sendingTime": None,
+        "effectiveTime": None,
+        "validUntilTime": None,
+        "expireTime": None,
+        "displayQty": None,
+        "grossTradeAmt": Decimal(0),
+        "orderQty": orderQty,
+        "cashOrderQty": Decimal(0),
+        "orderPercent": None,
+        "cumQty": Decimal(0),
+        "leavesQty": orderQty,
+        "price": valid_request.price,
+        "stopPx": valid_request.stopPrice,
+        "avgPx": None,
+        "fills": None,
+        "commission": Decimal(0),
+        "targetStrategy": None,
+        "targetStrategyParameters": None,
+    }
+
+
 # ============================================================
 # FETCH
 # ============================================================
@@ -262,15 +314,14 @@ async def post_neworder_kraken(
     auth=KrakenAuth(),
     base_url: pydantic.AnyHttpUrl = endpoints.KRAKEN_ENDPOINTS.private.url,
     endpoint: str = endpoints.KRAKEN_ENDPOINTS.private.endpoints.new_order,
+    fast_ack: bool = False,
+    on_enriched: typing.Optional[typing.Callable[[Result[NoobitResponseItemOrder, Exception]], typing.Any]] = None,
     **kwargs,
 ) -> Result[NoobitResponseItemOrder, Exception]:
 
-    symbol_to_exchange = lambda x: {
-        k: v.exchange_pair for k, v in symbols_resp.asset_pairs.items()
-    }[x]
+    symbol_to_exchange = lambda x: symbols_index(symbols_resp).symbol_to_exchange(x)
 
     req_url = urljoin(base_url, endpoint)
-    method = "POST"
 
     valid_noobit_req = _validate_data(
         NoobitRequestAddOrder,
@@ -299,21 +350,87 @@ async def post_neworder_kraken(
         logger(f"New Order - Noobit Request : {valid_noobit_req.value}")
 
     parsed_req = parse_request(valid_noobit_req.value, symbol_to_exchange)
-    data = {"nonce": auth.nonce, **parsed_req}
 
     valid_kraken_req = _validate_data(
-        KrakenRequestNewOrder, pmap({"nonce": data["nonce"], **parsed_req})
+        KrakenRequestNewOrder, pmap({"nonce": auth.nonce, **parsed_req})
+    )
+    if valid_kraken_req.is_err():
+        return valid_kraken_req
+
+    return await _send_neworder(
+        client, valid_noobit_req.value, valid_kraken_req.value,
+        logger=logger, auth=auth, req_url=req_url, endpoint=endpoint, fast_ack=fast_ack, on_enriched=on_enriched
+    )
+
+
+# kraken request fields that change between two orders of the same template
+_TEMPLATE_VARYING = ("nonce", "price", "price2", "volume", "userref")
+
+
+async def post_templated_order_kraken(
+    client: ntypes.CLIENT,
+    template: OrderTemplate,
+    price: typing.Optional[Decimal] = None,
+    orderQty: typing.Optional[Decimal] = None,
+    clOrdID: typing.Optional[str] = None,
+    stopPrice: typing.Optional[Decimal] = None,
+    # prevent unintentional passing of following args
+    *,
+    logger: typing.Optional[typing.Callable] = None,
+    auth=KrakenAuth(),
+    base_url: pydantic.AnyHttpUrl = endpoints.KRAKEN_ENDPOINTS.private.url,
+    endpoint: str = endpoints.KRAKEN_ENDPOINTS.private.endpoints.new_order,
+    fast_ack: bool = False,
+    on_enriched: typing.Optional[typing.Callable[[Result[NoobitResponseItemOrder, Exception]], typing.Any]] = None,
+) -> Result[NoobitResponseItemOrder, Exception]:
+    """same as `post_neworder_kraken`, but only price, orderQty, clOrdID and stopPrice are validated
+    (see `noobit_markets.base.templates`)
+    """
+
+    req_url = urljoin(base_url, endpoint)
+
+    valid_noobit_req = template.fill(price=price, orderQty=orderQty, clOrdID=clOrdID, stopPrice=stopPrice)
+    if valid_noobit_req.is_err():
+        return valid_noobit_req
+
+    parsed_req = parse_request(valid_noobit_req.value, template.symbol_to_exchange)
+
+    valid_kraken_req = template.exchange_request(
+        KrakenRequestNewOrder, {"nonce": auth.nonce, **parsed_req}, _TEMPLATE_VARYING
     )
     if valid_kraken_req.is_err():
         return valid_kraken_req
 
+    return await _send_neworder(
+        client, valid_noobit_req.value, valid_kraken_req.value,
+        logger=logger, auth=auth, req_url=req_url, endpoint=endpoint, fast_ack=fast_ack, on_enriched=on_enriched
+    )
+
+
+async def _send_neworder(
+    client: ntypes.CLIENT,
+    valid_noobit_req: NoobitRequestAddOrder,
+    valid_kraken_req: KrakenRequestNewOrder,
+    *,
+    logger: typing.Optional[typing.Callable],
+    auth: KrakenAuth,
+    req_url: str,
+    endpoint: str,
+    fast_ack: bool,
+    on_enriched: typing.Optional[typing.Callable],
+) -> Result[NoobitResponseItemOrder, Exception]:
+
+    method = "POST"
+    symbol = valid_noobit_req.symbol
+    symbols_resp = valid_noobit_req.symbols_resp.response
+
     if logger:
-        logger(f"New Order - Parsed Request : {valid_kraken_req.value}")
+        logger(f"New Order - Parsed Request : {valid_kraken_req}")
 
-    headers = auth.headers(endpoint, valid_kraken_req.value.dict(exclude_none=True))
+    headers = auth.headers(endpoint, valid_kraken_req.dict(exclude_none=True))
 
     result_content = await get_result_content_from_req(
-        client, method, req_url, valid_kraken_req.value, headers
+        client, method, req_url, valid_kraken_req, headers
     )
     if result_content.is_err():
         return result_content
@@ -344,36 +461,100 @@ async def post_neworder_kraken(
 
     [newOrderID] = valid_parsed_response_data.value.txid
 
-    # # TODO we want to return a more complete info on the trade:
-    # # ?     ==> should we fetch the order corresponding to the txid we get back ?
-    # tx_info = await get_usertrades_kraken(client, symbol, lambda x : {"DOTUSD": ntypes.PSymbol("DOT-USD")}, auth)
-    # return [trade for trade in tx_info.value.trades if trade.orderID == valid_parsed_response_data.value.txid]
-
-    if ordType == "MARKET":
-        # FIXME symbol_from_exchange lambda isnt entirely accurate
-        # will be ok for most pairs but some have 4/5 letters for base
-        cl_ord = await get_closedorders_kraken(
-            client, symbol, symbols_resp, logger=logger, auth=auth
+    if fast_ack:
+        # acknowledge from the AddOrder response only, order details are filled in from our request
+        ack = _validate_data(
+            NoobitResponseItemOrder,
+            pmap(parse_ack(valid_noobit_req, newOrderID))
         )
-        if isinstance(cl_ord, Ok):
-            [order_info] = [
-                order for order in cl_ord.value.orders if order.orderID == newOrderID
-            ]
-        else:
-            return cl_ord
-
-    else:
-        await asyncio.sleep(0.1)
-        # FIXME symbol_from_exchange lambda isnt entirely accurate
-        # will be ok for most pairs but some have 4/5 letters for base
-        op_ord = await get_openorders_kraken(
-            client, symbol, symbols_resp, logger=logger, auth=auth
+
+        if on_enriched:
+            # full order info is fetched in the background (QueryOrders for this txid only)
+            # for a streaming alternative, subscribe to the `openOrders` websocket feed
+            async def _enrich():
+                try:
+                    order_info = await _query_new_order(
+                        client, symbol, symbols_resp, newOrderID, logger=logger, auth=auth
+                    )
+                except Exception as e:
+                    order_info = Err(e)
+                # errors raised by the callback are reported by `_enrich_done`
+                enriched = on_enriched(order_info)
+                if asyncio.iscoroutine(enriched):
+                    await enriched
+
+            task = asyncio.ensure_future(_enrich())
+            _enrich_tasks.add(task)
+            task.add_done_callback(_enrich_done)
+
+        return ack
+
+    # QueryOrders for the new txid only, instead of fetching and scanning all open/closed orders
+    return await _query_new_order(
+        client, symbol, symbols_resp, newOrderID, logger=logger, auth=auth
+    )
+
+
+# background enrichments of fast acks, referenced until done
+_enrich_tasks: typing.Set[asyncio.Future] = set()
+
+
+def _enrich_done(task: asyncio.Future):
+    _enrich_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        print(f"Order enrichment failed : {task.exception()!r}")
+
+
+async def _query_new_order(
+    client: ntypes.CLIENT,
+    symbol: ntypes.SYMBOL,
+    symbols_resp: NoobitResponseSymbols,
+    newOrderID: str,
+    *,
+    logger: typing.Optional[typing.Callable],
+    auth: KrakenAuth,
+    retries: int = 3,
+    delay: float = 0.1,
+) -> Result[NoobitResponseItemOrder, Exception]:
+    """QueryOrders for an order we just placed, kraken might not know about it right after AddOrder
+    """
+
+    for attempt in range(retries):
+        await asyncio.sleep(delay * (attempt + 1))
+        order_info = await get_order_kraken(
+            client, symbol, symbols_resp, newOrderID, logger=logger, auth=auth
         )
-        if isinstance(op_ord, Ok):
-            [order_info] = [
-                order for order in op_ord.value.orders if order.orderID == newOrderID   #FIXME this causes errors because false sometimes
-            ]
-        else:
-            return op_ord
-    # return type will be : NoobitResponseItemOrder, same as binance trading.py, so should be ok
-    return Ok(order_info)
+        # not found
+        if not (order_info.is_err() and isinstance(order_info.value, KeyError)):
+            break
+
+    return order_info
+
+
+async def post_neworders_kraken(
+    client: ntypes.CLIENT,
+    symbols_resp: NoobitResponseSymbols,
+    orders: typing.Sequence[typing.Mapping[str, typing.Any]],
+    # prevent unintentional passing of following args
+    *,
+    limiter: typing.Optional[RateLimiter] = None,
+    logger: typing.Optional[typing.Callable] = None,
+    auth=KrakenAuth(),
+    base_url: pydantic.AnyHttpUrl = endpoints.KRAKEN_ENDPOINTS.private.url,
+    endpoint: str = endpoints.KRAKEN_ENDPOINTS.private.endpoints.new_order,
+    fast_ack: bool = False,
+) -> typing.Tuple[Result[NoobitResponseItemOrder, Exception], ...]:
+    """place `orders` (keyword arguments of `post_neworder_kraken`), one `Result` per order
+
+    Kraken has no batch endpoint, each order is a separate AddOrder call under `limiter`.
+    Requests are signed with increasing nonces, sent one at a time by default so they reach Kraken in order.
+    Pass a `limiter` allowing more requests in flight if a nonce window is configured on the API key.
+    """
+
+    # one request in flight at a time
+    limiter = limiter if limiter is not None else RateLimiter(max_concurrent=1)
+
+    return await batch_new_orders(
+        post_neworder_kraken, client, symbols_resp, orders,
+        limiter=limiter, logger=logger, auth=auth, base_url=base_url, endpoint=endpoint, fast_ack=fast_ack
+    )
@@ -1,6 +1,12 @@
-from .instrument import get_instrument_kraken
-from .ohlc import get_ohlc_kraken
-from .orderbook import get_orderbook_kraken
-from .spread import get_spread_kraken
-from .symbols import get_symbols_kraken
-from .trades import get_trades_kraken
\ No newline at end of file
+from noobit_markets.base.lazy import lazy_exports
+
+
+# endpoint modules are only imported when first accessed
+__getattr__, __dir__, __all__ = lazy_exports(__name__, {
+    "instrument": ("get_instrument_kraken",),
+    "ohlc": ("get_ohlc_kraken",),
+    "orderbook": ("get_orderbook_kraken",),
+    "spread": ("get_spread_kraken",),
+    "symbols": ("get_symbols_kraken",),
+    "trades": ("get_trades_kraken",),
+})
@@ -9,6 +9,7 @@ from pyrsistent import pmap
 from noobit_markets.base.request import (
     # retry_request,
     _validate_data,
+    _avalidate_data,
 )
 
 # Base
@@ -211,7 +212,7 @@ async def get_symbols_kraken(
     if logger:
         logger(f"Symbols - Result Content : {result_content.value}")
 
-    valid_result_content = _validate_data(
+    valid_result_content = await _avalidate_data(
         KrakenResponseSymbols, pmap({"symbols": filtered_result})
     )
     if valid_result_content.is_err():
@@ -220,7 +221,7 @@ async def get_symbols_kraken(
     # ? or should we pass in entire model ? (not passing data attribute)
     parsed_result_data = parse_result(valid_result_content.value.symbols)
 
-    valid_parsed_result_data = _validate_data(
+    valid_parsed_result_data = await _avalidate_data(
         NoobitResponseSymbols,
         pmap(
             {
@@ -12,10 +12,12 @@ from typing_extensions import Literal, TypedDict
 from noobit_markets.base.request import (
     # retry_request,
     _validate_data,
+    _avalidate_data,
 )
 
 # Base
 from noobit_markets.base import ntypes
+from noobit_markets.base.symbols import symbols_index
 from noobit_markets.base.models.result import Err, Result
 from noobit_markets.base.models.rest.response import (
     NoobitResponseSymbols,
@@ -187,9 +189,7 @@ async def get_trades_kraken(
     endpoint: str = endpoints.KRAKEN_ENDPOINTS.public.endpoints.trades,
 ) -> Result[NoobitResponseTrades, ValidationError]:
 
-    symbol_to_exchange = lambda x: {
-        k: v.exchange_pair for k, v in symbols_resp.asset_pairs.items()
-    }[x]
+    symbol_to_exchange = lambda x: symbols_index(symbols_resp).symbol_to_exchange(x)
 
     req_url = urljoin(base_url, endpoint)
     method = "GET"
@@ -223,7 +223,7 @@ async def get_trades_kraken(
     if logger:
         logger(f"Trades - Result Content : {result_content.value}")
 
-    valid_result_content = _validate_data(
+    valid_result_content = await _avalidate_data(
         make_kraken_model_trades(symbol, symbol_to_exchange), result_content.value
     )
     if valid_result_content.is_err():
@@ -233,7 +233,7 @@ async def get_trades_kraken(
         getattr(valid_result_content.value, symbol_to_exchange(symbol)), symbol
     )
 
-    valid_parsed_response_data = _validate_data(
+    valid_parsed_response_data = await _avalidate_data(
         NoobitResponseTrades,
         pmap(
             {
@@ -1,26 +1,122 @@
+import asyncio
+import itertools
+import json
+import typing
+from decimal import Decimal
+
+from pyrsistent import pmap
+
 # noobit base
+from noobit_markets.base import ntypes
+from noobit_markets.base.request import _validate_data
 from noobit_markets.base.websockets import subscribe, BaseWsPrivate 
+from noobit_markets.base.models.result import Result, Ok, Err
+from noobit_markets.base.models.rest.request import NoobitRequestAddOrder
+from noobit_markets.base.models.rest.response import NoobitResponseItemOrder, NoobitResponseSymbols
 
 # noobit kraken ws
 from noobit_markets.exchanges.kraken.websockets.private import trades as user_trades
 from noobit_markets.exchanges.kraken.websockets.private import orders as user_orders
+from noobit_markets.exchanges.kraken.websockets.private import trading
+from noobit_markets.exchanges.kraken.websockets.private.token import KrakenWsTokenManager
+from noobit_markets.exchanges.kraken.rest.private.trading import parse_ack
 
 
 
 class KrakenWsPrivate(BaseWsPrivate):
-    
+
+
+    def __init__(
+            self,
+            client,
+            msg_handler,
+            loop: asyncio.BaseEventLoop,
+            auth_token: typing.Optional[str],
+            feed_map: dict,
+            *,
+            token_manager: typing.Optional[KrakenWsTokenManager] = None,
+            **kwargs
+        ):
+        # token can be left to the manager
+        if auth_token is None and token_manager is not None:
+            auth_token = token_manager.token
+
+        # kwargs: reconnection options, see `BaseWsApi`
+        super().__init__(client, msg_handler, loop, auth_token, feed_map, **kwargs)
+        self.token_manager = token_manager
+
+        # reqid => future resolved by addOrderStatus/cancelOrderStatus messages
+        self._order_requests: typing.Dict[int, asyncio.Future] = dict()
+        self._reqids = itertools.count(1)
+
+
+    #========================================
+    # RECONNECT
+
+
+    # private feeds we resubscribe to, with the module validating their subscription
+    _sub_validators = {
+        "user_trades": user_trades.validate_sub,
+        "user_orders": user_orders.validate_sub,
+    }
+
+
+    async def resubscribe(self, client=None) -> Result[typing.Tuple[str, ...], Exception]:
+        """subscribe again to all private feeds we were subscribed to (e.g after a reconnect)
+
+        Called without `client` by `_dispatch` when reconnection is enabled (see `BaseWsApi`).
+
+        Args:
+            client: new websocket connection, replaces the current one (and restarts dispatch)
+
+        Returns:
+            resubscribed feeds
+        """
+
+        if client is not None:
+            self._swap_client(client)
+
+        if self.token_manager is not None:
+            token = await self.token_manager.get()
+            if token.is_err():
+                return token
+            self.auth_token = token.value
+
+        feeds = tuple(feed for feed, validate in self._sub_validators.items() if self._subd_feeds.get(feed))
+        for feed in feeds:
+            valid_sub_model = self._sub_validators[feed](self.auth_token)
+            if valid_sub_model.is_err():
+                return valid_sub_model
+            await subscribe(self.client, valid_sub_model.value)
+
+        return Ok(feeds)
+
+
+    def _swap_client(self, client):
+        dispatch = self._running_tasks.get("dispatch", None)
+        if dispatch is not None and not dispatch.done():
+            dispatch.cancel()
+
+        self.client = client
+        self._running_tasks["dispatch"] = asyncio.ensure_future(self._dispatch())
+
+
+    #========================================
+    # FEEDS
+
     
     async def trade(self):
         super()._ensure_dispatch()
 
         valid_sub_model = user_trades.validate_sub(self.auth_token)
         if valid_sub_model.is_err():
-            print(valid_sub_model)
             yield valid_sub_model
+            return
 
-        sub_result = await subscribe(self.client, valid_sub_model.value)
+        sub_result = await self.subscribe_acked(valid_sub_model.value, self.sub_timeout)
         if sub_result.is_err():
             yield sub_result
+            return
 
         self._subd_feeds["user_trades"] = True
         
@@ -35,15 +131,132 @@ class KrakenWsPrivate(BaseWsPrivate):
 
         valid_sub_model = user_orders.validate_sub(self.auth_token)
         if valid_sub_model.is_err():
-            print(valid_sub_model)
             yield valid_sub_model
+            return
 
-        sub_result = await subscribe(self.client, valid_sub_model.value)
+        sub_result = await self.subscribe_acked(valid_sub_model.value, self.sub_timeout)
         if sub_result.is_err():
             yield sub_result
+            return
 
         self._subd_feeds["user_orders"] = True
         
         # async for msg in self.iterq(self._data_queues, "user_orders"):
         async for msg in self.aiter_userorder():
             yield msg
+
+
+    #========================================
+    # ORDER ENTRY
+
+
+    def _ensure_order_watcher(self):
+        if not self._running_tasks.get("order_status", None):
+            self._running_tasks["order_status"] = asyncio.ensure_future(self._watch_order_status())
+
+
+    async def _watch_order_status(self):
+        async for msg in self.iterq(self._status_queues, "order_status"):
+            fut = self._order_requests.pop(msg.get("reqid"), None)
+            if fut is not None and not fut.done():
+                fut.set_result(msg)
+
+
+    async def _request(self, msg_model, timeout: float) -> Result[dict, Exception]:
+        super()._ensure_dispatch()
+        self._ensure_order_watcher()
+
+        payload = msg_model.dict(exclude_none=True)
+        # dont leak token in errors
+        sent = {k: v for k, v in payload.items() if k != "token"}
+
+        fut = asyncio.get_event_loop().create_future()
+        self._order_requests[msg_model.reqid] = fut
+        try:
+            await self.client.send(json.dumps(payload))
+        except Exception as e:
+            self._order_requests.pop(msg_model.reqid, None)
+            return Err(e)
+
+        try:
+            msg = await asyncio.wait_for(fut, timeout)
+        except asyncio.TimeoutError:
+            self._order_requests.pop(msg_model.reqid, None)
+            return trading.timeout_error(sent, timeout)
+
+        return trading.parse_status(msg, sent)
+
+
+    async def add_order(
+            self,
+            symbols_resp: NoobitResponseSymbols,
+            symbol: ntypes.SYMBOL,
+            side: ntypes.ORDERSIDE,
+            ordType: ntypes.ORDERTYPE,
+            clOrdID: str,
+            orderQty: Decimal,
+            price: Decimal,
+            timeInForce: ntypes.TIMEINFORCE,
+            stopPrice: typing.Optional[Decimal] = None,
+            quoteOrderQty: typing.Optional[Decimal] = None,
+            *,
+            timeout: float = 5,
+            **kwargs
+        ) -> Result[NoobitResponseItemOrder, Exception]:
+        """same arguments and validation as `post_neworder_kraken`, returns a PENDING-NEW order on ack
+        """
+
+        valid_noobit_req = _validate_data(
+            NoobitRequestAddOrder,
+            pmap({
+                "exchange": "KRAKEN",
+                "symbol": symbol,
+                "symbols_resp": symbols_resp,
+                "side": side,
+                "ordType": ordType,
+                "clOrdID": clOrdID,
+                "orderQty": orderQty,
+                "price": price,
+                "timeInForce": timeInForce,
+                "quoteOrderQty": quoteOrderQty,
+                "stopPrice": stopPrice,
+                **kwargs,
+            })
+        )
+        if valid_noobit_req.is_err():
+            return valid_noobit_req
+
+        valid_msg = trading.validate_addorder(self.auth_token, next(self._reqids), valid_noobit_req.value, symbols_resp)
+        if valid_msg.is_err():
+            return valid_msg
+
+        status = await self._request(valid_msg.value, timeout)
+        if status.is_err():
+            return status
+
+        return _validate_data(
+            NoobitResponseItemOrder,
+            pmap(parse_ack(valid_noobit_req.value, status.value["txid"]))
+        )
+
+
+    async def cancel_order(
+            self,
+            orderID: typing.Union[str, typing.Sequence[str]],
+            *,
+            timeout: float = 5
+        ) -> Result[typing.Tuple[str, ...], Exception]:
+        """returns cancelled orderIDs on ack
+        """
+
+        orderIDs = (orderID, ) if isinstance(orderID, str) else tuple(orderID)
+
+        valid_msg = trading.validate_cancelorder(self.auth_token, next(self._reqids), orderIDs)
+        if valid_msg.is_err():
+            return valid_msg
+
+        status = await self._request(valid_msg.value, timeout)
+        if status.is_err():
+            return status
+
+        return Ok(orderIDs)
@@ -2,15 +2,14 @@ from decimal import Decimal
 
 from pydantic import ValidationError
 
-import stackprinter     #type: ignore
-stackprinter.set_excepthook(style="darkbg2")
-
 from noobit_markets.base.websockets import KrakenSubModel
 
 from noobit_markets.base.models.rest.response import NoobitResponseOpenOrders
 from noobit_markets.base.models.result import Result, Ok, Err
 from noobit_markets.base.request import _validate_data
 
+from noobit_markets.exchanges.kraken.types import K_ORDERSIDE_TO_N, K_ORDERTYPE_TO_N, K_ORDERSTATUS_TO_N
+
 
 
 def validate_sub(token) -> Result[KrakenSubModel, Exception]:
@@ -37,15 +36,18 @@ def validate_sub(token) -> Result[KrakenSubModel, Exception]:
 def validate_parsed(msg, parsed_msg):
     return _validate_data(
         NoobitResponseOpenOrders,
-        {"orders": parsed_msg, "rawJson": msg}
+        {"orders": parsed_msg, "rawJson": msg, "exchange": "KRAKEN"}
     )
 
 
 def parse_msg(message):
     try:
+        # after the initial snapshot, kraken only sends changed fields (no `descr`) for existing orders
+        # those are only applied to the account state (see state.py)
         parsed_trades = [
             _parse_single(key, value) for order_dict in message[0]
             for key, value in order_dict.items()
+            if "descr" in value
         ]
         return parsed_trades
 
@@ -53,6 +55,13 @@ def parse_msg(message):
         raise e
 
 
+def parse_status(info):
+    status = K_ORDERSTATUS_TO_N[info["status"]]
+    if status == "NEW" and Decimal(info.get("vol_exec", 0)) > 0:
+        return "PARTIALLY-FILLED"
+    return status
+
+
 def _parse_single(key, info):
     try:
         parsed_info = {
@@ -60,8 +69,8 @@ def _parse_single(key, info):
             "orderID": key,
             "symbol": info["descr"]["pair"].replace("/", "-"),
             "currency": info["descr"]["pair"].split("/")[1],
-            "side": info["descr"]["type"],
-            "ordType": info["descr"]["ordertype"],
+            "side": K_ORDERSIDE_TO_N[info["descr"]["type"]],
+            "ordType": K_ORDERTYPE_TO_N[info["descr"]["ordertype"]],
             "execInst": None,
 
             "clOrdID": info["userref"],
@@ -69,8 +78,7 @@ def _parse_single(key, info):
             "cashMargin": "cash" if (info["descr"]["leverage"] is None) else "margin",
             "marginRatio": 0 if info["descr"]["leverage"] is None else 1/int(info["descr"]["leverage"][0]),
             "marginAmt": 0 if info["descr"]["leverage"] is None else Decimal(info["cost"])/int(info["descr"]["leverage"][0]),
-            # "ordStatus": MAP_ORDER_STATUS[info["status"]],
-            "ordStatus": "new", 
+            "ordStatus": parse_status(info),
             "workingIndicator": True if (info["status"] in ["pending", "open"]) else False,
             "ordRejReason": info.get("reason", None),
 
@@ -79,7 +87,7 @@ def _parse_single(key, info):
             "sendingTime": None,
             "effectiveTime": float(info["opentm"])*10**9,
             "validUntilTime": None,
-            "expireTime": None if info["expiretm"] is None else float(info["expiretm"])*10**9,
+            "expireTime": None if not float(info["expiretm"] or 0) else float(info["expiretm"])*10**9,
 
             "displayQty": None,
             "grossTradeAmt": info["cost"],
@@ -1,47 +1,73 @@
 import json
 import time
+import typing
 
 from . import trades, orders
 
 
 
-async def msg_handler(msg, data_queues, status_queues):
+def make_msg_handler(account_state: typing.Optional[typing.Any] = None):
     """
     forward to appropriate parser ==> redis channel
+
+    Args:
+        account_state: `KrakenAccountState` to which raw private frames are applied before validation
     """
 
-    if "systemStatus" in msg:
-        await status_queues["connection"].put(json.loads(msg))
-    
-    
-    elif "subscriptionStatus" in msg:
-        await status_queues["subscription"].put(json.loads(msg))
+    async def msg_handler(msg, data_queues, status_queues):
+
+        msg = json.loads(msg)
 
+        # private data frames : [data, channelName, {"sequence": n}]
+        if isinstance(msg, list):
+            feed = msg[1]
 
-    elif "heartbeat" in msg:
-        
-        # messages will normally not be consumed
-        if status_queues["heartbeat"].full():
-            await status_queues["heartbeat"].get()
+            if account_state is not None:
+                account_state.apply_ws_msg(msg)
 
-        # message is just {"event": "heartbeat"}
-        # put timestamp instead
-        await status_queues["heartbeat"].put(time.time() * 10**3)        
+            if feed == "ownTrades":
+                parsed_msg = trades.parse_msg(msg)
+                valid_parsed_msg = trades.validate_parsed(msg, parsed_msg)
+                if valid_parsed_msg.is_ok():
+                    await data_queues["user_trades"].put(valid_parsed_msg)
 
+            elif feed == "openOrders":
+                parsed_msg = orders.parse_msg(msg)
+                # partial updates only
+                if not parsed_msg:
+                    return
+                valid_parsed_msg = orders.validate_parsed(msg, parsed_msg)
+                if valid_parsed_msg.is_ok():
+                    await data_queues["user_orders"].put(valid_parsed_msg)
 
-    else:
-        msg = json.loads(msg)
-        feed = msg[-1]
+            return
+
+        event = msg.get("event")
+
+        if event == "systemStatus":
+            await status_queues["connection"].put(msg)
+
+
+        elif event == "subscriptionStatus":
+            await status_queues["subscription"].put(msg)
+
+
+        elif event in ("addOrderStatus", "cancelOrderStatus"):
+            # resolved against pending requests by reqid, see KrakenWsPrivate
+            await status_queues["order_status"].put(msg)
+
+
+        elif event == "heartbeat":
+
+            # messages will normally not be consumed
+            if status_queues["heartbeat"].full():
+                await status_queues["heartbeat"].get()
+
+            # message is just {"event": "heartbeat"}
+            # put timestamp instead
+            await status_queues["heartbeat"].put(time.time() * 10**3)
 
-        if feed == "ownTrades":
-            parsed_msg = trades.parse_msg(msg)
-            valid_parsed_msg = trades.validate_parsed(msg, parsed_msg)
-            if valid_parsed_msg.is_ok():
-                await data_queues["user_trades"].put(valid_parsed_msg)
+    return msg_handler
 
-        if feed == "openOrders":
-            parsed_msg = orders.parse_msg(msg)
-            valid_parsed_msg = orders.validate_parsed(msg, parsed_msg)
-            if valid_parsed_msg.is_ok():
-                await data_queues["user_orders"].put(valid_parsed_msg)
 
+msg_handler = make_msg_handler()
@@ -0,0 +1,196 @@
+import asyncio
+import typing
+from decimal import Decimal
+
+from pyrsistent import pmap
+
+# noobit base
+from noobit_markets.base import ntypes
+from noobit_markets.base.state import AccountState
+from noobit_markets.base.request import _validate_data
+from noobit_markets.base.models.result import Result, Ok
+from noobit_markets.base.models.rest.response import NoobitResponseItemOrder, NoobitResponseItemTrade, NoobitResponseSymbols
+
+# noobit kraken
+from noobit_markets.exchanges.kraken.rest.auth import KrakenAuth
+from noobit_markets.exchanges.kraken.rest.private.orders import get_openorders_kraken
+from noobit_markets.exchanges.kraken.rest.private.balances import get_balances_kraken
+from noobit_markets.exchanges.kraken.rest.private.positions import get_openpositions_kraken
+from noobit_markets.exchanges.kraken.websockets.private import orders, trades
+from noobit_markets.exchanges.kraken.websockets.private.routing import make_msg_handler
+
+
+__all__ = "KrakenAccountState"
+
+
+
+
+class KrakenAccountState(AccountState):
+    """account state seeded from REST and kept current from `openOrders`/`ownTrades` websocket frames
+
+    Usage:
+        state = KrakenAccountState(symbols_resp)
+        await state.seed(http_client)
+        kwp = KrakenWsPrivate(ws_client, state.msg_handler, loop, token, feed_map)
+        asyncio.ensure_future(state.follow(kwp))
+        asyncio.ensure_future(state.reconcile_every(http_client, 60))
+
+        state.order_by_clordid(123)
+
+    Kraken has no balances websocket feed (v1), balances and positions are only updated on reconcile.
+    """
+
+    def __init__(self, symbols_resp: NoobitResponseSymbols, max_closed: int = 1000):
+        super().__init__(max_closed)
+        self.symbols_resp = symbols_resp
+        # raw frames are applied by the msg_handler, before queuing
+        self.msg_handler = make_msg_handler(account_state=self)
+
+
+    # ========================================
+    # WEBSOCKET
+
+
+    def apply_ws_msg(self, msg: list):
+        feed = msg[1]
+        if feed == "openOrders":
+            for order_dict in msg[0]:
+                for txid, info in order_dict.items():
+                    self._apply_order(txid, info)
+        elif feed == "ownTrades":
+            for trade_dict in msg[0]:
+                for key, info in trade_dict.items():
+                    self._apply_trade(key, info)
+
+
+    def _apply_order(self, txid: str, info: dict):
+
+        # snapshot or new order
+        if "descr" in info:
+            valid_order = _validate_data(NoobitResponseItemOrder, pmap(orders._parse_single(txid, info)))
+            if valid_order.is_ok():
+                self.upsert_order(valid_order.value)
+            return
+
+        # partial update of a known order
+        current = self.order(txid)
+        if current is None:
+            # will be picked up on next reconcile
+            return
+
+        fields: typing.Dict[str, typing.Any] = {}
+        if "vol_exec" in info:
+            fields["cumQty"] = Decimal(info["vol_exec"])
+            fields["leavesQty"] = current.orderQty - fields["cumQty"]
+        if "cost" in info:
+            fields["grossTradeAmt"] = Decimal(info["cost"])
+        if "fee" in info:
+            fields["commission"] = Decimal(info["fee"])
+        if "avg_price" in info:
+            fields["avgPx"] = Decimal(info["avg_price"])
+        if "status" in info:
+            fields["ordStatus"] = orders.parse_status({"vol_exec": fields.get("cumQty", current.cumQty), **info})
+            fields["workingIndicator"] = info["status"] in ["pending", "open"]
+            if "reason" in info:
+                fields["ordRejReason"] = info["reason"]
+        elif fields.get("cumQty") and current.ordStatus == "NEW":
+            fields["ordStatus"] = "PARTIALLY-FILLED"
+
+        self.update_order(txid, **fields)
+
+
+    def _apply_trade(self, key: str, info: dict):
+        valid_trade = _validate_data(NoobitResponseItemTrade, pmap(trades._parse_single(key, info)))
+        if valid_trade.is_ok():
+            self.add_fill(valid_trade.value)
+
+
+    async def follow(self, ws):
+        """subscribe to `openOrders` and `ownTrades` on `ws` (`KrakenWsPrivate`) and drain the feeds
+
+        `ws` needs to be created with `self.msg_handler`
+        """
+
+        async def _drain(aiter):
+            async for _msg in aiter:
+                pass
+
+        await asyncio.gather(_drain(ws.order()), _drain(ws.trade()))
+
+
+    # ========================================
+    # REST
+
+
+    async def _fetch(self, client: ntypes.CLIENT, auth, logger):
+
+        open_orders = await get_openorders_kraken(client, None, self.symbols_resp, logger=logger, auth=auth)
+        if open_orders.is_err():
+            return open_orders
+
+        balances = await get_balances_kraken(client, self.symbols_resp, logger=logger, auth=auth)
+        if balances.is_err():
+            return balances
+
+        positions = await get_openpositions_kraken(client, self.symbols_resp, logger=logger, auth=auth)
+        if positions.is_err():
+            return positions
+
+        return Ok((open_orders.value, balances.value, positions.value))
+
+
+    async def seed(
+            self,
+            client: ntypes.CLIENT,
+            *,
+            logger: typing.Optional[typing.Callable] = None,
+            auth=KrakenAuth(),
+        ) -> Result["KrakenAccountState", Exception]:
+
+        fetched = await self._fetch(client, auth, logger)
+        if fetched.is_err():
+            return fetched
+
+        open_orders, balances, positions = fetched.value
+        self.seed_orders(open_orders.orders)
+        self.seed_balances(balances.balances)
+        self.seed_positions(positions.positions)
+        return Ok(self)
+
+
+    async def reconcile(
+            self,
+            client: ntypes.CLIENT,
+            *,
+            logger: typing.Optional[typing.Callable] = None,
+            auth=KrakenAuth(),
+        ) -> Result[typing.Set[str], Exception]:
+        """returns orderIDs that differed from REST
+        """
+
+        fetched = await self._fetch(client, auth, logger)
+        if fetched.is_err():
+            return fetched
+
+        open_orders, balances, positions = fetched.value
+        diff = self.reconcile_orders(open_orders.orders)
+        self.seed_balances(balances.balances)
+        self.seed_positions(positions.positions)
+
+        if diff and logger:
+            logger(f"Account State - Reconciled orders : {diff}")
+
+        return Ok(diff)
+
+
+    async def reconcile_every(
+            self,
+            client: ntypes.CLIENT,
+            interval: float = 60,
+            *,
+            logger: typing.Optional[typing.Callable] = None,
+            auth=KrakenAuth(),
+        ):
+        while True:
+            await asyncio.sleep(interval)
+            await self.reconcile(client, logger=logger, auth=auth)
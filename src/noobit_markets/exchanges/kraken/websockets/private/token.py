@@ -0,0 +1,127 @@
+import asyncio
+import time
+import typing
+
+import pydantic
+
+# noobit base
+from noobit_markets.base import ntypes
+from noobit_markets.base.models.result import Result, Ok
+
+# noobit kraken
+from noobit_markets.exchanges.kraken import endpoints
+from noobit_markets.exchanges.kraken.rest.auth import KrakenAuth
+from noobit_markets.exchanges.kraken.rest.private import ws_auth
+
+
+__all__ = "KrakenWsTokenManager"
+
+
+
+
+class KrakenWsTokenManager(object):
+    """caches the private websocket token and renews it before it expires
+
+    Kraken tokens have to be used to subscribe within `expires` seconds (15 minutes) of their creation,
+    subscriptions made with it then stay valid for the lifetime of the connection.
+    So a token is only needed again on (re)connect, and we keep a fresh one at hand for that.
+
+    Usage:
+        tokens = KrakenWsTokenManager(http_client)
+        await tokens.prefetch()
+        asyncio.ensure_future(tokens.keep_fresh())
+        kwp = KrakenWsPrivate(ws_client, msg_handler, loop, tokens.token, feed_map, token_manager=tokens)
+
+    Args:
+        margin: seconds before expiry at which a token is considered stale
+    """
+
+    def __init__(
+            self,
+            client: ntypes.CLIENT,
+            *,
+            margin: float = 60,
+            logger: typing.Optional[typing.Callable] = None,
+            auth=KrakenAuth(),
+            base_url: pydantic.AnyHttpUrl = endpoints.KRAKEN_ENDPOINTS.private.url,
+            endpoint=endpoints.KRAKEN_ENDPOINTS.private.endpoints.ws_token,
+        ):
+        self.client = client
+        self.margin = margin
+        self.logger = logger
+        self.auth = auth
+        self.base_url = base_url
+        self.endpoint = endpoint
+
+        self._token: typing.Optional[str] = None
+        self._expires_at: float = 0
+        # created lazily, so the manager can be instantiated outside of a running loop
+        self._lock: typing.Optional[asyncio.Lock] = None
+
+
+    @property
+    def token(self) -> typing.Optional[str]:
+        """current token, without checking for expiry (None if never fetched)
+        """
+        return self._token
+
+
+    def is_fresh(self) -> bool:
+        return self._token is not None and time.monotonic() < self._expires_at - self.margin
+
+
+    async def get(self) -> Result[str, Exception]:
+        """cached token if still fresh, otherwise fetch a new one
+        """
+        if self.is_fresh():
+            return Ok(self._token)
+
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            # another task may have renewed it while we were waiting
+            if self.is_fresh():
+                return Ok(self._token)
+            return await self._fetch()
+
+
+    async def prefetch(self) -> Result[str, Exception]:
+        return await self.get()
+
+
+    async def _fetch(self) -> Result[str, Exception]:
+        requested_at = time.monotonic()
+
+        result = await ws_auth.get_wstoken_kraken(
+            self.client,
+            logger=self.logger,
+            auth=self.auth,
+            base_url=self.base_url,
+            endpoint=self.endpoint
+        )
+        if result.is_err():
+            return result
+
+        self._token = result.value.token
+        # expiry counts from when kraken issued the token, request time is a safe lower bound
+        self._expires_at = requested_at + result.value.expires
+
+        if self.logger:
+            self.logger(f"Ws Token - Renewed, expires in {result.value.expires}s")
+
+        return Ok(self._token)
+
+
+    async def keep_fresh(self, retry_delay: float = 5):
+        """renew the token before it expires, forever (to run as a background task)
+        """
+        while True:
+            result = await self.get()
+            if result.is_err():
+                if self.logger:
+                    self.logger(f"Ws Token - Renewal failed : {result.value}")
+                await asyncio.sleep(retry_delay)
+                continue
+
+            await asyncio.sleep(max(self._expires_at - self.margin - time.monotonic(), 0) + 0.01)
@@ -2,15 +2,14 @@ from decimal import Decimal
 
 from pydantic import ValidationError
 
-import stackprinter     #type: ignore
-stackprinter.set_excepthook(style="darkbg2")
-
 from noobit_markets.base.websockets import KrakenSubModel
 
 from noobit_markets.base.models.rest.response import NoobitResponseTrades
 from noobit_markets.base.models.result import Result, Ok, Err
 from noobit_markets.base.request import _validate_data
 
+from noobit_markets.exchanges.kraken.types import K_ORDERSIDE_TO_N, K_ORDERTYPE_TO_N
+
 
 
 def validate_sub(token) -> Result[KrakenSubModel, Exception]:
@@ -38,7 +37,7 @@ def validate_sub(token) -> Result[KrakenSubModel, Exception]:
 def validate_parsed(msg, parsed_msg):
     return _validate_data(
         NoobitResponseTrades,
-        {"trades": parsed_msg, "rawJson": msg}
+        {"trades": parsed_msg, "rawJson": msg, "exchange": "KRAKEN"}
     )
 
 
@@ -59,10 +58,10 @@ def _parse_single(key, info):
     try:
         parsed_trade = {
             "trdMatchID": key,
-            "orderID": info["postxid"],
+            "orderID": info["ordertxid"],
             "symbol": info["pair"].replace("/", "-"),
-            "side": info["type"],
-            "ordType": info["ordertype"],
+            "side": K_ORDERSIDE_TO_N[info["type"]],
+            "ordType": K_ORDERTYPE_TO_N[info["ordertype"]],
             "avgPx": info["price"],
             "cumQty": info["vol"],
             "grossTradeAmt": Decimal(info["price"]) * Decimal(info["vol"]),
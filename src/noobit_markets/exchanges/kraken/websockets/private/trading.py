@@ -0,0 +1,165 @@
+import typing
+from decimal import Decimal
+
+import pydantic
+from pydantic import ValidationError
+from pyrsistent import pmap
+from typing_extensions import Literal
+
+from noobit_markets.base.errors import UndefinedError, RequestTimeout
+from noobit_markets.base.models.result import Result, Ok, Err
+from noobit_markets.base.models.rest.request import NoobitRequestAddOrder
+from noobit_markets.base.models.rest.response import NoobitResponseSymbols
+from noobit_markets.base.request import _validate_data
+
+from noobit_markets.exchanges.kraken.errors import ERRORS_FROM_EXCHANGE
+from noobit_markets.exchanges.kraken.rest.private.trading import parse_request
+
+
+
+
+# ============================================================
+# KRAKEN MESSAGES
+# ============================================================
+
+
+# EXAMPLE ADD ORDER MESSAGE:
+# {
+#   "event": "addOrder",
+#   "token": "WW91ciBhdXRoZW50aWNhdGlvbiB0b2tlbiBnb2VzIGhlcmUu",
+#   "reqid": 1,
+#   "ordertype": "limit",
+#   "type": "buy",
+#   "pair": "XBT/USD",
+#   "price": "9000",
+#   "volume": "10",
+#   "oflags": "post",
+#   "userref": "123"
+# }
+
+# EXAMPLE RESPONSE:
+# {
+#   "event": "addOrderStatus",
+#   "reqid": 1,
+#   "status": "ok",
+#   "txid": "ONPNXH-KMKMU-F4MR5V",
+#   "descr": "buy 0.02010000 XBTEUR @ limit 9857.0"
+# }
+
+
+class KrakenWsAddOrderMsg(pydantic.BaseModel):
+
+    event: Literal["addOrder"] = "addOrder"
+    token: str
+    reqid: int
+    pair: str
+    type: Literal["buy", "sell"]
+    ordertype: str
+    # kraken ws expects all numbers as strings
+    price: typing.Optional[str]
+    price2: typing.Optional[str]
+    volume: str
+    leverage: typing.Optional[str]
+    oflags: typing.Optional[str]
+    starttm: typing.Optional[str]
+    expiretm: typing.Optional[str]
+    userref: typing.Optional[str]
+
+
+class KrakenWsCancelOrderMsg(pydantic.BaseModel):
+
+    event: Literal["cancelOrder"] = "cancelOrder"
+    token: str
+    reqid: int
+    txid: typing.List[str]
+
+
+def _to_str(value: typing.Any) -> typing.Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, (float, Decimal)):
+        # avoid scientific notation
+        return format(Decimal(str(value)), "f")
+    return str(value)
+
+
+
+
+# ============================================================
+# VALIDATE
+# ============================================================
+
+
+def validate_addorder(
+        token: str,
+        reqid: int,
+        valid_request: NoobitRequestAddOrder,
+        symbols_resp: NoobitResponseSymbols
+    ) -> Result[KrakenWsAddOrderMsg, ValidationError]:
+    """`valid_request` is validated exactly as in `post_neworder_kraken`
+    """
+
+    # format "XBT/USD"
+    symbol_to_exchange = lambda x: {
+        k: f"{v.noobit_base}/{v.noobit_quote}" for k, v in symbols_resp.asset_pairs.items()
+    }[x]
+
+    parsed_req = parse_request(valid_request, symbol_to_exchange)
+    oflags = parsed_req["oflags"]
+
+    return _validate_data(
+        KrakenWsAddOrderMsg,
+        pmap({
+            "token": token,
+            "reqid": reqid,
+            "pair": parsed_req["pair"],
+            "type": parsed_req["type"],
+            "ordertype": parsed_req["ordertype"],
+            "price": _to_str(parsed_req["price"]),
+            "price2": _to_str(parsed_req["price2"]),
+            "volume": _to_str(parsed_req["volume"]),
+            "leverage": _to_str(parsed_req["leverage"]),
+            "oflags": ",".join(oflags) if oflags else None,
+            "starttm": _to_str(parsed_req["starttm"]),
+            "expiretm": _to_str(parsed_req["expiretm"]),
+            "userref": _to_str(parsed_req["userref"]),
+        })
+    )
+
+
+def validate_cancelorder(
+        token: str,
+        reqid: int,
+        orderIDs: typing.Sequence[str]
+    ) -> Result[KrakenWsCancelOrderMsg, ValidationError]:
+
+    return _validate_data(
+        KrakenWsCancelOrderMsg,
+        pmap({"token": token, "reqid": reqid, "txid": list(orderIDs)})
+    )
+
+
+
+
+# ============================================================
+# PARSE RESPONSE
+# ============================================================
+
+
+def parse_status(msg: dict, sent: typing.Any) -> Result[dict, Exception]:
+    """addOrderStatus / cancelOrderStatus message to Ok(msg) or Err(noobit error)
+    """
+
+    if msg.get("status") == "ok":
+        return Ok(msg)
+
+    err_msg = msg.get("errorMessage", "")
+    # error messages might carry details after the documented key (e.g "EOrder:Invalid price:...")
+    err_key = ":".join(err_msg.split(":")[:2])
+    err_class = ERRORS_FROM_EXCHANGE.get(err_key, UndefinedError)
+    return Err(err_class(err_msg, sent))
+
+
+def timeout_error(sent: typing.Any, timeout: float) -> Err:
+    err = RequestTimeout(f"No response after {timeout} seconds", sent)
+    return Err(err)
@@ -7,21 +7,161 @@ from pydantic.error_wrappers import ValidationError
 # noobit base
 from noobit_markets.base import ntypes
 from noobit_markets.base.request import _validate_data
-from noobit_markets.base.websockets import subscribe, BaseWsPublic
+from noobit_markets.base.websockets import subscribe, BaseWsPublic, SubModel
 from noobit_markets.base.models.result import Result, Ok, Err
 from noobit_markets.base.models.rest.response import NoobitResponseOhlc, NoobitResponseOrderBook, NoobitResponseSpread, NoobitResponseSymbols, NoobitResponseTrades
 
 
 # noobit kraken ws
 from noobit_markets.exchanges.kraken.websockets.public import ohlc, trades, spread, orderbook
+from noobit_markets.exchanges.kraken.websockets.public.routing import KrakenMsgRouter
+# noobit kraken rest (backfill)
+from noobit_markets.exchanges.kraken.rest.public.trades import get_trades_kraken
+from noobit_markets.exchanges.kraken.rest.public.ohlc import get_ohlc_kraken
 
 
 
 
+# (data queue, coroutine function called with (http client, since in ms))
+_Backfill = typing.Tuple[str, typing.Callable[[ntypes.CLIENT, int], typing.Awaitable[Result]]]
+
 
 class KrakenWsPublic(BaseWsPublic):
 
 
+    def __init__(
+            self,
+            client,
+            msg_handler,
+            loop: asyncio.BaseEventLoop,
+            feed_map: dict,
+            *,
+            backfill_client: typing.Optional[ntypes.CLIENT] = None,
+            **kwargs
+        ):
+        """
+        Args:
+            backfill_client: http client used on reconnect to fetch trades and ohlc
+                missed while disconnected (no backfill if None)
+            kwargs: reconnection options, see `BaseWsApi`
+        """
+        super().__init__(client, msg_handler, loop, feed_map, **kwargs)
+        self.backfill_client = backfill_client
+
+        # (subscription name, pairs) => (sub model, backfills), replayed on reconnect
+        self._subs: typing.Dict[typing.Tuple[str, typing.Tuple[str, ...]], typing.Tuple[SubModel, typing.Tuple[_Backfill, ...]]] = dict()
+
+
+    async def _subscribe(self, sub_model: SubModel, *backfills: _Backfill) -> Result[typing.Tuple[str, ...], Exception]:
+        """subscribe and wait for the acknowledgement of all pairs (see `subscribe_acked`)
+
+        Args:
+            backfills: one per symbol of `sub_model`, for trades and ohlc
+        """
+        self._subs[(sub_model.msg.subscription["name"], tuple(sub_model.msg.pair or ()))] = (sub_model, backfills)
+        return await self.subscribe_acked(sub_model, self.sub_timeout)
+
+
+    #========================================
+    # RECONNECT
+
+
+    async def resubscribe(self) -> Result[typing.Tuple[str, ...], Exception]:
+        """replay subscriptions that were acknowledged, on the current connection
+
+        Book subscriptions are replayed as well, so we get a new snapshot for each book.
+
+        Returns:
+            resubscribed feeds
+        """
+
+        # channelIDs of the previous connection
+        if isinstance(self.msg_handler, KrakenMsgRouter):
+            self.msg_handler.reset()
+
+        replayed = []
+        for (name, pairs), (sub_model, _backfills) in self._subs.items():
+            feed = self.feed_map.get(name, name)
+            subd = self._subd_feeds.get(feed, set())
+            if not any(pair in subd for pair in pairs):
+                continue
+            # acks of the new subscriptions will add them back (see `_watch_sub`)
+            subd.difference_update(pairs)
+            # full books of replayed pairs are rebuilt from the snapshots sent on subscription
+            if feed == "orderbook":
+                for pair in pairs:
+                    self._full_books.pop(ntypes.PSymbol(pair.replace("/", "-")), None)
+            await subscribe(self.client, sub_model)
+            replayed.append(feed)
+
+        return Ok(tuple(replayed))
+
+
+    async def _on_reconnect(self, disconnected_at: int):
+        await super()._on_reconnect(disconnected_at)
+        if self.backfill_client is not None:
+            await self.backfill(disconnected_at)
+
+
+    async def backfill(self, since: int):
+        """fetch trades and ohlc since `since` (ms) over REST, and queue them ahead of live messages
+
+        Messages received around `since` may be queued twice (from REST and from the websocket).
+        """
+
+        backfills = [backfill for _sub_model, sub_backfills in self._subs.values() for backfill in sub_backfills]
+        results = await asyncio.gather(*[fetch(self.backfill_client, since) for _queue, fetch in backfills])
+
+        for (queue, _fetch), result in zip(backfills, results):
+            await self._data_queues[queue].put(result)
+
+
+
+    #========================================
+    # BULK SUBSCRIPTION
+
+
+    # kraken documents no limit, keeps messages (and acknowledgement bursts) reasonable
+    _sub_batch_size = 100
+
+
+    def _symbol_to_ws(self, symbols_resp: NoobitResponseSymbols) -> ntypes.SYMBOL_TO_EXCHANGE:
+        # mapping built once per symbols response (called for each symbol of a bulk subscription)
+        cached = getattr(self, "_ws_pairs", None)
+        if cached is None or cached[0] is not symbols_resp:
+            cached = (symbols_resp, {k: f"{v.noobit_base}/{v.noobit_quote}" for k, v in symbols_resp.asset_pairs.items()})
+            self._ws_pairs = cached
+        return cached[1].__getitem__
+
+
+    def _validate_sub_many(self, symbols_resp, feed, symbols, **params):
+        symbol_to_exchange = self._symbol_to_ws(symbols_resp)
+        if feed == "trade":
+            return trades.validate_sub(symbol_to_exchange, symbols)
+        if feed == "spread":
+            return spread.validate_sub(symbol_to_exchange, symbols)
+        if feed == "orderbook":
+            return orderbook.validate_sub(symbol_to_exchange, symbols, params["depth"])
+        if feed == "ohlc":
+            return ohlc.validate_sub(symbol_to_exchange, symbols, params["timeframe"])
+        return Err(ValueError(f"Unknown feed : {feed}"))
+
+
+    def _ack_key(self, symbols_resp, feed, symbol):
+        return self._symbol_to_ws(symbols_resp)(symbol)
+
+
+    async def _subscribe_batch(self, symbols_resp, feed, symbols, sub_model, **params):
+
+        def _backfill(symbol):
+            if feed == "trade":
+                return ("trade", lambda client, since: get_trades_kraken(client, symbol, symbols_resp, since))
+            return ("ohlc", lambda client, since: get_ohlc_kraken(client, symbol, symbols_resp, params["timeframe"], since))
+
+        backfills = [_backfill(symbol) for symbol in symbols] if feed in ["trade", "ohlc"] else []
+        return await self._subscribe(sub_model, *backfills)
+
+
     async def confirm_subscription(self):
 
         msg = await self.client.recv()
@@ -43,13 +183,15 @@ class KrakenWsPublic(BaseWsPublic):
         valid_sub_model = ohlc.validate_sub(symbol_to_exchange, symbol, timeframe)
         if isinstance(valid_sub_model, Err):
             yield valid_sub_model
-        else:
-            sub_result = await subscribe(self.client, valid_sub_model.value)
+            return
 
-        await asyncio.sleep(1)
-        # verify if we have subd
-        if not symbol_to_exchange(symbol) in self._subd_feeds["ohlc"]:
-            print("No symbol in subd ohlc set")
+        # resolved by the subscription status (see `_watch_sub`)
+        sub_result = await self._subscribe(
+            valid_sub_model.value,
+            ("ohlc", lambda client, since: get_ohlc_kraken(client, symbol, symbols_resp, timeframe, since))
+        )
+        if sub_result.is_err():
+            yield sub_result
             return
 
         async for msg in self.aiter_ohlc():
@@ -63,16 +205,16 @@ class KrakenWsPublic(BaseWsPublic):
         symbol_to_exchange = lambda x : {k: f"{v.noobit_base}/{v.noobit_quote}" for k, v in symbols_resp.asset_pairs.items()}[x]
         valid_sub_model = spread.validate_sub(symbol_to_exchange, symbol)
         if isinstance(valid_sub_model, Err):
-           yield valid_sub_model
             # validation error upon subscription
             #? should we yield this in here or push it to a "sub error" queue
             #? or simply log the error
+            yield valid_sub_model
+            return
 
-        sub_result = await subscribe(self.client, valid_sub_model.value)        #type: ignore
         # subscription status is checked by a watcher coro
-
-        await asyncio.sleep(1)
-        if not symbol_to_exchange(symbol) in self._subd_feeds["spread"]:
+        sub_result = await self._subscribe(valid_sub_model.value)
+        if sub_result.is_err():
+            yield sub_result
             return
 
         async for msg in self.aiter_spread():
@@ -87,13 +229,16 @@ class KrakenWsPublic(BaseWsPublic):
         symbol_to_exchange = lambda x : {k: f"{v.noobit_base}/{v.noobit_quote}" for k, v in symbols_resp.asset_pairs.items()}[x]
         valid_sub_model = trades.validate_sub(symbol_to_exchange, symbol)
         if isinstance(valid_sub_model, Err):
-           yield valid_sub_model
+            yield valid_sub_model
+            return
 
-        sub_result = await subscribe(self.client, valid_sub_model.value)        #type: ignore
         # subscription status is checked by a watcher coro
-
-        await asyncio.sleep(1)
-        if not symbol_to_exchange(symbol) in self._subd_feeds["trade"]:
+        sub_result = await self._subscribe(
+            valid_sub_model.value,
+            ("trade", lambda client, since: get_trades_kraken(client, symbol, symbols_resp, since))
+        )
+        if sub_result.is_err():
+            yield sub_result
             return
 
         async for msg in self.aiter_trade():
@@ -116,17 +261,14 @@ class KrakenWsPublic(BaseWsPublic):
 
         if isinstance(valid_sub_model, Err):
             yield valid_sub_model
-        #! replace with: below
+            return
 
-        sub_result = await subscribe(self.client, valid_sub_model.value)        #type: ignore
         # subscription status is checked by a watcher coro
-        
-        await asyncio.sleep(1)
-        if not symbol_to_exchange(symbol) in self._subd_feeds["orderbook"]:
+        sub_result = await self._subscribe(valid_sub_model.value)
+        if sub_result.is_err():
+            yield sub_result
             return
 
-        self._subd_feeds["orderbook"].add(symbol_to_exchange(symbol))
-
         #? should we stream full orderbook ?
         if not aggregate:
             # # stream udpates
@@ -147,7 +289,8 @@ class KrakenWsPublic(BaseWsPublic):
                 sp_q: Result[NoobitResponseSpread, Exception] = await self._data_queues["spread_copy"].get()
 
                 if isinstance(sp_q, Ok):
-                    spreads = sp_q
+                    # compact handlers emit a single `BestBidOffer` instead of a `NoobitResponseSpread`
+                    top = sp_q.value.spread[0] if isinstance(sp_q.value, NoobitResponseSpread) else sp_q.value
                 else:
                     #? how should we handle this
                     raise ValueError("Error in Spread")
@@ -160,7 +303,8 @@ class KrakenWsPublic(BaseWsPublic):
                 # see: https://github.com/dbrgn/result/issues/17#issue-502950927
                 if isinstance(msg, Ok):
 
-                    if _count == 0:
+                    # first message, or first after a reconnect (books are cleared on resubscribe)
+                    if pair_key not in self._full_books:
                         # snapshot
                         print("orderbook snapshot")
                         # TODO exchange shoudl be dynamic (add to model ?)
@@ -176,11 +320,11 @@ class KrakenWsPublic(BaseWsPublic):
                         # filter out 0 values and bids/asks outside of spread
                         self._full_books[pair_key]["asks"] = {
                             k: v for k, v in self._full_books[pair]["asks"].items()
-                            if v > 0 and k >= spreads.value.spread[0].bestAskPrice
+                            if v > 0 and k >= top.bestAskPrice
                         }
                         self._full_books[pair_key]["bids"] = {
                             k: v for k, v in self._full_books[pair]["bids"].items()
-                            if v > 0 and k <= spreads.value.spread[0].bestBidPrice
+                            if v > 0 and k <= top.bestBidPrice
                         }
 
                     _count += 1
@@ -1,25 +1,26 @@
+import typing
 from decimal import Decimal
 from noobit_markets.exchanges.kraken.types import K_TIMEFRAME_FROM_N
 
 from pydantic import ValidationError
 
-import stackprinter                             #type: ignore
-stackprinter.set_excepthook(style="darkbg2")
-
 from noobit_markets.base.ntypes import SYMBOL_TO_EXCHANGE, SYMBOL, TIMEFRAME
-from noobit_markets.base.websockets import KrakenSubModel
+from noobit_markets.base.websockets import KrakenSubModel, as_symbols
 
 from noobit_markets.base.models.rest.response import NoobitResponseOhlc
+from noobit_markets.base.models.events import CandleUpdate
 from noobit_markets.base.models.result import Result, Ok, Err
+from noobit_markets.base.rawjson import apply_rawjson_policy
 
 
 
 
-def validate_sub(symbol_to_exchange: SYMBOL_TO_EXCHANGE, symbol: SYMBOL, timeframe: TIMEFRAME) -> Result[KrakenSubModel, ValidationError]:
+def validate_sub(symbol_to_exchange: SYMBOL_TO_EXCHANGE, symbol: typing.Union[SYMBOL, typing.Sequence[SYMBOL]], timeframe: TIMEFRAME) -> Result[KrakenSubModel, ValidationError]:
 
     msg = {
         "event": "subscribe",
-        "pair": [symbol_to_exchange(symbol), ],
+        # one or many pairs per message
+        "pair": [symbol_to_exchange(s) for s in as_symbols(symbol)],
         "subscription": {"name": "ohlc", "interval": K_TIMEFRAME_FROM_N[timeframe]}
     }
 
@@ -41,7 +42,7 @@ def validate_parsed(msg, parsed_msg):
     try:
         validated_msg = NoobitResponseOhlc(
             ohlc=parsed_msg,
-            rawJson=msg,
+            rawJson=apply_rawjson_policy(msg),
             exchange="KRAKEN"
             )
         return Ok(validated_msg)
@@ -75,3 +76,25 @@ def parse_msg(message):
 
     return parsed_ohlc
 
+
+
+def parse_event(message, keep_raw: bool = False):
+    """compact alternative to `parse_msg` + `validate_parsed`, used by msg_handler in routing.py
+    """
+
+    pair = message[3]
+    # [time, etime, open, high, low, close, vwap, volume, count]
+    candle = message[1]
+
+    return CandleUpdate(
+        exchange="KRAKEN",
+        symbol=pair.replace("/", "-"),
+        utcTime=int(float(candle[0])*10**3),
+        open=Decimal(candle[2]),
+        high=Decimal(candle[3]),
+        low=Decimal(candle[4]),
+        close=Decimal(candle[5]),
+        volume=Decimal(candle[7]),
+        trdCount=candle[8],
+        rawJson=message if keep_raw else None
+    )
@@ -1,18 +1,23 @@
+import typing
 import time
+from decimal import Decimal
 
 from pydantic import ValidationError
 
 from noobit_markets.base.ntypes import SYMBOL_TO_EXCHANGE, SYMBOL, DEPTH
-from noobit_markets.base.websockets import KrakenSubModel
+from noobit_markets.base.websockets import KrakenSubModel, as_symbols
 from noobit_markets.base.models.result import Result, Ok, Err
+from noobit_markets.base.rawjson import apply_rawjson_policy
 from noobit_markets.base.models.rest.response import NoobitResponseOrderBook
+from noobit_markets.base.models.events import BookDelta
 
 
-def validate_sub(symbol_to_exchange: SYMBOL_TO_EXCHANGE, symbol: SYMBOL, depth: DEPTH) -> Result[KrakenSubModel, ValidationError]:
+def validate_sub(symbol_to_exchange: SYMBOL_TO_EXCHANGE, symbol: typing.Union[SYMBOL, typing.Sequence[SYMBOL]], depth: DEPTH) -> Result[KrakenSubModel, ValidationError]:
 
     msg = {
         "event": "subscribe",
-        "pair": [symbol_to_exchange(symbol), ],
+        # one or many pairs per message
+        "pair": [symbol_to_exchange(s) for s in as_symbols(symbol)],
         "subscription": {"name": "book", "depth": depth}
     }
 
@@ -32,12 +37,20 @@ def validate_sub(symbol_to_exchange: SYMBOL_TO_EXCHANGE, symbol: SYMBOL, depth:
 
 
 def validate_parsed(msg, parsed_msg):
+    return validate_with_rawjson(apply_rawjson_policy(msg), parsed_msg)
+
+
+def validate_with_rawjson(raw_json, parsed_msg):
+    """same as `validate_parsed`, with the rawJson policy already applied
+
+    Used when validation is offloaded : the policy has to be applied on the loop (context vars, rawJson store)
+    """
 
     try:
         validated_msg = NoobitResponseOrderBook(
             **parsed_msg,
             utcTime=time.time() * 10**3,
-            rawJson=msg,
+            rawJson=raw_json,
             exchange="KRAKEN"
         )
         return Ok(validated_msg)
@@ -103,4 +116,38 @@ def parse_update(info, pair):
     except Exception as e:
         raise e
 
-    return parsed_update
\ No newline at end of file
+    return parsed_update
+
+
+def parse_event(message, keep_raw: bool = False):
+    """compact alternative to `parse_msg` + `validate_parsed`, used by msg_handler in routing.py
+    """
+
+    pair = message[-1].replace("/", "-")
+
+    # updates for both sides are sent as two separate dicts:
+    #   [channelID, {"a": [...]}, {"b": [...]}, "book-10", "XBT/USD"]
+    asks: dict = {}
+    bids: dict = {}
+    is_snapshot = False
+
+    for info in message[1:-2]:
+        if "as" in info:
+            is_snapshot = True
+            asks.update({Decimal(item[0]): Decimal(item[1]) for item in info["as"]})
+            bids.update({Decimal(item[0]): Decimal(item[1]) for item in info["bs"]})
+        else:
+            if "a" in info:
+                asks.update({Decimal(item[0]): Decimal(item[1]) for item in info["a"]})
+            if "b" in info:
+                bids.update({Decimal(item[0]): Decimal(item[1]) for item in info["b"]})
+
+    return BookDelta(
+        exchange="KRAKEN",
+        symbol=pair,
+        utcTime=int(time.time() * 10**3),
+        asks=asks,
+        bids=bids,
+        isSnapshot=is_snapshot,
+        rawJson=message if keep_raw else None
+    )
@@ -3,83 +3,229 @@ import json
 import time
 import typing
 
+from noobit_markets.base.models.result import Ok
+from noobit_markets.base.offload import offload, payload_size
+from noobit_markets.base.rawjson import apply_rawjson_policy
+
 from noobit_markets.exchanges.kraken.websockets.public import ohlc
 
 from . import trades, spread, orderbook
 
 # just for type hints
 _t_qdict = typing.Dict[str, asyncio.Queue]
+_t_handler = typing.Callable[[list, _t_qdict], typing.Coroutine[typing.Any, typing.Any, None]]
 
-# TODO separate data_queues and status_queues ????
-async def msg_handler(msg, data_queues: _t_qdict, status_queues: _t_qdict):
-    """
-    forward to appropriate asyncio queue
-    """
 
-    if "systemStatus" in msg:
-        await status_queues["connection"].put(json.loads(msg))
 
-    elif "subscriptionStatus" in msg:
-        await status_queues["subscription"].put(json.loads(msg))
 
+# ============================================================
+# FEED HANDLERS
+# ============================================================
 
-    elif "heartbeat" in msg:
 
-        # messages will normally not be consumed
-        if status_queues["heartbeat"].full():
-            await status_queues["heartbeat"].get()
+async def _ohlc_validated(msg, data_queues: _t_qdict):
+    parsed_msg = ohlc.parse_msg(msg)
+    valid_parsed_msg = ohlc.validate_parsed(msg, parsed_msg)
+    if valid_parsed_msg.is_ok():
+        await data_queues["ohlc"].put(valid_parsed_msg)
+    else:
+        print("Validation Error", valid_parsed_msg.value)
 
-        # message is just {"event": "heartbeat"}
-        # put timestamp instead
-        await status_queues["heartbeat"].put(time.time() * 10**3)
 
+#! needs to send message to be read by orderbook q
+#! so we can determine the top bid/ask
 
+#? should we create a specific queue for topbid/ask that would be read here, in if book statement ??
+#? we essentially want to consume the same msg in queue, twice (spread async for and book)
+async def _spread_validated(msg, data_queues: _t_qdict):
+    parsed_msg = spread.parse_msg(msg)
+    valid_parsed_msg = spread.validate_parsed(msg, parsed_msg)
+    if valid_parsed_msg.is_ok():
+        await data_queues["spread"].put(valid_parsed_msg)
+
+        # we use this to reconstruct orderbook since invalid levels arent deleted
+        await data_queues["spread_copy"].put(valid_parsed_msg)
+
+    #TODO else we should log the message ?
+
+
+async def _book_validated(msg, data_queues: _t_qdict):
+    parsed_msg = orderbook.parse_msg(msg)
+    # snapshots for deep books are large enough to stall the loop
+    # policy needs to be applied in this process (context vars, rawJson store)
+    valid_parsed_msg = await offload(
+        orderbook.validate_with_rawjson, apply_rawjson_policy(msg), parsed_msg, size=payload_size(msg)
+    )
+    if valid_parsed_msg.is_ok():
+
+        # top_spreads = await data_queues["spread_copy"].get()
+        await data_queues["orderbook"].put(valid_parsed_msg)
+
+
+async def _trade_validated(msg, data_queues: _t_qdict):
+    parsed_msg = trades.parse_msg(msg)
+    valid_parsed_msg = trades.validate_parsed(msg, parsed_msg)
+    if valid_parsed_msg.is_ok():
+        await data_queues["trade"].put(valid_parsed_msg)
+
+
+def _compact_handlers(keep_raw: bool) -> typing.Dict[str, _t_handler]:
+
+    async def _ohlc(msg, data_queues: _t_qdict):
+        await data_queues["ohlc"].put(Ok(ohlc.parse_event(msg, keep_raw)))
+
+    async def _spread(msg, data_queues: _t_qdict):
+        bbo = Ok(spread.parse_event(msg, keep_raw))
+        await data_queues["spread"].put(bbo)
+        # we use this to reconstruct orderbook since invalid levels arent deleted
+        await data_queues["spread_copy"].put(bbo)
+
+    async def _book(msg, data_queues: _t_qdict):
+        await data_queues["orderbook"].put(Ok(orderbook.parse_event(msg, keep_raw)))
+
+    async def _trade(msg, data_queues: _t_qdict):
+        for tick in trades.parse_event(msg, keep_raw):
+            await data_queues["trade"].put(Ok(tick))
+
+    return {"ohlc": _ohlc, "spread": _spread, "book": _book, "trade": _trade}
+
+
+async def _ignore(msg, data_queues: _t_qdict):
+    return
+
+
+_VALIDATED_HANDLERS: typing.Dict[str, _t_handler] = {
+    "ohlc": _ohlc_validated,
+    "spread": _spread_validated,
+    "book": _book_validated,
+    "trade": _trade_validated,
+}
+
+
+def _feed_key(channel_name: str) -> str:
+    # channel names are suffixed with params for book and ohlc (e.g "book-10", "ohlc-5")
+    return channel_name.split("-", 1)[0]
+
+
+
+
+# ============================================================
+# ROUTER
+# ============================================================
+
+
+class KrakenMsgRouter(object):
+    """msg_handler dispatching data frames by channelID
+
+    Each frame is parsed exactly once. The channelID -> (feed, pair, handler) table is
+    built from `subscriptionStatus` replies, so data frames only need an int lookup.
+
+    Channel IDs are connection specific: use one router per websocket connection.
+
+    Args:
+        compact: emit slotted events from `base.models.events` (one per trade/update)
+            instead of validated pydantic responses
+        keep_raw: retain the original message under `rawJson` (compact mode only,
+            pydantic responses always carry it)
+    """
+
+    def __init__(self, compact: bool = False, keep_raw: bool = True):
+        self._handlers = _compact_handlers(keep_raw) if compact else _VALIDATED_HANDLERS
+        self._channels: typing.Dict[int, typing.Tuple[str, str, _t_handler]] = {}
+
+
+    @property
+    def channels(self) -> typing.Mapping[int, typing.Tuple[str, str, _t_handler]]:
+        return self._channels
+
+
+    async def __call__(self, msg: str, data_queues: _t_qdict, status_queues: _t_qdict):
 
-    else:
         msg = json.loads(msg)
-        feed = msg[-2]
 
-        if feed == "ticker":
+        if isinstance(msg, list):
+            try:
+                _feed, _pair, handler = self._channels[msg[0]]
+            except KeyError:
+                # frame received before its subscriptionStatus (or channel not announced)
+                # dispatch on channel name but dont cache, channelID might not be unique yet
+                handler = self._handlers.get(_feed_key(msg[-2]), _ignore)
+            await handler(msg, data_queues)
             return
 
-        if feed.startswith("ohlc"):
-            parsed_msg = ohlc.parse_msg(msg)
-            valid_parsed_msg = ohlc.validate_parsed(msg, parsed_msg)
-            if valid_parsed_msg.is_ok():
-                await data_queues["ohlc"].put(valid_parsed_msg)
-            else:
-                print("Validation Error", valid_parsed_msg.value)
-                
+        event = msg.get("event")
+
+        if event == "heartbeat":
+
+            # messages will normally not be consumed
+            if status_queues["heartbeat"].full():
+                await status_queues["heartbeat"].get()
 
-        #! needs to send message to be read by orderbook q
-        #! so we can determine the top bid/ask
+            # message is just {"event": "heartbeat"}
+            # put timestamp instead
+            await status_queues["heartbeat"].put(time.time() * 10**3)
 
-        #? should we create a specific queue for topbid/ask that would be read here, in if book statement ??
-        #? we essentially want to consume the same msg in queue, twice (spread async for and book)
+        elif event == "subscriptionStatus":
+            channel_id = msg.get("channelID")
+            if channel_id is not None:
+                if msg["status"] == "subscribed":
+                    self._register(channel_id, msg["channelName"], msg["pair"])
+                elif msg["status"] == "unsubscribed":
+                    self._channels.pop(channel_id, None)
+            await status_queues["subscription"].put(msg)
 
-        if feed == "spread":
-            parsed_msg = spread.parse_msg(msg)
-            valid_parsed_msg = spread.validate_parsed(msg, parsed_msg)
-            if valid_parsed_msg.is_ok():
-                await data_queues["spread"].put(valid_parsed_msg)
+        elif event == "systemStatus":
+            await status_queues["connection"].put(msg)
 
-                # we use this to reconstruct orderbook since invalid levels arent deleted
-                await data_queues["spread_copy"].put(valid_parsed_msg)
 
-            #TODO else we should log the message ?
+    def reset(self):
+        """forget channels, for a new connection (channelIDs are assigned again on resubscription)
+        """
+        self._channels.clear()
 
-        if feed.startswith("book"):
-            parsed_msg = orderbook.parse_msg(msg)
-            valid_parsed_msg = orderbook.validate_parsed(msg, parsed_msg)
-            if valid_parsed_msg.is_ok():
 
-                # top_spreads = await data_queues["spread_copy"].get()
-                await data_queues["orderbook"].put(valid_parsed_msg)
+    def _register(self, channel_id: int, channel_name: str, pair: str):
+        feed = _feed_key(channel_name)
+        self._channels[channel_id] = (feed, pair, self._handlers.get(feed, _ignore))
 
-        if feed == "trade":
-            parsed_msg = trades.parse_msg(msg)
-            valid_parsed_msg = trades.validate_parsed(msg, parsed_msg)
-            if valid_parsed_msg.is_ok():
-                await data_queues["trade"].put(valid_parsed_msg)
 
 
+
+def make_msg_handler(compact: bool = False, keep_raw: bool = True) -> KrakenMsgRouter:
+    """return a msg_handler, see `KrakenMsgRouter`
+    """
+    return KrakenMsgRouter(compact, keep_raw)
+
+
+# TODO separate data_queues and status_queues ????
+async def msg_handler(msg, data_queues: _t_qdict, status_queues: _t_qdict):
+    """
+    forward to appropriate asyncio queue
+
+    stateless handler (can be shared across connections), dispatches on channel name
+    prefer `KrakenMsgRouter` for a per connection channelID table
+    """
+
+    msg = json.loads(msg)
+
+    if isinstance(msg, list):
+        await _VALIDATED_HANDLERS.get(_feed_key(msg[-2]), _ignore)(msg, data_queues)
+        return
+
+    event = msg.get("event")
+
+    if event == "systemStatus":
+        await status_queues["connection"].put(msg)
+
+    elif event == "subscriptionStatus":
+        await status_queues["subscription"].put(msg)
+
+    elif event == "heartbeat":
+
+        # messages will normally not be consumed
+        if status_queues["heartbeat"].full():
+            await status_queues["heartbeat"].get()
+
+        # message is just {"event": "heartbeat"}
+        # put timestamp instead
+        await status_queues["heartbeat"].put(time.time() * 10**3)
@@ -1,24 +1,25 @@
+import typing
 from decimal import Decimal
 
 from pydantic import ValidationError
 
-import stackprinter         #type: ignore
-stackprinter.set_excepthook(style="darkbg2")
-
 from noobit_markets.base.ntypes import SYMBOL_TO_EXCHANGE, SYMBOL
-from noobit_markets.base.websockets import KrakenSubModel
+from noobit_markets.base.websockets import KrakenSubModel, as_symbols
 
 from noobit_markets.base.models.rest.response import NoobitResponseSpread
+from noobit_markets.base.models.events import BestBidOffer
 from noobit_markets.base.models.result import Result, Ok, Err
+from noobit_markets.base.rawjson import apply_rawjson_policy
 
 
 
 
-def validate_sub(symbol_to_exchange: SYMBOL_TO_EXCHANGE, symbol: SYMBOL) -> Result[KrakenSubModel, ValidationError]:
+def validate_sub(symbol_to_exchange: SYMBOL_TO_EXCHANGE, symbol: typing.Union[SYMBOL, typing.Sequence[SYMBOL]]) -> Result[KrakenSubModel, ValidationError]:
 
     msg = {
         "event": "subscribe",
-        "pair": [symbol_to_exchange(symbol), ],
+        # one or many pairs per message
+        "pair": [symbol_to_exchange(s) for s in as_symbols(symbol)],
         "subscription": {"name": "spread"}
     }
 
@@ -42,7 +43,7 @@ def validate_parsed(msg, parsed_msg):
     try:
         validated_msg = NoobitResponseSpread(
             spread=(parsed_msg,),
-            rawJson=msg,
+            rawJson=apply_rawjson_policy(msg),
             exchange="KRAKEN"
         )
         return Ok(validated_msg)
@@ -65,3 +66,22 @@ def parse_msg(message):
 
     except Exception as e:
         raise e
+
+
+def parse_event(message, keep_raw: bool = False):
+    """compact alternative to `parse_msg` + `validate_parsed`, used by msg_handler in routing.py
+    """
+
+    # [bid, ask, timestamp, bidVolume, askVolume]
+    info = message[1]
+
+    return BestBidOffer(
+        exchange="KRAKEN",
+        symbol=message[-1].replace("/", "-"),
+        utcTime=int(float(info[2])*10**3),
+        bestBidPrice=Decimal(info[0]),
+        bestAskPrice=Decimal(info[1]),
+        bestBidQty=Decimal(info[3]) if len(info) > 3 else None,
+        bestAskQty=Decimal(info[4]) if len(info) > 4 else None,
+        rawJson=message if keep_raw else None
+    )
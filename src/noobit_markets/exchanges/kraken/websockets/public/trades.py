@@ -1,24 +1,25 @@
+import typing
 from decimal import Decimal
 
 from pydantic import ValidationError
 
-import stackprinter                             #type: ignore
-stackprinter.set_excepthook(style="darkbg2")
-
 from noobit_markets.base.ntypes import SYMBOL_TO_EXCHANGE, SYMBOL
-from noobit_markets.base.websockets import KrakenSubModel
+from noobit_markets.base.websockets import KrakenSubModel, as_symbols
 
 from noobit_markets.base.models.rest.response import NoobitResponseTrades
+from noobit_markets.base.models.events import TradeTick
 from noobit_markets.base.models.result import Result, Ok, Err
+from noobit_markets.base.rawjson import apply_rawjson_policy
 
 
 
 
-def validate_sub(symbol_to_exchange: SYMBOL_TO_EXCHANGE, symbol: SYMBOL) -> Result[KrakenSubModel, ValidationError]:
+def validate_sub(symbol_to_exchange: SYMBOL_TO_EXCHANGE, symbol: typing.Union[SYMBOL, typing.Sequence[SYMBOL]]) -> Result[KrakenSubModel, ValidationError]:
 
     msg = {
         "event": "subscribe",
-        "pair": [symbol_to_exchange(symbol), ],
+        # one or many pairs per message
+        "pair": [symbol_to_exchange(s) for s in as_symbols(symbol)],
         "subscription": {"name": "trade"}
     }
 
@@ -42,7 +43,7 @@ def validate_parsed(msg, parsed_msg):
     try:
         validated_msg = NoobitResponseTrades(
             trades=parsed_msg,
-            rawJson=msg,
+            rawJson=apply_rawjson_policy(msg),
             exchange="KRAKEN"
             )
         return Ok(validated_msg)
@@ -80,7 +81,32 @@ def _parse_single(info, pair):
             "avgPx": info[0],
             "cumQty": info[1],
             "grossTradeAmt": Decimal(info[0]) * Decimal(info[1]),
-            "transactTime": Decimal(info[2])*10**9,
+            # noobit timestamp = ms
+            "transactTime": int(Decimal(info[2])*10**3),
         }
 
-    return parsed_trade
\ No newline at end of file
+    return parsed_trade
+
+
+
+def parse_event(message, keep_raw: bool = False):
+    """compact alternative to `parse_msg` + `validate_parsed`, used by msg_handler in routing.py
+    """
+
+    pair = message[3].replace("/", "-")
+    raw = message if keep_raw else None
+
+    return [
+        TradeTick(
+            exchange="KRAKEN",
+            symbol=pair,
+            side="BUY" if (info[3] == "b") else "SELL",
+            ordType="MARKET" if (info[4] == "m") else "LIMIT",
+            avgPx=Decimal(info[0]),
+            cumQty=Decimal(info[1]),
+            # noobit timestamp = ms
+            transactTime=int(float(info[2])*10**3),
+            rawJson=raw
+        )
+        for info in message[1]
+    ]
@@ -855,7 +855,7 @@ class NoobitCLI:
 
     async def connect(self):
         import websockets
-        from noobit_markets.exchanges.kraken.websockets.public.routing import msg_handler
+        from noobit_markets.exchanges.kraken.websockets.public.routing import KrakenMsgRouter
         from noobit_markets.exchanges.kraken.websockets.public.api import KrakenWsPublic
 
         
@@ -868,7 +868,7 @@ class NoobitCLI:
 
         #! only connect Kraken for now
         client = await websockets.connect("wss://ws.kraken.com")
-        self.ws["KRAKEN"] = KrakenWsPublic(client, msg_handler, self.loop, feed_map)
+        self.ws["KRAKEN"] = KrakenWsPublic(client, KrakenMsgRouter(), self.loop, feed_map)
 
         self.log(client)
 
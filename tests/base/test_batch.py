@@ -0,0 +1,63 @@
+import asyncio
+
+import pytest
+
+from noobit_markets.base.batch import RateLimiter, batch_new_orders, batch_cancel
+from noobit_markets.base.models.result import Ok, Err
+
+
+@pytest.mark.asyncio
+async def test_batch_new_orders_keeps_order_and_isolates_errors():
+
+    async def new_order(client, symbol, symbols_resp, side, price, **kwargs):
+        # later orders complete first
+        await asyncio.sleep(0.01 / price)
+        if price == 2:
+            raise ValueError("boom")
+        if price == 3:
+            return Err(KeyError(price))
+        return Ok((symbol, side, price, kwargs["logger"]))
+
+    orders = [{"symbol": "XBT-USD", "side": "buy", "price": p} for p in (1, 2, 3, 4)]
+    results = await batch_new_orders(new_order, None, "symbols", orders, logger="log")
+
+    assert [r.is_ok() for r in results] == [True, False, False, True]
+    assert results[0].value == ("XBT-USD", "buy", 1, "log")
+    assert isinstance(results[1].value, ValueError)
+    assert results[3].value[2] == 4
+
+
+@pytest.mark.asyncio
+async def test_batch_cancel_respects_limiter():
+
+    in_flight = 0
+    max_in_flight = 0
+
+    async def cancel(client, symbol, symbols_resp, orderID, **kwargs):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return Ok(orderID)
+
+    orders = [("XBT-USD", str(i)) for i in range(20)]
+    results = await batch_cancel(cancel, None, "symbols", orders, limiter=RateLimiter(max_concurrent=3))
+
+    assert [r.value for r in results] == [str(i) for i in range(20)]
+    assert max_in_flight == 3
+
+
+@pytest.mark.asyncio
+async def test_ratelimiter_interval():
+
+    limiter = RateLimiter(max_concurrent=10, interval=0.02)
+    starts = []
+
+    async def _req():
+        async with limiter:
+            starts.append(asyncio.get_event_loop().time())
+
+    await asyncio.gather(*[_req() for _ in range(4)])
+    gaps = [b - a for a, b in zip(starts, starts[1:])]
+    assert all(gap >= 0.015 for gap in gaps)
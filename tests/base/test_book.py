@@ -0,0 +1,90 @@
+import asyncio
+from decimal import Decimal as D
+
+import pytest
+from pyrsistent import pmap
+
+from noobit_markets.base.book import ConsolidatedBook, ConsolidatedBooks
+from noobit_markets.base.models.result import Err
+from noobit_markets.base.models.rest.response import NoobitResponseOrderBook
+from noobit_markets.base.request import _validate_data
+
+
+def _book(exchange, asks, bids, utcTime=1):
+    return _validate_data(NoobitResponseOrderBook, pmap({
+        "exchange": exchange,
+        "symbol": "XBT-USD",
+        "utcTime": utcTime,
+        "rawJson": {},
+        "asks": asks,
+        "bids": bids,
+    }))
+
+
+def test_merge_with_venue_attribution():
+    book = ConsolidatedBook("XBT-USD")
+    book.apply_snapshot("KRAKEN", {D(101): D(1), D(102): D(2)}, {D(99): D(1)})
+    book.apply_snapshot("BINANCE", {D("101.0"): D(3), D(103): D(1)}, {D(100): D(5)})
+
+    price, venues = book.best_ask()
+    assert price == D(101) and dict(venues) == {"KRAKEN": D(1), "BINANCE": D(3)}
+    assert book.depth_at("asks", D(101)) == D(4)
+
+    price, venues = book.best_bid()
+    assert price == D(100) and dict(venues) == {"BINANCE": D(5)}
+    assert book.spread() == D(1)
+
+    assert [level[0] for level in book.levels("asks")] == [D(101), D(102), D(103)]
+    assert [level[0] for level in book.levels("bids", 1)] == [D(100)]
+
+
+def test_snapshot_is_diffed_against_previous_venue_book():
+    book = ConsolidatedBook("XBT-USD")
+    book.apply_snapshot("KRAKEN", {D(101): D(1)}, {D(99): D(1)})
+    book.apply_snapshot("BINANCE", {D(101): D(2)}, {})
+
+    # level vanished from kraken book, binance volume stays
+    book.apply_snapshot("KRAKEN", {D(102): D(1)}, {D(99): D(2)})
+    assert dict(book.venues_at("asks", D(101))) == {"BINANCE": D(2)}
+    assert book.depth_at("asks", D(102)) == D(1)
+    assert book.depth_at("bids", D(99)) == D(2)
+
+
+def test_deltas_and_venue_removal():
+    book = ConsolidatedBook("XBT-USD")
+    book.apply_snapshot("KRAKEN", {D(101): D(1)}, {D(99): D(1)})
+    book.apply_snapshot("BINANCE", {D(100): D(1)}, {D(98): D(1)})
+
+    book.apply_update("BINANCE", {D(100): D(0), D(101): D(1)}, {})
+    assert book.best_ask()[0] == D(101)
+    assert book.depth_at("asks", D(101)) == D(2)
+
+    book.remove_venue("KRAKEN")
+    assert book.venues == ("BINANCE",)
+    assert book.best_bid()[0] == D(98)
+    assert dict(book.best_ask()[1]) == {"BINANCE": D(1)}
+
+    book.remove_venue("BINANCE")
+    assert book.best_ask() is None and book.spread() is None
+
+
+@pytest.mark.asyncio
+async def test_consume_streams():
+    books = ConsolidatedBooks()
+
+    async def stream(exchange, price):
+        yield _book(exchange, {D(price): D(1)}, {D(price - 2): D(1)})
+        yield Err(ValueError("skipped"))
+        await asyncio.sleep(0.05)
+
+    kraken = asyncio.ensure_future(books.consume(stream("KRAKEN", 101)))
+    binance = asyncio.ensure_future(books.consume(stream("BINANCE", 100)))
+    await asyncio.sleep(0.01)
+
+    assert books["XBT-USD"].best_ask()[0] == D(100)
+    assert books["XBT-USD"].best_bid()[0] == D(99)
+    assert set(books["XBT-USD"].venues) == {"KRAKEN", "BINANCE"}
+
+    await asyncio.gather(kraken, binance)
+    # ended streams are stale
+    assert books["XBT-USD"].venues == ()
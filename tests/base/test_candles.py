@@ -0,0 +1,120 @@
+import asyncio
+import time
+from decimal import Decimal as D
+
+import pytest
+
+from noobit_markets.base.candles import CandleBuilder, aiter_candles, timeframe_ms
+from noobit_markets.base.models.events import TradeTick, CandleUpdate
+from noobit_markets.base.models.result import Ok, Err
+
+
+def _tick(price, qty, ts, symbol="XBT-USD"):
+    return TradeTick("KRAKEN", symbol, "BUY", "MARKET", D(price), D(qty), ts)
+
+
+def test_timeframe_ms():
+    assert timeframe_ms("15S") == 15_000
+    assert timeframe_ms("1m") == 60_000
+    assert timeframe_ms("4H") == 4 * 3_600_000
+    with pytest.raises(ValueError):
+        timeframe_ms("0M")
+    with pytest.raises(ValueError):
+        timeframe_ms("1Y")
+
+
+def test_time_bars():
+    builder = CandleBuilder("XBT-USD", timeframe="1M")
+
+    assert builder.add(D(10), D(1), 60_000) == []
+    assert builder.add(D(12), D(1), 61_000) == []
+    assert builder.add(D(9), D(2), 119_999) == []
+
+    closed = builder.add(D(11), D(1), 125_000)
+    assert len(closed) == 1
+    bar = closed[0].value
+    assert (bar.utcTime, bar.open, bar.high, bar.low, bar.close) == (60_000, 10, 12, 9, 9)
+    assert (bar.volume, bar.trdCount) == (4, 3)
+
+    # late trade for a closed bar
+    assert builder.add(D(1), D(1), 100_000) == []
+    assert builder.late == 1
+
+    assert builder.flush(now=119_999) is None
+    assert builder.flush(now=180_000).value.utcTime == 120_000
+    assert not builder.is_open
+
+
+def test_volume_bars_split_trades():
+    builder = CandleBuilder("XBT-USD", volume=D(2))
+
+    assert builder.add(D(10), D(1), 1) == []
+    closed = builder.add(D(11), D("3.5"), 2)
+    assert [bar.value.volume for bar in closed] == [2, 2]
+    assert closed[0].value.open == 10 and closed[1].value.open == 11
+    assert builder.partial().volume == D("0.5")
+
+
+def test_tick_bars():
+    builder = CandleBuilder("XBT-USD", ticks=2)
+    assert builder.add(D(1), D(1), 1) == []
+    closed = builder.add(D(2), D(1), 2)
+    assert closed[0].value.trdCount == 2 and closed[0].value.close == 2
+
+
+@pytest.mark.asyncio
+async def test_aiter_candles_partial_and_errors():
+
+    async def stream():
+        yield Ok([_tick(10, 1, 1), _tick(11, 1, 2)])
+        yield Err(ValueError("passed through"))
+        yield Ok(_tick(12, 1, 3, symbol="ETH-USD"))
+        yield Ok(_tick(13, 1, 4))
+
+    msgs = [msg async for msg in aiter_candles(stream(), ticks=3, partial=True)]
+    values = [msg.value for msg in msgs]
+
+    assert isinstance(values[0], CandleUpdate) and values[0].trdCount == 2
+    assert isinstance(values[1], ValueError)
+    assert values[2].symbol == "ETH-USD"
+    # third kraken trade closes the bar
+    assert values[3].trdCount == 3 and values[3].close == 13
+    # stream ended, open eth bar is flushed
+    assert values[-1].symbol == "ETH-USD" and values[-1].trdCount == 1
+
+
+@pytest.mark.asyncio
+async def test_time_bar_closes_on_clock():
+    now = int(time.time()*10**3)
+
+    async def stream():
+        yield Ok(_tick(10, 1, now))
+        await asyncio.sleep(3)
+
+    started = time.monotonic()
+    candles = aiter_candles(stream(), timeframe="1S", grace=0)
+    first = await candles.__anext__()
+    # emitted on bar close, before the next trade (or the end of the stream)
+    assert time.monotonic() - started < 2
+    assert first.value.utcTime == now - now % 1000
+    await candles.aclose()
+
+
+@pytest.mark.asyncio
+async def test_aiter_candles_validated_trades():
+    from pyrsistent import pmap
+    from noobit_markets.base.request import _validate_data
+    from noobit_markets.base.models.rest.response import NoobitResponseTrades
+
+    trade = {
+        "trdMatchID": None, "orderID": None, "symbol": "XBT-USD", "side": "BUY", "ordType": "MARKET",
+        "avgPx": 10, "cumQty": 1, "grossTradeAmt": 10, "transactTime": 1,
+    }
+    resp = _validate_data(NoobitResponseTrades, pmap({"exchange": "KRAKEN", "rawJson": {}, "trades": (trade, trade)}))
+    assert resp.is_ok()
+
+    async def stream():
+        yield resp
+
+    msgs = [msg async for msg in aiter_candles(stream(), ticks=5, partial=True)]
+    assert msgs[0].value.exchange == "KRAKEN" and msgs[0].value.trdCount == 2
@@ -0,0 +1,53 @@
+import json
+import subprocess
+import sys
+import time
+
+
+# optional at runtime, must not be imported just by importing an endpoint or auth module
+HEAVY = ("dotenv", "stackprinter", "tabulate", "websockets")
+
+
+def _import_in_subprocess(stmt: str) -> dict:
+    code = (
+        "import sys, json, time\n"
+        "hook = sys.excepthook\n"
+        "start = time.perf_counter()\n"
+        f"{stmt}\n"
+        "elapsed = time.perf_counter() - start\n"
+        "print(json.dumps({'modules': sorted(sys.modules), 'hook_changed': sys.excepthook is not hook, 'elapsed': elapsed}))\n"
+    )
+    out = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout
+    return json.loads(out.splitlines()[-1])
+
+
+def test_rest_endpoint_import_is_light():
+    res = _import_in_subprocess("from noobit_markets.exchanges.kraken.rest.public import get_ohlc_kraken")
+
+    assert not res["hook_changed"]
+    assert not [m for m in res["modules"] if m.split(".")[0] in HEAVY]
+    # only the requested endpoint is imported
+    assert "noobit_markets.exchanges.kraken.rest.public.ohlc" in res["modules"]
+    assert "noobit_markets.exchanges.kraken.rest.public.trades" not in res["modules"]
+
+
+def test_ws_modules_have_no_side_effects():
+    res = _import_in_subprocess("import noobit_markets.exchanges.kraken.websockets.public.api")
+    assert not res["hook_changed"]
+    assert "stackprinter" not in res["modules"]
+
+
+def test_auth_does_not_read_env_on_construction():
+    res = _import_in_subprocess(
+        "from noobit_markets.exchanges.kraken.rest.auth import KrakenAuth\n"
+        "assert KrakenAuth().key_pairs_dq is None"
+    )
+    assert "dotenv" not in res["modules"]
+
+
+def test_import_time_budget():
+    # generous bound, guards against eager imports creeping back in (typically well under 1s)
+    start = time.perf_counter()
+    res = _import_in_subprocess("from noobit_markets.exchanges.kraken.rest.private import get_balances_kraken")
+    assert res["elapsed"] < 3
+    assert time.perf_counter() - start < 10
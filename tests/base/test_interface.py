@@ -0,0 +1,46 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+from noobit_markets.base.lazy import LazyNamespace
+from noobit_markets.base.models.interface import ExchangeInterface
+from noobit_markets.exchanges import KRAKEN, BINANCE, FTX
+
+
+@pytest.mark.parametrize("interface", [KRAKEN, BINANCE, FTX])
+def test_interfaces_validate(interface):
+    # what used to run at import time, every path must resolve to a valid callable
+    ExchangeInterface(**interface.resolve())
+
+
+def test_resolved_once_and_cached():
+    ns = LazyNamespace("TEST", a={"join": "os.path:join", "missing": None})
+
+    assert not ns.a.is_resolved("join")
+    first = ns.a.join
+    assert ns.a.is_resolved("join")
+    assert ns.a.join is first
+    assert ns.a.missing is None
+
+    with pytest.raises(AttributeError):
+        ns.a.unknown
+    with pytest.raises(AttributeError):
+        ns.a.join = None
+
+
+def test_only_accessed_interface_is_loaded():
+    code = (
+        "import sys, json\n"
+        "from noobit_markets.exchanges import BINANCE\n"
+        "BINANCE.rest.public.ohlc\n"
+        "print(json.dumps(sorted(sys.modules)))\n"
+    )
+    modules = json.loads(subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout)
+    loaded = [m for m in modules if m.startswith("noobit_markets.exchanges.")]
+
+    assert "noobit_markets.exchanges.binance.rest.public.ohlc" in loaded
+    assert not [m for m in loaded if m.startswith(("noobit_markets.exchanges.kraken", "noobit_markets.exchanges.ftx"))]
+    assert not [m for m in loaded if ".rest.private" in m or ".websockets" in m]
+    assert "noobit_markets.base.models.interface" not in modules
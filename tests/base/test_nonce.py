@@ -0,0 +1,73 @@
+import multiprocessing
+import threading
+
+from noobit_markets.base.auth import make_base
+from noobit_markets.base.nonce import LocalNonceSource, FileNonceSource, NonceServer, RemoteNonceSource
+
+
+def _draw_file_nonces(path, n, queue):
+    source = FileNonceSource(path)
+    queue.put([source.next_nonce("KRAKEN") for _ in range(n)])
+
+
+def test_local_source_increasing():
+    source = LocalNonceSource()
+    nonces = [source.next_nonce("KRAKEN") for _ in range(1000)]
+    assert all(b > a for a, b in zip(nonces, nonces[1:]))
+    assert [source.next_key("KRAKEN", 3) for _ in range(4)] == [0, 1, 2, 0]
+
+
+def test_file_source_across_processes(tmp_path):
+    path = str(tmp_path / "nonces.json")
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    procs = [ctx.Process(target=_draw_file_nonces, args=(path, 200, queue)) for _ in range(4)]
+    for p in procs:
+        p.start()
+    drawn = [queue.get(timeout=30) for _ in procs]
+    for p in procs:
+        p.join()
+
+    for nonces in drawn:
+        assert all(b > a for a, b in zip(nonces, nonces[1:]))
+    flat = [n for nonces in drawn for n in nonces]
+    assert len(set(flat)) == len(flat)
+
+
+def test_server_source():
+    with NonceServer() as server:
+        source = RemoteNonceSource(server.address)
+        drawn = []
+
+        def draw():
+            drawn.extend(source.next_nonce("KRAKEN") for _ in range(100))
+
+        threads = [threading.Thread(target=draw) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(set(drawn)) == 400
+        assert source.next_key("KRAKEN", 2) == 0
+
+
+def test_auth_uses_source(monkeypatch):
+    monkeypatch.setenv("NONCETEST_API_KEY", "key1")
+    monkeypatch.setenv("NONCETEST_API_SECRET", "secret1")
+    monkeypatch.setenv("NONCETEST_API_KEY_2", "key2")
+    monkeypatch.setenv("NONCETEST_API_SECRET_2", "secret2")
+
+    Auth = make_base("NoncetestAuth")
+    auth = Auth("noncetest")
+    source = LocalNonceSource()
+    Auth.set_nonce_source(source)
+
+    first = auth.nonce
+    assert auth.nonce > first
+
+    # key rotation follows the shared counter
+    Auth.rotate_keys()
+    assert auth.key == "key1"
+    Auth.rotate_keys()
+    assert auth.key == "key2"
@@ -0,0 +1,52 @@
+import threading
+
+import pytest
+from pyrsistent import pmap
+
+from noobit_markets.base.offload import configure_offload, get_offload_config, offload, payload_size
+from noobit_markets.base.request import _avalidate_data
+from noobit_markets.base.models.frozenbase import FrozenBaseModel
+
+
+class _Model(FrozenBaseModel):
+    values: list
+
+
+def _thread_name():
+    return threading.current_thread().name
+
+
+@pytest.fixture
+def restore_config():
+    mode, threshold = get_offload_config()
+    yield
+    configure_offload(mode, threshold)
+
+
+def test_payload_size():
+    assert payload_size("abc") == 1
+    assert payload_size([1, 2, 3]) == 3
+    assert payload_size({"XXBTZUSD": [[1, 2]] * 10, "last": "123"}) == 21
+
+
+@pytest.mark.asyncio
+async def test_offload_threshold(restore_config):
+
+    configure_offload("thread", threshold=10)
+    assert (await offload(_thread_name, size=1)) == threading.current_thread().name
+    assert (await offload(_thread_name, size=10)).startswith("noobit-offload")
+
+    configure_offload("inline", threshold=10)
+    assert (await offload(_thread_name, size=100)) == threading.current_thread().name
+
+
+@pytest.mark.asyncio
+async def test_avalidate_data(restore_config):
+
+    configure_offload("thread", threshold=5)
+    ok = await _avalidate_data(_Model, pmap({"values": list(range(10))}))
+    assert ok.is_ok()
+    assert ok.value.values == list(range(10))
+
+    err = await _avalidate_data(_Model, pmap({"values": 1}))
+    assert err.is_err()
@@ -0,0 +1,59 @@
+import pytest
+from pyrsistent import pmap
+
+from noobit_markets.base.request import _validate_data
+from noobit_markets.base.rawjson import (
+    rawjson_policy,
+    set_rawjson_policy,
+    get_rawjson_policy,
+    CompressedRawJson,
+    RawJsonRef,
+)
+from noobit_markets.base.models.rest.response import NoobitResponseSpread
+
+
+RAW = {"XXBTZUSD": [[1601000000, "10000.1", "10000.2"]], "last": 1601000000}
+
+FIELDS = pmap({
+    "exchange": "KRAKEN",
+    "rawJson": RAW,
+    "spread": ({"symbol": "XBT-USD", "utcTime": 1601000000000, "bestAskPrice": "10000.2", "bestBidPrice": "10000.1"}, )
+})
+
+
+def test_default_keep():
+    assert get_rawjson_policy() == "keep"
+    valid = _validate_data(NoobitResponseSpread, FIELDS)
+    assert valid.value.rawJson is RAW
+
+
+def test_per_call_policies():
+
+    with rawjson_policy("drop"):
+        assert _validate_data(NoobitResponseSpread, FIELDS).value.rawJson is None
+
+    with rawjson_policy("compressed"):
+        raw = _validate_data(NoobitResponseSpread, FIELDS).value.rawJson
+        assert isinstance(raw, CompressedRawJson)
+        assert raw.load() == RAW
+
+    with rawjson_policy("reference"):
+        raw = _validate_data(NoobitResponseSpread, FIELDS).value.rawJson
+        assert isinstance(raw, RawJsonRef)
+        assert raw.resolve() is RAW
+
+    # context is restored on exit
+    assert _validate_data(NoobitResponseSpread, FIELDS).value.rawJson is RAW
+
+
+def test_global_policy():
+    set_rawjson_policy("drop")
+    try:
+        assert _validate_data(NoobitResponseSpread, FIELDS).value.rawJson is None
+        with rawjson_policy("keep"):
+            assert _validate_data(NoobitResponseSpread, FIELDS).value.rawJson is RAW
+    finally:
+        set_rawjson_policy("keep")
+
+    with pytest.raises(ValueError):
+        set_rawjson_policy("zip")
@@ -0,0 +1,107 @@
+import asyncio
+import json
+import os
+import time
+
+import pytest
+
+from noobit_markets.base.recorder import FrameRecorder, read_frames, replay, TEXT, BINARY, MARKER
+from noobit_markets.base.websockets import BaseWsPublic
+
+
+class FakeClient:
+
+    open = True
+
+    def __init__(self, frames):
+        self.frames = list(frames)
+
+    async def send(self, msg):
+        pass
+
+    async def close(self):
+        pass
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self.frames:
+            raise StopAsyncIteration
+        return self.frames.pop(0)
+
+
+@pytest.mark.parametrize("codec", [None, "zlib"])
+def test_roundtrip_and_rotation(tmp_path, codec):
+    with FrameRecorder(str(tmp_path), codec=codec, rotate_bytes=200) as recorder:
+        for i in range(20):
+            recorder.record(json.dumps({"i": i}))
+        recorder.mark("reconnected")
+        recorder.record(b"\x00\x01")
+
+    assert recorder.recorded == 22 and recorder.dropped == 0
+    assert len(recorder.files) > 1 and all(os.path.exists(path) for path in recorder.files)
+
+    frames = [frame for path in recorder.files for frame in read_frames(path)]
+    assert [json.loads(f.data)["i"] for f in frames if f.kind == TEXT] == list(range(20))
+    assert (frames[-2].kind, frames[-2].data) == (MARKER, "reconnected")
+    assert (frames[-1].kind, frames[-1].data) == (BINARY, b"\x00\x01")
+    assert all(a.ts <= b.ts for a, b in zip(frames, frames[1:]))
+
+
+def test_flushed_file_is_readable_while_recording(tmp_path):
+    recorder = FrameRecorder(str(tmp_path), flush_interval=0.05)
+    recorder.record("first")
+
+    time.sleep(0.3)
+    assert [f.data for f in read_frames(recorder.files[0])] == ["first"]
+    recorder.close()
+
+
+@pytest.mark.asyncio
+async def test_dispatch_records_and_replays(tmp_path, monkeypatch):
+    monkeypatch.setattr(BaseWsPublic, "_data_queues", {"trade": asyncio.Queue()})
+    monkeypatch.setattr(BaseWsPublic, "_status_queues", {})
+
+    handled = []
+
+    async def msg_handler(msg, data_queues, status_queues):
+        handled.append(msg)
+
+    recorder = FrameRecorder(str(tmp_path))
+    ws = BaseWsPublic(FakeClient(["a", "b", "c"]), msg_handler, asyncio.get_event_loop(), {}, recorder=recorder)
+    await ws._dispatch()
+    await ws.close()
+    recorder.close()
+
+    assert handled == ["a", "b", "c"]
+
+    replayed = []
+
+    async def replay_handler(msg, data_queues, status_queues):
+        replayed.append(msg)
+
+    assert await replay(recorder.files, replay_handler, {}, {}) == 3
+    assert replayed == handled
+
+
+def test_close_raises_writer_error(tmp_path):
+    recorder = FrameRecorder(str(tmp_path), max_pending=2)
+
+    def failing_open():
+        raise OSError("No space left on device")
+
+    recorder._open = failing_open
+    recorder.record("lost")
+    recorder._thread.join(1)
+    assert not recorder._thread.is_alive()
+
+    # queue is not drained anymore
+    for _ in range(5):
+        recorder.record("dropped")
+
+    started = time.monotonic()
+    with pytest.raises(OSError):
+        recorder.close(timeout=0.5)
+    assert time.monotonic() - started < 1
+    assert recorder.dropped == 5
@@ -0,0 +1,84 @@
+from decimal import Decimal as D
+
+import pytest
+from pyrsistent import pmap
+
+from noobit_markets.base.resample import resample, resample_many, resample_ohlc, fill_gaps
+from noobit_markets.base.models.rest.response import NoobitResponseItemOhlc, NoobitResponseOhlc
+from noobit_markets.base.request import _validate_data
+
+
+MIN = 60_000
+DAY = 86_400_000
+# 2020-08-26 00:00 UTC
+T0 = 18_500 * DAY
+
+
+def _candle(minute, close, volume=1, step=MIN):
+    return NoobitResponseItemOhlc(
+        symbol="XBT-USD", utcTime=T0 + minute * step,
+        open=D(close - 1), high=D(close + 1), low=D(close - 2), close=D(close),
+        volume=D(volume), trdCount=1,
+    )
+
+
+def test_resample_aggregates_buckets():
+    candles = [_candle(m, 100 + m) for m in range(10)]
+    five = resample(candles, "5M")
+
+    assert [c.utcTime - T0 for c in five] == [0, 5 * MIN]
+    first = five[0]
+    assert (first.open, first.high, first.low, first.close) == (99, 105, 98, 104)
+    assert (first.volume, first.trdCount) == (5, 5)
+
+
+def test_resample_fills_and_aligns_gaps():
+    # minutes 3 to 9 missing, bucket of minute 1 starts at 0
+    candles = [_candle(1, 100), _candle(2, 101), _candle(10, 102)]
+
+    five = resample(candles, "5M", fill_gaps=True)
+    assert [c.utcTime - T0 for c in five] == [0, 5 * MIN, 10 * MIN]
+    gap = five[1]
+    assert (gap.open, gap.high, gap.low, gap.close, gap.volume, gap.trdCount) == (101, 101, 101, 101, 0, 0)
+    assert isinstance(gap.volume, D)
+
+    filled = fill_gaps(candles)
+    assert len(filled) == 10 and filled[2].utcTime == T0 + 3 * MIN
+
+
+def test_invalid_targets():
+    candles = [_candle(0, 100, step=5 * MIN), _candle(1, 100, step=5 * MIN)]
+    with pytest.raises(ValueError):
+        resample(candles, "1M")
+    with pytest.raises(ValueError):
+        resample(list(reversed(candles)), "15M")
+
+
+def test_resample_many_matches_direct_resample():
+    candles = [_candle(m, 100 + (m * 7) % 13, volume=m % 3) for m in range(0, 3 * 24 * 60, 3)]
+    candles = [c for c in candles if c.utcTime % (7 * MIN)]     # gaps
+
+    views = resample_many(candles, ["15M", "1H", "4H", "1D"], fill_gaps=True)
+    for tf, view in views.items():
+        assert view == resample(candles, tf, fill_gaps=True)
+
+    # default : every TIMEFRAME that can be derived from 3 minutes candles
+    assert set(resample_many(candles)) == {"15M", "30M", "1H", "4H", "1D", "1W"}
+
+
+def test_weeks_start_on_monday():
+    # T0 is a wednesday
+    days = [_candle(d, 100, step=DAY) for d in range(0, 10)]
+    weeks = resample(days, "1W")
+    assert [w.utcTime - T0 for w in weeks] == [-2 * DAY, 5 * DAY]
+    assert [w.trdCount for w in weeks] == [5, 5]
+
+
+def test_resample_response():
+    resp = _validate_data(NoobitResponseOhlc, pmap({
+        "exchange": "KRAKEN", "rawJson": {}, "ohlc": tuple(_candle(m, 100) for m in range(60)),
+    })).value
+
+    res = resample_ohlc(resp, "1H")
+    assert res.is_ok()
+    assert len(res.value.ohlc) == 1 and res.value.ohlc[0].trdCount == 60
@@ -0,0 +1,89 @@
+import multiprocessing
+import os
+import uuid
+from decimal import Decimal
+
+import pytest
+
+from noobit_markets.base.models.events import BookDelta
+from noobit_markets.base.sharding import LocalBook, shard_symbols
+from noobit_markets.base.shm import SharedBookWriter, SharedBookReader
+
+
+SYMBOLS = ["XBT-USD", "ETH-USD", "DOT-USD"]
+
+
+def _publish(name):
+    with SharedBookWriter(name, SYMBOLS, top_n=2) as writer:
+        writer.publish("ETH-USD", [(Decimal("101"), Decimal("1"))], [(Decimal("99"), Decimal("2"))], 1000)
+
+
+def _die_mid_write(name):
+    writer = SharedBookWriter(name, SYMBOLS, top_n=2)
+    writer.publish("ETH-USD", [(Decimal("101"), Decimal("1"))], [(Decimal("99"), Decimal("2"))], 1000)
+    # killed between the two sequence increments of the next publish
+    writer._buf[writer._offset("ETH-USD")] += 1
+    os._exit(1)
+
+
+def test_shard_symbols():
+    assert shard_symbols(SYMBOLS, 2) == [["XBT-USD", "DOT-USD"], ["ETH-USD"]]
+    assert shard_symbols(SYMBOLS, 5) == [["XBT-USD"], ["ETH-USD"], ["DOT-USD"]]
+
+
+def test_local_book():
+    book = LocalBook(max_depth=2)
+    book.apply(BookDelta("KRAKEN", "XBT-USD", 1, {Decimal(10): Decimal(1), Decimal(11): Decimal(1), Decimal(12): Decimal(1)}, {Decimal(9): Decimal(1)}, isSnapshot=True))
+    assert list(book.asks) == [Decimal(10), Decimal(11)]
+
+    book.apply(BookDelta("KRAKEN", "XBT-USD", 2, {Decimal(10): Decimal(0)}, {Decimal("9.5"): Decimal(2)}))
+    assert book.top_asks(5) == [(Decimal(11), Decimal(1))]
+    assert book.top_bids(1) == [(Decimal("9.5"), Decimal(2))]
+    assert book.utcTime == 2
+
+
+def test_shared_book_across_processes():
+    name = f"noobit-test-{uuid.uuid4().hex[:8]}"
+    owner = SharedBookWriter(name, SYMBOLS, top_n=2, create=True)
+    try:
+        reader = SharedBookReader(name, SYMBOLS, top_n=2)
+        assert reader.bbo("ETH-USD") is None
+
+        process = multiprocessing.get_context("spawn").Process(target=_publish, args=(name, ))
+        process.start()
+        process.join(10)
+
+        assert reader.seq("ETH-USD") == 1
+        assert reader.bbo("ETH-USD") == (1000, 99.0, 2.0, 101.0, 1.0)
+        assert reader.top("ETH-USD") == (1000, [(101.0, 1.0)], [(99.0, 2.0)])
+        assert reader.top("XBT-USD") is None
+        reader.close()
+    finally:
+        owner.close()
+        owner.unlink()
+
+
+def test_readers_recover_after_writer_died_mid_write():
+    name = f"noobit-test-{uuid.uuid4().hex[:8]}"
+    owner = SharedBookWriter(name, SYMBOLS, top_n=2, create=True)
+    ctx = multiprocessing.get_context("spawn")
+    try:
+        reader = SharedBookReader(name, SYMBOLS, top_n=2, max_retries=10)
+
+        process = ctx.Process(target=_die_mid_write, args=(name, ))
+        process.start()
+        process.join(10)
+        with pytest.raises(BlockingIOError):
+            reader.bbo("ETH-USD")
+
+        # restarted worker
+        process = ctx.Process(target=_publish, args=(name, ))
+        process.start()
+        process.join(10)
+
+        assert reader.bbo("ETH-USD") == (1000, 99.0, 2.0, 101.0, 1.0)
+        assert reader.seq("ETH-USD") == 2
+        reader.close()
+    finally:
+        owner.close()
+        owner.unlink()
@@ -0,0 +1,47 @@
+import base64
+import hashlib
+import hmac
+import urllib.parse
+from collections import deque
+
+from pyrsistent import pmap
+
+from noobit_markets.base.auth import hmac_signer
+from noobit_markets.exchanges.kraken.rest.auth import KrakenAuth
+from noobit_markets.exchanges.binance.rest.auth import BinanceAuth
+
+
+SECRET = base64.b64encode(b"kraken-secret").decode()
+
+
+def test_hmac_signer_fresh_state():
+    first = hmac_signer("secret", hashlib.sha256)
+    first.update(b"payload")
+    second = hmac_signer("secret", hashlib.sha256)
+    second.update(b"payload")
+
+    expected = hmac.new(b"secret", b"payload", hashlib.sha256).hexdigest()
+    assert first.hexdigest() == second.hexdigest() == expected
+
+
+def test_kraken_signature_unchanged(monkeypatch):
+    auth = KrakenAuth()
+    monkeypatch.setattr(KrakenAuth, "key_pairs_dq", deque([pmap({"api_key": "key", "api_secret": SECRET})]))
+
+    data = pmap({"nonce": 1234, "pair": "XXBTZUSD"})
+    message = b"/0/private/AddOrder" + hashlib.sha256(("1234" + urllib.parse.urlencode(data)).encode()).digest()
+    expected = base64.b64encode(hmac.new(base64.b64decode(SECRET), message, hashlib.sha512).digest()).decode()
+
+    assert auth._sign(data, "/0/private/AddOrder") == expected
+
+
+def test_binance_query_is_signed_payload(monkeypatch):
+    auth = BinanceAuth()
+    monkeypatch.setattr(BinanceAuth, "key_pairs_dq", deque([pmap({"api_key": "key", "api_secret": "secret"})]))
+
+    query = auth._signed_query({"symbol": "BTCUSDT", "timestamp": 1234, "side": "BUY"})
+    payload, signature = query.rsplit("&signature=", 1)
+
+    assert payload == "timestamp=1234&symbol=BTCUSDT&side=BUY"
+    assert signature == hmac.new(b"secret", payload.encode(), hashlib.sha256).hexdigest()
+    assert auth._sign({"symbol": "BTCUSDT", "timestamp": 1234, "side": "BUY"})["signature"] == signature
@@ -0,0 +1,104 @@
+import os
+from decimal import Decimal as D
+
+import pytest
+from pyrsistent import pmap
+
+from noobit_markets.base.store import MarketStore
+from noobit_markets.base.models.events import TradeTick, BookDelta
+from noobit_markets.base.models.result import Ok, Err
+from noobit_markets.base.models.rest.response import NoobitResponseOhlc
+from noobit_markets.base.request import _validate_data
+
+
+DAY = 86_400_000
+T0 = 18_500 * DAY
+
+
+def _tick(price, ts, qty=1, side="BUY"):
+    return TradeTick("KRAKEN", "XBT-USD", side, "MARKET", D(price), D(qty), ts)
+
+
+def _ohlc(*closes, start=T0):
+    return _validate_data(NoobitResponseOhlc, pmap({
+        "exchange": "KRAKEN",
+        "rawJson": {},
+        "ohlc": tuple(
+            {"symbol": "XBT-USD", "utcTime": start + i * 60_000, "open": c, "high": c, "low": c, "close": c, "volume": 1, "trdCount": 1}
+            for i, c in enumerate(closes)
+        ),
+    })).value
+
+
+def test_roundtrip_partitions_and_ranges(tmp_path):
+    store = MarketStore(str(tmp_path), segment_rows=3)
+    # spans two days, written out of order
+    ticks = [_tick(100 + i, T0 + DAY - 2 + i) for i in range(4)]
+    store.append([ticks[1], ticks[0]])
+    store.append(ticks[2:])
+    store.flush()
+
+    day_dirs = sorted(os.listdir(tmp_path / "KRAKEN" / "XBT-USD" / "trades"))
+    assert day_dirs == ["2020-08-26", "2020-08-27"]
+
+    batch = store.read("KRAKEN", "XBT-USD", "trades")
+    assert list(batch["ts"]) == [T0 + DAY - 2 + i for i in range(4)]
+    assert list(batch["price"]) == [100, 101, 102, 103]
+    assert list(batch["side"]) == [1, 1, 1, 1]
+
+    batch = store.read("KRAKEN", "XBT-USD", "trades", start=T0 + DAY - 1, end=T0 + DAY + 1, columns=("qty",))
+    assert list(batch.columns) == ["ts", "qty"] and len(batch) == 2
+    # only the second day is opened
+    assert len(store.segments("KRAKEN", "XBT-USD", "trades", start=T0 + DAY)) == 1
+
+
+def test_dedup_overlapping_writes(tmp_path):
+    store = MarketStore(str(tmp_path))
+
+    # stream : two identical trades in the same ms are distinct
+    store.append(Ok([_tick(100, T0), _tick(100, T0), _tick(101, T0 + 1)]))
+    store.flush()
+    # backfill overlapping the stream
+    store.append([_tick(100, T0), _tick(101, T0 + 1), _tick(102, T0 + 2)])
+    store.append(Err(ValueError("ignored")))
+    store.flush()
+
+    batch = store.read("KRAKEN", "XBT-USD", "trades")
+    assert list(batch["price"]) == [100, 100, 101, 102]
+    assert len(store.read("KRAKEN", "XBT-USD", "trades", dedup=False)) == 6
+
+    # last candle of a REST call is updated by the next one
+    store.append(_ohlc(1, 2))
+    store.flush()
+    store.append(_ohlc(3, 4, start=T0 + 60_000))
+    store.flush()
+    batch = store.read("KRAKEN", "XBT-USD", "ohlc")
+    assert list(batch["close"]) == [1, 3, 4]
+
+
+def test_book_levels(tmp_path):
+    with MarketStore(str(tmp_path)) as store:
+        store.append(BookDelta("BINANCE", "XBT-USD", T0, {D(101): D(1)}, {D(99): D(2), D(98): D(1)}, isSnapshot=True))
+
+    batch = store.read("BINANCE", "XBT-USD", "book")
+    assert sorted(batch.rows()) == [
+        (T0, -1, 101.0, 1.0, 1),
+        (T0, 1, 98.0, 1.0, 1),
+        (T0, 1, 99.0, 2.0, 1),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_record_stream(tmp_path):
+    store = MarketStore(str(tmp_path))
+
+    async def stream():
+        yield Ok(_tick(100, T0))
+        yield Ok([])
+        yield Ok([_tick(101, T0 + 1)])
+
+    await store.record(stream())
+    assert list(store.read("KRAKEN", "XBT-USD", "trades")["price"]) == [100, 101]
+
+    with pytest.raises(TypeError):
+        store.append(Ok(["not a trade"]))
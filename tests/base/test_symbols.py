@@ -0,0 +1,56 @@
+from decimal import Decimal
+
+import pytest
+
+from noobit_markets.base.symbols import SymbolsIndex, symbols_index
+from noobit_markets.base.models.rest.request import NoobitRequestOrderBook
+from noobit_markets.base.models.rest.response import NoobitResponseSymbols
+
+
+def _symbols_resp(n):
+    return NoobitResponseSymbols(
+        exchange="KRAKEN",
+        rawJson=None,
+        assets={},
+        asset_pairs={
+            f"A{i}-USD": {
+                "exchange_pair": f"A{i}ZUSD",
+                "exchange_base": f"A{i}",
+                "exchange_quote": "ZUSD",
+                "noobit_base": f"A{i}",
+                "noobit_quote": "USD",
+                "volume_decimals": 8,
+                "price_decimals": 1,
+                "leverage_available": None,
+                "order_min": Decimal("0.0001"),
+            } for i in range(n)
+        },
+    )
+
+
+def test_index_is_cached():
+    symbols_resp = _symbols_resp(3)
+
+    index = symbols_index(symbols_resp)
+    assert symbols_index(symbols_resp) is index
+    assert symbols_index(index) is index
+    assert symbols_index(_symbols_resp(3)) is not index
+
+    assert "A1-USD" in index
+    assert index.symbol_to_exchange("A1-USD") == "A1ZUSD"
+    assert index.symbol_from_exchange("A1ZUSD") == "A1-USD"
+
+
+def test_request_holds_index_by_reference():
+    symbols_resp = _symbols_resp(500)
+
+    req = NoobitRequestOrderBook(symbols_resp=symbols_resp, symbol="A1-USD", depth=10)
+    assert isinstance(req.symbols_resp, SymbolsIndex)
+    assert req.symbols_resp is symbols_index(symbols_resp)
+    assert req.symbols_resp.response is symbols_resp
+
+    other = NoobitRequestOrderBook(symbols_resp=req.symbols_resp, symbol="A2-USD", depth=10)
+    assert other.symbols_resp is req.symbols_resp
+
+    with pytest.raises(ValueError):
+        NoobitRequestOrderBook(symbols_resp=symbols_resp, symbol="B1-USD", depth=10)
@@ -0,0 +1,87 @@
+from decimal import Decimal
+
+import pytest
+from pydantic import ValidationError
+from pyrsistent import pmap
+
+from noobit_markets.base.request import _validate_data
+from noobit_markets.base.templates import OrderTemplate
+from noobit_markets.base.models.rest.request import NoobitRequestAddOrder
+from noobit_markets.base.models.rest.response import NoobitResponseSymbols
+from noobit_markets.exchanges.kraken.rest.private.trading import KrakenRequestNewOrder, parse_request, _TEMPLATE_VARYING
+
+
+@pytest.fixture
+def symbols_resp():
+    return NoobitResponseSymbols(
+        exchange="KRAKEN",
+        rawJson=None,
+        assets={"XXBT": "XBT", "ZUSD": "USD"},
+        asset_pairs={
+            "XBT-USD": {
+                "exchange_pair": "XXBTZUSD",
+                "exchange_base": "XXBT",
+                "exchange_quote": "ZUSD",
+                "noobit_base": "XBT",
+                "noobit_quote": "USD",
+                "volume_decimals": 8,
+                "price_decimals": 1,
+                "leverage_available": (2, 3),
+                "order_min": Decimal("0.0001"),
+            }
+        },
+    )
+
+
+@pytest.fixture
+def template(symbols_resp):
+    return OrderTemplate.compile("KRAKEN", symbols_resp, "XBT-USD", "BUY", "LIMIT", "GOOD-TIL-CANCEL").value
+
+
+def test_compile_errors(symbols_resp):
+    assert OrderTemplate.compile("KRAKEN", symbols_resp, "DOGE-USD", "BUY", "LIMIT", "GOOD-TIL-CANCEL").is_err()
+    # limit orders need a timeInForce
+    assert OrderTemplate.compile("KRAKEN", symbols_resp, "XBT-USD", "BUY", "LIMIT").is_err()
+
+
+def test_fill_matches_full_validation(symbols_resp, template):
+
+    filled = template.fill(price=Decimal("9000.5"), orderQty=Decimal("0.1"), clOrdID=123)
+    assert filled.is_ok()
+
+    full = _validate_data(NoobitRequestAddOrder, pmap({
+        "exchange": "KRAKEN", "symbols_resp": symbols_resp, "symbol": "XBT-USD", "side": "BUY",
+        "ordType": "LIMIT", "timeInForce": "GOOD-TIL-CANCEL", "clOrdID": 123,
+        "orderQty": Decimal("0.1"), "price": Decimal("9000.5"), "stopPrice": None, "quoteOrderQty": None,
+    }))
+    assert filled.value == full.value
+
+
+@pytest.mark.parametrize("fields", [
+    {"price": Decimal("9000.55"), "orderQty": Decimal("0.1")},     # price decimals
+    {"price": Decimal("9000.5"), "orderQty": Decimal("0.00001")},  # order_min
+    {"price": Decimal("9000.5"), "orderQty": Decimal("0.1"), "clOrdID": -1},
+    {"orderQty": Decimal("0.1")},                                  # missing price
+])
+def test_fill_errors(template, fields):
+    filled = template.fill(**fields)
+    assert filled.is_err()
+    assert isinstance(filled.value, ValidationError)
+
+
+def test_exchange_request(template):
+
+    payloads = []
+    for i, price in enumerate(["9000.5", "9001"]):
+        valid_req = template.fill(price=Decimal(price), orderQty=Decimal("0.1"), clOrdID=i + 1).value
+        parsed_req = {"nonce": 1000 + i, **parse_request(valid_req, template.symbol_to_exchange)}
+        templated = template.exchange_request(KrakenRequestNewOrder, parsed_req, _TEMPLATE_VARYING)
+        full = _validate_data(KrakenRequestNewOrder, pmap(parsed_req))
+        assert templated.value.dict(exclude_none=True) == full.value.dict(exclude_none=True)
+        payloads.append(templated.value)
+
+    assert payloads[1].price == 9001 and payloads[1].userref == 2
+
+    # varying fields are still validated
+    bad = {**parsed_req, "nonce": -1}
+    assert template.exchange_request(KrakenRequestNewOrder, bad, _TEMPLATE_VARYING).is_err()
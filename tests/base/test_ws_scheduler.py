@@ -0,0 +1,105 @@
+import asyncio
+import json
+import time
+
+import pytest
+
+from noobit_markets.base.websockets import BaseWsPublic
+from noobit_markets.exchanges.kraken.websockets.public.routing import msg_handler
+
+
+class FakeClient:
+
+    open = True
+
+    def __init__(self):
+        self.inbox = asyncio.Queue()
+        self.closed = False
+
+    async def send(self, msg):
+        pass
+
+    async def close(self):
+        self.closed = True
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        return json.dumps(await self.inbox.get())
+
+
+@pytest.fixture
+def ws(monkeypatch):
+    monkeypatch.setattr(BaseWsPublic, "_data_queues", {"trade": asyncio.Queue()})
+    monkeypatch.setattr(BaseWsPublic, "_status_queues", {k: asyncio.Queue() for k in ("connection", "subscription", "heartbeat")})
+    monkeypatch.setattr(BaseWsPublic, "_subd_feeds", {"trade": set()})
+    return BaseWsPublic(FakeClient(), msg_handler, asyncio.get_event_loop(), {"trade": "trade"})
+
+
+@pytest.mark.asyncio
+async def test_schedule_starts_immediately(ws):
+    started = asyncio.Event()
+
+    async def job():
+        started.set()
+
+    async def failing():
+        raise ValueError("boom")
+
+    t0 = time.monotonic()
+    ws.schedule(failing())
+    ws.schedule(job())
+    await asyncio.wait_for(started.wait(), 0.2)
+    assert time.monotonic() - t0 < 0.1
+
+    await asyncio.sleep(0)
+    assert not ws._scheduled
+    await ws.close()
+
+
+@pytest.mark.asyncio
+async def test_wait_subscribed_and_close(ws):
+    waiter = asyncio.ensure_future(ws.wait_subscribed("trade", "XBT/USD"))
+    refused = asyncio.ensure_future(ws.wait_subscribed("trade", "ETH/USD"))
+    await asyncio.sleep(0)
+
+    ws.client.inbox.put_nowait({"event": "subscriptionStatus", "status": "subscribed", "pair": "XBT/USD", "subscription": {"name": "trade"}})
+    ws.client.inbox.put_nowait({"event": "subscriptionStatus", "status": "error", "pair": "ETH/USD", "subscription": {"name": "trade"}, "errorMessage": "nope"})
+    assert await asyncio.wait_for(waiter, 0.2) is True
+    assert await asyncio.wait_for(refused, 0.2) is False
+    assert await ws.wait_subscribed("trade", "ABC/USD", timeout=0.01) is False
+
+    received = []
+
+    async def consume():
+        async for msg in ws.aiter_trade():
+            received.append(msg)
+
+    consumer = asyncio.ensure_future(consume())
+    await asyncio.sleep(0)
+    await ws.close()
+    await asyncio.wait_for(consumer, 0.2)
+    assert received == []
+    assert ws.client.closed
+
+
+@pytest.mark.asyncio
+async def test_close_only_ends_own_streams():
+    first = BaseWsPublic(FakeClient(), msg_handler, asyncio.get_event_loop(), {"trade": "trade"})
+    second = BaseWsPublic(FakeClient(), msg_handler, asyncio.get_event_loop(), {"trade": "trade"})
+    assert first._data_queues["trade"] is not second._data_queues["trade"]
+
+    tasks = list(second._running_tasks.values())
+    await first.close()
+    assert not any(task.done() for task in tasks)
+
+    second._data_queues["trade"].put_nowait("msg")
+    stream = second.aiter_trade()
+    assert await asyncio.wait_for(stream.__anext__(), 0.2) == "msg"
+
+    # created after a close, starts clean
+    third = BaseWsPublic(FakeClient(), msg_handler, asyncio.get_event_loop(), {"trade": "trade"})
+    assert third._data_queues["trade"].empty()
+
+    await asyncio.gather(second.close(), third.close())
@@ -0,0 +1,82 @@
+import asyncio
+import json
+
+import pytest
+
+from noobit_markets.base.errors import BadRequest, RequestTimeout
+from noobit_markets.base.websockets import BaseWsPublic, KrakenSubModel, BinanceSubModel
+from noobit_markets.exchanges.kraken.websockets.public.routing import msg_handler as kraken_handler
+from noobit_markets.exchanges.binance.websockets.public.routing import msg_handler as binance_handler
+
+
+class FakeClient:
+    """replies to each sent message with `reply(msg)` (list of messages)"""
+
+    open = True
+
+    def __init__(self, reply):
+        self.reply = reply
+        self.sent = []
+        self.inbox = asyncio.Queue()
+
+    async def send(self, msg):
+        msg = json.loads(msg)
+        self.sent.append(msg)
+        for r in self.reply(msg):
+            self.inbox.put_nowait(r)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        return json.dumps(await self.inbox.get())
+
+
+def make_ws(monkeypatch, client, handler):
+    monkeypatch.setattr(BaseWsPublic, "_status_queues", {k: asyncio.Queue() for k in ("connection", "subscription", "heartbeat")})
+    monkeypatch.setattr(BaseWsPublic, "_subd_feeds", {"trade": set()})
+    return BaseWsPublic(client, handler, asyncio.get_event_loop(), {"trade": "trade"})
+
+
+def kraken_reply(msg):
+    for pair in msg["pair"]:
+        if pair == "BAD/USD":
+            yield {"event": "subscriptionStatus", "status": "error", "pair": pair, "reqid": msg["reqid"], "subscription": {"name": "trade"}, "errorMessage": "Currency pair not supported"}
+        elif pair != "SLOW/USD":
+            yield {"event": "subscriptionStatus", "status": "subscribed", "pair": pair, "reqid": msg["reqid"], "channelID": 1, "channelName": "trade", "subscription": {"name": "trade"}}
+
+
+def kraken_sub(*pairs):
+    return KrakenSubModel(exchange="kraken", feed="trade", msg={"event": "subscribe", "pair": list(pairs), "subscription": {"name": "trade"}})
+
+
+@pytest.mark.asyncio
+async def test_kraken_subscribe_acked(monkeypatch):
+    client = FakeClient(kraken_reply)
+    ws = make_ws(monkeypatch, client, kraken_handler)
+
+    result = await ws.subscribe_acked(kraken_sub("XBT/USD", "ETH/USD", "BAD/USD"))
+    assert sorted(result.value) == ["ETH/USD", "XBT/USD"]
+    assert client.sent[0]["reqid"] == 1
+    assert ws._subd_feeds["trade"] == {"XBT/USD", "ETH/USD"}
+
+    refused = await ws.subscribe_acked(kraken_sub("BAD/USD"))
+    assert isinstance(refused.value, BadRequest)
+
+    timeout = await ws.subscribe_acked(kraken_sub("XBT/USD", "SLOW/USD"), timeout=0.05)
+    assert isinstance(timeout.value, RequestTimeout)
+    assert not ws._sub_requests
+
+    await ws.close()
+
+
+@pytest.mark.asyncio
+async def test_binance_subscribe_acked(monkeypatch):
+    client = FakeClient(lambda msg: [{"result": None, "id": msg["id"]}])
+    ws = make_ws(monkeypatch, client, binance_handler)
+
+    sub = BinanceSubModel(exchange="binance", feed="trade", msg={"id": 1, "method": "SUBSCRIBE", "params": ("btcusdt@aggTrade", "ethusdt@aggTrade")})
+    result = await ws.subscribe_acked(sub)
+    assert result.value == ("btcusdt@aggTrade", "ethusdt@aggTrade")
+
+    await ws.close()
@@ -0,0 +1,53 @@
+import asyncio
+
+import pytest
+
+from noobit_markets.base.models.result import Ok, Err
+from noobit_markets.exchanges.kraken.rest.private import trading
+
+
+@pytest.mark.asyncio
+async def test_new_order_query_retries_not_found(monkeypatch):
+    replies = [Err(KeyError("Order OABC not found")), Ok("order")]
+    calls = []
+
+    async def fake_get_order(client, symbol, symbols_resp, orderID, **kwargs):
+        calls.append(orderID)
+        return replies.pop(0)
+
+    monkeypatch.setattr(trading, "get_order_kraken", fake_get_order)
+
+    result = await trading._query_new_order(None, "XBT-USD", None, "OABC", logger=None, auth=None, delay=0)
+    assert result.value == "order" and calls == ["OABC", "OABC"]
+
+    # other errors are not retried
+    replies.append(Err(ValueError("EAPI:Invalid key")))
+    result = await trading._query_new_order(None, "XBT-USD", None, "OABC", logger=None, auth=None, delay=0)
+    assert isinstance(result.value, ValueError) and len(calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_cancel_symbol_sequential_and_errors(monkeypatch):
+    from types import SimpleNamespace
+    from noobit_markets.base.errors import ExchangeError
+    from noobit_markets.exchanges.kraken.rest.private import cancel_open
+
+    in_flight, max_in_flight = [], []
+
+    async def fake_get_openorders(client, symbol, symbols_resp, **kwargs):
+        return Ok(SimpleNamespace(orders=[SimpleNamespace(orderID=f"O{i}") for i in range(3)]))
+
+    async def fake_cancel(client, symbol, symbols_resp, orderID, **kwargs):
+        in_flight.append(orderID)
+        max_in_flight.append(len(in_flight))
+        await asyncio.sleep(0.01)
+        in_flight.remove(orderID)
+        return Err(ValueError("EOrder:Unknown order")) if orderID == "O1" else Ok(SimpleNamespace(orderID=orderID))
+
+    monkeypatch.setattr(cancel_open, "get_openorders_kraken", fake_get_openorders)
+    monkeypatch.setattr(cancel_open, "cancel_openorder_kraken", fake_cancel)
+
+    result = await cancel_open.cancel_all_kraken(None, "XBT-USD", None, auth=None)
+    assert max(max_in_flight) == 1
+    assert isinstance(result.value, ExchangeError)
+    assert [str(e) for e in result.value.raw_error] == ["EOrder:Unknown order"]
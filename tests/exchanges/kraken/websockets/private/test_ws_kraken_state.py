@@ -0,0 +1,87 @@
+import asyncio
+import json
+from decimal import Decimal
+
+import pytest
+
+from noobit_markets.exchanges.kraken.websockets.private.state import KrakenAccountState
+
+
+ORDER_SNAPSHOT = [
+    [{"OGTT3Y-C6I3P-XRI6HX": {
+        "refid": None, "userref": 123, "status": "open", "opentm": "1616665496.7808",
+        "starttm": "0", "expiretm": "0",
+        "descr": {"pair": "XBT/USD", "position": "", "type": "buy", "ordertype": "limit", "price": "34000.0", "price2": "0.0", "leverage": None, "order": "buy 0.50000000 XBT/USD @ limit 34000.0", "close": ""},
+        "vol": "0.50000000", "vol_exec": "0.00000000", "cost": "0.00000", "fee": "0.00000", "avg_price": "0.00000",
+        "stopprice": "0.00000", "limitprice": "0.00000", "misc": "", "oflags": "fcib",
+    }}],
+    "openOrders",
+    {"sequence": 1}
+]
+
+ORDER_PARTIAL = [[{"OGTT3Y-C6I3P-XRI6HX": {"vol_exec": "0.20000000", "cost": "6800.00000", "fee": "10.00000", "avg_price": "34000.00000"}}], "openOrders", {"sequence": 2}]
+ORDER_CLOSED = [[{"OGTT3Y-C6I3P-XRI6HX": {"status": "canceled"}}], "openOrders", {"sequence": 3}]
+
+OWN_TRADE = [
+    [{"TDLH43-DVQXD-2KHVYY": {
+        "cost": "6800.00000", "fee": "10.00000", "margin": "0.00000", "ordertxid": "OGTT3Y-C6I3P-XRI6HX",
+        "ordertype": "limit", "pair": "XBT/USD", "postxid": "TKH2SE-M7IF3-CFI7LT", "price": "34000.00000",
+        "time": "1616665500.123", "type": "buy", "vol": "0.20000000",
+    }}],
+    "ownTrades",
+    {"sequence": 1}
+]
+
+
+def make_queues():
+    data_queues = {"user_trades": asyncio.Queue(), "user_orders": asyncio.Queue()}
+    status_queues = {"connection": asyncio.Queue(), "subscription": asyncio.Queue(), "heartbeat": asyncio.Queue()}
+    return data_queues, status_queues
+
+
+@pytest.mark.asyncio
+async def test_state_from_ws_frames():
+
+    state = KrakenAccountState(symbols_resp=None)
+    data_queues, status_queues = make_queues()
+
+    await state.msg_handler(json.dumps(ORDER_SNAPSHOT), data_queues, status_queues)
+    order = state.order_by_clordid(123)
+    assert order.orderID == "OGTT3Y-C6I3P-XRI6HX"
+    assert order.side == "BUY"
+    assert order.ordStatus == "NEW"
+    assert state.open_orders("XBT-USD") == (order, )
+    assert data_queues["user_orders"].qsize() == 1
+
+    # partial updates do not reach the validated queue
+    await state.msg_handler(json.dumps(ORDER_PARTIAL), data_queues, status_queues)
+    assert data_queues["user_orders"].qsize() == 1
+    order = state.order("OGTT3Y-C6I3P-XRI6HX")
+    assert order.ordStatus == "PARTIALLY-FILLED"
+    assert order.cumQty == Decimal("0.2")
+    assert order.leavesQty == Decimal("0.3")
+
+    await state.msg_handler(json.dumps(OWN_TRADE), data_queues, status_queues)
+    await state.msg_handler(json.dumps(OWN_TRADE), data_queues, status_queues)
+    fills = state.fills("OGTT3Y-C6I3P-XRI6HX")
+    assert len(fills) == 1 and fills[0].orderID == "OGTT3Y-C6I3P-XRI6HX"
+    # postxid is the position trade id, not an order
+    assert state.fills("TKH2SE-M7IF3-CFI7LT") == ()
+
+    await state.msg_handler(json.dumps(ORDER_CLOSED), data_queues, status_queues)
+    assert state.open_orders() == ()
+    assert state.order_by_clordid(123).ordStatus == "CANCELED"
+
+
+def test_reconcile_orders():
+
+    state = KrakenAccountState(symbols_resp=None)
+    state.apply_ws_msg(ORDER_SNAPSHOT)
+    order = state.order("OGTT3Y-C6I3P-XRI6HX")
+
+    # order not open anymore according to REST
+    assert state.reconcile_orders([]) == {"OGTT3Y-C6I3P-XRI6HX"}
+    assert state.open_orders() == ()
+
+    assert state.reconcile_orders([order]) == {"OGTT3Y-C6I3P-XRI6HX"}
+    assert state.reconcile_orders([order]) == set()
@@ -0,0 +1,76 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from noobit_markets.base.models.result import Ok
+from noobit_markets.exchanges.kraken.rest.private import ws_auth
+from noobit_markets.exchanges.kraken.websockets.private.api import KrakenWsPrivate
+from noobit_markets.exchanges.kraken.websockets.private.routing import msg_handler
+from noobit_markets.exchanges.kraken.websockets.private.token import KrakenWsTokenManager
+
+
+class FakeClient:
+
+    open = True
+
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, msg):
+        self.sent.append(json.loads(msg))
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        await asyncio.sleep(3600)
+
+
+@pytest.fixture
+def fetched(monkeypatch):
+    calls = []
+
+    async def fake_get_wstoken(client, **kwargs):
+        calls.append(client)
+        await asyncio.sleep(0.01)
+        return Ok(SimpleNamespace(token=f"token{len(calls)}", expires=900))
+
+    monkeypatch.setattr(ws_auth, "get_wstoken_kraken", fake_get_wstoken)
+    return calls
+
+
+@pytest.mark.asyncio
+async def test_token_cached_and_renewed(fetched):
+    tokens = KrakenWsTokenManager("client")
+
+    results = await asyncio.gather(tokens.get(), tokens.get(), tokens.get())
+    assert [r.value for r in results] == ["token1"] * 3
+    assert len(fetched) == 1
+
+    # within margin of expiry
+    tokens._expires_at = 0
+    assert not tokens.is_fresh()
+    assert (await tokens.get()).value == "token2"
+
+
+@pytest.mark.asyncio
+async def test_resubscribe_with_fresh_token(fetched, monkeypatch):
+    monkeypatch.setitem(KrakenWsPrivate._subd_feeds, "user_trades", True)
+    monkeypatch.setitem(KrakenWsPrivate._subd_feeds, "user_orders", False)
+
+    tokens = KrakenWsTokenManager("client")
+    await tokens.prefetch()
+    kwp = KrakenWsPrivate(FakeClient(), msg_handler, asyncio.get_event_loop(), None, {}, token_manager=tokens)
+    assert kwp.auth_token == "token1"
+
+    tokens._expires_at = 0
+    new_client = FakeClient()
+    result = await kwp.resubscribe(new_client)
+
+    assert result.value == ("user_trades", )
+    assert kwp.client is new_client
+    assert new_client.sent == [{"event": "subscribe", "subscription": {"name": "ownTrades", "token": "token2"}}]
+
+    await kwp.close()
@@ -0,0 +1,81 @@
+import asyncio
+import json
+
+import pytest
+
+from noobit_markets.base.errors import RequestTimeout, InvalidOrder, UndefinedError
+from noobit_markets.exchanges.kraken.websockets.private.api import KrakenWsPrivate
+from noobit_markets.exchanges.kraken.websockets.private.routing import msg_handler
+
+
+class FakeClient:
+    """answers cancelOrder requests with the status in `replies` (none = no answer)"""
+
+    open = True
+
+    def __init__(self, replies):
+        self.replies = list(replies)
+        self.sent = []
+        self._inbox = asyncio.Queue()
+
+    async def send(self, msg):
+        msg = json.loads(msg)
+        self.sent.append(msg)
+        reply = self.replies.pop(0)
+        if reply is not None:
+            await self._inbox.put(json.dumps({"event": "cancelOrderStatus", "reqid": msg["reqid"], **reply}))
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        return await self._inbox.get()
+
+
+@pytest.mark.asyncio
+async def test_cancel_order():
+
+    client = FakeClient([
+        {"status": "ok"},
+        {"status": "error", "errorMessage": "EOrder:Unknown order"},
+        {"status": "error", "errorMessage": "EOrder:Something new"},
+        None,
+    ])
+    kwp = KrakenWsPrivate(client, msg_handler, asyncio.get_event_loop(), "token", {})
+
+    ok = await kwp.cancel_order("OGTT3Y-C6I3P-XRI6HX")
+    assert ok.value == ("OGTT3Y-C6I3P-XRI6HX", )
+    assert client.sent[0]["event"] == "cancelOrder"
+    assert client.sent[0]["txid"] == ["OGTT3Y-C6I3P-XRI6HX"]
+
+    err = await kwp.cancel_order("OGTT3Y-C6I3P-XRI6HX")
+    assert isinstance(err.value, InvalidOrder)
+    assert "token" not in err.value.sent_request
+
+    err = await kwp.cancel_order("OGTT3Y-C6I3P-XRI6HX")
+    assert isinstance(err.value, UndefinedError)
+
+    err = await kwp.cancel_order(["OGTT3Y-C6I3P-XRI6HX"], timeout=0.1)
+    assert isinstance(err.value, RequestTimeout)
+    assert not kwp._order_requests
+
+    await kwp.close()
+
+
+@pytest.mark.asyncio
+async def test_send_failure_returns_err():
+
+    class ClosedClient(FakeClient):
+
+        async def send(self, msg):
+            raise ConnectionResetError("closed")
+
+    kwp = KrakenWsPrivate(ClosedClient([]), msg_handler, asyncio.get_event_loop(), "token", {})
+    other = KrakenWsPrivate(FakeClient([]), msg_handler, asyncio.get_event_loop(), "token", {})
+
+    err = await kwp.cancel_order("OGTT3Y-C6I3P-XRI6HX")
+    assert isinstance(err.value, ConnectionResetError)
+    assert not kwp._order_requests
+    assert other._order_requests is not kwp._order_requests
+
+    await asyncio.gather(kwp.close(), other.close())
@@ -0,0 +1,106 @@
+import asyncio
+import json
+
+import pytest
+
+from noobit_markets.base.models.result import Ok
+from noobit_markets.exchanges.kraken.websockets.public import trades, orderbook
+from noobit_markets.exchanges.kraken.websockets.public.api import KrakenWsPublic
+from noobit_markets.exchanges.kraken.websockets.public.routing import make_msg_handler
+
+
+class FakeClient:
+    """yields what is put in `inbox`, an exception put in `inbox` is raised (dropped connection)"""
+
+    open = True
+
+    def __init__(self):
+        self.sent = []
+        self.inbox = asyncio.Queue()
+
+    async def send(self, msg):
+        self.sent.append(json.loads(msg))
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        msg = await self.inbox.get()
+        if isinstance(msg, Exception):
+            raise msg
+        return json.dumps(msg)
+
+
+async def wait_for(predicate, timeout=1):
+    for _ in range(int(timeout / 0.01)):
+        if predicate():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("timed out")
+
+
+def ack(pair, channel_id):
+    return {"event": "subscriptionStatus", "status": "subscribed", "channelID": channel_id, "channelName": "trade", "pair": pair, "subscription": {"name": "trade"}}
+
+
+@pytest.mark.asyncio
+async def test_reconnect_replays_and_backfills(monkeypatch):
+    monkeypatch.setattr(KrakenWsPublic, "_subd_feeds", {"trade": set(), "spread": set(), "orderbook": set(), "ohlc": set(), "error": set()})
+    monkeypatch.setattr(KrakenWsPublic, "_data_queues", {"trade": asyncio.Queue()})
+
+    first, second = FakeClient(), FakeClient()
+    clients = [second]
+    backfilled = []
+
+    async def connect():
+        return clients.pop(0)
+
+    async def fetch(client, since):
+        backfilled.append((client, since))
+        return Ok("backfill")
+
+    router = make_msg_handler()
+    kws = KrakenWsPublic(first, router, asyncio.get_event_loop(), {"trade": "trade"}, connect=connect, backoff=0.01, backfill_client="http")
+
+    sub_model = trades.validate_sub(lambda x: "XBT/USD", "XBT-USD").value
+    subscribing = asyncio.ensure_future(kws._subscribe(sub_model, ("trade", fetch)))
+    await wait_for(lambda: first.sent)
+    first.inbox.put_nowait({**ack("XBT/USD", 42), "reqid": first.sent[0]["reqid"]})
+    assert (await subscribing).value == ("XBT/USD", )
+    assert "XBT/USD" in kws._subd_feeds["trade"]
+    assert 42 in router.channels
+
+    first.inbox.put_nowait(ConnectionResetError("dropped"))
+    await wait_for(lambda: second.sent)
+
+    assert kws.client is second
+    assert [(m["pair"], m["subscription"]) for m in second.sent] == [(m["pair"], m["subscription"]) for m in first.sent]
+    assert not router.channels
+    await wait_for(lambda: backfilled)
+    assert backfilled[0][0] == "http"
+    assert (await kws._data_queues["trade"].get()).value == "backfill"
+
+    # subscription is tracked again once acknowledged on the new connection
+    second.inbox.put_nowait(ack("XBT/USD", 7))
+    await wait_for(lambda: "XBT/USD" in kws._subd_feeds["trade"])
+
+    for task in kws._running_tasks.values():
+        task.cancel()
+
+
+@pytest.mark.asyncio
+async def test_resubscribe_only_resets_replayed_books():
+    kws = KrakenWsPublic(FakeClient(), make_msg_handler(), asyncio.get_event_loop(), {"book": "orderbook"})
+    other = KrakenWsPublic(FakeClient(), make_msg_handler(), asyncio.get_event_loop(), {"book": "orderbook"})
+
+    sub_model = orderbook.validate_sub(lambda x: x.replace("-", "/"), "XBT-USD", 10).value
+    kws._subs[("book", ("XBT/USD", ))] = (sub_model, ())
+    kws._subd_feeds["orderbook"].add("XBT/USD")
+    kws._full_books.update({"XBT-USD": {"asks": {}, "bids": {}}, "ETH-USD": {"asks": {}, "bids": {}}})
+    other._full_books["XBT-USD"] = {"asks": {}, "bids": {}}
+
+    assert (await kws.resubscribe()).value == ("orderbook", )
+    assert set(kws._full_books) == {"ETH-USD"}
+    assert set(other._full_books) == {"XBT-USD"}
+
+    await asyncio.gather(kws.close(), other.close())
@@ -0,0 +1,102 @@
+import asyncio
+import json
+
+import pytest
+
+from noobit_markets.exchanges.kraken.websockets.public.routing import make_msg_handler
+
+from noobit_markets.base.models.result import Ok
+from noobit_markets.base.models.events import TradeTick, BookDelta, BestBidOffer
+
+
+TRADE_MSG = [0, [["5541.20000", "0.15850568", "1534614057.321597", "s", "l", ""], ["6060.00000", "0.02455000", "1534614057.324998", "b", "l", ""]], "trade", "XBT/USD"]
+BOOK_MSG = [1234, {"a": [["5541.30000", "2.50700000", "1534614248.456738"]]}, {"b": [["5541.20000", "1.52900000", "1534614248.765567"]]}, "book-10", "XBT/USD"]
+SPREAD_MSG = [0, ["5698.40000", "5700.00000", "1542057299.545897", "1.01234567", "0.98765432"], "spread", "XBT/USD"]
+
+
+def make_queues():
+    data_queues = {k: asyncio.Queue() for k in ["trade", "spread", "spread_copy", "orderbook", "ohlc"]}
+    status_queues = {"connection": asyncio.Queue(), "subscription": asyncio.Queue(), "heartbeat": asyncio.Queue(maxsize=10)}
+    return data_queues, status_queues
+
+
+@pytest.mark.asyncio
+async def test_compact_events():
+
+    data_queues, status_queues = make_queues()
+    handler = make_msg_handler(compact=True, keep_raw=False)
+
+    await handler(json.dumps(TRADE_MSG), data_queues, status_queues)
+    await handler(json.dumps(BOOK_MSG), data_queues, status_queues)
+    await handler(json.dumps(SPREAD_MSG), data_queues, status_queues)
+
+    assert data_queues["trade"].qsize() == 2
+    tick = (await data_queues["trade"].get()).value
+    assert isinstance(tick, TradeTick)
+    assert tick.side == "SELL"
+    assert tick.rawJson is None
+    assert not hasattr(tick, "__dict__")
+
+    delta = (await data_queues["orderbook"].get()).value
+    assert isinstance(delta, BookDelta)
+    assert not delta.isSnapshot
+    assert len(delta.asks) == 1 and len(delta.bids) == 1
+
+    bbo = await data_queues["spread_copy"].get()
+    assert isinstance(bbo, Ok)
+    assert isinstance(bbo.value, BestBidOffer)
+
+
+@pytest.mark.asyncio
+async def test_compact_keep_raw():
+
+    data_queues, status_queues = make_queues()
+    handler = make_msg_handler(compact=True, keep_raw=True)
+
+    await handler(json.dumps(SPREAD_MSG), data_queues, status_queues)
+    bbo = (await data_queues["spread"].get()).value
+    assert bbo.rawJson == SPREAD_MSG
+
+
+@pytest.mark.asyncio
+async def test_router_channel_table():
+
+    data_queues, status_queues = make_queues()
+    router = make_msg_handler(compact=True, keep_raw=False)
+
+    sub_status = {"channelID": 42, "channelName": "spread", "event": "subscriptionStatus", "pair": "XBT/USD", "status": "subscribed", "subscription": {"name": "spread"}}
+    await router(json.dumps(sub_status), data_queues, status_queues)
+    assert router.channels[42][:2] == ("spread", "XBT/USD")
+    assert (await status_queues["subscription"].get()) == sub_status
+
+    # routed by channelID only
+    frame = [42] + SPREAD_MSG[1:]
+    await router(json.dumps(frame), data_queues, status_queues)
+    assert isinstance((await data_queues["spread"].get()).value, BestBidOffer)
+
+    await router(json.dumps({**sub_status, "status": "unsubscribed"}), data_queues, status_queues)
+    assert 42 not in router.channels
+
+    await router(json.dumps({"event": "heartbeat"}), data_queues, status_queues)
+    assert status_queues["heartbeat"].qsize() == 1
+
+
+@pytest.mark.asyncio
+async def test_offloaded_book_applies_rawjson_policy():
+    from noobit_markets.base.offload import configure_offload, get_offload_config
+    from noobit_markets.base.rawjson import rawjson_policy
+
+    data_queues, status_queues = make_queues()
+    handler = make_msg_handler()
+
+    mode, threshold = get_offload_config()
+    configure_offload("thread", threshold=0)
+    try:
+        with rawjson_policy("drop"):
+            await handler(json.dumps(BOOK_MSG), data_queues, status_queues)
+    finally:
+        configure_offload(mode, threshold)
+
+    book = (await data_queues["orderbook"].get()).value
+    assert book.symbol == "XBT-USD"
+    assert book.rawJson is None
@@ -0,0 +1,61 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from noobit_markets.base.models.result import Ok
+from noobit_markets.exchanges.kraken.websockets.public.api import KrakenWsPublic
+from noobit_markets.exchanges.kraken.websockets.public.routing import msg_handler
+
+
+class FakeClient:
+    """acknowledges every pair of a subscription, except BAD/USD"""
+
+    open = True
+
+    def __init__(self):
+        self.sent = []
+        self.inbox = asyncio.Queue()
+
+    async def send(self, msg):
+        msg = json.loads(msg)
+        self.sent.append(msg)
+        for pair in msg["pair"]:
+            status = {"status": "error", "errorMessage": "nope"} if pair == "BAD/USD" else {"status": "subscribed"}
+            self.inbox.put_nowait({"event": "subscriptionStatus", "pair": pair, "reqid": msg["reqid"], "subscription": {"name": "trade"}, **status})
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        return json.dumps(await self.inbox.get())
+
+
+def symbols_resp(bases):
+    return SimpleNamespace(asset_pairs={f"{b}-USD": SimpleNamespace(noobit_base=b, noobit_quote="USD") for b in bases})
+
+
+@pytest.mark.asyncio
+async def test_subscribe_many(monkeypatch):
+    monkeypatch.setattr(KrakenWsPublic, "_data_queues", {"trade": asyncio.Queue()})
+    monkeypatch.setattr(KrakenWsPublic, "_status_queues", {k: asyncio.Queue() for k in ("connection", "subscription", "heartbeat")})
+    monkeypatch.setattr(KrakenWsPublic, "_subd_feeds", {"trade": set()})
+    monkeypatch.setattr(KrakenWsPublic, "_sub_batch_size", 2)
+
+    client = FakeClient()
+    kws = KrakenWsPublic(client, msg_handler, asyncio.get_event_loop(), {"trade": "trade"})
+    resp = symbols_resp(["XBT", "ETH", "BAD", "LTC", "DOT"])
+
+    streams = await kws.subscribe_many(resp, "trade", ["XBT-USD", "ETH-USD", "BAD-USD", "LTC-USD", "DOT-USD"], per_symbol=True)
+
+    # 3 messages of at most 2 pairs, refused pair left out
+    assert [m["pair"] for m in client.sent] == [["XBT/USD", "ETH/USD"], ["BAD/USD", "LTC/USD"], ["DOT/USD"]]
+    assert sorted(streams.value) == ["DOT-USD", "ETH-USD", "LTC-USD", "XBT-USD"]
+
+    # messages are routed by symbol
+    msg = Ok(SimpleNamespace(trades=(SimpleNamespace(symbol="ETH-USD"), )))
+    kws._data_queues["trade"].put_nowait(msg)
+    assert await asyncio.wait_for(streams.value["ETH-USD"].__anext__(), 0.5) is msg
+
+    await kws.close()
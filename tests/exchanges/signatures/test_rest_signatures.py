@@ -44,6 +44,14 @@ from noobit_markets.exchanges.kraken.rest.private.orders import get_closedorders
 from noobit_markets.exchanges.binance.rest.private.trades import get_usertrades_binance
 from noobit_markets.exchanges.kraken.rest.private.trades import get_usertrades_kraken
 
+#private cancel all / batch
+from noobit_markets.exchanges.binance.rest.private.cancel_open import cancel_all_binance, cancel_openorders_binance
+from noobit_markets.exchanges.kraken.rest.private.cancel_open import cancel_all_kraken, cancel_openorders_kraken
+from noobit_markets.exchanges.ftx.rest.private.cancel_open import cancel_all_ftx
+from noobit_markets.exchanges.binance.rest.private.trading import post_neworders_binance
+from noobit_markets.exchanges.kraken.rest.private.trading import post_neworders_kraken
+from noobit_markets.exchanges.ftx.rest.private.trading import post_neworders_ftx
+
 
 from noobit_markets.base.models.result import Ok, Err, Result
 from noobit_markets.base.models.rest.response import NoobitResponseInstrument
@@ -191,4 +199,23 @@ def test_usertrades_signature():
     sig_kraken = inspect.signature(get_usertrades_kraken)
     sig_binance = inspect.signature(get_usertrades_binance)
 
-    _util_test_sigs(sig_kraken, sig_binance)
\ No newline at end of file
+    _util_test_sigs(sig_kraken, sig_binance)
+
+
+def test_cancelall_signature():
+
+    sig_kraken = inspect.signature(cancel_all_kraken)
+    sig_binance = inspect.signature(cancel_all_binance)
+    sig_ftx = inspect.signature(cancel_all_ftx)
+
+    _util_test_sigs(sig_kraken, sig_binance, sig_ftx)
+
+
+def test_batch_signature():
+
+    _util_test_sigs(inspect.signature(cancel_openorders_kraken), inspect.signature(cancel_openorders_binance))
+
+    # kraken has an extra `fast_ack` kwarg
+    sig_kraken = inspect.signature(post_neworders_kraken)
+    sig_kraken = sig_kraken.replace(parameters=[p for n, p in sig_kraken.parameters.items() if n != "fast_ack"])
+    _util_test_sigs(sig_kraken, inspect.signature(post_neworders_binance), inspect.signature(post_neworders_ftx))